@@ -0,0 +1,39 @@
+"""add chat session keyset pagination indexes
+
+Revision ID: a7c1e9d4b2f3
+Revises: 09995b8811eb
+Create Date: 2025-10-27 10:12:31.482913
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "a7c1e9d4b2f3"
+down_revision = "09995b8811eb"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # (user_id, time_created DESC, id DESC) matches the ORDER BY used for
+    # keyset pagination of chat history and search results
+    op.create_index(
+        "ix_chat_session_user_time_created_id",
+        "chat_session",
+        ["user_id", sa.text("time_created DESC"), sa.text("id DESC")],
+        unique=False,
+    )
+    op.create_index(
+        "ix_chat_message_chat_session_id_id",
+        "chat_message",
+        ["chat_session_id", "id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_chat_message_chat_session_id_id", table_name="chat_message")
+    op.drop_index("ix_chat_session_user_time_created_id", table_name="chat_session")
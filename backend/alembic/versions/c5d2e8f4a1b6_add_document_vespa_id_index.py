@@ -0,0 +1,32 @@
+"""add document vespa id index
+
+Revision ID: c5d2e8f4a1b6
+Revises: a7c1e9d4b2f3
+Create Date: 2025-10-29 09:41:12.305518
+
+"""
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "c5d2e8f4a1b6"
+down_revision = "a7c1e9d4b2f3"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # the id a document has in Vespa, in Vespa's (byte-wise) order. Matches
+    # _vespa_document_id in onyx/db/document.py, which documents are looked up and
+    # ordered by when deleting them from Vespa by id range
+    op.execute(
+        """
+        CREATE INDEX IF NOT EXISTS ix_document_vespa_document_id
+        ON document ((replace(id, '''', '_') COLLATE "C"))
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_document_vespa_document_id")
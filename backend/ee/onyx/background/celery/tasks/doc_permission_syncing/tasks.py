@@ -23,6 +23,7 @@ from tenacity import wait_random_exponential
 
 from ee.onyx.db.connector_credential_pair import get_all_auto_sync_cc_pairs
 from ee.onyx.db.document import upsert_document_external_perms
+from ee.onyx.db.document import upsert_document_external_perms_batch
 from ee.onyx.external_permissions.sync_params import get_source_perm_sync_config
 from onyx.access.models import DocExternalAccess
 from onyx.background.celery.apps.app_base import task_logger
@@ -31,6 +32,7 @@ from onyx.background.celery.celery_redis import celery_get_queue_length
 from onyx.background.celery.celery_redis import celery_get_queued_task_ids
 from onyx.background.celery.celery_redis import celery_get_unacked_task_ids
 from onyx.background.celery.tasks.beat_schedule import CLOUD_BEAT_MULTIPLIER_DEFAULT
+from onyx.configs.app_configs import DOC_PERMISSION_SYNC_DB_BATCH_SIZE
 from onyx.configs.app_configs import JOB_TIMEOUT
 from onyx.configs.constants import CELERY_GENERIC_BEAT_LOCK_TIMEOUT
 from onyx.configs.constants import CELERY_PERMISSIONS_SYNC_LOCK_TIMEOUT
@@ -77,6 +79,7 @@ from onyx.redis.redis_pool import get_redis_replica_client
 from onyx.redis.redis_pool import redis_lock_dump
 from onyx.server.runtime.onyx_runtime import OnyxRuntime
 from onyx.server.utils import make_short_id
+from onyx.utils.batching import batch_generator
 from onyx.utils.logger import doc_permission_sync_ctx
 from onyx.utils.logger import format_error_for_logging
 from onyx.utils.logger import LoggerContextVars
@@ -571,10 +574,13 @@ def connector_permission_sync_generator_task(
 
             tasks_generated = 0
             docs_with_errors = 0
-            for doc_external_access in document_external_accesses:
+            # permissions are written in batches, one transaction per batch
+            for permissions_batch in batch_generator(
+                document_external_accesses, DOC_PERMISSION_SYNC_DB_BATCH_SIZE
+            ):
                 result = redis_connector.permissions.update_db(
                     lock=lock,
-                    new_permissions=[doc_external_access],
+                    new_permissions=permissions_batch,
                     source_string=source_type,
                     connector_id=cc_pair.connector.id,
                     credential_id=cc_pair.credential.id,
@@ -695,6 +701,76 @@ def document_update_permissions(
     return True
 
 
+@retry(
+    retry=retry_if_exception(is_retryable_sqlalchemy_error),
+    wait=wait_random_exponential(
+        multiplier=1, max=DOCUMENT_PERMISSIONS_UPDATE_MAX_WAIT
+    ),
+    stop=stop_after_delay(DOCUMENT_PERMISSIONS_UPDATE_STOP_AFTER),
+)
+def document_update_permissions_batch(
+    tenant_id: str,
+    permissions_batch: list[DocExternalAccess],
+    source_type_str: str,
+    connector_id: int,
+    credential_id: int,
+) -> bool:
+    """Batched version of document_update_permissions. The users of the whole
+    batch are added at once and the permissions are written with a single upsert,
+    in one transaction."""
+    start = time.monotonic()
+
+    emails = {
+        email
+        for permissions in permissions_batch
+        for email in permissions.external_access.external_user_emails
+    }
+
+    try:
+        with get_session_with_tenant(tenant_id=tenant_id) as db_session:
+            # Add the users to the DB if they don't exist
+            batch_add_ext_perm_user_if_not_exists(
+                db_session=db_session,
+                emails=list(emails),
+                continue_on_error=True,
+            )
+            # Then upsert the documents' external permissions
+            created_doc_ids, updated_doc_ids = upsert_document_external_perms_batch(
+                db_session=db_session,
+                doc_external_accesses=permissions_batch,
+                source_type=DocumentSource(source_type_str),
+            )
+            db_session.commit()
+
+            if created_doc_ids:
+                # New documents are associated with the cc_pair
+                upsert_document_by_connector_credential_pair(
+                    db_session=db_session,
+                    connector_id=connector_id,
+                    credential_id=credential_id,
+                    document_ids=created_doc_ids,
+                )
+
+            elapsed = time.monotonic() - start
+            task_logger.info(
+                f"connector_id={connector_id} "
+                f"docs={len(permissions_batch)} "
+                f"created={len(created_doc_ids)} "
+                f"changed={len(updated_doc_ids)} "
+                f"users={len(emails)} "
+                f"action=update_permissions_batch "
+                f"elapsed={elapsed:.2f}"
+            )
+    except Exception:
+        task_logger.exception(
+            f"document_update_permissions_batch exceptioned: "
+            f"connector_id={connector_id} docs={len(permissions_batch)}"
+        )
+        raise
+
+    return True
+
+
 def validate_permission_sync_fences(
     tenant_id: str,
     r: Redis,
@@ -1,9 +1,14 @@
 from datetime import datetime
 from datetime import timezone
 
+from sqlalchemy import func
+from sqlalchemy import literal_column
 from sqlalchemy import select
+from sqlalchemy import text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import Session
 
+from onyx.access.models import DocExternalAccess
 from onyx.access.models import ExternalAccess
 from onyx.access.utils import build_ext_group_name_for_onyx
 from onyx.configs.constants import DocumentSource
@@ -101,3 +106,83 @@ def upsert_document_external_perms(
         db_session.commit()
 
     return False
+
+
+def _sorted_array_sql(column: str) -> str:
+    # permissions are compared as sets, like upsert_document_external_perms does
+    return f"ARRAY(SELECT unnest(coalesce({column}, '{{}}')) ORDER BY 1)"
+
+
+_EXTERNAL_PERMS_CHANGED_SQL = (
+    " OR ".join(
+        f"{_sorted_array_sql(f'document.{column}')} "
+        f"IS DISTINCT FROM {_sorted_array_sql(f'excluded.{column}')}"
+        for column in ("external_user_emails", "external_user_group_ids")
+    )
+    + " OR document.is_public IS DISTINCT FROM excluded.is_public"
+)
+
+
+def upsert_document_external_perms_batch(
+    db_session: Session,
+    doc_external_accesses: list[DocExternalAccess],
+    source_type: DocumentSource,
+) -> tuple[list[str], list[str]]:
+    """
+    Set-based version of upsert_document_external_perms for many documents, done
+    in a single INSERT ... ON CONFLICT statement. Only documents whose external
+    access actually changed are updated and have their last_modified bumped, so
+    only those are picked up by the next Vespa sync.
+
+    Returns the ids of the documents that were created and of the existing ones
+    that were changed. Does not commit.
+    NOTE: this will replace any existing external access, it will not do a union
+    """
+    # a row can only be upserted once per statement, the last access wins
+    access_by_doc_id = {
+        doc_external_access.doc_id: doc_external_access.external_access
+        for doc_external_access in doc_external_accesses
+    }
+    if not access_by_doc_id:
+        return [], []
+
+    insert_stmt = pg_insert(DbDocument).values(
+        [
+            {
+                "id": doc_id,
+                "semantic_id": "",
+                "external_user_emails": sorted(external_access.external_user_emails),
+                "external_user_group_ids": sorted(
+                    {
+                        build_ext_group_name_for_onyx(
+                            ext_group_name=group_id,
+                            source=source_type,
+                        )
+                        for group_id in external_access.external_user_group_ids
+                    }
+                ),
+                "is_public": external_access.is_public,
+            }
+            for doc_id, external_access in access_by_doc_id.items()
+        ]
+    )
+    upsert_stmt = insert_stmt.on_conflict_do_update(
+        index_elements=[DbDocument.id],
+        set_={
+            "external_user_emails": insert_stmt.excluded.external_user_emails,
+            "external_user_group_ids": insert_stmt.excluded.external_user_group_ids,
+            "is_public": insert_stmt.excluded.is_public,
+            "last_modified": func.now(),
+        },
+        where=text(_EXTERNAL_PERMS_CHANGED_SQL),
+    ).returning(
+        DbDocument.id,
+        # xmax is only 0 for rows that were inserted rather than updated
+        literal_column("(xmax = 0)").label("inserted"),
+    )
+
+    created_doc_ids: list[str] = []
+    updated_doc_ids: list[str] = []
+    for doc_id, inserted in db_session.execute(upsert_stmt):
+        (created_doc_ids if inserted else updated_doc_ids).append(doc_id)
+    return created_doc_ids, updated_doc_ids
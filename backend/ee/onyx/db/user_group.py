@@ -308,6 +308,39 @@ def fetch_documents_for_user_group_paginated(
     return documents, documents[-1].id if documents else None
 
 
+def fetch_cc_pair_ids_for_user_groups(
+    db_session: Session,
+    user_group_names: list[str],
+) -> Sequence[tuple[str, list[int]]]:
+    """
+    Gives back (user_group_name, cc_pair ids) tuples, using the same memberships as
+    fetch_user_groups_for_documents.
+
+    NOTE: this doesn't include cc_pairs with access type SYNC
+    """
+    stmt = (
+        select(UserGroup.name, func.array_agg(ConnectorCredentialPair.id))
+        .join(
+            UserGroup__ConnectorCredentialPair,
+            UserGroup.id == UserGroup__ConnectorCredentialPair.user_group_id,
+        )
+        .join(
+            ConnectorCredentialPair,
+            and_(
+                ConnectorCredentialPair.id
+                == UserGroup__ConnectorCredentialPair.cc_pair_id,
+                ConnectorCredentialPair.access_type != AccessType.SYNC,
+            ),
+        )
+        .where(UserGroup.name.in_(user_group_names))
+        .where(UserGroup__ConnectorCredentialPair.is_current == True)  # noqa: E712
+        .where(ConnectorCredentialPair.status != ConnectorCredentialPairStatus.DELETING)
+        .group_by(UserGroup.name)
+    )
+
+    return db_session.execute(stmt).all()  # type: ignore
+
+
 def fetch_user_groups_for_documents(
     db_session: Session,
     document_ids: list[str],
@@ -393,15 +393,14 @@ def download_query_history_csv(
 
     if has_file:
         try:
-            csv_stream = file_store.read_file(report_name)
+            csv_stream = file_store.open_stream(report_name)
         except Exception as e:
             raise HTTPException(
                 HTTPStatus.INTERNAL_SERVER_ERROR,
                 f"Failed to read query history file: {str(e)}",
             )
-        csv_stream.seek(0)
         return StreamingResponse(
-            iter(csv_stream),
+            csv_stream,
             media_type=FileType.CSV,
             headers={"Content-Disposition": f"attachment;filename={report_name}"},
         )
@@ -101,6 +101,7 @@ def basic_search(
             schema=BaseSearchProcessingResponse,
             timeout_override=TF_DR_TIMEOUT_SHORT,
             # max_tokens=100,
+            use_response_cache=True,
         )
     except Exception as e:
         logger.error(f"Could not process query: {e}")
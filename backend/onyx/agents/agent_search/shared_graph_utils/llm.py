@@ -142,6 +142,7 @@ def invoke_llm_json(
     tool_choice: ToolChoiceOptions | None = None,
     timeout_override: int | None = None,
     max_tokens: int | None = None,
+    use_response_cache: bool = False,
 ) -> SchemaType:
     """
     Invoke an LLM, forcing it to respond in a specified JSON format if possible,
@@ -162,6 +163,7 @@ def invoke_llm_json(
             tool_choice=tool_choice,
             timeout_override=timeout_override,
             max_tokens=max_tokens,
+            use_response_cache=use_response_cache,
             **cast(
                 dict, {"structured_response_format": schema} if supports_json else {}
             ),
@@ -82,6 +82,9 @@ from onyx.db.search_settings import get_current_search_settings
 from onyx.db.search_settings import get_secondary_search_settings
 from onyx.db.swap_index import check_and_perform_index_swap
 from onyx.document_index.factory import get_default_document_index
+from onyx.file_processing.extraction_service import (
+    delete_expired_extraction_cache_entries,
+)
 from onyx.file_store.document_batch_storage import DocumentBatchStorage
 from onyx.file_store.document_batch_storage import get_document_batch_storage
 from onyx.httpx.httpx_pool import HttpxPool
@@ -1156,6 +1159,47 @@ def cleanup_index_attempt_task(
         )
 
 
+# primary
+@shared_task(
+    name=OnyxCeleryTask.CHECK_FOR_EXTRACTION_CACHE_CLEANUP,
+    soft_time_limit=300,
+    bind=True,
+)
+def check_for_extraction_cache_cleanup(self: Task, *, tenant_id: str) -> None:
+    """Delete cached file extraction results older than the cache TTL."""
+    locked = False
+    redis_client = get_redis_client(tenant_id=tenant_id)
+    lock: RedisLock = redis_client.lock(
+        OnyxRedisLocks.CHECK_EXTRACTION_CACHE_CLEANUP_BEAT_LOCK,
+        timeout=CELERY_GENERIC_BEAT_LOCK_TIMEOUT,
+    )
+
+    # these tasks should never overlap
+    if not lock.acquire(blocking=False):
+        return None
+
+    try:
+        locked = True
+        with get_session_with_current_tenant() as db_session:
+            num_deleted = delete_expired_extraction_cache_entries(db_session)
+        task_logger.info(
+            f"check_for_extraction_cache_cleanup - Deleted {num_deleted} entries: "
+            f"tenant={tenant_id}"
+        )
+    except Exception:
+        task_logger.exception("Unexpected exception during extraction cache cleanup")
+        return None
+    finally:
+        if locked:
+            if lock.owned():
+                lock.release()
+            else:
+                task_logger.error(
+                    "check_for_extraction_cache_cleanup - Lock not owned on completion: "
+                    f"tenant={tenant_id}"
+                )
+
+
 class DocumentProcessingBatch(BaseModel):
     """Data structure for a document processing batch."""
 
@@ -4,6 +4,7 @@ from tenacity import retry_if_exception_type
 from tenacity import stop_after_delay
 from tenacity import wait_random_exponential
 
+from onyx.document_index.interfaces import DocumentIdRange
 from onyx.document_index.interfaces import DocumentIndex
 from onyx.document_index.interfaces import VespaDocumentFields
 from onyx.document_index.interfaces import VespaDocumentUserFields
@@ -42,6 +43,22 @@ class RetryDocumentIndex:
             chunk_count=chunk_count,
         )
 
+    @retry(
+        retry=retry_if_exception_type(httpx.ReadTimeout),
+        wait=wait_random_exponential(multiplier=1, max=MAX_WAIT),
+        stop=stop_after_delay(STOP_AFTER),
+    )
+    def delete_document_id_ranges(
+        self,
+        doc_id_ranges: list[DocumentIdRange],
+        *,
+        tenant_id: str,
+    ) -> int:
+        return self.index.delete_document_id_ranges(
+            doc_id_ranges,
+            tenant_id=tenant_id,
+        )
+
     @retry(
         retry=retry_if_exception_type(httpx.ReadTimeout),
         wait=wait_random_exponential(multiplier=1, max=MAX_WAIT),
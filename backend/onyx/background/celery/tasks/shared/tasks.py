@@ -16,9 +16,12 @@ from onyx.configs.constants import ONYX_CELERY_BEAT_HEARTBEAT_KEY
 from onyx.configs.constants import OnyxCeleryTask
 from onyx.db.document import delete_document_by_connector_credential_pair__no_commit
 from onyx.db.document import delete_documents_complete__no_commit
+from onyx.db.document import fetch_cc_pair_ids_for_documents
 from onyx.db.document import fetch_chunk_count_for_document
 from onyx.db.document import get_document
 from onyx.db.document import get_document_connector_count
+from onyx.db.document import get_document_connector_counts
+from onyx.db.document import get_document_ids_in_vespa_id_ranges
 from onyx.db.document import mark_document_as_modified
 from onyx.db.document import mark_document_as_synced
 from onyx.db.document_set import fetch_document_sets_for_document
@@ -26,8 +29,13 @@ from onyx.db.engine.sql_engine import get_session_with_current_tenant
 from onyx.db.relationships import delete_document_references_from_kg
 from onyx.db.search_settings import get_active_search_settings
 from onyx.document_index.factory import get_default_document_index
+from onyx.document_index.interfaces import DocumentIdRange
 from onyx.document_index.interfaces import VespaDocumentFields
+from onyx.document_index.vespa.shared_utils.utils import (
+    replace_invalid_doc_id_characters,
+)
 from onyx.httpx.httpx_pool import HttpxPool
+from onyx.redis.redis_connector import RedisConnector
 from onyx.redis.redis_pool import get_redis_client
 from onyx.server.documents.models import ConnectorCredentialPairIdentifier
 
@@ -38,6 +46,10 @@ DOCUMENT_BY_CC_PAIR_CLEANUP_MAX_RETRIES = 3
 LIGHT_SOFT_TIME_LIMIT = 105
 LIGHT_TIME_LIMIT = LIGHT_SOFT_TIME_LIMIT + 15
 
+# a bulk cleanup deletes up to CONNECTOR_DELETION_BULK_BATCH_SIZE documents
+BULK_CLEANUP_SOFT_TIME_LIMIT = 600
+BULK_CLEANUP_TIME_LIMIT = BULK_CLEANUP_SOFT_TIME_LIMIT + 60
+
 
 class OnyxCeleryTaskCompletionStatus(str, Enum):
     """The different statuses the watchdog can finish with.
@@ -149,11 +161,23 @@ def document_by_cc_pair_cleanup_task(
                 doc_sets = fetch_document_sets_for_document(document_id, db_session)
                 update_doc_sets: set[str] = set(doc_sets)
 
+                cc_pair_ids = dict(
+                    fetch_cc_pair_ids_for_documents(
+                        db_session,
+                        [document_id],
+                        exclude_cc_pair=ConnectorCredentialPairIdentifier(
+                            connector_id=connector_id,
+                            credential_id=credential_id,
+                        ),
+                    )
+                )
+
                 fields = VespaDocumentFields(
                     document_sets=update_doc_sets,
                     access=doc_access,
                     boost=doc.boost,
                     hidden=doc.hidden,
+                    cc_pair_ids=cc_pair_ids.get(document_id, []),
                 )
 
                 # update Vespa. OK if doc doesn't exist. Raises exception otherwise.
@@ -268,6 +292,170 @@ def document_by_cc_pair_cleanup_task(
     return True
 
 
+def _plan_bulk_document_deletion(
+    document_id_runs: list[list[str]],
+    connector_counts: dict[str, int],
+    document_ids_in_ranges: list[str],
+) -> tuple[list[DocumentIdRange], list[str], list[str]]:
+    """Decides how the documents of a bulk cleanup task are deleted.
+
+    A run is deleted from Vespa as a single id range only if it is still safe to do so,
+    i.e. none of its documents picked up another cc_pair reference and no other
+    document was created inside its range. Otherwise its documents are deleted by id.
+
+    Returns the ranges to delete from Vespa, the documents to delete from postgres and
+    the documents that are now shared with another cc_pair."""
+    run_document_ids = {doc_id for run in document_id_runs for doc_id in run}
+    unexpected_vespa_ids = [
+        replace_invalid_doc_id_characters(doc_id)
+        for doc_id in document_ids_in_ranges
+        if doc_id not in run_document_ids
+    ]
+
+    doc_id_ranges: list[DocumentIdRange] = []
+    deleted_doc_ids: list[str] = []
+    shared_doc_ids: list[str] = []
+    for run in document_id_runs:
+        exclusive_doc_ids = [
+            doc_id for doc_id in run if connector_counts.get(doc_id, 0) <= 1
+        ]
+        shared_doc_ids.extend(
+            doc_id for doc_id in run if connector_counts.get(doc_id, 0) > 1
+        )
+        deleted_doc_ids.extend(exclusive_doc_ids)
+
+        first_vespa_id = replace_invalid_doc_id_characters(run[0])
+        last_vespa_id = replace_invalid_doc_id_characters(run[-1])
+        if len(exclusive_doc_ids) == len(run) and not any(
+            first_vespa_id <= vespa_id <= last_vespa_id
+            for vespa_id in unexpected_vespa_ids
+        ):
+            doc_id_ranges.append(
+                DocumentIdRange(first_document_id=run[0], last_document_id=run[-1])
+            )
+            continue
+
+        doc_id_ranges.extend(
+            DocumentIdRange(first_document_id=doc_id, last_document_id=doc_id)
+            for doc_id in exclusive_doc_ids
+        )
+
+    return doc_id_ranges, deleted_doc_ids, shared_doc_ids
+
+
+@shared_task(
+    name=OnyxCeleryTask.DOCUMENT_BY_CC_PAIR_BULK_CLEANUP_TASK,
+    soft_time_limit=BULK_CLEANUP_SOFT_TIME_LIMIT,
+    time_limit=BULK_CLEANUP_TIME_LIMIT,
+    max_retries=DOCUMENT_BY_CC_PAIR_CLEANUP_MAX_RETRIES,
+    bind=True,
+)
+def document_by_cc_pair_bulk_cleanup_task(
+    self: Task,
+    document_id_runs: list[list[str]],
+    connector_id: int,
+    credential_id: int,
+    cc_pair_id: int,
+    tenant_id: str,
+) -> bool:
+    """Deletes many documents that only belong to a cc_pair being deleted at once.
+    Created by the connector deletion parent task.
+
+    Each run holds documents that are contiguous in the Vespa document id ordering, so
+    a whole run is removed from Vespa with a single range based delete instead of one
+    request per chunk, and all documents are removed from postgres with set based
+    statements. Documents that were indexed by another cc_pair in the meantime are
+    handed to document_by_cc_pair_cleanup_task."""
+    document_ids = [doc_id for run in document_id_runs for doc_id in run]
+    task_logger.debug(f"Task start: cc_pair={cc_pair_id} docs={len(document_ids)}")
+
+    start = time.monotonic()
+
+    try:
+        with get_session_with_current_tenant() as db_session:
+            active_search_settings = get_active_search_settings(db_session)
+            doc_index = get_default_document_index(
+                active_search_settings.primary,
+                active_search_settings.secondary,
+                httpx_client=HttpxPool.get("vespa"),
+            )
+
+            retry_index = RetryDocumentIndex(doc_index)
+
+            connector_counts = dict(
+                get_document_connector_counts(db_session, document_ids)
+            )
+            document_ids_in_ranges = get_document_ids_in_vespa_id_ranges(
+                db_session,
+                [
+                    (
+                        replace_invalid_doc_id_characters(run[0]),
+                        replace_invalid_doc_id_characters(run[-1]),
+                    )
+                    for run in document_id_runs
+                ],
+            )
+            doc_id_ranges, deleted_doc_ids, shared_doc_ids = (
+                _plan_bulk_document_deletion(
+                    document_id_runs, connector_counts, document_ids_in_ranges
+                )
+            )
+
+            chunks_affected = retry_index.delete_document_id_ranges(
+                doc_id_ranges, tenant_id=tenant_id
+            )
+
+            delete_documents_complete__no_commit(
+                db_session=db_session,
+                document_ids=deleted_doc_ids,
+            )
+            db_session.commit()
+
+        redis_connector = RedisConnector(tenant_id, cc_pair_id)
+        for doc_id in shared_doc_ids:
+            redis_connector.delete.generate_document_task(
+                self.app, doc_id, connector_id, credential_id
+            )
+
+        elapsed = time.monotonic() - start
+        task_logger.info(
+            f"cc_pair={cc_pair_id} "
+            f"deleted={len(deleted_doc_ids)} "
+            f"shared={len(shared_doc_ids)} "
+            f"ranges={len(doc_id_ranges)} "
+            f"chunks={chunks_affected} "
+            f"elapsed={elapsed:.2f}"
+        )
+    except Exception as e:
+        if (
+            not isinstance(e, SoftTimeLimitExceeded)
+            and self.max_retries is not None
+            and self.request.retries < self.max_retries
+        ):
+            task_logger.exception(
+                f"document_by_cc_pair_bulk_cleanup_task exceptioned: "
+                f"cc_pair={cc_pair_id}"
+            )
+            # Exponential backoff from 2^4 to 2^6 ... i.e. 16, 32, 64
+            countdown = 2 ** (self.request.retries + 4)
+            self.retry(exc=e, countdown=countdown)  # this will raise a celery exception
+
+        # give up on the bulk delete and clean up every document individually, which
+        # also takes care of marking documents for reconciliation if that fails
+        task_logger.exception(
+            f"document_by_cc_pair_bulk_cleanup_task failed, "
+            f"falling back to per document cleanup: cc_pair={cc_pair_id}"
+        )
+        redis_connector = RedisConnector(tenant_id, cc_pair_id)
+        for doc_id in document_ids:
+            redis_connector.delete.generate_document_task(
+                self.app, doc_id, connector_id, credential_id
+            )
+        return False
+
+    return True
+
+
 @shared_task(name=OnyxCeleryTask.CELERY_BEAT_HEARTBEAT, ignore_result=True, bind=True)
 def celery_beat_heartbeat(self: Task, *, tenant_id: str) -> None:
     """When this task runs, it writes a key to Redis with a TTL.
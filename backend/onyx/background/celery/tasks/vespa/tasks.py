@@ -28,11 +28,13 @@ from onyx.background.celery.tasks.vespa.document_sync import (
     try_generate_stale_document_sync_tasks,
 )
 from onyx.configs.app_configs import JOB_TIMEOUT
+from onyx.configs.app_configs import RESOLVE_DOC_SETS_AND_GROUPS_AT_QUERY_TIME
 from onyx.configs.app_configs import VESPA_SYNC_MAX_TASKS
 from onyx.configs.constants import CELERY_VESPA_SYNC_BEAT_LOCK_TIMEOUT
 from onyx.configs.constants import OnyxCeleryTask
 from onyx.configs.constants import OnyxRedisConstants
 from onyx.configs.constants import OnyxRedisLocks
+from onyx.db.document import fetch_cc_pair_ids_for_documents
 from onyx.db.document import get_document
 from onyx.db.document import mark_document_as_synced
 from onyx.db.document_set import delete_document_set
@@ -52,6 +54,8 @@ from onyx.db.sync_record import update_sync_record_status
 from onyx.document_index.factory import get_default_document_index
 from onyx.document_index.interfaces import VespaDocumentFields
 from onyx.httpx.httpx_pool import HttpxPool
+from onyx.redis.redis_cc_pair_membership import invalidate_document_set_cc_pair_ids
+from onyx.redis.redis_cc_pair_membership import invalidate_user_group_cc_pair_ids
 from onyx.redis.redis_document_set import RedisDocumentSet
 from onyx.redis.redis_pool import get_redis_client
 from onyx.redis.redis_pool import get_redis_replica_client
@@ -249,14 +253,21 @@ def try_generate_document_set_sync_tasks(
         f"RedisDocumentSet.generate_tasks starting. document_set_id={document_set.id}"
     )
 
-    # Add all documents that need to be updated into the queue
-    result = rds.generate_tasks(
-        VESPA_SYNC_MAX_TASKS, celery_app, db_session, r, lock_beat, tenant_id
-    )
-    if result is None:
-        return None
+    if RESOLVE_DOC_SETS_AND_GROUPS_AT_QUERY_TIME:
+        # documents are filtered on their cc_pairs, so only the cached mapping of the
+        # document set to its cc_pairs needs to be refreshed
+        invalidate_document_set_cc_pair_ids(r, document_set.name)
+        tasks_generated = 0
+    else:
+        # Add all documents that need to be updated into the queue
+        result = rds.generate_tasks(
+            VESPA_SYNC_MAX_TASKS, celery_app, db_session, r, lock_beat, tenant_id
+        )
+        if result is None:
+            return None
+
+        tasks_generated = result[0]
 
-    tasks_generated = result[0]
     # Currently we are allowing the sync to proceed with 0 tasks.
     # It's possible for sets/groups to be generated initially with no entries
     # and they still need to be marked as up to date.
@@ -326,13 +337,20 @@ def try_generate_user_group_sync_tasks(
     task_logger.info(
         f"RedisUserGroup.generate_tasks starting. usergroup_id={usergroup.id}"
     )
-    result = rug.generate_tasks(
-        VESPA_SYNC_MAX_TASKS, celery_app, db_session, r, lock_beat, tenant_id
-    )
-    if result is None:
-        return None
+    if RESOLVE_DOC_SETS_AND_GROUPS_AT_QUERY_TIME:
+        # documents are filtered on their cc_pairs, so only the cached mapping of the
+        # user group to its cc_pairs needs to be refreshed
+        invalidate_user_group_cc_pair_ids(r, usergroup.name)
+        tasks_generated = 0
+    else:
+        result = rug.generate_tasks(
+            VESPA_SYNC_MAX_TASKS, celery_app, db_session, r, lock_beat, tenant_id
+        )
+        if result is None:
+            return None
+
+        tasks_generated = result[0]
 
-    tasks_generated = result[0]
     # Currently we are allowing the sync to proceed with 0 tasks.
     # It's possible for sets/groups to be generated initially with no entries
     # and they still need to be marked as up to date.
@@ -492,11 +510,16 @@ def vespa_metadata_sync_task(self: Task, document_id: str, *, tenant_id: str) ->
                     document_id=document_id, db_session=db_session
                 )
 
+                cc_pair_ids = dict(
+                    fetch_cc_pair_ids_for_documents(db_session, [document_id])
+                )
+
                 fields = VespaDocumentFields(
                     document_sets=update_doc_sets,
                     access=doc_access,
                     boost=doc.boost,
                     hidden=doc.hidden,
+                    cc_pair_ids=cc_pair_ids.get(document_id, []),
                     # aggregated_boost_factor=doc.aggregated_boost_factor,
                 )
 
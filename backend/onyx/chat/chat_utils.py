@@ -16,6 +16,7 @@ from onyx.background.celery.tasks.kg_processing.kg_indexing import (
 from onyx.chat.models import LlmDoc
 from onyx.chat.models import PersonaOverrideConfig
 from onyx.chat.models import ThreadMessage
+from onyx.configs.chat_configs import CHAT_HISTORY_PREFETCH_MESSAGES
 from onyx.configs.constants import DEFAULT_PERSONA_ID
 from onyx.configs.constants import MessageType
 from onyx.configs.constants import TMP_DRALPHA_PERSONA_NAME
@@ -25,7 +26,8 @@ from onyx.context.search.models import RetrievalDetails
 from onyx.context.search.models import SavedSearchDoc
 from onyx.context.search.models import SearchDoc
 from onyx.db.chat import create_chat_session
-from onyx.db.chat import get_chat_messages_by_session
+from onyx.db.chat import get_chat_messages_by_ids
+from onyx.db.chat import get_mainline_chat_message_ids
 from onyx.db.kg_config import get_kg_config_settings
 from onyx.db.kg_config import is_kg_config_settings_enabled_valid
 from onyx.db.llm import fetch_existing_doc_sets
@@ -44,6 +46,9 @@ from onyx.llm.models import PreviousMessage
 from onyx.llm.override_models import LLMOverride
 from onyx.natural_language_processing.utils import BaseTokenizer
 from onyx.onyxbot.slack.models import SlackContext
+from onyx.redis.redis_chat_mainline import get_cached_mainline_message_ids
+from onyx.redis.redis_chat_mainline import set_cached_mainline_message_ids
+from onyx.redis.redis_pool import get_redis_client
 from onyx.server.query_and_chat.models import CreateChatMessageRequest
 from onyx.server.query_and_chat.streaming_models import CitationInfo
 from onyx.tools.tool_implementations.custom.custom_tool import (
@@ -196,6 +201,46 @@ def combine_message_thread(
     return "\n\n".join(message_strs)
 
 
+def _get_chat_messages(
+    chat_message_ids: list[int],
+    chat_session_id: UUID,
+    db_session: Session,
+    prefetch_tool_calls: bool,
+) -> list[ChatMessage]:
+    """Only the most recent messages get their tool calls and research steps prefetched,
+    the rest are loaded lazily if they are ever used"""
+    num_not_prefetched = (
+        max(len(chat_message_ids) - CHAT_HISTORY_PREFETCH_MESSAGES, 0)
+        if prefetch_tool_calls
+        else len(chat_message_ids)
+    )
+    return get_chat_messages_by_ids(
+        chat_message_ids=chat_message_ids[:num_not_prefetched],
+        chat_session_id=chat_session_id,
+        db_session=db_session,
+    ) + get_chat_messages_by_ids(
+        chat_message_ids=chat_message_ids[num_not_prefetched:],
+        chat_session_id=chat_session_id,
+        db_session=db_session,
+        prefetch_tool_calls=True,
+    )
+
+
+def _valid_mainline_prefix(messages: list[ChatMessage]) -> list[ChatMessage]:
+    """The cached mainline may be outdated, e.g. after a message was edited or
+    regenerated. Returns the part of it that still starts at the root message and
+    follows the latest_child_message pointers."""
+    mainline_prefix: list[ChatMessage] = []
+    for message in messages:
+        if mainline_prefix:
+            if mainline_prefix[-1].latest_child_message != message.id:
+                break
+        elif message.parent_message is not None:
+            break
+        mainline_prefix.append(message)
+    return mainline_prefix
+
+
 def create_chat_chain(
     chat_session_id: UUID,
     db_session: Session,
@@ -204,45 +249,46 @@ def create_chat_chain(
     stop_at_message_id: int | None = None,
 ) -> tuple[ChatMessage, list[ChatMessage]]:
     """Build the linear chain of messages without including the root message"""
-    mainline_messages: list[ChatMessage] = []
-
-    all_chat_messages = get_chat_messages_by_session(
-        chat_session_id=chat_session_id,
-        user_id=None,
-        db_session=db_session,
-        skip_permission_check=True,
-        prefetch_tool_calls=prefetch_tool_calls,
+    redis_client = get_redis_client()
+    cached_message_ids = get_cached_mainline_message_ids(redis_client, chat_session_id)
+    chain = _valid_mainline_prefix(
+        _get_chat_messages(
+            cached_message_ids, chat_session_id, db_session, prefetch_tool_calls
+        )
     )
-    id_to_msg = {msg.id: msg for msg in all_chat_messages}
 
-    if not all_chat_messages:
+    # only the messages past the (still valid) cached part of the chain are looked up
+    if not chain or chain[-1].latest_child_message is not None:
+        new_message_ids = get_mainline_chat_message_ids(
+            chat_session_id=chat_session_id,
+            db_session=db_session,
+            start_message_id=chain[-1].latest_child_message if chain else None,
+        )
+        chain += _get_chat_messages(
+            new_message_ids, chat_session_id, db_session, prefetch_tool_calls
+        )
+
+    chain_message_ids = [message.id for message in chain]
+    if chain_message_ids != cached_message_ids:
+        set_cached_mainline_message_ids(
+            redis_client, chat_session_id, chain_message_ids
+        )
+
+    if not chain:
         raise RuntimeError("No messages in Chat Session")
 
-    root_message = all_chat_messages[0]
-    if root_message.parent_message is not None:
+    # Stop at the `final_id` of the submitted message
+    if stop_at_message_id and stop_at_message_id in chain_message_ids:
+        chain = chain[: chain_message_ids.index(stop_at_message_id) + 1]
+    elif chain[-1].latest_child_message is not None:
         raise RuntimeError(
-            "Invalid root message, unable to fetch valid chat message sequence"
+            "Invalid message chain," "could not find next message in the same session"
         )
 
-    current_message: ChatMessage | None = root_message
+    mainline_messages: list[ChatMessage] = []
     previous_message: ChatMessage | None = None
-    while current_message is not None:
-        child_msg = current_message.latest_child_message
-
-        # Break if at the end of the chain
-        # or have reached the `final_id` of the submitted message
-        if not child_msg or (
-            stop_at_message_id and current_message.id == stop_at_message_id
-        ):
-            break
-        current_message = id_to_msg.get(child_msg)
-
-        if current_message is None:
-            raise RuntimeError(
-                "Invalid message chain,"
-                "could not find next message in the same session"
-            )
-
+    # the root message is not part of the chain
+    for current_message in chain[1:]:
         if (
             current_message.message_type == MessageType.ASSISTANT
             and previous_message is not None
@@ -0,0 +1,141 @@
+import queue
+import threading
+import time
+from collections.abc import Iterator
+
+from pydantic import BaseModel
+
+from onyx.configs.chat_configs import STREAM_COALESCE_MAX_DELTAS
+from onyx.configs.chat_configs import STREAM_COALESCE_WINDOW_MS
+from onyx.server.query_and_chat.streaming_models import MessageDelta
+from onyx.server.query_and_chat.streaming_models import Packet
+from onyx.server.query_and_chat.streaming_models import ReasoningDelta
+from onyx.server.utils import get_json_line
+from onyx.utils.threadpool_concurrency import run_in_background
+from onyx.utils.threadpool_concurrency import wait_on_background
+
+# the delta packets that can be merged, and the field holding their text
+_COALESCED_DELTA_FIELDS: dict[type[BaseModel], str] = {
+    MessageDelta: "content",
+    ReasoningDelta: "reasoning",
+}
+
+
+def serialize_stream_object(obj: BaseModel) -> str:
+    # some of the other stream objects override model_dump, so only packets skip
+    # the intermediate dict
+    if isinstance(obj, Packet):
+        return obj.model_dump_json() + "\n"
+    return get_json_line(obj.model_dump())
+
+
+class ChatStreamWriter:
+    """Serializes the chat stream into json lines. Consecutive message or reasoning
+    deltas of the same step are merged into one packet until window_ms has passed
+    since the first of them or max_deltas were merged. Any other object flushes the
+    merged packet first, so tool, section end and stop packets are never delayed.
+
+    write only checks the window when the next object arrives, stream also flushes
+    the merged packet once its window passes while waiting for the next object."""
+
+    def __init__(
+        self,
+        window_ms: int = STREAM_COALESCE_WINDOW_MS,
+        max_deltas: int = STREAM_COALESCE_MAX_DELTAS,
+    ) -> None:
+        self.window_seconds = window_ms / 1000
+        self.max_deltas = max_deltas
+
+        self._pending: Packet | None = None
+        self._pending_texts: list[str] = []
+        self._pending_since = 0.0
+
+    def _can_merge(self, obj: BaseModel) -> bool:
+        return (
+            self._pending is not None
+            and isinstance(obj, Packet)
+            and obj.ind == self._pending.ind
+            and type(obj.obj) is type(self._pending.obj)
+        )
+
+    def write(self, obj: BaseModel) -> list[str]:
+        lines: list[str] = []
+        if self._pending is not None and not self._can_merge(obj):
+            lines.extend(self.flush())
+
+        if not isinstance(obj, Packet) or type(obj.obj) not in _COALESCED_DELTA_FIELDS:
+            lines.append(serialize_stream_object(obj))
+            return lines
+
+        if self._pending is None:
+            self._pending = obj
+            self._pending_since = time.monotonic()
+        self._pending_texts.append(
+            getattr(obj.obj, _COALESCED_DELTA_FIELDS[type(obj.obj)])
+        )
+
+        if (
+            len(self._pending_texts) >= self.max_deltas
+            or time.monotonic() - self._pending_since >= self.window_seconds
+        ):
+            lines.extend(self.flush())
+        return lines
+
+    def seconds_until_flush(self) -> float | None:
+        if self._pending is None:
+            return None
+        return max(self._pending_since + self.window_seconds - time.monotonic(), 0)
+
+    def stream(self, objects: Iterator[BaseModel]) -> Iterator[str]:
+        """Writes the objects produced by a background thread, so that waiting on
+        the next object (e.g. a slow LLM token) does not hold back merged deltas"""
+        object_queue: queue.Queue[BaseModel | None] = queue.Queue()
+        stop = threading.Event()
+
+        def produce() -> None:
+            try:
+                for obj in objects:
+                    if stop.is_set():
+                        break
+                    object_queue.put(obj)
+            finally:
+                object_queue.put(None)
+
+        producer = run_in_background(produce)
+        try:
+            while True:
+                try:
+                    obj = object_queue.get(timeout=self.seconds_until_flush())
+                except queue.Empty:
+                    yield from self.flush()
+                    continue
+
+                if obj is None:
+                    break
+                yield from self.write(obj)
+        finally:
+            # if the reader stopped early, the stream is dropped after its current
+            # object, which it may still use the db session for
+            stop.set()
+            producer.join()
+
+        # don't drop the deltas merged so far, also when the stream failed
+        yield from self.flush()
+        # raises the error of the stream, if any
+        wait_on_background(producer)
+
+    def flush(self) -> list[str]:
+        if self._pending is None:
+            return []
+
+        packet = self._pending
+        if len(self._pending_texts) > 1:
+            field = _COALESCED_DELTA_FIELDS[type(packet.obj)]
+            packet = Packet(
+                ind=packet.ind,
+                obj=packet.obj.model_copy(update={field: "".join(self._pending_texts)}),
+            )
+
+        self._pending = None
+        self._pending_texts = []
+        return [serialize_stream_object(packet)]
@@ -32,6 +32,7 @@ from onyx.chat.models import PromptConfig
 from onyx.chat.models import QADocsResponse
 from onyx.chat.models import StreamingError
 from onyx.chat.models import UserKnowledgeFilePacket
+from onyx.chat.packet_proccessing.chat_stream_writer import ChatStreamWriter
 from onyx.chat.prompt_builder.answer_prompt_builder import AnswerPromptBuilder
 from onyx.chat.prompt_builder.answer_prompt_builder import default_build_system_message
 from onyx.chat.prompt_builder.answer_prompt_builder import (
@@ -101,7 +102,6 @@ from onyx.server.query_and_chat.streaming_models import CitationInfo
 from onyx.server.query_and_chat.streaming_models import MessageDelta
 from onyx.server.query_and_chat.streaming_models import MessageStart
 from onyx.server.query_and_chat.streaming_models import Packet
-from onyx.server.utils import get_json_line
 from onyx.tools.force import ForceUseTool
 from onyx.tools.models import SearchToolOverrideKwargs
 from onyx.tools.tool import Tool
@@ -940,13 +940,16 @@ def stream_chat_message(
             custom_tool_additional_headers=custom_tool_additional_headers,
             is_connected=is_connected,
         )
-        for obj in objects:
-            # Check if this is a QADocsResponse with document results
-            if isinstance(obj, QADocsResponse):
-                document_retrieval_latency = time.time() - start_time
-                logger.debug(f"First doc time: {document_retrieval_latency}")
 
-            yield get_json_line(obj.model_dump())
+        def log_first_doc_time(objects: AnswerStream) -> AnswerStream:
+            for obj in objects:
+                # Check if this is a QADocsResponse with document results
+                if isinstance(obj, QADocsResponse):
+                    document_retrieval_latency = time.time() - start_time
+                    logger.debug(f"First doc time: {document_retrieval_latency}")
+                yield obj
+
+        yield from ChatStreamWriter().stream(log_first_doc_time(objects))
 
 
 def remove_answer_citations(answer: str) -> str:
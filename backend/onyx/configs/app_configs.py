@@ -209,6 +209,8 @@ VESPA_CLOUD_KEY_PATH = os.environ.get("VESPA_CLOUD_KEY_PATH")
 INDEX_BATCH_SIZE = int(os.environ.get("INDEX_BATCH_SIZE") or 16)
 
 MAX_DRIVE_WORKERS = int(os.environ.get("MAX_DRIVE_WORKERS", 4))
+# Number of mailboxes the Gmail connector fetches concurrently
+MAX_GMAIL_WORKERS = int(os.environ.get("MAX_GMAIL_WORKERS") or 4)
 
 # Below are intended to match the env variables names used by the official postgres docker image
 # https://hub.docker.com/_/postgres
@@ -404,8 +406,36 @@ CELERY_WORKER_USER_FILE_PROCESSING_CONCURRENCY = int(
 # The maximum number of tasks that can be queued up to sync to Vespa in a single pass
 VESPA_SYNC_MAX_TASKS = 8192
 
+# Resolve document set and user group filters into cc_pair id filters at query time
+# instead of writing the memberships onto every document in Vespa. Changing which
+# cc_pairs belong to a document set or user group then no longer syncs documents.
+# Documents must carry their cc_pair ids in Vespa, so deployments with documents
+# indexed before the cc_pair_ids field existed need to re-index first. Turning this
+# off again leaves the document sets and user groups stored in Vespa stale until the
+# documents are re-indexed.
+RESOLVE_DOC_SETS_AND_GROUPS_AT_QUERY_TIME = (
+    os.environ.get("RESOLVE_DOC_SETS_AND_GROUPS_AT_QUERY_TIME", "").lower() == "true"
+)
+# How long the document set / user group -> cc_pair id mapping is cached in Redis
+CC_PAIR_MEMBERSHIP_CACHE_TTL = int(
+    os.environ.get("CC_PAIR_MEMBERSHIP_CACHE_TTL") or 300
+)
+
 DB_YIELD_PER_DEFAULT = 64
 
+# Number of documents whose external permissions are written to postgres in a
+# single transaction during a doc permission sync
+DOC_PERMISSION_SYNC_DB_BATCH_SIZE = int(
+    os.environ.get("DOC_PERMISSION_SYNC_DB_BATCH_SIZE") or 5000
+)
+
+# Number of documents that only belong to a connector being deleted which are removed
+# from Vespa and postgres together by a single deletion task. Set to 0 to delete every
+# document with its own task
+CONNECTOR_DELETION_BULK_BATCH_SIZE = int(
+    os.environ.get("CONNECTOR_DELETION_BULK_BATCH_SIZE") or 1000
+)
+
 #####
 # Connector Configs
 #####
@@ -478,6 +508,11 @@ CONFLUENCE_CONNECTOR_ATTACHMENT_SIZE_THRESHOLD = int(
 CONFLUENCE_CONNECTOR_ATTACHMENT_CHAR_COUNT_THRESHOLD = int(
     os.environ.get("CONFLUENCE_CONNECTOR_ATTACHMENT_CHAR_COUNT_THRESHOLD", 200_000)
 )
+# Number of pages (within a single page of CQL results) whose comments, attachments
+# and user mentions are fetched concurrently. Set to 1 to process pages one by one.
+CONFLUENCE_CONNECTOR_ENRICHMENT_WORKERS = int(
+    os.environ.get("CONFLUENCE_CONNECTOR_ENRICHMENT_WORKERS", 8)
+)
 
 # A JSON-formatted array. Each item in the array should have the following structure:
 # {
@@ -531,6 +566,11 @@ CONFLUENCE_TIMEZONE_OFFSET = float(
 GOOGLE_DRIVE_CONNECTOR_SIZE_THRESHOLD = int(
     os.environ.get("GOOGLE_DRIVE_CONNECTOR_SIZE_THRESHOLD", 10 * 1024 * 1024)
 )
+# Number of files downloaded / converted concurrently while a drive is listed.
+# Set to 1 to convert files one by one.
+GOOGLE_DRIVE_CONNECTOR_CONVERSION_WORKERS = int(
+    os.environ.get("GOOGLE_DRIVE_CONNECTOR_CONVERSION_WORKERS", 8)
+)
 
 # Default size threshold for SharePoint files (20MB)
 SHAREPOINT_CONNECTOR_SIZE_THRESHOLD = int(
@@ -540,6 +580,12 @@ SHAREPOINT_CONNECTOR_SIZE_THRESHOLD = int(
 BLOB_STORAGE_SIZE_THRESHOLD = int(
     os.environ.get("BLOB_STORAGE_SIZE_THRESHOLD", 20 * 1024 * 1024)
 )
+# Number of objects the blob storage connector downloads ahead of extraction, and
+# the max total size of those downloads
+BLOB_STORAGE_DOWNLOAD_WORKERS = int(os.environ.get("BLOB_STORAGE_DOWNLOAD_WORKERS", 8))
+BLOB_STORAGE_PREFETCH_MAX_BYTES = int(
+    os.environ.get("BLOB_STORAGE_PREFETCH_MAX_BYTES", 256 * 1024 * 1024)
+)
 
 JIRA_CONNECTOR_LABELS_TO_SKIP = [
     ignored_tag
@@ -554,6 +600,12 @@ JIRA_CONNECTOR_MAX_TICKET_SIZE = int(
 GONG_CONNECTOR_START_TIME = os.environ.get("GONG_CONNECTOR_START_TIME")
 
 GITHUB_CONNECTOR_BASE_URL = os.environ.get("GITHUB_CONNECTOR_BASE_URL") or None
+# Fetch PRs and issues (with their comments, authors and labels) through the GraphQL
+# API, a page at a time, instead of walking the REST API. Falls back to REST if the
+# GraphQL API can't be used.
+GITHUB_CONNECTOR_USE_GRAPHQL = (
+    os.environ.get("GITHUB_CONNECTOR_USE_GRAPHQL", "").lower() == "true"
+)
 
 GITLAB_CONNECTOR_INCLUDE_CODE_FILES = (
     os.environ.get("GITLAB_CONNECTOR_INCLUDE_CODE_FILES", "").lower() == "true"
@@ -753,6 +805,21 @@ CUSTOM_ANSWER_VALIDITY_CONDITIONS = json.loads(
 
 VESPA_REQUEST_TIMEOUT = int(os.environ.get("VESPA_REQUEST_TIMEOUT") or "15")
 
+# Limits for the long-lived, per-process client used for Vespa queries. Requests are
+# multiplexed over HTTP/2 where Vespa supports it, so few connections are needed.
+VESPA_QUERY_MAX_CONNECTIONS = int(os.environ.get("VESPA_QUERY_MAX_CONNECTIONS") or 32)
+VESPA_QUERY_MAX_KEEPALIVE_CONNECTIONS = int(
+    os.environ.get("VESPA_QUERY_MAX_KEEPALIVE_CONNECTIONS") or 16
+)
+# Seconds an idle connection is kept open before being closed
+VESPA_QUERY_KEEPALIVE_EXPIRY = float(
+    os.environ.get("VESPA_QUERY_KEEPALIVE_EXPIRY") or 60
+)
+# Per-request timeout (seconds) for queries sent through the pooled client
+VESPA_QUERY_REQUEST_TIMEOUT = float(
+    os.environ.get("VESPA_QUERY_REQUEST_TIMEOUT") or VESPA_REQUEST_TIMEOUT
+)
+
 SYSTEM_RECURSION_LIMIT = int(os.environ.get("SYSTEM_RECURSION_LIMIT") or "1000")
 
 PARSE_WITH_TRAFILATURA = os.environ.get("PARSE_WITH_TRAFILATURA", "").lower() == "true"
@@ -918,6 +985,64 @@ S3_GENERATE_LOCAL_CHECKSUM = (
     os.environ.get("S3_GENERATE_LOCAL_CHECKSUM", "").lower() == "true"
 )
 
+# Files larger than this are uploaded as a multipart upload of parts of this size,
+# so that only one part is held in memory at a time. S3 requires parts of >= 5MB.
+S3_MULTIPART_CHUNK_SIZE = max(
+    int(os.environ.get("S3_MULTIPART_CHUNK_SIZE") or 8 * 1024 * 1024),
+    5 * 1024 * 1024,
+)
+
 # Forcing Vespa Language
 # English: en, German:de, etc. See: https://docs.vespa.ai/en/linguistics.html
 VESPA_LANGUAGE_OVERRIDE = os.environ.get("VESPA_LANGUAGE_OVERRIDE")
+
+# How the query embedding is encoded when sent to Vespa:
+#   "short": tensor short form with floats trimmed to float32 precision (default)
+#   "hex": dense hex form (8 hex chars per float32 cell), the most compact
+#   "list": the full python float repr, as sent by older versions
+VESPA_QUERY_EMBEDDING_ENCODING = (
+    os.environ.get("VESPA_QUERY_EMBEDDING_ENCODING") or "short"
+).lower()
+
+#####
+# Shared Executor Pools
+#####
+# Process-wide, bounded thread pools used by `onyx.utils.executor_service`.
+# `io` is for network / disk bound work (Vespa, model server, connectors) and `llm`
+# for (slow) LLM calls.
+EXECUTOR_IO_MAX_WORKERS = int(os.environ.get("EXECUTOR_IO_MAX_WORKERS") or 64)
+EXECUTOR_LLM_MAX_WORKERS = int(os.environ.get("EXECUTOR_LLM_MAX_WORKERS") or 32)
+
+#####
+# File Extraction Service
+#####
+# Number of sandboxed worker processes used to extract text from files. 0 disables
+# the process pool and extracts in the calling process (as before).
+FILE_EXTRACTION_MAX_WORKERS = int(
+    os.environ.get("FILE_EXTRACTION_MAX_WORKERS")
+    or min(4, max(1, (os.cpu_count() or 1) // 2))
+)
+# CPU time (seconds) a single extraction job may use before it is aborted
+FILE_EXTRACTION_CPU_TIME_LIMIT_SECONDS = int(
+    os.environ.get("FILE_EXTRACTION_CPU_TIME_LIMIT_SECONDS") or 120
+)
+# Address space limit for each extraction worker process. 0 for no limit.
+FILE_EXTRACTION_MEMORY_LIMIT_MB = int(
+    os.environ.get("FILE_EXTRACTION_MEMORY_LIMIT_MB") or 4096
+)
+# Worker processes are replaced after this many jobs to bound leaks / fragmentation
+FILE_EXTRACTION_MAX_JOBS_PER_WORKER = int(
+    os.environ.get("FILE_EXTRACTION_MAX_JOBS_PER_WORKER") or 100
+)
+# PDFs with more pages than this are split into jobs of this many pages
+FILE_EXTRACTION_PDF_PAGES_PER_JOB = int(
+    os.environ.get("FILE_EXTRACTION_PDF_PAGES_PER_JOB") or 50
+)
+# Cache extraction results in the file store, keyed by a hash of the file content
+FILE_EXTRACTION_CACHE_ENABLED = (
+    os.environ.get("FILE_EXTRACTION_CACHE_ENABLED", "true").lower() == "true"
+)
+# Cached extraction results are deleted this many days after they were written
+FILE_EXTRACTION_CACHE_TTL_DAYS = int(
+    os.environ.get("FILE_EXTRACTION_CACHE_TTL_DAYS") or 30
+)
@@ -83,11 +83,26 @@ DISABLE_LLM_DOC_RELEVANCE = (
 # Stops streaming answers back to the UI if this pattern is seen:
 STOP_STREAM_PAT = os.environ.get("STOP_STREAM_PAT") or None
 
+# Consecutive message / reasoning deltas streamed to the UI are coalesced into one
+# packet for up to this many milliseconds or this many deltas. 0 disables it
+STREAM_COALESCE_WINDOW_MS = int(os.environ.get("STREAM_COALESCE_WINDOW_MS") or 15)
+STREAM_COALESCE_MAX_DELTAS = int(os.environ.get("STREAM_COALESCE_MAX_DELTAS") or 64)
+
 # Set this to "true" to hard delete chats
 # This will make chats unviewable by admins after a user deletes them
 # As opposed to soft deleting them, which just hides them from non-admin users
 HARD_DELETE_CHATS = os.environ.get("HARD_DELETE_CHATS", "").lower() == "true"
 
+# When building the chat history, the tool calls and research steps are only loaded
+# up front for this many of the most recent messages, older ones are loaded if used
+CHAT_HISTORY_PREFETCH_MESSAGES = int(
+    os.environ.get("CHAT_HISTORY_PREFETCH_MESSAGES") or 10
+)
+# How long the ids of the mainline messages of a chat session are cached in Redis
+CHAT_MAINLINE_CACHE_TTL = int(
+    os.environ.get("CHAT_MAINLINE_CACHE_TTL") or 60 * 60 * 24
+)  # 1 day
+
 # Internet Search
 EXA_API_KEY = os.environ.get("EXA_API_KEY") or None
 SERPER_API_KEY = os.environ.get("SERPER_API_KEY") or None
@@ -309,6 +309,7 @@ class FileOrigin(str, Enum):
     GENERATED_REPORT = "generated_report"
     INDEXING_CHECKPOINT = "indexing_checkpoint"
     PLAINTEXT_CACHE = "plaintext_cache"
+    EXTRACTION_CACHE = "extraction_cache"
     OTHER = "other"
     QUERY_HISTORY_CSV = "query_history_csv"
     USER_FILE = "user_file"
@@ -380,6 +381,9 @@ class OnyxRedisLocks:
     CHECK_INDEXING_BEAT_LOCK = "da_lock:check_indexing_beat"
     CHECK_CHECKPOINT_CLEANUP_BEAT_LOCK = "da_lock:check_checkpoint_cleanup_beat"
     CHECK_INDEX_ATTEMPT_CLEANUP_BEAT_LOCK = "da_lock:check_index_attempt_cleanup_beat"
+    CHECK_EXTRACTION_CACHE_CLEANUP_BEAT_LOCK = (
+        "da_lock:check_extraction_cache_cleanup_beat"
+    )
     CHECK_CONNECTOR_DOC_PERMISSIONS_SYNC_BEAT_LOCK = (
         "da_lock:check_connector_doc_permissions_sync_beat"
     )
@@ -499,6 +503,9 @@ class OnyxCeleryTask:
     CHECK_FOR_INDEX_ATTEMPT_CLEANUP = "check_for_index_attempt_cleanup"
     CLEANUP_INDEX_ATTEMPT = "cleanup_index_attempt"
 
+    # File extraction cache cleanup
+    CHECK_FOR_EXTRACTION_CACHE_CLEANUP = "check_for_extraction_cache_cleanup"
+
     MONITOR_BACKGROUND_PROCESSES = "monitor_background_processes"
     MONITOR_CELERY_QUEUES = "monitor_celery_queues"
     MONITOR_PROCESS_MEMORY = "monitor_process_memory"
@@ -521,6 +528,7 @@ class OnyxCeleryTask:
 
     CONNECTOR_PRUNING_GENERATOR_TASK = "connector_pruning_generator_task"
     DOCUMENT_BY_CC_PAIR_CLEANUP_TASK = "document_by_cc_pair_cleanup_task"
+    DOCUMENT_BY_CC_PAIR_BULK_CLEANUP_TASK = "document_by_cc_pair_bulk_cleanup_task"
     VESPA_METADATA_SYNC_TASK = "vespa_metadata_sync_task"
     USER_FILE_DOCID_MIGRATION = "user_file_docid_migration"
 
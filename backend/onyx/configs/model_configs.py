@@ -139,3 +139,15 @@ if _LITELLM_EXTRA_BODY_RAW:
 USE_INFORMATION_CONTENT_CLASSIFICATION = (
     os.environ.get("USE_INFORMATION_CONTENT_CLASSIFICATION", "false").lower() == "true"
 )
+
+# Opt-in cache for the responses of deterministic (temperature 0, non streaming)
+# auxiliary LLM calls like query rephrasing and contextual RAG summaries.
+# "redis", "disk" or empty to disable
+LLM_RESPONSE_CACHE_BACKEND = os.environ.get("LLM_RESPONSE_CACHE_BACKEND", "").lower()
+LLM_RESPONSE_CACHE_TTL = int(
+    os.environ.get("LLM_RESPONSE_CACHE_TTL") or 60 * 60 * 24 * 7
+)  # 1 week
+# only used by the disk backend, one subdirectory per tenant
+LLM_RESPONSE_CACHE_DIR = os.environ.get(
+    "LLM_RESPONSE_CACHE_DIR", "/tmp/onyx_llm_response_cache"
+)
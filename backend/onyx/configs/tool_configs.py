@@ -24,3 +24,9 @@ if _CUSTOM_TOOL_PASS_THROUGH_HEADERS_RAW:
         logger.error(
             "Failed to parse CUSTOM_TOOL_PASS_THROUGH_HEADERS, must be a valid JSON object"
         )
+
+# MCP client sessions are kept open and reused between tool calls, they are closed
+# after being idle for this many seconds
+MCP_SESSION_IDLE_TIMEOUT = int(os.environ.get("MCP_SESSION_IDLE_TIMEOUT") or 300)
+# How long the tools listed by an MCP server are cached for
+MCP_TOOL_LIST_CACHE_TTL = int(os.environ.get("MCP_TOOL_LIST_CACHE_TTL") or 300)
@@ -1,15 +1,22 @@
 import os
 import time
+from collections import deque
+from collections.abc import Iterator
 from collections.abc import Mapping
+from concurrent.futures import Future
+from dataclasses import dataclass
 from datetime import datetime
 from datetime import timezone
-from io import BytesIO
 from numbers import Integral
+from tempfile import SpooledTemporaryFile
 from typing import Any
+from typing import cast
+from typing import IO
 from typing import Optional
 from urllib.parse import quote
 
 import boto3  # type: ignore
+import redis
 from botocore.client import Config  # type: ignore
 from botocore.credentials import RefreshableCredentials
 from botocore.exceptions import ClientError
@@ -18,6 +25,8 @@ from botocore.exceptions import PartialCredentialsError
 from botocore.session import get_session
 from mypy_boto3_s3 import S3Client  # type: ignore
 
+from onyx.configs.app_configs import BLOB_STORAGE_DOWNLOAD_WORKERS
+from onyx.configs.app_configs import BLOB_STORAGE_PREFETCH_MAX_BYTES
 from onyx.configs.app_configs import BLOB_STORAGE_SIZE_THRESHOLD
 from onyx.configs.app_configs import INDEX_BATCH_SIZE
 from onyx.configs.constants import BlobType
@@ -31,28 +40,62 @@ from onyx.connectors.exceptions import CredentialExpiredError
 from onyx.connectors.exceptions import InsufficientPermissionsError
 from onyx.connectors.exceptions import UnexpectedValidationError
 from onyx.connectors.interfaces import GenerateDocumentsOutput
+from onyx.connectors.interfaces import GenerateSlimDocumentOutput
 from onyx.connectors.interfaces import LoadConnector
 from onyx.connectors.interfaces import PollConnector
 from onyx.connectors.interfaces import SecondsSinceUnixEpoch
+from onyx.connectors.interfaces import SlimConnector
 from onyx.connectors.models import ConnectorMissingCredentialError
 from onyx.connectors.models import Document
 from onyx.connectors.models import ImageSection
+from onyx.connectors.models import SlimDocument
 from onyx.connectors.models import TextSection
-from onyx.file_processing.extract_file_text import extract_text_and_images
+from onyx.file_processing.extract_file_text import ExtractionResult
 from onyx.file_processing.extract_file_text import get_file_ext
 from onyx.file_processing.extract_file_text import is_accepted_file_ext
 from onyx.file_processing.extract_file_text import OnyxExtensionType
+from onyx.file_processing.extraction_service import get_file_extraction_service
 from onyx.file_processing.image_utils import store_image_and_create_section
+from onyx.redis.redis_pool import get_raw_redis_client
+from onyx.utils.executor_service import ExecutorPool
+from onyx.utils.executor_service import get_executor_service
 from onyx.utils.logger import setup_logger
+from shared_configs.contextvars import get_current_tenant_id
 
 logger = setup_logger()
 
 
 DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+# downloads larger than this are spooled to disk instead of being kept in memory
+DOWNLOAD_SPOOL_MAX_MEMORY_SIZE = 8 * 1024 * 1024
 SIZE_THRESHOLD_BUFFER = 64
 
+_SLIM_BATCH_SIZE = 1000
 
-class BlobStorageConnector(LoadConnector, PollConnector):
+# Redis hash of object key -> version (ETag + size) of what was last indexed
+_OBJECT_VERSIONS_KEY_PREFIX = "blob_connector_object_versions"
+_OBJECT_VERSIONS_TTL_SECONDS = 60 * 60 * 24 * 30
+
+
+@dataclass(frozen=True)
+class _BlobObject:
+    key: str
+    file_name: str
+    last_modified: datetime
+    size_bytes: int | None
+    version: str | None
+    is_image: bool
+
+
+def _close_downloaded_file(future: Future[IO[bytes] | None]) -> None:
+    if future.cancelled() or future.exception() is not None:
+        return
+    downloaded_file = future.result()
+    if downloaded_file is not None:
+        downloaded_file.close()
+
+
+class BlobStorageConnector(LoadConnector, PollConnector, SlimConnector):
     def __init__(
         self,
         bucket_type: str,
@@ -238,26 +281,36 @@ class BlobStorageConnector(LoadConnector, PollConnector):
 
         return None
 
-    def _download_object(self, key: str) -> bytes | None:
+    def _download_object(self, key: str) -> IO[bytes] | None:
+        """Streams the object into a temporary file, which only spills to disk for
+        large objects. Returns None if the object exceeds the size threshold."""
         if self.s3_client is None:
             raise ConnectorMissingCredentialError("Blob storage")
         response = self.s3_client.get_object(Bucket=self.bucket_name, Key=key)
         body = response["Body"]
 
+        downloaded_file = SpooledTemporaryFile(max_size=DOWNLOAD_SPOOL_MAX_MEMORY_SIZE)
         try:
-            if self.size_threshold is None:
-                return body.read()
-
-            return self._read_stream_with_limit(body, key)
+            if self._read_stream_with_limit(body, key, downloaded_file):
+                downloaded_file.seek(0)
+                return cast(IO[bytes], downloaded_file)
+        except BaseException:
+            downloaded_file.close()
+            raise
         finally:
             body.close()
 
-    def _read_stream_with_limit(self, body: Any, key: str) -> bytes | None:
+        downloaded_file.close()
+        return None
+
+    def _read_stream_with_limit(self, body: Any, key: str, output: IO[bytes]) -> bool:
+        """Copies `body` to `output`. Returns False if it exceeds the size threshold."""
         if self.size_threshold is None:
-            return body.read()
+            for chunk in body.iter_chunks(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                output.write(chunk)
+            return True
 
         bytes_read = 0
-        chunks: list[bytes] = []
         chunk_size = min(
             DOWNLOAD_CHUNK_SIZE, self.size_threshold + SIZE_THRESHOLD_BUFFER
         )
@@ -265,16 +318,16 @@ class BlobStorageConnector(LoadConnector, PollConnector):
         for chunk in body.iter_chunks(chunk_size=chunk_size):
             if not chunk:
                 continue
-            chunks.append(chunk)
+            output.write(chunk)
             bytes_read += len(chunk)
 
             if bytes_read > self.size_threshold + SIZE_THRESHOLD_BUFFER:
                 logger.warning(
                     f"{key} exceeds size threshold of {self.size_threshold}. Skipping."
                 )
-                return None
+                return False
 
-        return b"".join(chunks)
+        return True
 
     # NOTE: Left in as may be useful for one-off access to documents and sharing across orgs.
     # def _get_presigned_url(self, key: str) -> str:
@@ -367,41 +420,103 @@ class BlobStorageConnector(LoadConnector, PollConnector):
 
         return None
 
-    def _yield_blob_objects(
+    def _document_from_image(
+        self, blob: _BlobObject, downloaded_file: IO[bytes]
+    ) -> Document | None:
+        try:
+            # TODO: Refactor to avoid direct DB access in connector
+            # This will require broader refactoring across the codebase
+            image_section, _ = store_image_and_create_section(
+                image_data=downloaded_file.read(),
+                file_id=f"{self.bucket_type}_{self.bucket_name}_{blob.key.replace('/', '_')}",
+                display_name=blob.file_name,
+                link=self._get_blob_link(blob.key),
+                file_origin=FileOrigin.CONNECTOR,
+            )
+
+            return Document(
+                id=f"{self.bucket_type}:{self.bucket_name}:{blob.key}",
+                sections=[image_section],
+                source=DocumentSource(self.bucket_type.value),
+                semantic_identifier=blob.file_name,
+                doc_updated_at=blob.last_modified,
+                metadata={},
+            )
+        except Exception:
+            logger.exception(f"Error processing image {blob.key}")
+            return None
+
+    def _document_from_extraction(
         self,
-        start: datetime,
-        end: datetime,
-    ) -> GenerateDocumentsOutput:
+        blob: _BlobObject,
+        extraction_future: Future[ExtractionResult],
+    ) -> Document | None:
+        key = blob.key
+        file_name = blob.file_name
+        try:
+            extraction_result = extraction_future.result()
+
+            onyx_metadata, custom_tags = process_onyx_metadata(
+                extraction_result.metadata
+            )
+            file_display_name = onyx_metadata.file_display_name or file_name
+            time_updated = onyx_metadata.doc_updated_at or blob.last_modified
+            link = onyx_metadata.link or self._get_blob_link(key)
+            primary_owners = onyx_metadata.primary_owners
+            secondary_owners = onyx_metadata.secondary_owners
+
+            sections: list[TextSection | ImageSection] = []
+            if extraction_result.text_content.strip():
+                logger.debug(f"Creating TextSection for {file_name} with link: {link}")
+                sections.append(
+                    TextSection(
+                        link=link,
+                        text=extraction_result.text_content.strip(),
+                    )
+                )
+
+            return Document(
+                id=f"{self.bucket_type}:{self.bucket_name}:{key}",
+                sections=(sections if sections else [TextSection(link=link, text="")]),
+                source=DocumentSource(self.bucket_type.value),
+                semantic_identifier=file_display_name,
+                doc_updated_at=time_updated,
+                metadata=custom_tags,
+                primary_owners=primary_owners,
+                secondary_owners=secondary_owners,
+            )
+        except Exception:
+            logger.exception(f"Error decoding object {key} as UTF-8")
+            return None
+
+    def _list_blob_objects(
+        self, start: datetime | None = None, end: datetime | None = None
+    ) -> Iterator[list[_BlobObject]]:
+        """Lists the objects that should be indexed, one listing page at a time."""
         if self.s3_client is None:
             raise ConnectorMissingCredentialError("Blob storage")
 
         paginator = self.s3_client.get_paginator("list_objects_v2")
         pages = paginator.paginate(Bucket=self.bucket_name, Prefix=self.prefix)
 
-        batch: list[Document] = []
         for page in pages:
-            if "Contents" not in page:
-                continue
-
-            for obj in page["Contents"]:
-                if obj["Key"].endswith("/"):
+            blob_objects: list[_BlobObject] = []
+            for obj in page.get("Contents", []):
+                key = obj["Key"]
+                if key.endswith("/"):
                     continue
 
                 last_modified = obj["LastModified"].replace(tzinfo=timezone.utc)
-
-                if not start <= last_modified <= end:
+                if start is not None and last_modified < start:
+                    continue
+                if end is not None and last_modified > end:
                     continue
 
-                file_name = os.path.basename(obj["Key"])
-                file_ext = get_file_ext(file_name)
-                key = obj["Key"]
-                link = self._get_blob_link(key)
-
+                file_name = os.path.basename(key)
                 size_bytes = self._extract_size_bytes(obj)
                 if (
                     self.size_threshold is not None
                     and isinstance(size_bytes, int)
-                    and self.size_threshold is not None
                     and size_bytes > self.size_threshold
                 ):
                     logger.warning(
@@ -409,102 +524,213 @@ class BlobStorageConnector(LoadConnector, PollConnector):
                     )
                     continue
 
-                # Handle image files
-                if is_accepted_file_ext(file_ext, OnyxExtensionType.Multimedia):
-                    if not self._allow_images:
-                        logger.debug(
-                            f"Skipping image file: {key} (image processing not enabled)"
-                        )
-                        continue
-
-                    # Process the image file
-                    try:
-                        downloaded_file = self._download_object(key)
-                        if downloaded_file is None:
-                            continue
-
-                        # TODO: Refactor to avoid direct DB access in connector
-                        # This will require broader refactoring across the codebase
-                        image_section, _ = store_image_and_create_section(
-                            image_data=downloaded_file,
-                            file_id=f"{self.bucket_type}_{self.bucket_name}_{key.replace('/', '_')}",
-                            display_name=file_name,
-                            link=link,
-                            file_origin=FileOrigin.CONNECTOR,
-                        )
-
-                        batch.append(
-                            Document(
-                                id=f"{self.bucket_type}:{self.bucket_name}:{key}",
-                                sections=[image_section],
-                                source=DocumentSource(self.bucket_type.value),
-                                semantic_identifier=file_name,
-                                doc_updated_at=last_modified,
-                                metadata={},
-                            )
-                        )
-
-                        if len(batch) == self.batch_size:
-                            yield batch
-                            batch = []
-                    except Exception:
-                        logger.exception(f"Error processing image {key}")
+                is_image = is_accepted_file_ext(
+                    get_file_ext(file_name), OnyxExtensionType.Multimedia
+                )
+                if is_image and not self._allow_images:
+                    logger.debug(
+                        f"Skipping image file: {key} (image processing not enabled)"
+                    )
                     continue
 
-                # Handle text and document files
-                try:
-                    downloaded_file = self._download_object(key)
-                    if downloaded_file is None:
-                        continue
-                    extraction_result = extract_text_and_images(
-                        BytesIO(downloaded_file), file_name=file_name
+                etag = obj.get("ETag")
+                blob_objects.append(
+                    _BlobObject(
+                        key=key,
+                        file_name=file_name,
+                        last_modified=last_modified,
+                        size_bytes=size_bytes,
+                        # ETags only change when the content does, the size is
+                        # included in case the store doesn't use content hashes
+                        version=f"{etag}:{size_bytes}" if etag else None,
+                        is_image=is_image,
                     )
+                )
+            yield blob_objects
 
-                    onyx_metadata, custom_tags = process_onyx_metadata(
-                        extraction_result.metadata
-                    )
-                    file_display_name = onyx_metadata.file_display_name or file_name
-                    time_updated = onyx_metadata.doc_updated_at or last_modified
-                    link = onyx_metadata.link or link
-                    primary_owners = onyx_metadata.primary_owners
-                    secondary_owners = onyx_metadata.secondary_owners
-
-                    sections: list[TextSection | ImageSection] = []
-                    if extraction_result.text_content.strip():
-                        logger.debug(
-                            f"Creating TextSection for {file_name} with link: {link}"
-                        )
-                        sections.append(
-                            TextSection(
-                                link=link,
-                                text=extraction_result.text_content.strip(),
-                            )
-                        )
-
-                    batch.append(
-                        Document(
-                            id=f"{self.bucket_type}:{self.bucket_name}:{key}",
-                            sections=(
-                                sections
-                                if sections
-                                else [TextSection(link=link, text="")]
-                            ),
-                            source=DocumentSource(self.bucket_type.value),
-                            semantic_identifier=file_display_name,
-                            doc_updated_at=time_updated,
-                            metadata=custom_tags,
-                            primary_owners=primary_owners,
-                            secondary_owners=secondary_owners,
-                        )
+    def _object_versions_key(self) -> str:
+        return (
+            f"{get_current_tenant_id()}:{_OBJECT_VERSIONS_KEY_PREFIX}:"
+            f"{self.bucket_type.value}:{self.bucket_name}:{self.prefix}"
+        )
+
+    def _skip_unchanged_objects(
+        self, pages: Iterator[list[_BlobObject]]
+    ) -> Iterator[_BlobObject]:
+        """Drops objects whose version matches the one recorded when they were
+        last indexed, so that polls don't download them again."""
+        redis_client = get_raw_redis_client()
+        versions_key = self._object_versions_key()
+        for blob_objects in pages:
+            if not blob_objects:
+                continue
+            try:
+                indexed_versions = cast(
+                    list[bytes | None],
+                    redis_client.hmget(
+                        versions_key, [blob.key for blob in blob_objects]
+                    ),
+                )
+            except redis.RedisError as e:
+                logger.warning(f"Unable to load indexed object versions: {e}")
+                yield from blob_objects
+                continue
+
+            for blob, indexed_version in zip(blob_objects, indexed_versions):
+                if (
+                    blob.version is not None
+                    and indexed_version is not None
+                    and indexed_version.decode() == blob.version
+                ):
+                    logger.debug(f"Skipping unchanged object: {blob.key}")
+                    continue
+                yield blob
+
+    def _record_indexed_versions(self, blob_objects: list[_BlobObject]) -> None:
+        versions = {
+            blob.key: blob.version for blob in blob_objects if blob.version is not None
+        }
+        if not versions:
+            return
+
+        versions_key = self._object_versions_key()
+        try:
+            pipeline = get_raw_redis_client().pipeline(transaction=False)
+            pipeline.hset(versions_key, mapping=versions)
+            pipeline.expire(versions_key, _OBJECT_VERSIONS_TTL_SECONDS)
+            pipeline.execute()
+        except redis.RedisError as e:
+            logger.warning(f"Unable to record indexed object versions: {e}")
+
+    def _prefetch_downloads(
+        self, blob_objects: Iterator[_BlobObject]
+    ) -> Iterator[tuple[_BlobObject, Future[IO[bytes] | None]]]:
+        """Downloads objects ahead of the consumer on the shared IO pool, yielding
+        them in listing order. At most BLOB_STORAGE_DOWNLOAD_WORKERS downloads are
+        in flight and they add up to at most BLOB_STORAGE_PREFETCH_MAX_BYTES (based
+        on the listed sizes), except that one download is always allowed."""
+        executor_service = get_executor_service()
+        in_flight: deque[tuple[_BlobObject, Future[IO[bytes] | None]]] = deque()
+        in_flight_bytes = 0
+
+        try:
+            for blob in blob_objects:
+                size_bytes = blob.size_bytes or 0
+                while in_flight and (
+                    len(in_flight) >= BLOB_STORAGE_DOWNLOAD_WORKERS
+                    or in_flight_bytes + size_bytes > BLOB_STORAGE_PREFETCH_MAX_BYTES
+                ):
+                    downloaded_blob, future = in_flight.popleft()
+                    in_flight_bytes -= downloaded_blob.size_bytes or 0
+                    yield downloaded_blob, future
+
+                in_flight.append(
+                    (
+                        blob,
+                        executor_service.submit(
+                            ExecutorPool.IO, self._download_object, blob.key
+                        ),
                     )
-                    if len(batch) == self.batch_size:
-                        yield batch
-                        batch = []
+                )
+                in_flight_bytes += size_bytes
 
-                except Exception:
-                    logger.exception(f"Error decoding object {key} as UTF-8")
-        if batch:
+            while in_flight:
+                yield in_flight.popleft()
+        finally:
+            # the consumer stopped early, don't leak the temporary files
+            for _, future in in_flight:
+                if not future.cancel():
+                    future.add_done_callback(_close_downloaded_file)
+
+    def _yield_blob_objects(
+        self,
+        start: datetime,
+        end: datetime,
+        skip_unchanged: bool = False,
+    ) -> GenerateDocumentsOutput:
+        if self.s3_client is None:
+            raise ConnectorMissingCredentialError("Blob storage")
+
+        pages = self._list_blob_objects(start, end)
+        blob_objects: Iterator[_BlobObject] = (
+            self._skip_unchanged_objects(pages)
+            if skip_unchanged
+            else (blob for page in pages for blob in page)
+        )
+
+        extraction_service = get_file_extraction_service()
+        # extraction runs in the background so that the next objects are
+        # downloaded meanwhile. Kept in listing order.
+        pending_extractions: deque[tuple[_BlobObject, Future[ExtractionResult]]] = (
+            deque()
+        )
+
+        batch: list[Document] = []
+        batch_objects: list[_BlobObject] = []
+
+        def _add_to_batch(blob: _BlobObject, document: Document | None) -> bool:
+            """Returns whether the batch is full."""
+            if document is None:
+                return False
+            batch.append(document)
+            batch_objects.append(blob)
+            return len(batch) >= self.batch_size
+
+        def _flush_batch() -> GenerateDocumentsOutput:
+            nonlocal batch, batch_objects
             yield batch
+            # only recorded once the batch has been handed off, so objects that
+            # fail before then are downloaded again on the next poll
+            self._record_indexed_versions(batch_objects)
+            batch = []
+            batch_objects = []
+
+        for blob, download in self._prefetch_downloads(blob_objects):
+            try:
+                downloaded_file = download.result()
+            except Exception:
+                logger.exception(f"Error downloading object {blob.key}")
+                continue
+            if downloaded_file is None:
+                continue
+
+            if blob.is_image:
+                with downloaded_file:
+                    document = self._document_from_image(blob, downloaded_file)
+                if _add_to_batch(blob, document):
+                    yield from _flush_batch()
+                continue
+
+            try:
+                extraction_future = extraction_service.submit(
+                    downloaded_file, file_name=blob.file_name
+                )
+            except BaseException:
+                downloaded_file.close()
+                raise
+            # the extraction streams the file from where it was downloaded to, so
+            # it's only closed once the extraction is done
+            extraction_future.add_done_callback(
+                lambda _, downloaded_file=downloaded_file: downloaded_file.close()
+            )
+            pending_extractions.append((blob, extraction_future))
+
+            while len(pending_extractions) >= self.batch_size:
+                blob, extraction_future = pending_extractions.popleft()
+                if _add_to_batch(
+                    blob, self._document_from_extraction(blob, extraction_future)
+                ):
+                    yield from _flush_batch()
+
+        while pending_extractions:
+            blob, extraction_future = pending_extractions.popleft()
+            if _add_to_batch(
+                blob, self._document_from_extraction(blob, extraction_future)
+            ):
+                yield from _flush_batch()
+
+        if batch:
+            yield from _flush_batch()
 
     def load_from_state(self) -> GenerateDocumentsOutput:
         logger.debug("Loading blob objects")
@@ -522,11 +748,30 @@ class BlobStorageConnector(LoadConnector, PollConnector):
         start_datetime = datetime.fromtimestamp(start, tz=timezone.utc)
         end_datetime = datetime.fromtimestamp(end, tz=timezone.utc)
 
-        for batch in self._yield_blob_objects(start_datetime, end_datetime):
+        # incremental polls skip objects that haven't changed since they were
+        # indexed, full re-indexes (starting from the epoch) fetch everything
+        for batch in self._yield_blob_objects(
+            start_datetime, end_datetime, skip_unchanged=start > 0
+        ):
             yield batch
 
         return None
 
+    def retrieve_all_slim_docs(self) -> GenerateSlimDocumentOutput:
+        # only lists the bucket, nothing is downloaded
+        slim_doc_batch: list[SlimDocument] = []
+        for blob_objects in self._list_blob_objects():
+            for blob in blob_objects:
+                slim_doc_batch.append(
+                    SlimDocument(id=f"{self.bucket_type}:{self.bucket_name}:{blob.key}")
+                )
+                if len(slim_doc_batch) >= _SLIM_BATCH_SIZE:
+                    yield slim_doc_batch
+                    slim_doc_batch = []
+
+        if slim_doc_batch:
+            yield slim_doc_batch
+
     def validate_connector_settings(self) -> None:
         if self.s3_client is None:
             raise ConnectorMissingCredentialError(
@@ -1,4 +1,5 @@
 import copy
+from collections.abc import Iterator
 from datetime import datetime
 from datetime import timedelta
 from datetime import timezone
@@ -10,6 +11,7 @@ from requests.exceptions import HTTPError
 from typing_extensions import override
 
 from onyx.access.models import ExternalAccess
+from onyx.configs.app_configs import CONFLUENCE_CONNECTOR_ENRICHMENT_WORKERS
 from onyx.configs.app_configs import CONFLUENCE_CONNECTOR_LABELS_TO_SKIP
 from onyx.configs.app_configs import CONFLUENCE_TIMEZONE_OFFSET
 from onyx.configs.app_configs import CONTINUE_ON_CONNECTOR_FAILURE
@@ -51,6 +53,7 @@ from onyx.connectors.models import SlimDocument
 from onyx.connectors.models import TextSection
 from onyx.indexing.indexing_heartbeat import IndexingHeartbeatInterface
 from onyx.utils.logger import setup_logger
+from onyx.utils.threadpool_concurrency import run_functions_tuples_in_parallel
 
 logger = setup_logger()
 # Potential Improvements
@@ -534,35 +537,86 @@ class ConfluenceConnector(
         def store_next_page_url(next_page_url: str) -> None:
             checkpoint.next_page_url = next_page_url
 
+        # pages from the current page of CQL results that haven't been processed yet
+        pages: list[dict[str, Any]] = []
         for page in self.confluence_client.paginated_page_retrieval(
             cql_url=page_query_url,
             limit=self.batch_size,
             next_page_callback=store_next_page_url,
         ):
+            pages.append(page)
+
+            # Create checkpoint once a full page of results is returned
+            if checkpoint.next_page_url and checkpoint.next_page_url != page_query_url:
+                yield from self._enrich_pages(pages, start, end)
+                return checkpoint
+
+        yield from self._enrich_pages(pages, start, end)
+        checkpoint.has_more = False
+        return checkpoint
+
+    def _convert_page_and_fetch_attachments(
+        self,
+        page: dict[str, Any],
+        start: SecondsSinceUnixEpoch | None,
+        end: SecondsSinceUnixEpoch | None,
+    ) -> tuple[list[Document | ConnectorFailure], Exception | None]:
+        """
+        Returns the page document followed by its attachment documents / failures.
+        Since this runs concurrently with other pages, unexpected errors are returned
+        (along with whatever was produced before them) rather than raised so that
+        the caller can raise them at the point processing this page one by one would.
+        """
+        docs_and_failures: list[Document | ConnectorFailure] = []
+        try:
             # Build doc from page
             doc_or_failure = self._convert_page_to_document(page)
-
+            docs_and_failures.append(doc_or_failure)
             if isinstance(doc_or_failure, ConnectorFailure):
-                yield doc_or_failure
-                continue
+                return docs_and_failures, None
 
-            # yield completed document (or failure)
-            yield doc_or_failure
-
-            # Now get attachments for that page:
+            # Now get attachments for that page
             attachment_docs, attachment_failures = self._fetch_page_attachments(
                 page, start, end
             )
-            # yield attached docs and failures
-            yield from attachment_docs
-            yield from attachment_failures
+            docs_and_failures.extend(attachment_docs)
+            docs_and_failures.extend(attachment_failures)
+        except Exception as e:
+            return docs_and_failures, e
 
-            # Create checkpoint once a full page of results is returned
-            if checkpoint.next_page_url and checkpoint.next_page_url != page_query_url:
-                return checkpoint
+        return docs_and_failures, None
 
-        checkpoint.has_more = False
-        return checkpoint
+    def _enrich_pages(
+        self,
+        pages: list[dict[str, Any]],
+        start: SecondsSinceUnixEpoch | None,
+        end: SecondsSinceUnixEpoch | None,
+    ) -> Iterator[Document | ConnectorFailure]:
+        """
+        Fetches the comments, attachments and mentioned users for a page of CQL
+        results concurrently (each request still goes through the client's rate
+        limiting), then yields the page documents followed by their attachment
+        documents / failures in the same order as processing them one by one would.
+        """
+        results = run_functions_tuples_in_parallel(
+            [
+                (self._convert_page_and_fetch_attachments, (page, start, end))
+                for page in pages
+            ],
+            max_workers=CONFLUENCE_CONNECTOR_ENRICHMENT_WORKERS,
+        )
+        pages.clear()
+
+        # the whole page of CQL results is retried with an offset by
+        # load_from_checkpoint, so don't yield anything that would be duplicated
+        for _, error in results:
+            if error is not None and is_atlassian_date_error(error):
+                raise error
+
+        for docs_and_failures, error in results:
+            yield from docs_and_failures
+            if error is not None:
+                raise error
 
     def _build_page_retrieval_url(
         self,
@@ -590,7 +644,9 @@ class ConfluenceConnector(
     ) -> CheckpointOutput[ConfluenceCheckpoint]:
         end += ONE_DAY  # handle time zone weirdness
         try:
-            return self._fetch_document_batches(checkpoint, start, end)
+            # delegate rather than return the generator so that errors raised
+            # while fetching are caught here
+            return (yield from self._fetch_document_batches(checkpoint, start, end))
         except Exception as e:
             if is_atlassian_date_error(e) and start is not None:
                 logger.warning(
@@ -598,7 +654,11 @@ class ConfluenceConnector(
                     "a real issue, but can also appear during edge cases like daylight"
                     f"savings time changes. Retrying with a 1 hour offset. Error: {e}"
                 )
-                return self._fetch_document_batches(checkpoint, start - ONE_HOUR, end)
+                return (
+                    yield from self._fetch_document_batches(
+                        checkpoint, start - ONE_HOUR, end
+                    )
+                )
             raise
 
     @override
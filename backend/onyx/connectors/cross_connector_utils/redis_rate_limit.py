@@ -0,0 +1,273 @@
+import hashlib
+import json
+import time
+from collections.abc import Callable
+from datetime import datetime
+from datetime import timezone
+from email.utils import parsedate_to_datetime
+from functools import wraps
+from typing import Any
+from typing import cast
+from typing import TypeVar
+
+import redis
+from redis.client import Redis
+
+from onyx.configs.constants import DocumentSource
+from onyx.connectors.cross_connector_utils.rate_limit_wrapper import (
+    RateLimitTriedTooManyTimesError,
+)
+from onyx.redis.redis_pool import get_raw_redis_client
+from onyx.utils.logger import setup_logger
+from shared_configs.contextvars import get_current_tenant_id
+
+logger = setup_logger()
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+_RATE_LIMIT_KEY_PREFIX = "connector_rate_limit"
+# How long to back off for when a 429 doesn't come with a usable Retry-After
+_DEFAULT_RETRY_AFTER_SECONDS = 5.0
+_MIN_WAIT_SECONDS = 0.001
+
+# Refills the bucket based on the time since the last call and takes `requested`
+# tokens if available. Uses the Redis server clock so that all workers agree on
+# the time. Returns {acquired (0/1), seconds to wait until enough tokens are
+# available}. Floats are returned as strings since Lua numbers are truncated to
+# integers when converted to Redis replies.
+_ACQUIRE_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local requested = tonumber(ARGV[3])
+
+local redis_time = redis.call('TIME')
+local now = tonumber(redis_time[1]) + tonumber(redis_time[2]) / 1000000
+
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts', 'blocked_until')
+local tokens = tonumber(state[1]) or capacity
+local ts = tonumber(state[2]) or now
+local blocked_until = tonumber(state[3]) or 0
+
+if blocked_until > now then
+    return {0, tostring(blocked_until - now)}
+end
+
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+
+local acquired = 0
+local wait = 0
+if tokens >= requested then
+    tokens = tokens - requested
+    acquired = 1
+else
+    wait = (requested - tokens) / rate
+end
+
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('PEXPIRE', KEYS[1], math.ceil(capacity / rate * 1000) + 1000)
+return {acquired, tostring(wait)}
+"""
+
+# Empties the bucket and stops anyone from acquiring tokens for `seconds`,
+# e.g. when the server responded with a Retry-After header
+_BLOCK_SCRIPT = """
+local seconds = tonumber(ARGV[1])
+
+local redis_time = redis.call('TIME')
+local now = tonumber(redis_time[1]) + tonumber(redis_time[2]) / 1000000
+
+local blocked_until = math.max(
+    tonumber(redis.call('HGET', KEYS[1], 'blocked_until')) or 0, now + seconds
+)
+redis.call(
+    'HSET', KEYS[1], 'blocked_until', tostring(blocked_until),
+    'tokens', '0', 'ts', tostring(blocked_until)
+)
+redis.call('PEXPIRE', KEYS[1], math.ceil((blocked_until - now) * 1000) + 60000)
+return tostring(blocked_until - now)
+"""
+
+
+def credential_key_from_credentials(credentials: dict[str, Any]) -> str:
+    """Stable, non-reversible identifier for a set of connector credentials.
+    Connectors that share credentials (e.g. the same API token) share a bucket."""
+    serialized = json.dumps(credentials, sort_keys=True, default=str)
+    return hashlib.sha256(serialized.encode()).hexdigest()[:32]
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """Parses a Retry-After header, which is either a number of seconds or an
+    HTTP date. Returns None if missing / unparseable."""
+    if not value:
+        return None
+
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max((retry_at - datetime.now(timezone.utc)).total_seconds(), 0.0)
+
+
+def get_retry_after_seconds(response_or_exception: Any) -> float | None:
+    """Returns how long the server asked us to back off for, if this is a rate
+    limit (429) response or an exception wrapping one. Works with requests /
+    httpx responses and exceptions that expose a `response` or `headers`."""
+    response = getattr(response_or_exception, "response", None)
+    if response is None:
+        response = response_or_exception
+
+    status = getattr(response, "status_code", None) or getattr(response, "status", None)
+    if status != 429:
+        return None
+
+    headers = getattr(response, "headers", None) or {}
+    retry_after = parse_retry_after(headers.get("Retry-After"))
+    # a 429 without a usable Retry-After still means we should slow down
+    return retry_after if retry_after is not None else _DEFAULT_RETRY_AFTER_SECONDS
+
+
+class RedisTokenBucketRateLimiter:
+    """Token bucket rate limiter stored in Redis, shared by every process / thread
+    that uses the same (source, credential) pair. This keeps docfetching, pruning
+    and permission sync workers hitting the same API within a single quota.
+
+    `max_calls` tokens are refilled every `period` seconds, up to `burst` (defaults
+    to `max_calls`). When the bucket is empty the caller sleeps for exactly as long
+    as it takes for a token to become available.
+
+    Can be used as a decorator, in which case 429 responses / exceptions are also
+    handled: the `Retry-After` period is applied to the shared bucket (so all
+    workers back off, not just the one that was rejected) and the call is retried.
+
+    If Redis is unavailable, calls are let through rather than failing the
+    connector.
+
+    Buckets are per tenant; the tenant is resolved from the current context on
+    every call, so a single limiter can be shared across tenants.
+
+    Thread safe; all state lives in Redis and is updated atomically.
+    """
+
+    def __init__(
+        self,
+        source: DocumentSource,
+        credential_key: str | int,
+        max_calls: int,
+        period: float,  # in seconds
+        burst: int | None = None,
+        max_wait: float | None = None,  # in seconds, None to wait indefinitely
+        max_rate_limit_retries: int = 5,
+        redis_client: Redis | None = None,
+    ) -> None:
+        if max_calls <= 0 or period <= 0:
+            raise ValueError("max_calls and period must be positive")
+
+        self.capacity = burst or max_calls
+        self.refill_rate = max_calls / period  # tokens per second
+        self.max_wait = max_wait
+        self.max_rate_limit_retries = max_rate_limit_retries
+
+        # the raw client is used since keys passed to scripts aren't prefixed
+        self._redis = redis_client or get_raw_redis_client()
+        self.source = source
+        self.credential_key = credential_key
+        self._acquire_script = self._redis.register_script(_ACQUIRE_SCRIPT)
+        self._block_script = self._redis.register_script(_BLOCK_SCRIPT)
+
+    @property
+    def key(self) -> str:
+        # resolved per call rather than at construction, since limiters are often
+        # module / class level and shared by tasks running for different tenants
+        return (
+            f"{get_current_tenant_id()}:{_RATE_LIMIT_KEY_PREFIX}:"
+            f"{self.source.value}:{self.credential_key}"
+        )
+
+    def try_acquire(self, tokens: int = 1) -> float:
+        """Attempts to take `tokens` from the bucket. Returns 0 if they were taken,
+        otherwise the number of seconds until they will be available."""
+        key = self.key
+        try:
+            acquired, wait = cast(
+                list[Any],
+                self._acquire_script(
+                    keys=[key],
+                    args=[self.capacity, self.refill_rate, tokens],
+                ),
+            )
+        except redis.RedisError as e:
+            logger.warning(f"Rate limiter unavailable for {key}, skipping: {e}")
+            return 0.0
+
+        if int(acquired) == 1:
+            return 0.0
+        return max(float(wait), _MIN_WAIT_SECONDS)
+
+    def acquire(self, tokens: int = 1) -> None:
+        """Blocks until `tokens` have been taken from the bucket. Raises
+        RateLimitTriedTooManyTimesError if that would take longer than max_wait."""
+        start = time.monotonic()
+        while True:
+            wait = self.try_acquire(tokens)
+            if wait <= 0:
+                return
+
+            if (
+                self.max_wait is not None
+                and time.monotonic() - start + wait > self.max_wait
+            ):
+                raise RateLimitTriedTooManyTimesError(
+                    f"Rate limit for '{self.key}' would exceed max wait of "
+                    f"{self.max_wait} seconds"
+                )
+
+            logger.debug(f"Rate limited on {self.key}, waiting {wait:.3f} seconds")
+            time.sleep(wait)
+
+    def block_for(self, seconds: float) -> None:
+        """Stops every user of this bucket from making calls for `seconds`."""
+        key = self.key
+        try:
+            self._block_script(keys=[key], args=[seconds])
+        except redis.RedisError as e:
+            logger.warning(f"Rate limiter unavailable for {key}, sleeping: {e}")
+            time.sleep(seconds)
+
+    def __call__(self, func: F) -> F:
+        @wraps(func)
+        def wrapped_func(*args: Any, **kwargs: Any) -> Any:
+            for _ in range(self.max_rate_limit_retries + 1):
+                self.acquire()
+                try:
+                    result = func(*args, **kwargs)
+                except Exception as e:
+                    retry_after = get_retry_after_seconds(e)
+                    if retry_after is None:
+                        raise
+                else:
+                    retry_after = get_retry_after_seconds(result)
+                    if retry_after is None:
+                        return result
+
+                logger.notice(
+                    f"Rate limited by the server for function {func.__name__}. "
+                    f"Blocking {self.key} for {retry_after} seconds."
+                )
+                self.block_for(retry_after)
+
+            raise RateLimitTriedTooManyTimesError(
+                f"Exceeded '{self.max_rate_limit_retries}' rate limit retries for "
+                f"function '{func.__name__}'"
+            )
+
+        return cast(F, wrapped_func)
+
+
+redis_rate_limit_builder = RedisTokenBucketRateLimiter
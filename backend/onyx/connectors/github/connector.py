@@ -21,12 +21,15 @@ from typing_extensions import override
 
 from onyx.access.models import ExternalAccess
 from onyx.configs.app_configs import GITHUB_CONNECTOR_BASE_URL
+from onyx.configs.app_configs import GITHUB_CONNECTOR_USE_GRAPHQL
 from onyx.configs.constants import DocumentSource
 from onyx.connectors.connector_runner import ConnectorRunner
 from onyx.connectors.exceptions import ConnectorValidationError
 from onyx.connectors.exceptions import CredentialExpiredError
 from onyx.connectors.exceptions import InsufficientPermissionsError
 from onyx.connectors.exceptions import UnexpectedValidationError
+from onyx.connectors.github.graphql_utils import fetch_graphql_page
+from onyx.connectors.github.graphql_utils import GithubGraphQLObjectType
 from onyx.connectors.github.models import SerializedRepository
 from onyx.connectors.github.rate_limit_utils import sleep_after_rate_limit_exception
 from onyx.connectors.github.utils import deserialize_repository
@@ -362,6 +365,135 @@ def _convert_issue_to_document(
     )
 
 
+def _parse_graphql_datetime(value: str | None) -> datetime | None:
+    if not value:
+        return None
+    return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+
+def _get_graphql_userinfo(user: dict[str, Any] | None) -> dict[str, str] | None:
+    if not user:
+        return None
+    # fields the token can't see (e.g. private emails) are returned as empty strings
+    return {
+        attr_name: user[attr_name]
+        for attr_name in ("login", "name", "email")
+        if user.get(attr_name)
+    }
+
+
+def _graphql_text_with_comments(node: dict[str, Any]) -> str:
+    comments = [comment["body"] for comment in node["comments"]["nodes"] if comment]
+    return "\nComment: ".join([node.get("body") or ""] + comments)
+
+
+def _convert_graphql_pr_to_document(
+    pull_request: dict[str, Any], repo_external_access: ExternalAccess | None
+) -> Document:
+    """Same as `_convert_pr_to_document`, for a PR fetched through GraphQL. Also
+    includes the PR's comments, since they come with the same query."""
+    repo_name = (pull_request.get("baseRepository") or {}).get("nameWithOwner")
+    doc_metadata = DocMetadata(repo=repo_name or "")
+    updated_at = _parse_graphql_datetime(pull_request["updatedAt"])
+    return Document(
+        id=pull_request["url"],
+        sections=[
+            TextSection(
+                link=pull_request["url"],
+                text=_graphql_text_with_comments(pull_request),
+            )
+        ],
+        external_access=repo_external_access,
+        source=DocumentSource.GITHUB,
+        semantic_identifier=f"{pull_request['number']}: {pull_request['title']}",
+        doc_updated_at=updated_at,
+        # this metadata is used in perm sync
+        doc_metadata=doc_metadata.model_dump(),
+        metadata={
+            k: [str(vi) for vi in v] if isinstance(v, list) else str(v)
+            for k, v in {
+                "object_type": "PullRequest",
+                "id": pull_request["number"],
+                "merged": pull_request["merged"],
+                # REST reports merged PRs as closed
+                "state": (
+                    "closed"
+                    if pull_request["state"] == "MERGED"
+                    else pull_request["state"].lower()
+                ),
+                "user": _get_graphql_userinfo(pull_request.get("author")),
+                "assignees": [
+                    _get_graphql_userinfo(assignee)
+                    for assignee in pull_request["assignees"]["nodes"]
+                    if assignee
+                ],
+                "repo": repo_name,
+                "num_commits": str(pull_request["commits"]["totalCount"]),
+                "num_files_changed": str(pull_request["changedFiles"]),
+                "labels": [
+                    label["name"] for label in pull_request["labels"]["nodes"] if label
+                ],
+                "created_at": _parse_graphql_datetime(pull_request.get("createdAt")),
+                "updated_at": updated_at,
+                "closed_at": _parse_graphql_datetime(pull_request.get("closedAt")),
+                "merged_at": _parse_graphql_datetime(pull_request.get("mergedAt")),
+                "merged_by": _get_graphql_userinfo(pull_request.get("mergedBy")),
+            }.items()
+            if v is not None
+        },
+    )
+
+
+def _convert_graphql_issue_to_document(
+    issue: dict[str, Any], repo_external_access: ExternalAccess | None
+) -> Document:
+    """Same as `_convert_issue_to_document`, for an issue fetched through GraphQL.
+    Also includes the issue's comments, since they come with the same query."""
+    repo_name = (issue.get("repository") or {}).get("nameWithOwner")
+    doc_metadata = DocMetadata(repo=repo_name or "")
+    updated_at = _parse_graphql_datetime(issue["updatedAt"])
+    closed_events = [event for event in issue["timelineItems"]["nodes"] if event]
+    return Document(
+        id=issue["url"],
+        sections=[
+            TextSection(link=issue["url"], text=_graphql_text_with_comments(issue))
+        ],
+        source=DocumentSource.GITHUB,
+        external_access=repo_external_access,
+        semantic_identifier=f"{issue['number']}: {issue['title']}",
+        doc_updated_at=updated_at,
+        # this metadata is used in perm sync
+        doc_metadata=doc_metadata.model_dump(),
+        metadata={
+            k: [str(vi) for vi in v] if isinstance(v, list) else str(v)
+            for k, v in {
+                "object_type": "Issue",
+                "id": issue["number"],
+                "state": issue["state"].lower(),
+                "user": _get_graphql_userinfo(issue.get("author")),
+                "assignees": [
+                    _get_graphql_userinfo(assignee)
+                    for assignee in issue["assignees"]["nodes"]
+                    if assignee
+                ],
+                "repo": repo_name,
+                "labels": [
+                    label["name"] for label in issue["labels"]["nodes"] if label
+                ],
+                "created_at": _parse_graphql_datetime(issue.get("createdAt")),
+                "updated_at": updated_at,
+                "closed_at": _parse_graphql_datetime(issue.get("closedAt")),
+                "closed_by": (
+                    _get_graphql_userinfo(closed_events[-1].get("actor"))
+                    if closed_events
+                    else None
+                ),
+            }.items()
+            if v is not None
+        },
+    )
+
+
 class GithubConnectorStage(Enum):
     START = "start"
     PRS = "prs"
@@ -379,13 +511,18 @@ class GithubConnectorCheckpoint(ConnectorCheckpoint):
     num_retrieved: int
     cursor_url: str | None = None
 
+    # Used when fetching through the GraphQL API, the end cursor of the last page
+    graphql_cursor: str | None = None
+
     def reset(self) -> None:
         """
-        Resets curr_page, num_retrieved, and cursor_url to their initial values (0, 0, None)
+        Resets curr_page, num_retrieved, cursor_url and graphql_cursor to their
+        initial values (0, 0, None, None)
         """
         self.curr_page = 0
         self.num_retrieved = 0
         self.cursor_url = None
+        self.graphql_cursor = None
 
 
 def make_cursor_url_callback(
@@ -415,6 +552,7 @@ class GithubConnector(CheckpointedConnectorWithPermSync[GithubConnectorCheckpoin
         self.state_filter = state_filter
         self.include_prs = include_prs
         self.include_issues = include_issues
+        self.use_graphql = GITHUB_CONNECTOR_USE_GRAPHQL
         self.github_client: Github | None = None
 
     def load_credentials(self, credentials: dict[str, Any]) -> dict[str, Any] | None:
@@ -564,6 +702,20 @@ class GithubConnector(CheckpointedConnectorWithPermSync[GithubConnectorCheckpoin
             repo_external_access = get_external_access_permission(
                 repo, self.github_client
             )
+
+        # GraphQL is only used at the start of a stage or when it was used for the
+        # previous page, never to continue REST pagination
+        if (
+            self.use_graphql
+            and checkpoint.curr_page == 0
+            and checkpoint.cursor_url is None
+        ):
+            graphql_checkpoint = yield from self._fetch_page_graphql(
+                checkpoint, repo, start, end, repo_external_access
+            )
+            if graphql_checkpoint is not None:
+                return graphql_checkpoint
+
         if self.include_prs and checkpoint.stage == GithubConnectorStage.PRS:
             logger.info(f"Fetching PRs for repo: {repo.name}")
 
@@ -701,6 +853,16 @@ class GithubConnector(CheckpointedConnectorWithPermSync[GithubConnectorCheckpoin
             checkpoint.stage = GithubConnectorStage.PRS
             checkpoint.reset()
 
+        return self._move_to_next_repo(checkpoint)
+
+    def _move_to_next_repo(
+        self, checkpoint: GithubConnectorCheckpoint
+    ) -> GithubConnectorCheckpoint:
+        if self.github_client is None:
+            raise ConnectorMissingCredentialError("GitHub")
+        if checkpoint.cached_repo_ids is None:
+            raise ValueError("No repo ids saved in checkpoint")
+
         checkpoint.has_more = len(checkpoint.cached_repo_ids) > 0
         if checkpoint.cached_repo_ids:
             next_id = checkpoint.cached_repo_ids.pop()
@@ -722,6 +884,98 @@ class GithubConnector(CheckpointedConnectorWithPermSync[GithubConnectorCheckpoin
 
         return checkpoint
 
+    def _fetch_page_graphql(
+        self,
+        checkpoint: GithubConnectorCheckpoint,
+        repo: Repository.Repository,
+        start: datetime | None,
+        end: datetime | None,
+        repo_external_access: ExternalAccess | None,
+    ) -> Generator[Document | ConnectorFailure, None, GithubConnectorCheckpoint | None]:
+        """Processes the next page of PRs / issues of the current repo through the
+        GraphQL API, which returns the comments, authors and labels of up to 100
+        items in a single request. Returns None without yielding anything if the
+        GraphQL API can't be used, in which case the caller falls back to REST."""
+        if self.github_client is None:
+            raise ConnectorMissingCredentialError("GitHub")
+
+        if checkpoint.stage == GithubConnectorStage.PRS and not self.include_prs:
+            checkpoint.stage = GithubConnectorStage.ISSUES
+            checkpoint.reset()
+        if checkpoint.stage == GithubConnectorStage.ISSUES and not self.include_issues:
+            checkpoint.stage = GithubConnectorStage.PRS
+            checkpoint.reset()
+            return self._move_to_next_repo(checkpoint)
+
+        is_prs = checkpoint.stage == GithubConnectorStage.PRS
+        object_name = "PRs" if is_prs else "issues"
+        logger.info(f"Fetching {object_name} for repo: {repo.name} through GraphQL")
+        try:
+            page = fetch_graphql_page(
+                self.github_client,
+                owner=repo.owner.login,
+                repo_name=repo.name,
+                object_type=(
+                    GithubGraphQLObjectType.PULL_REQUESTS
+                    if is_prs
+                    else GithubGraphQLObjectType.ISSUES
+                ),
+                state_filter=self.state_filter,
+                page_size=ITEMS_PER_PAGE,
+                cursor=checkpoint.graphql_cursor,
+                since=start,
+            )
+        except GithubException as e:
+            logger.warning(
+                f"Unable to fetch {object_name} through GraphQL, falling back to REST: {e}"
+            )
+            self.use_graphql = False
+            checkpoint.graphql_cursor = None
+            return None
+
+        convert_to_document = (
+            _convert_graphql_pr_to_document
+            if is_prs
+            else _convert_graphql_issue_to_document
+        )
+        done = False
+        for node in page.nodes:
+            updated_at = _parse_graphql_datetime(node["updatedAt"])
+            # we iterate backwards in time, so at this point we stop processing
+            if start is not None and updated_at is not None and updated_at < start:
+                done = True
+                break
+            # Skip items updated after the end date
+            if end is not None and updated_at is not None and updated_at > end:
+                continue
+
+            try:
+                yield convert_to_document(node, repo_external_access)
+            except Exception as e:
+                error_msg = f"Error converting {object_name} to document: {e}"
+                logger.exception(error_msg)
+                yield ConnectorFailure(
+                    failed_document=DocumentFailure(
+                        document_id=str(node.get("databaseId")),
+                        document_link=node.get("url"),
+                    ),
+                    failure_message=error_msg,
+                    exception=e,
+                )
+
+        logger.info(f"Fetched {len(page.nodes)} {object_name} for repo: {repo.name}")
+        if page.has_next_page and not done:
+            checkpoint.graphql_cursor = page.end_cursor
+            return checkpoint
+
+        checkpoint.reset()
+        if is_prs:
+            checkpoint.stage = GithubConnectorStage.ISSUES
+            return checkpoint
+
+        checkpoint.stage = GithubConnectorStage.PRS
+        return self._move_to_next_repo(checkpoint)
+
     def _load_from_checkpoint(
         self,
         start: SecondsSinceUnixEpoch,
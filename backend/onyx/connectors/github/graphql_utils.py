@@ -0,0 +1,242 @@
+from datetime import datetime
+from enum import Enum
+from typing import Any
+
+from github import Github
+from github import RateLimitExceededException
+from github.GithubException import GithubException
+from pydantic import BaseModel
+
+from onyx.connectors.github.rate_limit_utils import sleep_after_rate_limit_exception
+from onyx.utils.logger import setup_logger
+
+logger = setup_logger()
+
+_MAX_NUM_RATE_LIMIT_RETRIES = 5
+
+# Max number of comments, assignees and labels fetched per PR / issue. Items with
+# more than this are truncated rather than paginated.
+_MAX_NESTED_ITEMS = 100
+
+_USER_FIELDS = """
+    login
+    ... on User {
+        name
+        email
+    }
+"""
+
+_PULL_REQUESTS_QUERY = f"""
+query($owner: String!, $name: String!, $pageSize: Int!, $cursor: String, $states: [PullRequestState!]) {{
+    repository(owner: $owner, name: $name) {{
+        pullRequests(
+            first: $pageSize
+            after: $cursor
+            states: $states
+            orderBy: {{field: UPDATED_AT, direction: DESC}}
+        ) {{
+            pageInfo {{
+                hasNextPage
+                endCursor
+            }}
+            nodes {{
+                databaseId
+                number
+                title
+                body
+                url
+                state
+                merged
+                createdAt
+                updatedAt
+                closedAt
+                mergedAt
+                changedFiles
+                commits {{
+                    totalCount
+                }}
+                baseRepository {{
+                    nameWithOwner
+                }}
+                author {{ {_USER_FIELDS} }}
+                mergedBy {{ {_USER_FIELDS} }}
+                assignees(first: {_MAX_NESTED_ITEMS}) {{
+                    nodes {{ {_USER_FIELDS} }}
+                }}
+                labels(first: {_MAX_NESTED_ITEMS}) {{
+                    nodes {{
+                        name
+                    }}
+                }}
+                comments(first: {_MAX_NESTED_ITEMS}) {{
+                    nodes {{
+                        body
+                    }}
+                }}
+            }}
+        }}
+    }}
+}}
+"""
+
+_ISSUES_QUERY = f"""
+query($owner: String!, $name: String!, $pageSize: Int!, $cursor: String, $states: [IssueState!], $since: DateTime) {{
+    repository(owner: $owner, name: $name) {{
+        issues(
+            first: $pageSize
+            after: $cursor
+            states: $states
+            filterBy: {{since: $since}}
+            orderBy: {{field: UPDATED_AT, direction: DESC}}
+        ) {{
+            pageInfo {{
+                hasNextPage
+                endCursor
+            }}
+            nodes {{
+                databaseId
+                number
+                title
+                body
+                url
+                state
+                createdAt
+                updatedAt
+                closedAt
+                repository {{
+                    nameWithOwner
+                }}
+                author {{ {_USER_FIELDS} }}
+                assignees(first: {_MAX_NESTED_ITEMS}) {{
+                    nodes {{ {_USER_FIELDS} }}
+                }}
+                labels(first: {_MAX_NESTED_ITEMS}) {{
+                    nodes {{
+                        name
+                    }}
+                }}
+                comments(first: {_MAX_NESTED_ITEMS}) {{
+                    nodes {{
+                        body
+                    }}
+                }}
+                timelineItems(itemTypes: [CLOSED_EVENT], last: 1) {{
+                    nodes {{
+                        ... on ClosedEvent {{
+                            actor {{ {_USER_FIELDS} }}
+                        }}
+                    }}
+                }}
+            }}
+        }}
+    }}
+}}
+"""
+
+
+class GithubGraphQLObjectType(str, Enum):
+    PULL_REQUESTS = "pullRequests"
+    ISSUES = "issues"
+
+
+class GithubGraphQLPage(BaseModel):
+    nodes: list[dict[str, Any]]
+    has_next_page: bool
+    end_cursor: str | None
+
+
+def _graphql_states(
+    object_type: GithubGraphQLObjectType, state_filter: str
+) -> list[str] | None:
+    """Maps the REST `state` filter onto GraphQL states. None means all states."""
+    if state_filter == "open":
+        return ["OPEN"]
+    if state_filter == "closed":
+        if object_type == GithubGraphQLObjectType.PULL_REQUESTS:
+            return ["CLOSED", "MERGED"]
+        return ["CLOSED"]
+    return None
+
+
+def _is_graphql_rate_limit_error(e: GithubException) -> bool:
+    errors = e.data.get("errors") if isinstance(e.data, dict) else None
+    return any(
+        isinstance(error, dict) and error.get("type") == "RATE_LIMITED"
+        for error in errors or []
+    )
+
+
+def fetch_graphql_page(
+    github_client: Github,
+    owner: str,
+    repo_name: str,
+    object_type: GithubGraphQLObjectType,
+    state_filter: str,
+    page_size: int,
+    cursor: str | None,
+    since: datetime | None = None,
+    attempt_num: int = 0,
+) -> GithubGraphQLPage:
+    """Fetches one page of PRs or issues of a repo, most recently updated first,
+    including their authors, assignees, labels and comments.
+
+    `since` only applies to issues; PRs can't be filtered by update time and are
+    cut off by the caller instead. Raises GithubException if the query fails for
+    any reason other than rate limiting."""
+    if attempt_num > _MAX_NUM_RATE_LIMIT_RETRIES:
+        raise RuntimeError(
+            "Re-tried fetching GraphQL page too many times. Something is going wrong with fetching objects from Github"
+        )
+
+    query = (
+        _PULL_REQUESTS_QUERY
+        if object_type == GithubGraphQLObjectType.PULL_REQUESTS
+        else _ISSUES_QUERY
+    )
+    variables: dict[str, Any] = {
+        "owner": owner,
+        "name": repo_name,
+        "pageSize": page_size,
+        "cursor": cursor,
+        "states": _graphql_states(object_type, state_filter),
+    }
+    if object_type == GithubGraphQLObjectType.ISSUES:
+        variables["since"] = since.isoformat() if since else None
+
+    try:
+        _, data = github_client.requester.graphql_query(query, variables)
+    except RateLimitExceededException:
+        sleep_after_rate_limit_exception(github_client, graphql=True)
+        return fetch_graphql_page(
+            github_client,
+            owner,
+            repo_name,
+            object_type,
+            state_filter,
+            page_size,
+            cursor,
+            since,
+            attempt_num + 1,
+        )
+    except GithubException as e:
+        if not _is_graphql_rate_limit_error(e):
+            raise
+        sleep_after_rate_limit_exception(github_client, graphql=True)
+        return fetch_graphql_page(
+            github_client,
+            owner,
+            repo_name,
+            object_type,
+            state_filter,
+            page_size,
+            cursor,
+            since,
+            attempt_num + 1,
+        )
+
+    connection = data["data"]["repository"][object_type.value]
+    return GithubGraphQLPage(
+        nodes=[node for node in connection["nodes"] if node],
+        has_next_page=connection["pageInfo"]["hasNextPage"],
+        end_cursor=connection["pageInfo"]["endCursor"],
+    )
@@ -10,16 +10,19 @@ from onyx.utils.logger import setup_logger
 logger = setup_logger()
 
 
-def sleep_after_rate_limit_exception(github_client: Github) -> None:
+def sleep_after_rate_limit_exception(
+    github_client: Github, graphql: bool = False
+) -> None:
     """
     Sleep until the GitHub rate limit resets.
 
     Args:
         github_client: The GitHub client that hit the rate limit
+        graphql: Whether the GraphQL API (which has its own limit) was rate limited
     """
-    sleep_time = github_client.get_rate_limit().core.reset.replace(
-        tzinfo=timezone.utc
-    ) - datetime.now(tz=timezone.utc)
+    rate_limit = github_client.get_rate_limit()
+    rate = rate_limit.graphql if graphql else rate_limit.core
+    sleep_time = rate.reset.replace(tzinfo=timezone.utc) - datetime.now(tz=timezone.utc)
     sleep_time += timedelta(minutes=1)  # add an extra minute just to be safe
     logger.notice(f"Ran into Github rate-limit. Sleeping {sleep_time.seconds} seconds.")
     time.sleep(sleep_time.total_seconds())
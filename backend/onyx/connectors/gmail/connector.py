@@ -1,4 +1,6 @@
+import copy
 from base64 import urlsafe_b64decode
+from collections.abc import Iterator
 from typing import Any
 from typing import cast
 from typing import Dict
@@ -6,16 +8,22 @@ from typing import Dict
 from google.oauth2.credentials import Credentials as OAuthCredentials  # type: ignore
 from google.oauth2.service_account import Credentials as ServiceAccountCredentials  # type: ignore
 from googleapiclient.errors import HttpError  # type: ignore
+from typing_extensions import override
 
 from onyx.access.models import ExternalAccess
 from onyx.configs.app_configs import INDEX_BATCH_SIZE
+from onyx.configs.app_configs import MAX_GMAIL_WORKERS
 from onyx.configs.constants import DocumentSource
 from onyx.connectors.cross_connector_utils.miscellaneous_utils import time_str_to_utc
 from onyx.connectors.google_utils.google_auth import get_google_creds
 from onyx.connectors.google_utils.google_utils import execute_paginated_retrieval
+from onyx.connectors.google_utils.google_utils import (
+    execute_paginated_retrieval_with_max_pages,
+)
 from onyx.connectors.google_utils.google_utils import execute_single_retrieval
 from onyx.connectors.google_utils.resources import get_admin_service
 from onyx.connectors.google_utils.resources import get_gmail_service
+from onyx.connectors.google_utils.resources import GmailService
 from onyx.connectors.google_utils.shared_constants import (
     DB_CREDENTIALS_PRIMARY_ADMIN_KEY,
 )
@@ -23,13 +31,13 @@ from onyx.connectors.google_utils.shared_constants import MISSING_SCOPES_ERROR_S
 from onyx.connectors.google_utils.shared_constants import ONYX_SCOPE_INSTRUCTIONS
 from onyx.connectors.google_utils.shared_constants import SLIM_BATCH_SIZE
 from onyx.connectors.google_utils.shared_constants import USER_FIELDS
-from onyx.connectors.interfaces import GenerateDocumentsOutput
+from onyx.connectors.interfaces import CheckpointedConnector
+from onyx.connectors.interfaces import CheckpointOutput
 from onyx.connectors.interfaces import GenerateSlimDocumentOutput
-from onyx.connectors.interfaces import LoadConnector
-from onyx.connectors.interfaces import PollConnector
 from onyx.connectors.interfaces import SecondsSinceUnixEpoch
 from onyx.connectors.interfaces import SlimConnectorWithPermSync
 from onyx.connectors.models import BasicExpertInfo
+from onyx.connectors.models import ConnectorCheckpoint
 from onyx.connectors.models import Document
 from onyx.connectors.models import ImageSection
 from onyx.connectors.models import SlimDocument
@@ -37,6 +45,7 @@ from onyx.connectors.models import TextSection
 from onyx.indexing.indexing_heartbeat import IndexingHeartbeatInterface
 from onyx.utils.logger import setup_logger
 from onyx.utils.retry_wrapper import retry_builder
+from onyx.utils.threadpool_concurrency import parallel_yield
 
 
 logger = setup_logger()
@@ -60,6 +69,13 @@ EMAIL_FIELDS = [
 
 MAX_MESSAGE_BODY_BYTES = 10 * 1024 * 1024  # 10MB cap to keep large threads safe
 
+# threads.get calls sent in one batch HTTP request. Google allows up to 100, but
+# batches larger than 50 are likely to be rate limited by the Gmail API
+THREAD_BATCH_SIZE = 50
+# pages of threads.list (100 threads each) a mailbox works through before the
+# checkpoint is returned
+THREAD_PAGES_PER_CHECKPOINT = 10
+
 add_retries = retry_builder(tries=50, max_delay=30)
 
 
@@ -270,7 +286,64 @@ def thread_to_document(
     )
 
 
-class GmailConnector(LoadConnector, PollConnector, SlimConnectorWithPermSync):
+def _batch_get_threads(
+    gmail_service: GmailService, user_email: str, thread_ids: list[str]
+) -> list[dict[str, Any]]:
+    """Fetches the threads with a single batch HTTP request, in the order of
+    thread_ids. Threads that can't be fetched in the batch (e.g. because of rate
+    limits) are fetched one by one with the usual retries."""
+    threads: dict[str, dict[str, Any]] = {}
+
+    def _handle_response(
+        request_id: str, response: dict[str, Any], exception: HttpError | None
+    ) -> None:
+        if exception is None:
+            threads[request_id] = response
+        elif exception.resp.status == 404:
+            # deleted since it was listed
+            threads[request_id] = {}
+
+    batch = gmail_service.new_batch_http_request(callback=_handle_response)
+    for thread_id in thread_ids:
+        batch.add(
+            gmail_service.users()
+            .threads()
+            .get(userId=user_email, fields=THREAD_FIELDS, id=thread_id),
+            request_id=thread_id,
+        )
+    try:
+        batch.execute()
+    except HttpError as e:
+        logger.warning(f"Batch request for Gmail threads of {user_email} failed: {e}")
+
+    full_threads = []
+    for thread_id in thread_ids:
+        if thread_id not in threads:
+            threads[thread_id] = next(
+                execute_single_retrieval(
+                    retrieval_function=gmail_service.users().threads().get,
+                    list_key=None,
+                    userId=user_email,
+                    fields=THREAD_FIELDS,
+                    id=thread_id,
+                    continue_on_404_or_403=True,
+                )
+            )
+        full_threads.append(threads[thread_id])
+    return full_threads
+
+
+class GmailCheckpoint(ConnectorCheckpoint):
+    # cached user emails
+    user_emails: list[str] | None = None
+
+    # the threads.list page to resume from for the users that have been started on.
+    # Every user is only ever updated by the thread fetching its mailbox
+    next_page_tokens: dict[str, str] = {}
+    done_user_emails: set[str] = set()
+
+
+class GmailConnector(CheckpointedConnector[GmailCheckpoint], SlimConnectorWithPermSync):
     def __init__(self, batch_size: int = INDEX_BATCH_SIZE) -> None:
         self.batch_size = batch_size
 
@@ -349,54 +422,98 @@ class GmailConnector(LoadConnector, PollConnector, SlimConnectorWithPermSync):
         except Exception:
             raise
 
+    def _fetch_threads_for_user(
+        self,
+        user_email: str,
+        query: str | None,
+        checkpoint: GmailCheckpoint,
+    ) -> Iterator[Document]:
+        """Yields the threads of the mailbox in the order they are listed, stops after
+        THREAD_PAGES_PER_CHECKPOINT pages and records where to resume from."""
+        gmail_service = get_gmail_service(self.creds, user_email)
+        page_token_kwargs = {}
+        if page_token := checkpoint.next_page_tokens.get(user_email):
+            page_token_kwargs["pageToken"] = page_token
+
+        next_page_token: str | None = None
+        thread_ids: list[str] = []
+
+        def _flush() -> Iterator[Document]:
+            if not thread_ids:
+                return
+            for full_thread in _batch_get_threads(
+                gmail_service, user_email, thread_ids
+            ):
+                if doc := thread_to_document(full_thread, user_email):
+                    yield doc
+            thread_ids.clear()
+
+        try:
+            for thread in execute_paginated_retrieval_with_max_pages(
+                retrieval_function=gmail_service.users().threads().list,
+                max_num_pages=THREAD_PAGES_PER_CHECKPOINT,
+                list_key="threads",
+                userId=user_email,
+                fields=THREAD_LIST_FIELDS,
+                q=query,
+                continue_on_404_or_403=True,
+                **page_token_kwargs,
+            ):
+                if isinstance(thread, str):
+                    next_page_token = thread
+                    break
+
+                thread_ids.append(thread["id"])
+                if len(thread_ids) >= THREAD_BATCH_SIZE:
+                    yield from _flush()
+            yield from _flush()
+        except HttpError as e:
+            if not _is_mail_service_disabled_error(e):
+                raise
+            logger.warning(
+                "Skipping Gmail sync for %s because the mailbox is disabled.",
+                user_email,
+            )
+
+        if next_page_token:
+            checkpoint.next_page_tokens[user_email] = next_page_token
+        else:
+            checkpoint.next_page_tokens.pop(user_email, None)
+            checkpoint.done_user_emails.add(user_email)
+
     def _fetch_threads(
         self,
+        checkpoint: GmailCheckpoint,
         time_range_start: SecondsSinceUnixEpoch | None = None,
         time_range_end: SecondsSinceUnixEpoch | None = None,
-    ) -> GenerateDocumentsOutput:
+    ) -> Iterator[Document]:
+        """Fetches MAX_GMAIL_WORKERS mailboxes concurrently, the documents of each
+        mailbox are yielded in order. Mailboxes are independent quota buckets, so
+        they don't slow each other down."""
+        if checkpoint.user_emails is None:
+            checkpoint.user_emails = self._get_all_user_emails()
+
+        # don't start on too many mailboxes before returning a checkpoint, so that
+        # progress is saved regularly
+        user_emails = [
+            user_email
+            for user_email in checkpoint.user_emails
+            if user_email not in checkpoint.done_user_emails
+        ][:MAX_GMAIL_WORKERS]
+
         query = _build_time_range_query(time_range_start, time_range_end)
-        doc_batch = []
-        for user_email in self._get_all_user_emails():
-            gmail_service = get_gmail_service(self.creds, user_email)
-            try:
-                for thread in execute_paginated_retrieval(
-                    retrieval_function=gmail_service.users().threads().list,
-                    list_key="threads",
-                    userId=user_email,
-                    fields=THREAD_LIST_FIELDS,
-                    q=query,
-                    continue_on_404_or_403=True,
-                ):
-                    full_threads = execute_single_retrieval(
-                        retrieval_function=gmail_service.users().threads().get,
-                        list_key=None,
-                        userId=user_email,
-                        fields=THREAD_FIELDS,
-                        id=thread["id"],
-                        continue_on_404_or_403=True,
-                    )
-                    # full_threads is an iterator containing a single thread
-                    # so we need to convert it to a list and grab the first element
-                    full_thread = list(full_threads)[0]
-                    doc = thread_to_document(full_thread, user_email)
-                    if doc is None:
-                        continue
-
-                    doc_batch.append(doc)
-                    if len(doc_batch) > self.batch_size:
-                        yield doc_batch
-                        doc_batch = []
-            except HttpError as e:
-                if _is_mail_service_disabled_error(e):
-                    logger.warning(
-                        "Skipping Gmail sync for %s because the mailbox is disabled.",
-                        user_email,
-                    )
-                    continue
-                raise
+        yield from parallel_yield(
+            [
+                self._fetch_threads_for_user(user_email, query, checkpoint)
+                for user_email in user_emails
+            ],
+            max_workers=MAX_GMAIL_WORKERS,
+        )
 
-        if doc_batch:
-            yield doc_batch
+        checkpoint.has_more = any(
+            user_email not in checkpoint.done_user_emails
+            for user_email in checkpoint.user_emails
+        )
 
     def _fetch_slim_threads(
         self,
@@ -451,23 +568,21 @@ class GmailConnector(LoadConnector, PollConnector, SlimConnectorWithPermSync):
         if doc_batch:
             yield doc_batch
 
-    def load_from_state(self) -> GenerateDocumentsOutput:
-        try:
-            yield from self._fetch_threads()
-        except Exception as e:
-            if MISSING_SCOPES_ERROR_STR in str(e):
-                raise PermissionError(ONYX_SCOPE_INSTRUCTIONS) from e
-            raise e
-
-    def poll_source(
-        self, start: SecondsSinceUnixEpoch, end: SecondsSinceUnixEpoch
-    ) -> GenerateDocumentsOutput:
+    @override
+    def load_from_checkpoint(
+        self,
+        start: SecondsSinceUnixEpoch,
+        end: SecondsSinceUnixEpoch,
+        checkpoint: GmailCheckpoint,
+    ) -> CheckpointOutput[GmailCheckpoint]:
+        checkpoint = copy.deepcopy(checkpoint)
         try:
-            yield from self._fetch_threads(start, end)
+            yield from self._fetch_threads(checkpoint, start, end)
         except Exception as e:
             if MISSING_SCOPES_ERROR_STR in str(e):
                 raise PermissionError(ONYX_SCOPE_INSTRUCTIONS) from e
             raise e
+        return checkpoint
 
     def retrieve_all_slim_docs_perm_sync(
         self,
@@ -482,6 +597,14 @@ class GmailConnector(LoadConnector, PollConnector, SlimConnectorWithPermSync):
                 raise PermissionError(ONYX_SCOPE_INSTRUCTIONS) from e
             raise e
 
+    @override
+    def build_dummy_checkpoint(self) -> GmailCheckpoint:
+        return GmailCheckpoint(has_more=True)
+
+    @override
+    def validate_checkpoint_json(self, checkpoint_json: str) -> GmailCheckpoint:
+        return GmailCheckpoint.model_validate_json(checkpoint_json)
+
 
 if __name__ == "__main__":
     pass
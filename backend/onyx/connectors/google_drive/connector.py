@@ -10,7 +10,6 @@ from datetime import datetime
 from enum import Enum
 from functools import partial
 from typing import Any
-from typing import cast
 from typing import Protocol
 from urllib.parse import urlparse
 
@@ -20,6 +19,7 @@ from google.oauth2.service_account import Credentials as ServiceAccountCredentia
 from googleapiclient.errors import HttpError  # type: ignore
 from typing_extensions import override
 
+from onyx.configs.app_configs import GOOGLE_DRIVE_CONNECTOR_CONVERSION_WORKERS
 from onyx.configs.app_configs import GOOGLE_DRIVE_CONNECTOR_SIZE_THRESHOLD
 from onyx.configs.app_configs import INDEX_BATCH_SIZE
 from onyx.configs.app_configs import MAX_DRIVE_WORKERS
@@ -72,8 +72,8 @@ from onyx.connectors.models import EntityFailure
 from onyx.indexing.indexing_heartbeat import IndexingHeartbeatInterface
 from onyx.utils.logger import setup_logger
 from onyx.utils.retry_wrapper import retry_builder
+from onyx.utils.threadpool_concurrency import parallel_map_unordered
 from onyx.utils.threadpool_concurrency import parallel_yield
-from onyx.utils.threadpool_concurrency import run_functions_tuples_in_parallel
 from onyx.utils.threadpool_concurrency import ThreadSafeDict
 
 logger = setup_logger()
@@ -84,6 +84,9 @@ BATCHES_PER_CHECKPOINT = 1
 
 DRIVE_BATCH_SIZE = 80
 
+# Max number of listed files waiting to be converted
+DRIVE_CONVERSION_MAX_PENDING = DRIVE_BATCH_SIZE
+
 SHARED_DRIVE_PAGES_PER_CHECKPOINT = 2
 MY_DRIVE_PAGES_PER_CHECKPOINT = 2
 OAUTH_PAGES_PER_CHECKPOINT = 2
@@ -1126,55 +1129,18 @@ class GoogleDriveConnector(
                     else None
                 ),
             )
-            # Fetch files in batches
-            batches_complete = 0
-            files_batch: list[RetrievedDriveFile] = []
-
-            def _yield_batch(
-                files_batch: list[RetrievedDriveFile],
-            ) -> Iterator[Document | ConnectorFailure]:
-                nonlocal batches_complete
-                # Process the batch using run_functions_tuples_in_parallel
-                func_with_args = [
-                    (
-                        convert_func,
-                        (
-                            [file.user_email, self.primary_admin_email]
-                            + get_file_owners(
-                                file.drive_file, self.primary_admin_email
-                            ),
-                            file.drive_file,
-                        ),
-                    )
-                    for file in files_batch
-                ]
-                results = cast(
-                    list[Document | ConnectorFailure | None],
-                    run_functions_tuples_in_parallel(func_with_args, max_workers=8),
-                )
-                logger.debug(
-                    f"finished processing batch {batches_complete} with {len(results)} results"
-                )
-
-                docs_and_failures = [result for result in results if result is not None]
-                logger.debug(
-                    f"batch {batches_complete} has {len(docs_and_failures)} docs or failures"
-                )
-
-                if docs_and_failures:
-                    yield from docs_and_failures
-                    batches_complete += 1
-                logger.debug(f"finished yielding batch {batches_complete}")
 
-            for retrieved_file in self._fetch_drive_items(
-                field_type=field_type,
-                checkpoint=checkpoint,
-                start=start,
-                end=end,
-            ):
+            def _convert_retrieved_file(
+                retrieved_file: RetrievedDriveFile,
+            ) -> Document | ConnectorFailure | None:
                 if retrieved_file.error is None:
-                    files_batch.append(retrieved_file)
-                    continue
+                    return convert_func(
+                        [retrieved_file.user_email, self.primary_admin_email]
+                        + get_file_owners(
+                            retrieved_file.drive_file, self.primary_admin_email
+                        ),
+                        retrieved_file.drive_file,
+                    )
 
                 # handle retrieval errors
                 failure_stage = retrieved_file.completion_stage.value
@@ -1183,7 +1149,7 @@ class GoogleDriveConnector(
                 failure_message += f"parent drive/folder: {retrieved_file.parent_id},"
                 failure_message += f"error: {retrieved_file.error}"
                 logger.error(failure_message)
-                yield ConnectorFailure(
+                return ConnectorFailure(
                     failed_entity=EntityFailure(
                         entity_id=failure_stage,
                     ),
@@ -1191,7 +1157,28 @@ class GoogleDriveConnector(
                     exception=retrieved_file.error,
                 )
 
-            yield from _yield_batch(files_batch)
+            # Listing is pulled lazily as converter workers free up, so only a
+            # bounded number of files is held in memory and documents are yielded
+            # while the drive is still being enumerated. The checkpoint is only
+            # returned after every listed file has been converted and yielded.
+            num_yielded = 0
+            for doc_or_failure in parallel_map_unordered(
+                _convert_retrieved_file,
+                self._fetch_drive_items(
+                    field_type=field_type,
+                    checkpoint=checkpoint,
+                    start=start,
+                    end=end,
+                ),
+                max_workers=GOOGLE_DRIVE_CONNECTOR_CONVERSION_WORKERS,
+                max_pending=DRIVE_CONVERSION_MAX_PENDING,
+            ):
+                if doc_or_failure is None:
+                    continue
+                yield doc_or_failure
+                num_yielded += 1
+
+            logger.debug(f"finished yielding {num_yielded} docs or failures")
             checkpoint.retrieved_folder_and_drive_ids = (
                 self._retrieved_folder_and_drive_ids
             )
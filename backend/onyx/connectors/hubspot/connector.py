@@ -1,6 +1,8 @@
 import re
+from collections import OrderedDict
 from collections.abc import Callable
 from collections.abc import Generator
+from collections.abc import Iterator
 from datetime import datetime
 from datetime import timezone
 from typing import Any
@@ -30,6 +32,20 @@ HUBSPOT_API_URL = "https://api.hubapi.com/integrations/v1/me"
 AVAILABLE_OBJECT_TYPES = {"tickets", "companies", "deals", "contacts"}
 
 HUBSPOT_PAGE_SIZE = 100
+# max number of ids per batch read / batch associations call
+HUBSPOT_BATCH_SIZE = 100
+# objects associated with many others (e.g. a contact on many tickets) are only
+# fetched once per run, as long as they are among the most recently used ones
+ASSOCIATED_OBJECT_CACHE_SIZE = 20_000
+
+# Properties fetched for the objects associated with a document
+ASSOCIATED_OBJECT_PROPERTIES: dict[str, list[str]] = {
+    "contacts": ["firstname", "lastname", "email", "company", "jobtitle"],
+    "companies": ["name", "domain", "industry", "city", "state"],
+    "deals": ["dealname", "amount", "dealstage", "closedate", "pipeline"],
+    "tickets": ["subject", "content", "hs_ticket_priority"],
+    "notes": ["hs_note_body", "hs_timestamp", "hs_created_by", "hubspot_owner_id"],
+}
 
 T = TypeVar("T")
 
@@ -47,6 +63,9 @@ class HubSpotConnector(LoadConnector, PollConnector):
         self._access_token = access_token
         self._portal_id: str | None = None
         self._rate_limiter = HubSpotRateLimiter()
+        self._associated_object_cache: OrderedDict[tuple[str, str], dict[str, Any]] = (
+            OrderedDict()
+        )
 
         # Set object types to fetch, default to all available types
         if object_types is None:
@@ -181,141 +200,148 @@ class HubSpotConnector(LoadConnector, PollConnector):
         else:
             return f"{HUBSPOT_BASE_URL}/contacts/{self.portal_id}/{object_type}/{object_id}"
 
-    def _get_associated_objects(
+    def _batches_in_time_range(
+        self,
+        objects: Iterator[Any],
+        start: datetime | None = None,
+        end: datetime | None = None,
+    ) -> Generator[list[Any], None, None]:
+        batch: list[Any] = []
+        for obj in objects:
+            updated_at = obj.updated_at.replace(tzinfo=None)
+            if start is not None and updated_at < start.replace(tzinfo=None):
+                continue
+            if end is not None and updated_at > end.replace(tzinfo=None):
+                continue
+
+            batch.append(obj)
+            if len(batch) >= HUBSPOT_BATCH_SIZE:
+                yield batch
+                batch = []
+
+        if batch:
+            yield batch
+
+    def _get_association_ids(
         self,
         api_client: HubSpot,
-        object_id: str,
+        object_ids: list[str],
         from_object_type: str,
         to_object_type: str,
-    ) -> list[dict[str, Any]]:
-        """Get associated objects for a given object"""
+    ) -> dict[str, list[str]]:
+        """Get the ids of the objects associated with each of the given objects"""
+        association_ids: dict[str, list[str]] = {
+            object_id: [] for object_id in object_ids
+        }
         try:
-            associations_iter = self._paginated_results(
-                api_client.crm.associations.v4.basic_api.get_page,
-                object_type=from_object_type,
-                object_id=object_id,
+            response = self._call_hubspot(
+                api_client.crm.associations.v4.batch_api.get_page,
+                from_object_type=from_object_type,
                 to_object_type=to_object_type,
+                batch_input_public_fetch_associations_batch_request={
+                    "inputs": [{"id": object_id} for object_id in object_ids]
+                },
             )
-
-            object_ids = [assoc.to_object_id for assoc in associations_iter]
-
-            associated_objects: list[dict[str, Any]] = []
-
-            if to_object_type == "contacts":
-                for obj_id in object_ids:
-                    try:
-                        obj = self._call_hubspot(
-                            api_client.crm.contacts.basic_api.get_by_id,
-                            contact_id=obj_id,
-                            properties=[
-                                "firstname",
-                                "lastname",
-                                "email",
-                                "company",
-                                "jobtitle",
-                            ],
-                        )
-                        associated_objects.append(obj.to_dict())
-                    except Exception as e:
-                        logger.warning(f"Failed to fetch contact {obj_id}: {e}")
-
-            elif to_object_type == "companies":
-                for obj_id in object_ids:
-                    try:
-                        obj = self._call_hubspot(
-                            api_client.crm.companies.basic_api.get_by_id,
-                            company_id=obj_id,
-                            properties=[
-                                "name",
-                                "domain",
-                                "industry",
-                                "city",
-                                "state",
-                            ],
-                        )
-                        associated_objects.append(obj.to_dict())
-                    except Exception as e:
-                        logger.warning(f"Failed to fetch company {obj_id}: {e}")
-
-            elif to_object_type == "deals":
-                for obj_id in object_ids:
-                    try:
-                        obj = self._call_hubspot(
-                            api_client.crm.deals.basic_api.get_by_id,
-                            deal_id=obj_id,
-                            properties=[
-                                "dealname",
-                                "amount",
-                                "dealstage",
-                                "closedate",
-                                "pipeline",
-                            ],
-                        )
-                        associated_objects.append(obj.to_dict())
-                    except Exception as e:
-                        logger.warning(f"Failed to fetch deal {obj_id}: {e}")
-
-            elif to_object_type == "tickets":
-                for obj_id in object_ids:
-                    try:
-                        obj = self._call_hubspot(
-                            api_client.crm.tickets.basic_api.get_by_id,
-                            ticket_id=obj_id,
-                            properties=["subject", "content", "hs_ticket_priority"],
-                        )
-                        associated_objects.append(obj.to_dict())
-                    except Exception as e:
-                        logger.warning(f"Failed to fetch ticket {obj_id}: {e}")
-
-            return associated_objects
-
         except Exception as e:
             logger.warning(
                 f"Failed to get associations from {from_object_type} to {to_object_type}: {e}"
             )
-            return []
+            return association_ids
 
-    def _get_associated_notes(
-        self,
-        api_client: HubSpot,
-        object_id: str,
-        object_type: str,
-    ) -> list[dict[str, Any]]:
-        """Get notes associated with a given object"""
-        try:
-            associations_iter = self._paginated_results(
-                api_client.crm.associations.v4.basic_api.get_page,
-                object_type=object_type,
-                object_id=object_id,
-                to_object_type="notes",
-            )
+        for result in response.results:
+            object_id = str(result._from.id)
+            association_ids[object_id] = [
+                str(assoc.to_object_id) for assoc in result.to
+            ]
 
-            note_ids = [assoc.to_object_id for assoc in associations_iter]
-
-            associated_notes = []
-
-            for note_id in note_ids:
-                try:
-                    # Notes are engagements in HubSpot, use the engagements API
-                    note = self._call_hubspot(
-                        api_client.crm.objects.notes.basic_api.get_by_id,
-                        note_id=note_id,
-                        properties=[
-                            "hs_note_body",
-                            "hs_timestamp",
-                            "hs_created_by",
-                            "hubspot_owner_id",
-                        ],
+            # objects with a lot of associations are paged, get the rest one by one
+            next_page = getattr(result.paging, "next", None) if result.paging else None
+            if next_page is None:
+                continue
+            try:
+                association_ids[object_id].extend(
+                    str(assoc.to_object_id)
+                    for assoc in self._paginated_results(
+                        api_client.crm.associations.v4.basic_api.get_page,
+                        object_type=from_object_type,
+                        object_id=object_id,
+                        to_object_type=to_object_type,
+                        after=next_page.after,
                     )
-                    associated_notes.append(note.to_dict())
-                except Exception as e:
-                    logger.warning(f"Failed to fetch note {note_id}: {e}")
+                )
+            except Exception as e:
+                logger.warning(
+                    f"Failed to get all associations from {from_object_type} "
+                    f"{object_id} to {to_object_type}: {e}"
+                )
 
-            return associated_notes
+        return association_ids
+
+    def _get_objects(
+        self, api_client: HubSpot, object_type: str, object_ids: list[str]
+    ) -> dict[str, dict[str, Any]]:
+        """Get the objects by id, objects that were already fetched during this run
+        are taken from the cache and the rest is read in batches"""
+        objects: dict[str, dict[str, Any]] = {}
+        missing_ids: list[str] = []
+        for object_id in dict.fromkeys(object_ids):
+            cache_key = (object_type, object_id)
+            if cache_key in self._associated_object_cache:
+                self._associated_object_cache.move_to_end(cache_key)
+                objects[object_id] = self._associated_object_cache[cache_key]
+            else:
+                missing_ids.append(object_id)
+        if not missing_ids:
+            return objects
 
-        except Exception as e:
-            logger.warning(f"Failed to get notes for {object_type} {object_id}: {e}")
-            return []
+        if object_type == "notes":
+            batch_api = api_client.crm.objects.notes.batch_api
+        else:
+            batch_api = getattr(api_client.crm, object_type).batch_api
+
+        for i in range(0, len(missing_ids), HUBSPOT_BATCH_SIZE):
+            batch_ids = missing_ids[i : i + HUBSPOT_BATCH_SIZE]
+            try:
+                response = self._call_hubspot(
+                    batch_api.read,
+                    batch_read_input_simple_public_object_id={
+                        "inputs": [{"id": object_id} for object_id in batch_ids],
+                        "properties": ASSOCIATED_OBJECT_PROPERTIES[object_type],
+                    },
+                )
+            except Exception as e:
+                logger.warning(f"Failed to fetch {object_type} {batch_ids}: {e}")
+                continue
+
+            for result in response.results:
+                obj = result.to_dict()
+                objects[obj["id"]] = obj
+                self._associated_object_cache[(object_type, obj["id"])] = obj
+                if len(self._associated_object_cache) > ASSOCIATED_OBJECT_CACHE_SIZE:
+                    self._associated_object_cache.popitem(last=False)
+
+        return objects
+
+    def _get_associated_objects(
+        self,
+        api_client: HubSpot,
+        object_ids: list[str],
+        from_object_type: str,
+        to_object_type: str,
+    ) -> dict[str, list[dict[str, Any]]]:
+        """Get the associated objects (or notes) for each of the given objects"""
+        association_ids = self._get_association_ids(
+            api_client, object_ids, from_object_type, to_object_type
+        )
+        objects = self._get_objects(
+            api_client,
+            to_object_type,
+            [id for ids in association_ids.values() for id in ids],
+        )
+        return {
+            object_id: [objects[id] for id in ids if id in objects]
+            for object_id, ids in association_ids.items()
+        }
 
     def _create_object_section(
         self, obj: dict[str, Any], object_type: str
@@ -417,86 +443,88 @@ class HubSpotConnector(LoadConnector, PollConnector):
 
         doc_batch: list[Document] = []
 
-        for ticket in tickets_iter:
-            updated_at = ticket.updated_at.replace(tzinfo=None)
-            if start is not None and updated_at < start.replace(tzinfo=None):
-                continue
-            if end is not None and updated_at > end.replace(tzinfo=None):
-                continue
-
-            title = ticket.properties.get("subject") or f"Ticket {ticket.id}"
-            link = self._get_object_url("tickets", ticket.id)
-            content_text = ticket.properties.get("content", "")
-
-            # Main ticket section
-            sections = [TextSection(link=link, text=content_text)]
-
-            # Metadata with parent object IDs
-            metadata: dict[str, str | list[str]] = {
-                "object_type": "ticket",
-            }
-
-            if ticket.properties.get("hs_ticket_priority"):
-                metadata["priority"] = ticket.properties["hs_ticket_priority"]
-
-            # Add associated objects as sections
-            associated_contact_ids = []
-            associated_company_ids = []
-            associated_deal_ids = []
-
-            # Get associated contacts
-            associated_contacts = self._get_associated_objects(
-                api_client, ticket.id, "tickets", "contacts"
+        for tickets_batch in self._batches_in_time_range(tickets_iter, start, end):
+            # associations are fetched for the whole batch at once
+            ticket_ids = [ticket.id for ticket in tickets_batch]
+            contacts_by_ticket = self._get_associated_objects(
+                api_client, ticket_ids, "tickets", "contacts"
             )
-            for contact in associated_contacts:
-                sections.append(self._create_object_section(contact, "contacts"))
-                associated_contact_ids.append(contact["id"])
-
-            # Get associated companies
-            associated_companies = self._get_associated_objects(
-                api_client, ticket.id, "tickets", "companies"
+            companies_by_ticket = self._get_associated_objects(
+                api_client, ticket_ids, "tickets", "companies"
             )
-            for company in associated_companies:
-                sections.append(self._create_object_section(company, "companies"))
-                associated_company_ids.append(company["id"])
-
-            # Get associated deals
-            associated_deals = self._get_associated_objects(
-                api_client, ticket.id, "tickets", "deals"
+            deals_by_ticket = self._get_associated_objects(
+                api_client, ticket_ids, "tickets", "deals"
             )
-            for deal in associated_deals:
-                sections.append(self._create_object_section(deal, "deals"))
-                associated_deal_ids.append(deal["id"])
-
-            # Get associated notes
-            associated_notes = self._get_associated_notes(
-                api_client, ticket.id, "tickets"
+            notes_by_ticket = self._get_associated_objects(
+                api_client, ticket_ids, "tickets", "notes"
             )
-            for note in associated_notes:
-                sections.append(self._create_object_section(note, "notes"))
-
-            # Add association IDs to metadata
-            if associated_contact_ids:
-                metadata["associated_contact_ids"] = associated_contact_ids
-            if associated_company_ids:
-                metadata["associated_company_ids"] = associated_company_ids
-            if associated_deal_ids:
-                metadata["associated_deal_ids"] = associated_deal_ids
-
-            doc_batch.append(
-                Document(
-                    id=f"hubspot_ticket_{ticket.id}",
-                    sections=cast(list[TextSection | ImageSection], sections),
-                    source=DocumentSource.HUBSPOT,
-                    semantic_identifier=title,
-                    doc_updated_at=ticket.updated_at.replace(tzinfo=timezone.utc),
-                    metadata=metadata,
+
+            for ticket in tickets_batch:
+                title = ticket.properties.get("subject") or f"Ticket {ticket.id}"
+                link = self._get_object_url("tickets", ticket.id)
+                content_text = ticket.properties.get("content", "")
+
+                # Main ticket section
+                sections = [TextSection(link=link, text=content_text)]
+
+                # Metadata with parent object IDs
+                metadata: dict[str, str | list[str]] = {
+                    "object_type": "ticket",
+                }
+
+                if ticket.properties.get("hs_ticket_priority"):
+                    metadata["priority"] = ticket.properties["hs_ticket_priority"]
+
+                # Add associated objects as sections
+                associated_contact_ids = []
+                associated_company_ids = []
+                associated_deal_ids = []
+
+                # Get associated contacts
+                associated_contacts = contacts_by_ticket[ticket.id]
+                for contact in associated_contacts:
+                    sections.append(self._create_object_section(contact, "contacts"))
+                    associated_contact_ids.append(contact["id"])
+
+                # Get associated companies
+                associated_companies = companies_by_ticket[ticket.id]
+                for company in associated_companies:
+                    sections.append(self._create_object_section(company, "companies"))
+                    associated_company_ids.append(company["id"])
+
+                # Get associated deals
+                associated_deals = deals_by_ticket[ticket.id]
+                for deal in associated_deals:
+                    sections.append(self._create_object_section(deal, "deals"))
+                    associated_deal_ids.append(deal["id"])
+
+                # Get associated notes
+                associated_notes = notes_by_ticket[ticket.id]
+                for note in associated_notes:
+                    sections.append(self._create_object_section(note, "notes"))
+
+                # Add association IDs to metadata
+                if associated_contact_ids:
+                    metadata["associated_contact_ids"] = associated_contact_ids
+                if associated_company_ids:
+                    metadata["associated_company_ids"] = associated_company_ids
+                if associated_deal_ids:
+                    metadata["associated_deal_ids"] = associated_deal_ids
+
+                doc_batch.append(
+                    Document(
+                        id=f"hubspot_ticket_{ticket.id}",
+                        sections=cast(list[TextSection | ImageSection], sections),
+                        source=DocumentSource.HUBSPOT,
+                        semantic_identifier=title,
+                        doc_updated_at=ticket.updated_at.replace(tzinfo=timezone.utc),
+                        metadata=metadata,
+                    )
                 )
-            )
 
-            if len(doc_batch) >= self.batch_size:
-                yield doc_batch
-                doc_batch = []
+                if len(doc_batch) >= self.batch_size:
+                    yield doc_batch
+                    doc_batch = []
 
         if doc_batch:
             yield doc_batch
@@ -523,105 +551,107 @@ class HubSpotConnector(LoadConnector, PollConnector):
 
         doc_batch: list[Document] = []
 
-        for company in companies_iter:
-            updated_at = company.updated_at.replace(tzinfo=None)
-            if start is not None and updated_at < start.replace(tzinfo=None):
-                continue
-            if end is not None and updated_at > end.replace(tzinfo=None):
-                continue
-
-            title = company.properties.get("name") or f"Company {company.id}"
-            link = self._get_object_url("companies", company.id)
-
-            # Build main content
-            content_parts = [f"Company: {title}"]
-            if company.properties.get("domain"):
-                content_parts.append(f"Domain: {company.properties['domain']}")
-            if company.properties.get("industry"):
-                content_parts.append(f"Industry: {company.properties['industry']}")
-            if company.properties.get("city") and company.properties.get("state"):
-                content_parts.append(
-                    f"Location: {company.properties['city']}, {company.properties['state']}"
-                )
-            if company.properties.get("description"):
-                content_parts.append(
-                    f"Description: {company.properties['description']}"
-                )
-
-            content_text = "\n".join(content_parts)
-
-            # Main company section
-            sections = [TextSection(link=link, text=content_text)]
-
-            # Metadata with parent object IDs
-            metadata: dict[str, str | list[str]] = {
-                "company_id": company.id,
-                "object_type": "company",
-            }
-
-            if company.properties.get("industry"):
-                metadata["industry"] = company.properties["industry"]
-            if company.properties.get("domain"):
-                metadata["domain"] = company.properties["domain"]
-
-            # Add associated objects as sections
-            associated_contact_ids = []
-            associated_deal_ids = []
-            associated_ticket_ids = []
-
-            # Get associated contacts
-            associated_contacts = self._get_associated_objects(
-                api_client, company.id, "companies", "contacts"
+        for companies_batch in self._batches_in_time_range(companies_iter, start, end):
+            # associations are fetched for the whole batch at once
+            company_ids = [company.id for company in companies_batch]
+            contacts_by_company = self._get_associated_objects(
+                api_client, company_ids, "companies", "contacts"
             )
-            for contact in associated_contacts:
-                sections.append(self._create_object_section(contact, "contacts"))
-                associated_contact_ids.append(contact["id"])
-
-            # Get associated deals
-            associated_deals = self._get_associated_objects(
-                api_client, company.id, "companies", "deals"
+            deals_by_company = self._get_associated_objects(
+                api_client, company_ids, "companies", "deals"
             )
-            for deal in associated_deals:
-                sections.append(self._create_object_section(deal, "deals"))
-                associated_deal_ids.append(deal["id"])
-
-            # Get associated tickets
-            associated_tickets = self._get_associated_objects(
-                api_client, company.id, "companies", "tickets"
+            tickets_by_company = self._get_associated_objects(
+                api_client, company_ids, "companies", "tickets"
             )
-            for ticket in associated_tickets:
-                sections.append(self._create_object_section(ticket, "tickets"))
-                associated_ticket_ids.append(ticket["id"])
-
-            # Get associated notes
-            associated_notes = self._get_associated_notes(
-                api_client, company.id, "companies"
+            notes_by_company = self._get_associated_objects(
+                api_client, company_ids, "companies", "notes"
             )
-            for note in associated_notes:
-                sections.append(self._create_object_section(note, "notes"))
-
-            # Add association IDs to metadata
-            if associated_contact_ids:
-                metadata["associated_contact_ids"] = associated_contact_ids
-            if associated_deal_ids:
-                metadata["associated_deal_ids"] = associated_deal_ids
-            if associated_ticket_ids:
-                metadata["associated_ticket_ids"] = associated_ticket_ids
-
-            doc_batch.append(
-                Document(
-                    id=f"hubspot_company_{company.id}",
-                    sections=cast(list[TextSection | ImageSection], sections),
-                    source=DocumentSource.HUBSPOT,
-                    semantic_identifier=title,
-                    doc_updated_at=company.updated_at.replace(tzinfo=timezone.utc),
-                    metadata=metadata,
+
+            for company in companies_batch:
+                title = company.properties.get("name") or f"Company {company.id}"
+                link = self._get_object_url("companies", company.id)
+
+                # Build main content
+                content_parts = [f"Company: {title}"]
+                if company.properties.get("domain"):
+                    content_parts.append(f"Domain: {company.properties['domain']}")
+                if company.properties.get("industry"):
+                    content_parts.append(f"Industry: {company.properties['industry']}")
+                if company.properties.get("city") and company.properties.get("state"):
+                    content_parts.append(
+                        f"Location: {company.properties['city']}, {company.properties['state']}"
+                    )
+                if company.properties.get("description"):
+                    content_parts.append(
+                        f"Description: {company.properties['description']}"
+                    )
+
+                content_text = "\n".join(content_parts)
+
+                # Main company section
+                sections = [TextSection(link=link, text=content_text)]
+
+                # Metadata with parent object IDs
+                metadata: dict[str, str | list[str]] = {
+                    "company_id": company.id,
+                    "object_type": "company",
+                }
+
+                if company.properties.get("industry"):
+                    metadata["industry"] = company.properties["industry"]
+                if company.properties.get("domain"):
+                    metadata["domain"] = company.properties["domain"]
+
+                # Add associated objects as sections
+                associated_contact_ids = []
+                associated_deal_ids = []
+                associated_ticket_ids = []
+
+                # Get associated contacts
+                associated_contacts = contacts_by_company[company.id]
+                for contact in associated_contacts:
+                    sections.append(self._create_object_section(contact, "contacts"))
+                    associated_contact_ids.append(contact["id"])
+
+                # Get associated deals
+                associated_deals = deals_by_company[company.id]
+                for deal in associated_deals:
+                    sections.append(self._create_object_section(deal, "deals"))
+                    associated_deal_ids.append(deal["id"])
+
+                # Get associated tickets
+                associated_tickets = tickets_by_company[company.id]
+                for ticket in associated_tickets:
+                    sections.append(self._create_object_section(ticket, "tickets"))
+                    associated_ticket_ids.append(ticket["id"])
+
+                # Get associated notes
+                associated_notes = notes_by_company[company.id]
+                for note in associated_notes:
+                    sections.append(self._create_object_section(note, "notes"))
+
+                # Add association IDs to metadata
+                if associated_contact_ids:
+                    metadata["associated_contact_ids"] = associated_contact_ids
+                if associated_deal_ids:
+                    metadata["associated_deal_ids"] = associated_deal_ids
+                if associated_ticket_ids:
+                    metadata["associated_ticket_ids"] = associated_ticket_ids
+
+                doc_batch.append(
+                    Document(
+                        id=f"hubspot_company_{company.id}",
+                        sections=cast(list[TextSection | ImageSection], sections),
+                        source=DocumentSource.HUBSPOT,
+                        semantic_identifier=title,
+                        doc_updated_at=company.updated_at.replace(tzinfo=timezone.utc),
+                        metadata=metadata,
+                    )
                 )
-            )
 
-            if len(doc_batch) >= self.batch_size:
-                yield doc_batch
-                doc_batch = []
+                if len(doc_batch) >= self.batch_size:
+                    yield doc_batch
+                    doc_batch = []
 
         if doc_batch:
             yield doc_batch
@@ -648,103 +678,109 @@ class HubSpotConnector(LoadConnector, PollConnector):
 
         doc_batch: list[Document] = []
 
-        for deal in deals_iter:
-            updated_at = deal.updated_at.replace(tzinfo=None)
-            if start is not None and updated_at < start.replace(tzinfo=None):
-                continue
-            if end is not None and updated_at > end.replace(tzinfo=None):
-                continue
-
-            title = deal.properties.get("dealname") or f"Deal {deal.id}"
-            link = self._get_object_url("deals", deal.id)
-
-            # Build main content
-            content_parts = [f"Deal: {title}"]
-            if deal.properties.get("amount"):
-                content_parts.append(f"Amount: ${deal.properties['amount']}")
-            if deal.properties.get("dealstage"):
-                content_parts.append(f"Stage: {deal.properties['dealstage']}")
-            if deal.properties.get("closedate"):
-                content_parts.append(f"Close Date: {deal.properties['closedate']}")
-            if deal.properties.get("pipeline"):
-                content_parts.append(f"Pipeline: {deal.properties['pipeline']}")
-            if deal.properties.get("description"):
-                content_parts.append(f"Description: {deal.properties['description']}")
-
-            content_text = "\n".join(content_parts)
-
-            # Main deal section
-            sections = [TextSection(link=link, text=content_text)]
-
-            # Metadata with parent object IDs
-            metadata: dict[str, str | list[str]] = {
-                "deal_id": deal.id,
-                "object_type": "deal",
-            }
-
-            if deal.properties.get("dealstage"):
-                metadata["deal_stage"] = deal.properties["dealstage"]
-            if deal.properties.get("pipeline"):
-                metadata["pipeline"] = deal.properties["pipeline"]
-            if deal.properties.get("amount"):
-                metadata["amount"] = deal.properties["amount"]
-
-            # Add associated objects as sections
-            associated_contact_ids = []
-            associated_company_ids = []
-            associated_ticket_ids = []
-
-            # Get associated contacts
-            associated_contacts = self._get_associated_objects(
-                api_client, deal.id, "deals", "contacts"
+        for deals_batch in self._batches_in_time_range(deals_iter, start, end):
+            # associations are fetched for the whole batch at once
+            deal_ids = [deal.id for deal in deals_batch]
+            contacts_by_deal = self._get_associated_objects(
+                api_client, deal_ids, "deals", "contacts"
             )
-            for contact in associated_contacts:
-                sections.append(self._create_object_section(contact, "contacts"))
-                associated_contact_ids.append(contact["id"])
-
-            # Get associated companies
-            associated_companies = self._get_associated_objects(
-                api_client, deal.id, "deals", "companies"
+            companies_by_deal = self._get_associated_objects(
+                api_client, deal_ids, "deals", "companies"
             )
-            for company in associated_companies:
-                sections.append(self._create_object_section(company, "companies"))
-                associated_company_ids.append(company["id"])
-
-            # Get associated tickets
-            associated_tickets = self._get_associated_objects(
-                api_client, deal.id, "deals", "tickets"
+            tickets_by_deal = self._get_associated_objects(
+                api_client, deal_ids, "deals", "tickets"
             )
-            for ticket in associated_tickets:
-                sections.append(self._create_object_section(ticket, "tickets"))
-                associated_ticket_ids.append(ticket["id"])
-
-            # Get associated notes
-            associated_notes = self._get_associated_notes(api_client, deal.id, "deals")
-            for note in associated_notes:
-                sections.append(self._create_object_section(note, "notes"))
-
-            # Add association IDs to metadata
-            if associated_contact_ids:
-                metadata["associated_contact_ids"] = associated_contact_ids
-            if associated_company_ids:
-                metadata["associated_company_ids"] = associated_company_ids
-            if associated_ticket_ids:
-                metadata["associated_ticket_ids"] = associated_ticket_ids
-
-            doc_batch.append(
-                Document(
-                    id=f"hubspot_deal_{deal.id}",
-                    sections=cast(list[TextSection | ImageSection], sections),
-                    source=DocumentSource.HUBSPOT,
-                    semantic_identifier=title,
-                    doc_updated_at=deal.updated_at.replace(tzinfo=timezone.utc),
-                    metadata=metadata,
-                )
+            notes_by_deal = self._get_associated_objects(
+                api_client, deal_ids, "deals", "notes"
             )
 
-            if len(doc_batch) >= self.batch_size:
-                yield doc_batch
-                doc_batch = []
+            for deal in deals_batch:
+                title = deal.properties.get("dealname") or f"Deal {deal.id}"
+                link = self._get_object_url("deals", deal.id)
+
+                # Build main content
+                content_parts = [f"Deal: {title}"]
+                if deal.properties.get("amount"):
+                    content_parts.append(f"Amount: ${deal.properties['amount']}")
+                if deal.properties.get("dealstage"):
+                    content_parts.append(f"Stage: {deal.properties['dealstage']}")
+                if deal.properties.get("closedate"):
+                    content_parts.append(f"Close Date: {deal.properties['closedate']}")
+                if deal.properties.get("pipeline"):
+                    content_parts.append(f"Pipeline: {deal.properties['pipeline']}")
+                if deal.properties.get("description"):
+                    content_parts.append(
+                        f"Description: {deal.properties['description']}"
+                    )
+
+                content_text = "\n".join(content_parts)
+
+                # Main deal section
+                sections = [TextSection(link=link, text=content_text)]
+
+                # Metadata with parent object IDs
+                metadata: dict[str, str | list[str]] = {
+                    "deal_id": deal.id,
+                    "object_type": "deal",
+                }
+
+                if deal.properties.get("dealstage"):
+                    metadata["deal_stage"] = deal.properties["dealstage"]
+                if deal.properties.get("pipeline"):
+                    metadata["pipeline"] = deal.properties["pipeline"]
+                if deal.properties.get("amount"):
+                    metadata["amount"] = deal.properties["amount"]
+
+                # Add associated objects as sections
+                associated_contact_ids = []
+                associated_company_ids = []
+                associated_ticket_ids = []
+
+                # Get associated contacts
+                associated_contacts = contacts_by_deal[deal.id]
+                for contact in associated_contacts:
+                    sections.append(self._create_object_section(contact, "contacts"))
+                    associated_contact_ids.append(contact["id"])
+
+                # Get associated companies
+                associated_companies = companies_by_deal[deal.id]
+                for company in associated_companies:
+                    sections.append(self._create_object_section(company, "companies"))
+                    associated_company_ids.append(company["id"])
+
+                # Get associated tickets
+                associated_tickets = tickets_by_deal[deal.id]
+                for ticket in associated_tickets:
+                    sections.append(self._create_object_section(ticket, "tickets"))
+                    associated_ticket_ids.append(ticket["id"])
+
+                # Get associated notes
+                associated_notes = notes_by_deal[deal.id]
+                for note in associated_notes:
+                    sections.append(self._create_object_section(note, "notes"))
+
+                # Add association IDs to metadata
+                if associated_contact_ids:
+                    metadata["associated_contact_ids"] = associated_contact_ids
+                if associated_company_ids:
+                    metadata["associated_company_ids"] = associated_company_ids
+                if associated_ticket_ids:
+                    metadata["associated_ticket_ids"] = associated_ticket_ids
+
+                doc_batch.append(
+                    Document(
+                        id=f"hubspot_deal_{deal.id}",
+                        sections=cast(list[TextSection | ImageSection], sections),
+                        source=DocumentSource.HUBSPOT,
+                        semantic_identifier=title,
+                        doc_updated_at=deal.updated_at.replace(tzinfo=timezone.utc),
+                        metadata=metadata,
+                    )
+                )
+
+                if len(doc_batch) >= self.batch_size:
+                    yield doc_batch
+                    doc_batch = []
 
         if doc_batch:
             yield doc_batch
@@ -773,127 +809,130 @@ class HubSpotConnector(LoadConnector, PollConnector):
 
         doc_batch: list[Document] = []
 
-        for contact in contacts_iter:
-            updated_at = contact.updated_at.replace(tzinfo=None)
-            if start is not None and updated_at < start.replace(tzinfo=None):
-                continue
-            if end is not None and updated_at > end.replace(tzinfo=None):
-                continue
-
-            # Build contact name
-            name_parts = []
-            if contact.properties.get("firstname"):
-                name_parts.append(contact.properties["firstname"])
-            if contact.properties.get("lastname"):
-                name_parts.append(contact.properties["lastname"])
-
-            if name_parts:
-                title = " ".join(name_parts)
-            elif contact.properties.get("email"):
-                # Use email as fallback if no first/last name
-                title = contact.properties["email"]
-            else:
-                title = f"Contact {contact.id}"
-
-            link = self._get_object_url("contacts", contact.id)
-
-            # Build main content
-            content_parts = [f"Contact: {title}"]
-            if contact.properties.get("email"):
-                content_parts.append(f"Email: {contact.properties['email']}")
-            if contact.properties.get("company"):
-                content_parts.append(f"Company: {contact.properties['company']}")
-            if contact.properties.get("jobtitle"):
-                content_parts.append(f"Job Title: {contact.properties['jobtitle']}")
-            if contact.properties.get("phone"):
-                content_parts.append(f"Phone: {contact.properties['phone']}")
-            if contact.properties.get("city") and contact.properties.get("state"):
-                content_parts.append(
-                    f"Location: {contact.properties['city']}, {contact.properties['state']}"
-                )
-
-            content_text = "\n".join(content_parts)
-
-            # Main contact section
-            sections = [TextSection(link=link, text=content_text)]
-
-            # Metadata with parent object IDs
-            metadata: dict[str, str | list[str]] = {
-                "contact_id": contact.id,
-                "object_type": "contact",
-            }
-
-            if contact.properties.get("email"):
-                metadata["email"] = contact.properties["email"]
-            if contact.properties.get("company"):
-                metadata["company"] = contact.properties["company"]
-            if contact.properties.get("jobtitle"):
-                metadata["job_title"] = contact.properties["jobtitle"]
-
-            # Add associated objects as sections
-            associated_company_ids = []
-            associated_deal_ids = []
-            associated_ticket_ids = []
-
-            # Get associated companies
-            associated_companies = self._get_associated_objects(
-                api_client, contact.id, "contacts", "companies"
+        for contacts_batch in self._batches_in_time_range(contacts_iter, start, end):
+            # associations are fetched for the whole batch at once
+            contact_ids = [contact.id for contact in contacts_batch]
+            companies_by_contact = self._get_associated_objects(
+                api_client, contact_ids, "contacts", "companies"
             )
-            for company in associated_companies:
-                sections.append(self._create_object_section(company, "companies"))
-                associated_company_ids.append(company["id"])
-
-            # Get associated deals
-            associated_deals = self._get_associated_objects(
-                api_client, contact.id, "contacts", "deals"
+            deals_by_contact = self._get_associated_objects(
+                api_client, contact_ids, "contacts", "deals"
             )
-            for deal in associated_deals:
-                sections.append(self._create_object_section(deal, "deals"))
-                associated_deal_ids.append(deal["id"])
-
-            # Get associated tickets
-            associated_tickets = self._get_associated_objects(
-                api_client, contact.id, "contacts", "tickets"
+            tickets_by_contact = self._get_associated_objects(
+                api_client, contact_ids, "contacts", "tickets"
             )
-            for ticket in associated_tickets:
-                sections.append(self._create_object_section(ticket, "tickets"))
-                associated_ticket_ids.append(ticket["id"])
-
-            # Get associated notes
-            associated_notes = self._get_associated_notes(
-                api_client, contact.id, "contacts"
+            notes_by_contact = self._get_associated_objects(
+                api_client, contact_ids, "contacts", "notes"
             )
-            for note in associated_notes:
-                sections.append(self._create_object_section(note, "notes"))
-
-            # Add association IDs to metadata
-            if associated_company_ids:
-                metadata["associated_company_ids"] = associated_company_ids
-            if associated_deal_ids:
-                metadata["associated_deal_ids"] = associated_deal_ids
-            if associated_ticket_ids:
-                metadata["associated_ticket_ids"] = associated_ticket_ids
-
-            doc_batch.append(
-                Document(
-                    id=f"hubspot_contact_{contact.id}",
-                    sections=cast(list[TextSection | ImageSection], sections),
-                    source=DocumentSource.HUBSPOT,
-                    semantic_identifier=title,
-                    doc_updated_at=contact.updated_at.replace(tzinfo=timezone.utc),
-                    metadata=metadata,
+
+            for contact in contacts_batch:
+                # Build contact name
+                name_parts = []
+                if contact.properties.get("firstname"):
+                    name_parts.append(contact.properties["firstname"])
+                if contact.properties.get("lastname"):
+                    name_parts.append(contact.properties["lastname"])
+
+                if name_parts:
+                    title = " ".join(name_parts)
+                elif contact.properties.get("email"):
+                    # Use email as fallback if no first/last name
+                    title = contact.properties["email"]
+                else:
+                    title = f"Contact {contact.id}"
+
+                link = self._get_object_url("contacts", contact.id)
+
+                # Build main content
+                content_parts = [f"Contact: {title}"]
+                if contact.properties.get("email"):
+                    content_parts.append(f"Email: {contact.properties['email']}")
+                if contact.properties.get("company"):
+                    content_parts.append(f"Company: {contact.properties['company']}")
+                if contact.properties.get("jobtitle"):
+                    content_parts.append(f"Job Title: {contact.properties['jobtitle']}")
+                if contact.properties.get("phone"):
+                    content_parts.append(f"Phone: {contact.properties['phone']}")
+                if contact.properties.get("city") and contact.properties.get("state"):
+                    content_parts.append(
+                        f"Location: {contact.properties['city']}, {contact.properties['state']}"
+                    )
+
+                content_text = "\n".join(content_parts)
+
+                # Main contact section
+                sections = [TextSection(link=link, text=content_text)]
+
+                # Metadata with parent object IDs
+                metadata: dict[str, str | list[str]] = {
+                    "contact_id": contact.id,
+                    "object_type": "contact",
+                }
+
+                if contact.properties.get("email"):
+                    metadata["email"] = contact.properties["email"]
+                if contact.properties.get("company"):
+                    metadata["company"] = contact.properties["company"]
+                if contact.properties.get("jobtitle"):
+                    metadata["job_title"] = contact.properties["jobtitle"]
+
+                # Add associated objects as sections
+                associated_company_ids = []
+                associated_deal_ids = []
+                associated_ticket_ids = []
+
+                # Get associated companies
+                associated_companies = companies_by_contact[contact.id]
+                for company in associated_companies:
+                    sections.append(self._create_object_section(company, "companies"))
+                    associated_company_ids.append(company["id"])
+
+                # Get associated deals
+                associated_deals = deals_by_contact[contact.id]
+                for deal in associated_deals:
+                    sections.append(self._create_object_section(deal, "deals"))
+                    associated_deal_ids.append(deal["id"])
+
+                # Get associated tickets
+                associated_tickets = tickets_by_contact[contact.id]
+                for ticket in associated_tickets:
+                    sections.append(self._create_object_section(ticket, "tickets"))
+                    associated_ticket_ids.append(ticket["id"])
+
+                # Get associated notes
+                associated_notes = notes_by_contact[contact.id]
+                for note in associated_notes:
+                    sections.append(self._create_object_section(note, "notes"))
+
+                # Add association IDs to metadata
+                if associated_company_ids:
+                    metadata["associated_company_ids"] = associated_company_ids
+                if associated_deal_ids:
+                    metadata["associated_deal_ids"] = associated_deal_ids
+                if associated_ticket_ids:
+                    metadata["associated_ticket_ids"] = associated_ticket_ids
+
+                doc_batch.append(
+                    Document(
+                        id=f"hubspot_contact_{contact.id}",
+                        sections=cast(list[TextSection | ImageSection], sections),
+                        source=DocumentSource.HUBSPOT,
+                        semantic_identifier=title,
+                        doc_updated_at=contact.updated_at.replace(tzinfo=timezone.utc),
+                        metadata=metadata,
+                    )
                 )
-            )
 
-            if len(doc_batch) >= self.batch_size:
-                yield doc_batch
-                doc_batch = []
+                if len(doc_batch) >= self.batch_size:
+                    yield doc_batch
+                    doc_batch = []
 
         if doc_batch:
             yield doc_batch
 
     def load_from_state(self) -> GenerateDocumentsOutput:
         """Load all HubSpot objects (tickets, companies, deals, contacts)"""
+        self._associated_object_cache.clear()
         # Process each object type based on configuration
         if "tickets" in self.object_types:
             yield from self._process_tickets()
@@ -909,6 +948,7 @@ class HubSpotConnector(LoadConnector, PollConnector):
     ) -> GenerateDocumentsOutput:
         start_datetime = datetime.fromtimestamp(start, tz=timezone.utc)
         end_datetime = datetime.fromtimestamp(end, tz=timezone.utc)
+        self._associated_object_cache.clear()
 
         # Process each object type with time filtering based on configuration
         if "tickets" in self.object_types:
@@ -33,6 +33,7 @@ from onyx.llm.interfaces import LLM
 from onyx.llm.utils import message_to_string
 from onyx.natural_language_processing.search_nlp_models import RerankingModel
 from onyx.secondary_llm_flows.chunk_usefulness import llm_batch_eval_sections
+from onyx.utils.executor_service import ExecutorPool
 from onyx.utils.logger import setup_logger
 from onyx.utils.threadpool_concurrency import FunctionCall
 from onyx.utils.threadpool_concurrency import run_functions_in_parallel
@@ -122,7 +123,9 @@ def update_image_sections_with_query(
     logger.info(
         f"Starting parallel processing of {len(image_processing_tasks)} image tasks"
     )
-    image_processing_results = run_functions_in_parallel(image_processing_tasks)
+    image_processing_results = run_functions_in_parallel(
+        image_processing_tasks, pool=ExecutorPool.LLM
+    )
     logger.info(
         f"Completed parallel processing with {len(image_processing_results)} results"
     )
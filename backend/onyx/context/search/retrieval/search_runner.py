@@ -1,5 +1,6 @@
 import string
 from collections.abc import Callable
+from concurrent.futures import Future
 from uuid import UUID
 
 from sqlalchemy.orm import Session
@@ -31,11 +32,10 @@ from onyx.federated_connectors.federated_retrieval import (
 )
 from onyx.onyxbot.slack.models import SlackContext
 from onyx.secondary_llm_flows.query_expansion import multilingual_query_expansion
+from onyx.utils.executor_service import ExecutorPool
+from onyx.utils.executor_service import get_executor_service
 from onyx.utils.logger import setup_logger
 from onyx.utils.threadpool_concurrency import run_functions_tuples_in_parallel
-from onyx.utils.threadpool_concurrency import run_in_background
-from onyx.utils.threadpool_concurrency import TimeoutThread
-from onyx.utils.threadpool_concurrency import wait_on_background
 from onyx.utils.timing import log_function_time
 from shared_configs.model_server_models import Embedding
 
@@ -134,15 +134,15 @@ def doc_index_retrieval(
         query.query, db_session
     )
 
-    keyword_embeddings_thread: TimeoutThread[list[Embedding]] | None = None
-    semantic_embeddings_thread: TimeoutThread[list[Embedding]] | None = None
+    executor_service = get_executor_service()
+
+    keyword_embeddings_thread: Future[list[Embedding]] | None = None
+    semantic_embeddings_thread: Future[list[Embedding]] | None = None
     top_base_chunks_standard_ranking_thread: (
-        TimeoutThread[list[InferenceChunkUncleaned]] | None
+        Future[list[InferenceChunkUncleaned]] | None
     ) = None
 
-    top_semantic_chunks_thread: TimeoutThread[list[InferenceChunkUncleaned]] | None = (
-        None
-    )
+    top_semantic_chunks_thread: Future[list[InferenceChunkUncleaned]] | None = None
 
     keyword_embeddings: list[Embedding] | None = None
     semantic_embeddings: list[Embedding] | None = None
@@ -150,7 +150,8 @@ def doc_index_retrieval(
     top_semantic_chunks: list[InferenceChunkUncleaned] | None = None
 
     # original retrieveal method
-    top_base_chunks_standard_ranking_thread = run_in_background(
+    top_base_chunks_standard_ranking_thread = executor_service.submit(
+        ExecutorPool.IO,
         document_index.hybrid_retrieval,
         query.query,
         query_embedding,
@@ -169,29 +170,32 @@ def doc_index_retrieval(
         and query.expanded_queries.semantic_expansions
     ):
 
-        keyword_embeddings_thread = run_in_background(
+        keyword_embeddings_thread = executor_service.submit(
+            ExecutorPool.IO,
             get_query_embeddings,
             query.expanded_queries.keywords_expansions,
             db_session,
         )
 
         if query.search_type == SearchType.SEMANTIC:
-            semantic_embeddings_thread = run_in_background(
+            semantic_embeddings_thread = executor_service.submit(
+                ExecutorPool.IO,
                 get_query_embeddings,
                 query.expanded_queries.semantic_expansions,
                 db_session,
             )
 
-        keyword_embeddings = wait_on_background(keyword_embeddings_thread)
+        keyword_embeddings = keyword_embeddings_thread.result()
         if query.search_type == SearchType.SEMANTIC:
             assert semantic_embeddings_thread is not None
-            semantic_embeddings = wait_on_background(semantic_embeddings_thread)
+            semantic_embeddings = semantic_embeddings_thread.result()
 
         # Use original query embedding for keyword retrieval embedding
         keyword_embeddings = [query_embedding]
 
         # Note: we generally prepped earlier for multiple expansions, but for now we only use one.
-        top_keyword_chunks_thread = run_in_background(
+        top_keyword_chunks_thread = executor_service.submit(
+            ExecutorPool.IO,
             document_index.hybrid_retrieval,
             query.expanded_queries.keywords_expansions[0],
             keyword_embeddings[0],
@@ -207,7 +211,8 @@ def doc_index_retrieval(
         if query.search_type == SearchType.SEMANTIC:
             assert semantic_embeddings is not None
 
-            top_semantic_chunks_thread = run_in_background(
+            top_semantic_chunks_thread = executor_service.submit(
+                ExecutorPool.IO,
                 document_index.hybrid_retrieval,
                 query.expanded_queries.semantic_expansions[0],
                 semantic_embeddings[0],
@@ -220,15 +225,15 @@ def doc_index_retrieval(
                 query.offset,
             )
 
-        top_base_chunks_standard_ranking = wait_on_background(
-            top_base_chunks_standard_ranking_thread
+        top_base_chunks_standard_ranking = (
+            top_base_chunks_standard_ranking_thread.result()
         )
 
-        top_keyword_chunks = wait_on_background(top_keyword_chunks_thread)
+        top_keyword_chunks = top_keyword_chunks_thread.result()
 
         if query.search_type == SearchType.SEMANTIC:
             assert top_semantic_chunks_thread is not None
-            top_semantic_chunks = wait_on_background(top_semantic_chunks_thread)
+            top_semantic_chunks = top_semantic_chunks_thread.result()
 
         all_top_chunks = top_base_chunks_standard_ranking + top_keyword_chunks
 
@@ -242,8 +247,8 @@ def doc_index_retrieval(
 
     else:
 
-        top_base_chunks_standard_ranking = wait_on_background(
-            top_base_chunks_standard_ranking_thread
+        top_base_chunks_standard_ranking = (
+            top_base_chunks_standard_ranking_thread.result()
         )
 
         top_chunks = _dedupe_chunks(top_base_chunks_standard_ranking)
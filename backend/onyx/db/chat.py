@@ -10,6 +10,7 @@ from fastapi import HTTPException
 from sqlalchemy import delete
 from sqlalchemy import desc
 from sqlalchemy import func
+from sqlalchemy import literal
 from sqlalchemy import nullsfirst
 from sqlalchemy import or_
 from sqlalchemy import Row
@@ -17,6 +18,7 @@ from sqlalchemy import select
 from sqlalchemy import update
 from sqlalchemy.exc import MultipleResultsFound
 from sqlalchemy.orm import joinedload
+from sqlalchemy.orm import selectinload
 from sqlalchemy.orm import Session
 
 from onyx.agents.agent_search.dr.enums import ResearchAnswerPurpose
@@ -585,6 +587,89 @@ def get_chat_messages_by_session(
     return list(result)
 
 
+def get_mainline_chat_message_ids(
+    chat_session_id: UUID,
+    db_session: Session,
+    start_message_id: int | None = None,
+) -> list[int]:
+    """Returns the ids of the mainline messages of a chat session, i.e. the chain of
+    latest_child_message pointers starting at the root message (or at
+    start_message_id). The pointers are followed in a single recursive query, so the
+    messages of abandoned edit branches are never read."""
+    anchor_id = (
+        start_message_id
+        if start_message_id is not None
+        else select(func.min(ChatMessage.id))
+        .where(
+            ChatMessage.chat_session_id == chat_session_id,
+            ChatMessage.parent_message.is_(None),
+        )
+        .scalar_subquery()
+    )
+    mainline = (
+        select(
+            ChatMessage.id,
+            ChatMessage.latest_child_message,
+            literal(True).label("is_start"),
+        )
+        .where(
+            ChatMessage.chat_session_id == chat_session_id,
+            ChatMessage.id == anchor_id,
+        )
+        .cte("mainline", recursive=True)
+    )
+    # UNION rather than UNION ALL so that a cycle of pointers can't recurse forever
+    mainline = mainline.union(
+        select(
+            ChatMessage.id,
+            ChatMessage.latest_child_message,
+            literal(False).label("is_start"),
+        )
+        .join(mainline, ChatMessage.id == mainline.c.latest_child_message)
+        .where(ChatMessage.chat_session_id == chat_session_id)
+    )
+
+    rows = db_session.execute(select(mainline)).all()
+    next_ids = {row.id: row.latest_child_message for row in rows}
+    message_id = next((row.id for row in rows if row.is_start), None)
+    message_ids: list[int] = []
+    while message_id in next_ids and len(message_ids) < len(next_ids):
+        message_ids.append(message_id)
+        message_id = next_ids[message_id]
+    return message_ids
+
+
+def get_chat_messages_by_ids(
+    chat_message_ids: list[int],
+    chat_session_id: UUID,
+    db_session: Session,
+    prefetch_tool_calls: bool = False,
+) -> list[ChatMessage]:
+    """Returns the messages in the order of chat_message_ids, ids of messages which
+    don't exist or belong to another chat session are skipped"""
+    if not chat_message_ids:
+        return []
+
+    stmt = select(ChatMessage).where(
+        ChatMessage.chat_session_id == chat_session_id,
+        ChatMessage.id.in_(chat_message_ids),
+    )
+    if prefetch_tool_calls:
+        stmt = stmt.options(
+            selectinload(ChatMessage.tool_call),
+            selectinload(ChatMessage.research_iterations).selectinload(
+                ResearchAgentIteration.sub_steps
+            ),
+        )
+
+    id_to_message = {message.id: message for message in db_session.scalars(stmt)}
+    return [
+        id_to_message[message_id]
+        for message_id in chat_message_ids
+        if message_id in id_to_message
+    ]
+
+
 def get_or_create_root_message(
     chat_session_id: UUID,
     db_session: Session,
@@ -1,19 +1,94 @@
+import base64
+import datetime
+import json
+from decimal import Decimal
+from typing import Any
 from typing import List
 from typing import Optional
 from typing import Tuple
 from uuid import UUID
 
+from pydantic import BaseModel
+from sqlalchemy import and_
+from sqlalchemy import cast
 from sqlalchemy import column
 from sqlalchemy import desc
+from sqlalchemy import exists
 from sqlalchemy import func
+from sqlalchemy import literal
+from sqlalchemy import Numeric
+from sqlalchemy import or_
 from sqlalchemy import select
+from sqlalchemy import tuple_
 from sqlalchemy.orm import joinedload
 from sqlalchemy.orm import Session
+from sqlalchemy.sql.elements import ColumnElement
 from sqlalchemy.sql.expression import ColumnClause
 
 from onyx.db.models import ChatMessage
 from onyx.db.models import ChatSession
 
+# Weight applied to a match on the session description relative to a single
+# matching message when computing the ranked search score
+_DESCRIPTION_MATCH_WEIGHT = 2.0
+# The ranked search score is rounded to this many decimal places (as a numeric)
+# so that it compares exactly against the cursor. A float sum of per-message
+# ranks isn't guaranteed to come out bit-identical on every execution.
+_RANK_DECIMAL_PLACES = 8
+
+
+class ChatSessionCursor(BaseModel):
+    """Opaque keyset position for paginating chat sessions.
+
+    For the recency-ordered paths this is the `(time_created, id)` of the last
+    session returned. For the ranked path `rank` is also populated, since the
+    results are ordered by `(rank, time_created, id)`. The rank is kept as a
+    Decimal (serialized as a string) so that it survives the round trip exactly."""
+
+    time_created: datetime.datetime
+    id: UUID
+    rank: Decimal | None = None
+
+    def encode(self) -> str:
+        return (
+            base64.urlsafe_b64encode(self.model_dump_json().encode())
+            .decode()
+            .rstrip("=")
+        )
+
+    @classmethod
+    def decode(cls, cursor: str) -> "ChatSessionCursor":
+        padded = cursor + "=" * (-len(cursor) % 4)
+        try:
+            return cls.model_validate(json.loads(base64.urlsafe_b64decode(padded)))
+        except Exception as e:
+            raise ValueError(f"Invalid chat session cursor: {cursor}") from e
+
+
+def _base_conditions(
+    user_id: UUID | None,
+    include_deleted: bool,
+    include_onyxbot_flows: bool,
+) -> list[ColumnElement[bool]]:
+    conditions: list[ColumnElement[bool]] = []
+    if user_id is not None:
+        conditions.append(ChatSession.user_id == user_id)
+    if not include_onyxbot_flows:
+        conditions.append(ChatSession.onyxbot_flow.is_(False))
+    if not include_deleted:
+        conditions.append(ChatSession.deleted.is_(False))
+    return conditions
+
+
+def _split_page(
+    rows: list[Any],
+    page_size: int,
+) -> tuple[list[Any], bool]:
+    has_more = len(rows) > page_size
+    if has_more:
+        rows = rows[:page_size]
+    return rows, has_more
+
 
 def search_chat_sessions(
     user_id: UUID | None,
@@ -23,6 +98,7 @@ def search_chat_sessions(
     page_size: int = 10,
     include_deleted: bool = False,
     include_onyxbot_flows: bool = False,
+    cursor: ChatSessionCursor | None = None,
 ) -> Tuple[List[ChatSession], bool]:
     """
     Fast full-text search on ChatSession + ChatMessage using tsvectors.
@@ -30,82 +106,150 @@ def search_chat_sessions(
     If no query is provided, returns the most recent chat sessions.
     Otherwise, searches both chat messages and session descriptions.
 
+    If `cursor` is provided, keyset pagination on `(time_created, id)` is used
+    and `page` is ignored. This stays fast for arbitrarily deep pages since it
+    is served directly from `ix_chat_session_user_time_created_id`. `page` is
+    kept for backwards compatibility and falls back to OFFSET pagination.
+
     Returns a tuple of (sessions, has_more) where has_more indicates if
     there are additional results beyond the requested page.
     """
-    offset_val = (page - 1) * page_size
-
-    # If no query, just return the most recent sessions
-    if not query or not query.strip():
-        stmt = (
-            select(ChatSession)
-            .order_by(desc(ChatSession.time_created))
-            .offset(offset_val)
-            .limit(page_size + 1)
+    if cursor is not None and cursor.rank is not None:
+        raise ValueError("Cursor is from a ranked chat session search")
+
+    base_conditions = _base_conditions(
+        user_id=user_id,
+        include_deleted=include_deleted,
+        include_onyxbot_flows=include_onyxbot_flows,
+    )
+
+    stmt = select(ChatSession).where(*base_conditions)
+
+    if query and query.strip():
+        ts_query = func.plainto_tsquery("english", query.strip())
+        message_tsv: ColumnClause = column("message_tsv")
+        description_tsv: ColumnClause = column("description_tsv")
+
+        # EXISTS lets postgres stop at the first matching message per session
+        # instead of building (and de-duplicating) a union of every match
+        message_match = exists(
+            select(literal(1))
+            .select_from(ChatMessage)
+            .where(ChatMessage.chat_session_id == ChatSession.id)
+            .where(message_tsv.op("@@")(ts_query))
         )
-        if user_id is not None:
-            stmt = stmt.where(ChatSession.user_id == user_id)
-        if not include_onyxbot_flows:
-            stmt = stmt.where(ChatSession.onyxbot_flow.is_(False))
-        if not include_deleted:
-            stmt = stmt.where(ChatSession.deleted.is_(False))
+        stmt = stmt.where(or_(description_tsv.op("@@")(ts_query), message_match))
+
+    if cursor is not None:
+        stmt = stmt.where(
+            tuple_(ChatSession.time_created, ChatSession.id)
+            < tuple_(literal(cursor.time_created), literal(cursor.id))
+        )
+    else:
+        stmt = stmt.offset((page - 1) * page_size)
+
+    stmt = (
+        stmt.order_by(desc(ChatSession.time_created), desc(ChatSession.id))
+        .limit(page_size + 1)
+        .options(joinedload(ChatSession.persona))
+    )
 
-        result = db_session.execute(stmt.options(joinedload(ChatSession.persona)))
-        sessions = result.scalars().all()
+    sessions = list(db_session.execute(stmt).scalars().all())
+    return _split_page(sessions, page_size)
 
-        has_more = len(sessions) > page_size
-        if has_more:
-            sessions = sessions[:page_size]
 
-        return list(sessions), has_more
+def search_chat_sessions_ranked(
+    user_id: UUID | None,
+    db_session: Session,
+    query: str,
+    page_size: int = 10,
+    include_deleted: bool = False,
+    include_onyxbot_flows: bool = False,
+    cursor: ChatSessionCursor | None = None,
+) -> Tuple[List[tuple[ChatSession, Decimal]], bool]:
+    """
+    Full-text search that orders sessions by relevance rather than recency.
 
-    # Otherwise, proceed with full-text search
-    query = query.strip()
+    Each session is scored by the sum of `ts_rank` over its matching messages
+    plus a weighted description match. Scores are aggregated per session in
+    SQL, so individual matching messages are never returned to the caller.
+    Pagination is keyset-based on `(rank, time_created, id)`, so `cursor` must
+    come from a previous ranked search (i.e. have `rank` set).
 
-    base_conditions = []
-    if user_id is not None:
-        base_conditions.append(ChatSession.user_id == user_id)
-    if not include_onyxbot_flows:
-        base_conditions.append(ChatSession.onyxbot_flow.is_(False))
-    if not include_deleted:
-        base_conditions.append(ChatSession.deleted.is_(False))
+    Returns a tuple of ([(session, rank), ...], has_more).
+    """
+    if cursor is not None and cursor.rank is None:
+        raise ValueError("Cursor is not from a ranked chat session search")
 
+    base_conditions = _base_conditions(
+        user_id=user_id,
+        include_deleted=include_deleted,
+        include_onyxbot_flows=include_onyxbot_flows,
+    )
+    ts_query = func.plainto_tsquery("english", query.strip())
     message_tsv: ColumnClause = column("message_tsv")
     description_tsv: ColumnClause = column("description_tsv")
 
-    ts_query = func.plainto_tsquery("english", query)
-
-    description_session_ids = (
-        select(ChatSession.id)
+    message_scores = (
+        select(
+            ChatMessage.chat_session_id.label("chat_session_id"),
+            func.sum(func.ts_rank(message_tsv, ts_query)).label("score"),
+        )
+        .join(ChatSession, ChatMessage.chat_session_id == ChatSession.id)
         .where(*base_conditions)
-        .where(description_tsv.op("@@")(ts_query))
+        .where(message_tsv.op("@@")(ts_query))
+        .group_by(ChatMessage.chat_session_id)
+        .subquery("message_scores")
     )
 
-    message_session_ids = (
-        select(ChatMessage.chat_session_id)
-        .join(ChatSession, ChatMessage.chat_session_id == ChatSession.id)
+    description_score = func.coalesce(
+        func.ts_rank(description_tsv, ts_query), 0.0
+    ) * literal(_DESCRIPTION_MATCH_WEIGHT)
+    rank = func.round(
+        cast(
+            func.coalesce(message_scores.c.score, 0.0) + description_score,
+            Numeric,
+        ),
+        _RANK_DECIMAL_PLACES,
+    ).label("rank")
+
+    ranked = (
+        select(ChatSession.id.label("id"), rank)
+        .outerjoin(message_scores, message_scores.c.chat_session_id == ChatSession.id)
         .where(*base_conditions)
-        .where(message_tsv.op("@@")(ts_query))
+        .where(
+            or_(
+                description_tsv.op("@@")(ts_query),
+                message_scores.c.chat_session_id.is_not(None),
+            )
+        )
+        .subquery("ranked")
     )
 
-    combined_ids = description_session_ids.union(message_session_ids).alias(
-        "combined_ids"
+    stmt = select(ChatSession, ranked.c.rank).join(
+        ranked, ranked.c.id == ChatSession.id
     )
+    if cursor is not None:
+        stmt = stmt.where(
+            or_(
+                ranked.c.rank < cursor.rank,
+                and_(
+                    ranked.c.rank == cursor.rank,
+                    tuple_(ChatSession.time_created, ChatSession.id)
+                    < tuple_(literal(cursor.time_created), literal(cursor.id)),
+                ),
+            )
+        )
 
-    final_stmt = (
-        select(ChatSession)
-        .join(combined_ids, ChatSession.id == combined_ids.c.id)
-        .order_by(desc(ChatSession.time_created))
-        .distinct()
-        .offset(offset_val)
+    stmt = (
+        stmt.order_by(
+            desc(ranked.c.rank),
+            desc(ChatSession.time_created),
+            desc(ChatSession.id),
+        )
         .limit(page_size + 1)
         .options(joinedload(ChatSession.persona))
     )
 
-    session_objs = db_session.execute(final_stmt).scalars().all()
-
-    has_more = len(session_objs) > page_size
-    if has_more:
-        session_objs = session_objs[:page_size]
-
-    return list(session_objs), has_more
+    rows = [(row[0], row[1]) for row in db_session.execute(stmt).all()]
+    return _split_page(rows, page_size)
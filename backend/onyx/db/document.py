@@ -8,6 +8,7 @@ from datetime import timedelta
 from datetime import timezone
 
 from sqlalchemy import and_
+from sqlalchemy import ColumnElement
 from sqlalchemy import delete
 from sqlalchemy import exists
 from sqlalchemy import func
@@ -121,6 +122,83 @@ def construct_document_id_select_for_connector_credential_pair(
     return stmt
 
 
+def _vespa_document_id(document_id: ColumnElement[str]) -> ColumnElement[str]:
+    # same replacement as replace_invalid_doc_id_characters, compared byte-wise like
+    # Vespa compares strings. Must match the expression of the
+    # ix_document_vespa_document_id index for the index to be used.
+    return func.replace(document_id, "'", "_").collate("C")
+
+
+def construct_document_deletion_run_select_for_connector_credential_pair(
+    connector_id: int, credential_id: int
+) -> Select:
+    """Selects (document id, exclusive, run) for every document of the cc_pair, ordered
+    by the id the document has in Vespa. A document is exclusive if no other cc_pair
+    references it. Exclusive documents with the same run are contiguous in the ordering
+    of all documents, so they can be deleted from Vespa as a single id range."""
+    doc_refs = (
+        select(
+            DocumentByConnectorCredentialPair.id.label("id"),
+            func.bool_or(
+                and_(
+                    DocumentByConnectorCredentialPair.connector_id == connector_id,
+                    DocumentByConnectorCredentialPair.credential_id == credential_id,
+                )
+            ).label("owned"),
+            (func.count() == 1).label("single_ref"),
+        )
+        .group_by(DocumentByConnectorCredentialPair.id)
+        .subquery()
+    )
+
+    vespa_document_id = _vespa_document_id(DbDocument.id)
+    exclusive = func.coalesce(and_(doc_refs.c.owned, doc_refs.c.single_ref), False)
+    ordered_docs = (
+        select(
+            DbDocument.id.label("id"),
+            vespa_document_id.label("vespa_document_id"),
+            func.coalesce(doc_refs.c.owned, False).label("owned"),
+            exclusive.label("exclusive"),
+            # gaps and islands: constant within a run of consecutive exclusive docs
+            (
+                func.row_number().over(order_by=vespa_document_id)
+                - func.row_number().over(
+                    partition_by=exclusive, order_by=vespa_document_id
+                )
+            ).label("run"),
+        )
+        .select_from(DbDocument)
+        .outerjoin(doc_refs, doc_refs.c.id == DbDocument.id)
+        .subquery()
+    )
+
+    return (
+        select(ordered_docs.c.id, ordered_docs.c.exclusive, ordered_docs.c.run)
+        .where(ordered_docs.c.owned)
+        .order_by(ordered_docs.c.vespa_document_id)
+    )
+
+
+def get_document_ids_in_vespa_id_ranges(
+    db_session: Session, vespa_id_ranges: list[tuple[str, str]]
+) -> list[str]:
+    """Returns the ids of all documents whose Vespa document id is in one of the
+    inclusive ranges"""
+    if not vespa_id_ranges:
+        return []
+
+    vespa_document_id = _vespa_document_id(DbDocument.id)
+    stmt = select(DbDocument.id).where(
+        or_(
+            *(
+                vespa_document_id.between(first_id, last_id)
+                for first_id, last_id in vespa_id_ranges
+            )
+        )
+    )
+    return list(db_session.scalars(stmt).all())
+
+
 def construct_document_select_for_connector_credential_pair(
     connector_id: int, credential_id: int | None = None
 ) -> Select:
@@ -253,6 +331,42 @@ def get_document_connector_counts(
     return db_session.execute(stmt).all()  # type: ignore
 
 
+def fetch_cc_pair_ids_for_documents(
+    db_session: Session,
+    document_ids: list[str],
+    exclude_cc_pair: ConnectorCredentialPairIdentifier | None = None,
+) -> Sequence[tuple[str, list[int]]]:
+    """Gives back (document_id, cc_pair ids) tuples for the documents that are
+    referenced by at least one cc_pair. cc_pairs that are being deleted are left out,
+    same as for document sets and user groups, and so is `exclude_cc_pair`."""
+    stmt = (
+        select(
+            DocumentByConnectorCredentialPair.id,
+            func.array_agg(ConnectorCredentialPair.id),
+        )
+        .join(
+            ConnectorCredentialPair,
+            and_(
+                ConnectorCredentialPair.connector_id
+                == DocumentByConnectorCredentialPair.connector_id,
+                ConnectorCredentialPair.credential_id
+                == DocumentByConnectorCredentialPair.credential_id,
+            ),
+        )
+        .where(DocumentByConnectorCredentialPair.id.in_(document_ids))
+        .where(ConnectorCredentialPair.status != ConnectorCredentialPairStatus.DELETING)
+        .group_by(DocumentByConnectorCredentialPair.id)
+    )
+    if exclude_cc_pair:
+        stmt = stmt.where(
+            or_(
+                ConnectorCredentialPair.connector_id != exclude_cc_pair.connector_id,
+                ConnectorCredentialPair.credential_id != exclude_cc_pair.credential_id,
+            )
+        )
+    return db_session.execute(stmt).all()  # type: ignore
+
+
 def get_document_counts_for_cc_pairs(
     db_session: Session, cc_pairs: list[ConnectorCredentialPairIdentifier]
 ) -> Sequence[tuple[int, int, int]]:
@@ -1020,6 +1134,23 @@ def update_document_kg_info(
     db_session.execute(stmt)
 
 
+def update_documents_kg_info(
+    db_session: Session, document_ids: list[str], kg_stage: KGStage
+) -> None:
+    """Same as update_document_kg_info, for many documents in one statement."""
+    if not document_ids:
+        return
+    stmt = (
+        update(DbDocument)
+        .where(DbDocument.id.in_(document_ids))
+        .values(
+            kg_stage=kg_stage,
+            kg_processing_time=datetime.now(timezone.utc),
+        )
+    )
+    db_session.execute(stmt)
+
+
 def update_document_kg_stage(
     db_session: Session,
     document_id: str,
@@ -673,6 +673,35 @@ def fetch_document_sets_for_document(
     return result[0][1]
 
 
+def fetch_cc_pair_ids_for_document_sets(
+    db_session: Session,
+    document_set_names: list[str],
+) -> Sequence[tuple[str, list[int]]]:
+    """Gives back (document_set_name, cc_pair ids) tuples, using the same memberships
+    as fetch_document_sets_for_documents"""
+    stmt = (
+        select(
+            DocumentSetDBModel.name,
+            func.array_agg(ConnectorCredentialPair.id),
+        )
+        .join(
+            DocumentSet__ConnectorCredentialPair,
+            DocumentSet__ConnectorCredentialPair.document_set_id
+            == DocumentSetDBModel.id,
+        )
+        .join(
+            ConnectorCredentialPair,
+            ConnectorCredentialPair.id
+            == DocumentSet__ConnectorCredentialPair.connector_credential_pair_id,
+        )
+        .where(DocumentSetDBModel.name.in_(document_set_names))
+        .where(DocumentSet__ConnectorCredentialPair.is_current == True)  # noqa: E712
+        .where(ConnectorCredentialPair.status != ConnectorCredentialPairStatus.DELETING)
+        .group_by(DocumentSetDBModel.name)
+    )
+    return db_session.execute(stmt).all()  # type: ignore
+
+
 def fetch_document_sets_for_documents(
     document_ids: list[str],
     db_session: Session,
@@ -1,17 +1,14 @@
-import uuid
 from datetime import datetime
 from datetime import timezone
+from typing import Any
 from typing import List
 
 from sqlalchemy import func
-from sqlalchemy import literal
 from sqlalchemy import select
 from sqlalchemy import update
 from sqlalchemy.dialects.postgresql import insert as pg_insert
-from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Session
 
-import onyx.db.document as dbdocument
 from onyx.db.entity_type import UNGROUNDED_SOURCE_NAME
 from onyx.db.models import Document
 from onyx.db.models import KGEntity
@@ -101,136 +98,67 @@ def upsert_staging_entity(
     return result
 
 
-def transfer_entity(
-    db_session: Session,
-    entity: KGEntityExtractionStaging,
-) -> KGEntity:
-    """Transfer an entity from the extraction staging table to the normalized table.
+def get_entity_keys_for_type(
+    db_session: Session, entity_type_id_name: str
+) -> list[tuple[str, str, str | None]]:
+    """Get the (id_name, name, document_id) of every entity of an entity type."""
+    rows = db_session.execute(
+        select(KGEntity.id_name, KGEntity.name, KGEntity.document_id).where(
+            KGEntity.entity_type_id_name == entity_type_id_name
+        )
+    ).all()
+    return [(row.id_name, row.name, row.document_id) for row in rows]
 
-    Args:
-        db_session: SQLAlchemy session
-        entity: Entity to transfer
 
-    Returns:
-        KGEntity: The transferred entity
-    """
-    # Create the transferred entity
-    stmt = (
-        pg_insert(KGEntity)
-        .values(
-            id_name=make_entity_id(entity.entity_type_id_name, uuid.uuid4().hex[:20]),
-            name=entity.name.casefold(),
-            entity_key=entity.entity_key,
-            parent_key=entity.parent_key,
-            alternative_names=entity.alternative_names or [],
-            entity_type_id_name=entity.entity_type_id_name,
-            document_id=entity.document_id,
-            occurrences=entity.occurrences,
-            attributes=entity.attributes,
-            event_time=entity.event_time,
-        )
-        .on_conflict_do_update(
-            index_elements=["name", "entity_type_id_name", "document_id"],
-            set_=dict(
-                occurrences=KGEntity.occurrences + entity.occurrences,
-                attributes=KGEntity.attributes.op("||")(
-                    literal(entity.attributes, JSONB)
-                ),
-                entity_key=func.coalesce(KGEntity.entity_key, entity.entity_key),
-                parent_key=func.coalesce(KGEntity.parent_key, entity.parent_key),
-                event_time=entity.event_time,
-                time_updated=datetime.now(),
-            ),
-        )
-        .returning(KGEntity)
+def get_entities_by_id_names(
+    db_session: Session, id_names: list[str]
+) -> list[KGEntity]:
+    if not id_names:
+        return []
+    return list(
+        db_session.scalars(select(KGEntity).where(KGEntity.id_name.in_(id_names)))
     )
-    new_entity = db_session.execute(stmt).scalar()
-    if new_entity is None:
-        raise RuntimeError(f"Failed to transfer entity with id_name: {entity.id_name}")
 
-    # Update the document's kg_stage if document_id is provided
-    if entity.document_id is not None:
-        dbdocument.update_document_kg_info(
-            db_session,
-            document_id=entity.document_id,
-            kg_stage=KGStage.NORMALIZED,
-        )
 
-    # Update transferred
-    db_session.query(KGEntityExtractionStaging).filter(
-        KGEntityExtractionStaging.id_name == entity.id_name
-    ).update({"transferred_id_name": new_entity.id_name})
-    db_session.flush()
+def insert_entities(db_session: Session, entities: list[dict[str, Any]]) -> None:
+    """Insert new entities in a single statement. Each dict holds the columns of
+    one entity, and all of them must have the same keys.
+
+    The kg_entity trigger sets the stored name (and its trigrams) from the
+    document's semantic_id for entities with a document."""
+    if not entities:
+        return
+    db_session.execute(pg_insert(KGEntity), entities)
+
 
-    return new_entity
+def update_entities(db_session: Session, entities: list[dict[str, Any]]) -> None:
+    """Update existing entities by id_name in a single executemany. Each dict
+    holds id_name and the columns to set, and all of them must have the same
+    keys."""
+    if not entities:
+        return
+    db_session.execute(update(KGEntity), entities)
 
 
-def merge_entities(
-    db_session: Session, parent: KGEntity, child: KGEntityExtractionStaging
-) -> KGEntity:
-    """Merge an entity from the extraction staging table into
-    an existing entity in the normalized table.
+def mark_staging_entities_transferred(
+    db_session: Session, transferred_id_names: dict[str, str]
+) -> None:
+    """Point staging entities at the entity they were transferred or merged into.
 
     Args:
         db_session: SQLAlchemy session
-        parent: Parent entity to merge into
-        child: Child staging entity to merge
-
-    Returns:
-        KGEntity: The merged entity
+        transferred_id_names: staging entity id_name -> KGEntity id_name
     """
-    # check we're not merging two entities with different document_ids
-    if (
-        parent.document_id is not None
-        and child.document_id is not None
-        and parent.document_id != child.document_id
-    ):
-        raise ValueError(
-            "Overwriting the document_id of an entity with a document_id already is not allowed"
-        )
-
-    # update the parent entity (only document_id, alternative_names, occurrences)
-    setting_doc = parent.document_id is None and child.document_id is not None
-    document_id = child.document_id if setting_doc else parent.document_id
-    alternative_names = set(parent.alternative_names or [])
-    alternative_names.update(child.alternative_names or [])
-    alternative_names.add(child.name.lower())
-    alternative_names.discard(parent.name)
-
-    stmt = (
-        update(KGEntity)
-        .where(KGEntity.id_name == parent.id_name)
-        .values(
-            document_id=document_id,
-            alternative_names=list(alternative_names),
-            occurrences=parent.occurrences + child.occurrences,
-            attributes=parent.attributes | child.attributes,
-            entity_key=parent.entity_key or child.entity_key,
-            parent_key=parent.parent_key or child.parent_key,
-        )
-        .returning(KGEntity)
+    if not transferred_id_names:
+        return
+    db_session.execute(
+        update(KGEntityExtractionStaging),
+        [
+            {"id_name": staging_id_name, "transferred_id_name": id_name}
+            for staging_id_name, id_name in transferred_id_names.items()
+        ],
     )
 
-    result = db_session.execute(stmt).scalar()
-    if result is None:
-        raise RuntimeError(f"Failed to merge entities with id_name: {parent.id_name}")
-
-    # Update the document's kg_stage if document_id is set
-    if setting_doc and child.document_id is not None:
-        dbdocument.update_document_kg_info(
-            db_session,
-            document_id=child.document_id,
-            kg_stage=KGStage.NORMALIZED,
-        )
-
-    # Update transferred
-    db_session.query(KGEntityExtractionStaging).filter(
-        KGEntityExtractionStaging.id_name == child.id_name
-    ).update({"transferred_id_name": parent.id_name})
-    db_session.flush()
-
-    return result
-
 
 def get_kg_entity_by_document(db: Session, document_id: str) -> KGEntity | None:
     """
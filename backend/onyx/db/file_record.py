@@ -1,3 +1,5 @@
+from datetime import datetime
+
 from sqlalchemy import and_
 from sqlalchemy import select
 from sqlalchemy.orm import Session
@@ -54,6 +56,24 @@ def get_filerecord_by_prefix(
     )
 
 
+def get_file_ids_by_origin_created_before(
+    file_origin: FileOrigin,
+    created_before: datetime,
+    limit: int,
+    db_session: Session,
+) -> list[str]:
+    return list(
+        db_session.scalars(
+            select(FileRecord.file_id)
+            .where(
+                FileRecord.file_origin == file_origin,
+                FileRecord.created_at < created_before,
+            )
+            .limit(limit)
+        )
+    )
+
+
 def delete_filerecord_by_file_id(
     file_id: str,
     db_session: Session,
@@ -684,6 +684,12 @@ class Document(Base):
             last_modified,
             last_synced,
         ),
+        # Backs the lookups by Vespa document id range when deleting documents, see
+        # _vespa_document_id in onyx/db/document.py
+        Index(
+            "ix_document_vespa_document_id",
+            func.replace(id, "'", "_").collate("C"),
+        ),
     )
 
 
@@ -2122,6 +2128,16 @@ class ChatSession(Base):
     )
     persona: Mapped["Persona"] = relationship("Persona")
 
+    __table_args__ = (
+        # Backs keyset pagination of a user's chat history / search results
+        Index(
+            "ix_chat_session_user_time_created_id",
+            "user_id",
+            desc("time_created"),
+            desc("id"),
+        ),
+    )
+
 
 class ChatMessage(Base):
     """Note, the first message in a chain has no contents, it's a workaround to allow edits
@@ -2219,6 +2235,11 @@ class ChatMessage(Base):
         Enum(ResearchAnswerPurpose, native_enum=False), nullable=True
     )
 
+    __table_args__ = (
+        # Used for per-session message lookups (search ranking, history loading)
+        Index("ix_chat_message_chat_session_id_id", "chat_session_id", "id"),
+    )
+
 
 class AgentSubQuestion(Base):
     """
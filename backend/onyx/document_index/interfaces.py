@@ -20,6 +20,17 @@ class DocumentInsertionRecord:
     already_existed: bool
 
 
+@dataclass(frozen=True)
+class DocumentIdRange:
+    """
+    Inclusive range of document ids, compared byte-wise. A range with the same first
+    and last id matches that single document.
+    """
+
+    first_document_id: str
+    last_document_id: str
+
+
 @dataclass(frozen=True)
 class VespaChunkRequest:
     document_id: str
@@ -108,6 +119,7 @@ class VespaDocumentFields:
     boost: float | None = None
     hidden: bool | None = None
     aggregated_chunk_boost_factor: float | None = None
+    cc_pair_ids: list[int] | None = None
 
     # document_id is added for migration purposes, ideally we should not be updating this field
     # TODO(subash): remove this field in a future migration
@@ -259,6 +271,27 @@ class Deletable(abc.ABC):
         """
         raise NotImplementedError
 
+    @abc.abstractmethod
+    def delete_document_id_ranges(
+        self,
+        doc_id_ranges: list[DocumentIdRange],
+        *,
+        tenant_id: str,
+    ) -> int:
+        """
+        Hard delete every document of the tenant whose id falls in one of the ranges.
+        Used to delete many documents at once, e.g. all of the documents that only
+        belong to a connector being deleted. The caller must make sure the ranges only
+        contain documents that should be deleted.
+
+        Parameters:
+        - doc_id_ranges: inclusive ranges of document ids as specified by the connectors
+
+        Returns:
+            The number of chunks deleted
+        """
+        raise NotImplementedError
+
 
 class Updatable(abc.ABC):
     """
@@ -11,11 +11,12 @@ import httpx
 from retry import retry
 
 from onyx.configs.app_configs import LOG_VESPA_TIMING_INFORMATION
+from onyx.configs.app_configs import RESOLVE_DOC_SETS_AND_GROUPS_AT_QUERY_TIME
 from onyx.configs.app_configs import VESPA_LANGUAGE_OVERRIDE
 from onyx.context.search.models import IndexFilters
 from onyx.context.search.models import InferenceChunkUncleaned
 from onyx.document_index.interfaces import VespaChunkRequest
-from onyx.document_index.vespa.shared_utils.utils import get_vespa_http_client
+from onyx.document_index.vespa.shared_utils.utils import send_vespa_query_request
 from onyx.document_index.vespa.shared_utils.vespa_request_builders import (
     build_vespa_filters,
 )
@@ -25,6 +26,7 @@ from onyx.document_index.vespa.shared_utils.vespa_request_builders import (
 from onyx.document_index.vespa_constants import ACCESS_CONTROL_LIST
 from onyx.document_index.vespa_constants import BLURB
 from onyx.document_index.vespa_constants import BOOST
+from onyx.document_index.vespa_constants import CC_PAIR_IDS
 from onyx.document_index.vespa_constants import CHUNK_CONTEXT
 from onyx.document_index.vespa_constants import CHUNK_ID
 from onyx.document_index.vespa_constants import CONTENT
@@ -34,6 +36,7 @@ from onyx.document_index.vespa_constants import DOC_UPDATED_AT
 from onyx.document_index.vespa_constants import DOCUMENT_ID
 from onyx.document_index.vespa_constants import DOCUMENT_ID_ENDPOINT
 from onyx.document_index.vespa_constants import HIDDEN
+from onyx.document_index.vespa_constants import ID_BASED_RETRIEVAL_SUMMARY
 from onyx.document_index.vespa_constants import IMAGE_FILE_NAME
 from onyx.document_index.vespa_constants import LARGE_CHUNK_REFERENCE_IDS
 from onyx.document_index.vespa_constants import MAX_ID_SEARCH_QUERY_SIZE
@@ -51,6 +54,7 @@ from onyx.document_index.vespa_constants import SOURCE_TYPE
 from onyx.document_index.vespa_constants import TENANT_ID
 from onyx.document_index.vespa_constants import TITLE
 from onyx.document_index.vespa_constants import YQL_BASE
+from onyx.redis.redis_cc_pair_membership import resolve_user_groups_in_acl
 from onyx.utils.logger import setup_logger
 from onyx.utils.threadpool_concurrency import run_functions_tuples_in_parallel
 from shared_configs.configs import MULTI_TENANT
@@ -180,6 +184,18 @@ def get_chunks_via_visit_api(
     ):
         field_set_list.append(acl_fieldset_entry)
 
+    # with user groups resolved at query time, documents are also accessible through
+    # the cc_pairs of the user's groups
+    acl_entries = filters.access_control_list
+    acl_cc_pair_ids: set[int] = set()
+    if filters.access_control_list and RESOLVE_DOC_SETS_AND_GROUPS_AT_QUERY_TIME:
+        acl_entries, cc_pair_ids = resolve_user_groups_in_acl(
+            filters.access_control_list
+        )
+        acl_cc_pair_ids = set(cc_pair_ids)
+        if field_set_list and CC_PAIR_IDS not in field_set_list:
+            field_set_list.append(CC_PAIR_IDS)
+
     if MULTI_TENANT:
         tenant_id_fieldset_entry = f"{TENANT_ID}"
         if tenant_id_fieldset_entry not in field_set_list:
@@ -220,9 +236,9 @@ def get_chunks_via_visit_api(
     while True:
         try:
             filtered_params = {k: v for k, v in params.items() if v is not None}
-            with get_vespa_http_client() as http_client:
-                response = http_client.get(url, params=filtered_params)
-                response.raise_for_status()
+            response = send_vespa_query_request(
+                "GET", url, operation="visit", params=filtered_params
+            )
         except httpx.HTTPError as e:
             error_base = "Failed to query Vespa"
             logger.error(
@@ -240,11 +256,12 @@ def get_chunks_via_visit_api(
         if "documents" in response_data:
             for document in response_data["documents"]:
                 if filters.access_control_list:
-                    document_acl = document["fields"].get(ACCESS_CONTROL_LIST)
-                    if not document_acl or not any(
+                    document_acl = document["fields"].get(ACCESS_CONTROL_LIST) or {}
+                    document_cc_pair_ids = document["fields"].get(CC_PAIR_IDS) or []
+                    if not any(
                         user_acl_entry in document_acl
-                        for user_acl_entry in filters.access_control_list
-                    ):
+                        for user_acl_entry in acl_entries or []
+                    ) and not acl_cc_pair_ids.intersection(document_cc_pair_ids):
                         continue
 
                 if MULTI_TENANT:
@@ -343,9 +360,9 @@ def query_vespa(
         params["language"] = VESPA_LANGUAGE_OVERRIDE
 
     try:
-        with get_vespa_http_client() as http_client:
-            response = http_client.post(SEARCH_ENDPOINT, json=params)
-            response.raise_for_status()
+        response = send_vespa_query_request(
+            "POST", SEARCH_ENDPOINT, operation="search", json=params
+        )
     except httpx.HTTPError as e:
         error_base = "Failed to query Vespa"
         logger.error(
@@ -426,6 +443,7 @@ def _get_chunks_via_batch_search(
     params: dict[str, str | int | float] = {
         "yql": yql,
         "hits": MAX_ID_SEARCH_QUERY_SIZE,
+        "presentation.summary": ID_BASED_RETRIEVAL_SUMMARY,
     }
 
     inference_chunks = query_vespa(params)
@@ -1,11 +1,17 @@
-import concurrent.futures
 from uuid import UUID
 
 import httpx
 from retry import retry
 
+from onyx.configs.app_configs import DOCUMENT_INDEX_NAME
+from onyx.document_index.interfaces import DocumentIdRange
+from onyx.document_index.vespa_constants import DOCUMENT_ID
 from onyx.document_index.vespa_constants import DOCUMENT_ID_ENDPOINT
 from onyx.document_index.vespa_constants import NUM_THREADS
+from onyx.document_index.vespa_constants import TENANT_ID
+from onyx.utils.batching import batch_generator
+from onyx.utils.executor_service import ExecutorPool
+from onyx.utils.executor_service import get_executor_service
 from onyx.utils.logger import setup_logger
 
 logger = setup_logger()
@@ -13,6 +19,9 @@ logger = setup_logger()
 
 CONTENT_SUMMARY = "content_summary"
 
+# keeps the document selection of a single delete request reasonably short
+DOCUMENT_ID_RANGES_PER_SELECTION = 64
+
 
 @retry(tries=10, delay=1, backoff=2)
 def _retryable_http_delete(http_client: httpx.Client, url: str) -> None:
@@ -37,25 +46,97 @@ def delete_vespa_chunks(
     doc_chunk_ids: list[UUID],
     index_name: str,
     http_client: httpx.Client,
-    executor: concurrent.futures.ThreadPoolExecutor | None = None,
 ) -> None:
-    external_executor = True
+    futures = get_executor_service().run_all(
+        ExecutorPool.IO,
+        [
+            (_delete_vespa_chunk, (doc_chunk_id, index_name, http_client), {})
+            for doc_chunk_id in doc_chunk_ids
+        ],
+        max_concurrency=NUM_THREADS,
+        fail_fast=True,
+    )
+    for future in futures:
+        # Will raise exception if the deletion raised an exception
+        future.result()
 
-    if not executor:
-        external_executor = False
-        executor = concurrent.futures.ThreadPoolExecutor(max_workers=NUM_THREADS)
 
-    try:
-        chunk_deletion_future = {
-            executor.submit(
-                _delete_vespa_chunk, doc_chunk_id, index_name, http_client
-            ): doc_chunk_id
-            for doc_chunk_id in doc_chunk_ids
+def _selection_string(value: str) -> str:
+    escaped = value.replace("\\", "\\\\").replace('"', '\\"')
+    return f'"{escaped}"'
+
+
+def build_document_id_range_selection(
+    doc_id_ranges: list[DocumentIdRange],
+    index_name: str,
+    tenant_id: str | None,
+) -> str:
+    """Builds a Vespa document selection matching all chunks of the documents in the
+    ranges. The ids must already have had their invalid characters replaced."""
+    field = f"{index_name}.{DOCUMENT_ID}"
+    terms = [
+        (
+            f"{field} == {_selection_string(doc_id_range.first_document_id)}"
+            if doc_id_range.first_document_id == doc_id_range.last_document_id
+            else (
+                f"({field} >= {_selection_string(doc_id_range.first_document_id)}"
+                f" and {field} <= {_selection_string(doc_id_range.last_document_id)})"
+            )
+        )
+        for doc_id_range in doc_id_ranges
+    ]
+    selection = " or ".join(terms)
+    if tenant_id is None:
+        return selection
+    return (
+        f"{index_name}.{TENANT_ID} == {_selection_string(tenant_id)} and ({selection})"
+    )
+
+
+@retry(tries=10, delay=1, backoff=2)
+def _retryable_http_selection_delete(
+    http_client: httpx.Client, url: str, params: dict[str, str]
+) -> dict:
+    res = http_client.delete(url, params=params)
+    res.raise_for_status()
+    return res.json()
+
+
+def delete_vespa_document_id_ranges(
+    doc_id_ranges: list[DocumentIdRange],
+    index_name: str,
+    tenant_id: str | None,
+    http_client: httpx.Client,
+) -> int:
+    """Deletes all chunks of the documents in the ranges with selection based deletes,
+    one request per batch of ranges instead of one per chunk. Vespa visits the matching
+    documents and may ask to be called again with a continuation token.
+
+    Returns the number of chunks deleted."""
+    url = DOCUMENT_ID_ENDPOINT.format(index_name=index_name)
+    total_chunks_deleted = 0
+    for doc_id_ranges_batch in batch_generator(
+        doc_id_ranges, DOCUMENT_ID_RANGES_PER_SELECTION
+    ):
+        params = {
+            "selection": build_document_id_range_selection(
+                doc_id_ranges_batch, index_name, tenant_id
+            ),
+            "cluster": DOCUMENT_INDEX_NAME,
         }
-        for future in concurrent.futures.as_completed(chunk_deletion_future):
-            # Will raise exception if the deletion raised an exception
-            future.result()
+        while True:
+            try:
+                response = _retryable_http_selection_delete(http_client, url, params)
+            except httpx.HTTPStatusError as e:
+                logger.error(
+                    f"Failed to delete document id ranges, details: {e.response.text}"
+                )
+                raise
+
+            total_chunks_deleted += response.get("documentCount", 0)
+            continuation = response.get("continuation")
+            if not continuation:
+                break
+            params["continuation"] = continuation
 
-    finally:
-        if not external_executor:
-            executor.shutdown(wait=True)
+    return total_chunks_deleted
@@ -1,4 +1,3 @@
-import concurrent.futures
 import io
 import logging
 import os
@@ -32,6 +31,7 @@ from onyx.context.search.models import InferenceChunkUncleaned
 from onyx.db.enums import EmbeddingPrecision
 from onyx.document_index.document_index_utils import get_document_chunk_ids
 from onyx.document_index.document_index_utils import get_uuid_from_chunk_info
+from onyx.document_index.interfaces import DocumentIdRange
 from onyx.document_index.interfaces import DocumentIndex
 from onyx.document_index.interfaces import DocumentInsertionRecord
 from onyx.document_index.interfaces import EnrichedDocumentIndexingInfo
@@ -47,12 +47,14 @@ from onyx.document_index.vespa.chunk_retrieval import (
 )
 from onyx.document_index.vespa.chunk_retrieval import query_vespa
 from onyx.document_index.vespa.deletion import delete_vespa_chunks
+from onyx.document_index.vespa.deletion import delete_vespa_document_id_ranges
 from onyx.document_index.vespa.indexing_utils import BaseHTTPXClientContext
 from onyx.document_index.vespa.indexing_utils import batch_index_vespa_chunks
 from onyx.document_index.vespa.indexing_utils import check_for_final_chunk_existence
 from onyx.document_index.vespa.indexing_utils import clean_chunk_id_copy
 from onyx.document_index.vespa.indexing_utils import GlobalHTTPXClientContext
 from onyx.document_index.vespa.indexing_utils import TemporaryHTTPXClientContext
+from onyx.document_index.vespa.shared_utils.utils import encode_query_embedding
 from onyx.document_index.vespa.shared_utils.utils import get_vespa_http_client
 from onyx.document_index.vespa.shared_utils.utils import (
     replace_invalid_doc_id_characters,
@@ -61,13 +63,17 @@ from onyx.document_index.vespa.shared_utils.vespa_request_builders import (
     build_vespa_filters,
 )
 from onyx.document_index.vespa_constants import ACCESS_CONTROL_LIST
+from onyx.document_index.vespa_constants import ADMIN_SEARCH_SUMMARY
 from onyx.document_index.vespa_constants import BATCH_SIZE
 from onyx.document_index.vespa_constants import BOOST
+from onyx.document_index.vespa_constants import CC_PAIR_IDS
 from onyx.document_index.vespa_constants import CONTENT_SUMMARY
 from onyx.document_index.vespa_constants import DOCUMENT_ID
 from onyx.document_index.vespa_constants import DOCUMENT_ID_ENDPOINT
 from onyx.document_index.vespa_constants import DOCUMENT_SETS
 from onyx.document_index.vespa_constants import HIDDEN
+from onyx.document_index.vespa_constants import HYBRID_SEARCH_SUMMARY
+from onyx.document_index.vespa_constants import ID_BASED_RETRIEVAL_SUMMARY
 from onyx.document_index.vespa_constants import NUM_THREADS
 from onyx.document_index.vespa_constants import USER_PROJECT
 from onyx.document_index.vespa_constants import VESPA_APPLICATION_ENDPOINT
@@ -77,6 +83,8 @@ from onyx.indexing.models import DocMetadataAwareIndexChunk
 from onyx.key_value_store.factory import get_shared_kv_store
 from onyx.kg.utils.formatting_utils import split_relationship_id
 from onyx.utils.batching import batch_generator
+from onyx.utils.executor_service import ExecutorPool
+from onyx.utils.executor_service import get_executor_service
 from onyx.utils.logger import setup_logger
 from shared_configs.configs import MULTI_TENANT
 from shared_configs.model_server_models import Embedding
@@ -452,10 +460,7 @@ class VespaIndex(DocumentIndex):
 
         # NOTE: using `httpx` here since `requests` doesn't support HTTP2. This is beneficial for
         # indexing / updates / deletes since we have to make a large volume of requests.
-        with (
-            concurrent.futures.ThreadPoolExecutor(max_workers=NUM_THREADS) as executor,
-            self.httpx_client_context as http_client,
-        ):
+        with self.httpx_client_context as http_client:
             # We require the start and end index for each document in order to
             # know precisely which chunks to delete. This information exists for
             # documents that have `chunk_count` in the database, but not for
@@ -491,7 +496,6 @@ class VespaIndex(DocumentIndex):
                     doc_chunk_ids=doc_chunk_ids_batch,
                     index_name=self.index_name,
                     http_client=http_client,
-                    executor=executor,
                 )
 
             for chunk_batch in batch_generator(cleaned_chunks, BATCH_SIZE):
@@ -500,7 +504,6 @@ class VespaIndex(DocumentIndex):
                     index_name=self.index_name,
                     http_client=http_client,
                     multitenant=self.multitenant,
-                    executor=executor,
                 )
 
         all_cleaned_doc_ids = {chunk.source_document.id for chunk in cleaned_chunks}
@@ -520,7 +523,7 @@ class VespaIndex(DocumentIndex):
         httpx_client: httpx.Client,
         batch_size: int = BATCH_SIZE,
     ) -> None:
-        """Runs a batch of updates in parallel via the ThreadPoolExecutor."""
+        """Runs a batch of updates in parallel on the shared IO executor pool."""
 
         def _update_chunk(
             update: _VespaUpdateRequest, http_client: httpx.Client
@@ -537,25 +540,22 @@ class VespaIndex(DocumentIndex):
         # NOTE: using `httpx` here since `requests` doesn't support HTTP2. This is beneficient for
         # indexing / updates / deletes since we have to make a large volume of requests.
 
-        with (
-            concurrent.futures.ThreadPoolExecutor(max_workers=NUM_THREADS) as executor,
-            httpx_client as http_client,
-        ):
+        with httpx_client as http_client:
             for update_batch in batch_generator(updates, batch_size):
-                future_to_document_id = {
-                    executor.submit(
-                        _update_chunk,
-                        update,
-                        http_client,
-                    ): update.document_id
-                    for update in update_batch
-                }
-                for future in concurrent.futures.as_completed(future_to_document_id):
+                futures = get_executor_service().run_all(
+                    ExecutorPool.IO,
+                    [
+                        (_update_chunk, (update, http_client), {})
+                        for update in update_batch
+                    ],
+                    max_concurrency=NUM_THREADS,
+                )
+                for update, future in zip(update_batch, futures):
                     res = future.result()
                     try:
                         res.raise_for_status()
                     except requests.HTTPError as e:
-                        failure_msg = f"Failed to update document: {future_to_document_id[future]}"
+                        failure_msg = f"Failed to update document: {update.document_id}"
                         raise requests.HTTPError(failure_msg) from e
 
     @classmethod
@@ -565,7 +565,7 @@ class VespaIndex(DocumentIndex):
         httpx_client: httpx.Client,
         batch_size: int = BATCH_SIZE,
     ) -> None:
-        """Runs a batch of updates in parallel via the ThreadPoolExecutor."""
+        """Runs a batch of updates in parallel on the shared IO executor pool."""
 
         @retry(tries=3, delay=1, backoff=2, jitter=(0.0, 1.0))
         def _kg_update_chunk(
@@ -580,26 +580,25 @@ class VespaIndex(DocumentIndex):
         # NOTE: using `httpx` here since `requests` doesn't support HTTP2. This is beneficient for
         # indexing / updates / deletes since we have to make a large volume of requests.
 
-        with concurrent.futures.ThreadPoolExecutor(max_workers=NUM_THREADS) as executor:
-            for update_batch in batch_generator(updates, batch_size):
-                future_to_document_id = {
-                    executor.submit(
-                        _kg_update_chunk,
-                        update,
-                        httpx_client,
-                    ): update.document_id
+        for update_batch in batch_generator(updates, batch_size):
+            futures = get_executor_service().run_all(
+                ExecutorPool.IO,
+                [
+                    (_kg_update_chunk, (update, httpx_client), {})
                     for update in update_batch
-                }
-                for future in concurrent.futures.as_completed(future_to_document_id):
-                    res = future.result()
-                    try:
-                        res.raise_for_status()
-                    except requests.HTTPError as e:
-                        failure_msg = (
-                            f"Failed to update document {future_to_document_id[future]}\n"
-                            f"Response: {res.text}"
-                        )
-                        raise requests.HTTPError(failure_msg) from e
+                ],
+                max_concurrency=NUM_THREADS,
+            )
+            for update, future in zip(update_batch, futures):
+                res = future.result()
+                try:
+                    res.raise_for_status()
+                except requests.HTTPError as e:
+                    failure_msg = (
+                        f"Failed to update document {update.document_id}\n"
+                        f"Response: {res.text}"
+                    )
+                    raise requests.HTTPError(failure_msg) from e
 
     def update(self, update_requests: list[UpdateRequest], *, tenant_id: str) -> None:
         logger.debug(f"Updating {len(update_requests)} documents in Vespa")
@@ -765,6 +764,9 @@ class VespaIndex(DocumentIndex):
             if fields.hidden is not None:
                 update_dict["fields"][HIDDEN] = {"assign": fields.hidden}
 
+            if fields.cc_pair_ids is not None:
+                update_dict["fields"][CC_PAIR_IDS] = {"assign": fields.cc_pair_ids}
+
             # document_id update is added only for migration purposes, ideally we should not be updating this field
             if fields.document_id is not None:
                 update_dict["fields"][DOCUMENT_ID] = {"assign": fields.document_id}
@@ -866,10 +868,7 @@ class VespaIndex(DocumentIndex):
         if self.secondary_index_name:
             index_names.append(self.secondary_index_name)
 
-        with (
-            self.httpx_client_context as http_client,
-            concurrent.futures.ThreadPoolExecutor(max_workers=NUM_THREADS) as executor,
-        ):
+        with self.httpx_client_context as http_client:
             for (
                 index_name,
                 large_chunks_enabled,
@@ -895,11 +894,40 @@ class VespaIndex(DocumentIndex):
                         doc_chunk_ids=doc_chunk_ids_batch,
                         index_name=index_name,
                         http_client=http_client,
-                        executor=executor,
                     )
 
         return total_chunks_deleted
 
+    def delete_document_id_ranges(
+        self,
+        doc_id_ranges: list[DocumentIdRange],
+        *,
+        tenant_id: str,
+    ) -> int:
+        doc_id_ranges = [
+            DocumentIdRange(
+                first_document_id=replace_invalid_doc_id_characters(
+                    doc_id_range.first_document_id
+                ),
+                last_document_id=replace_invalid_doc_id_characters(
+                    doc_id_range.last_document_id
+                ),
+            )
+            for doc_id_range in doc_id_ranges
+        ]
+
+        total_chunks_deleted = 0
+        with self.httpx_client_context as http_client:
+            for index_name in self.index_to_large_chunks_enabled:
+                total_chunks_deleted += delete_vespa_document_id_ranges(
+                    doc_id_ranges=doc_id_ranges,
+                    index_name=index_name,
+                    tenant_id=tenant_id if self.multitenant else None,
+                    http_client=http_client,
+                )
+
+        return total_chunks_deleted
+
     def id_based_retrieval(
         self,
         chunk_requests: list[VespaChunkRequest],
@@ -973,7 +1001,7 @@ class VespaIndex(DocumentIndex):
         params: dict[str, str | int | float] = {
             "yql": yql,
             "query": final_query,
-            "input.query(query_embedding)": str(query_embedding),
+            "input.query(query_embedding)": encode_query_embedding(query_embedding),
             "input.query(decay_factor)": str(DOC_TIME_DECAY * time_decay_multiplier),
             "input.query(alpha)": hybrid_alpha,
             "input.query(title_content_ratio)": (
@@ -984,6 +1012,7 @@ class VespaIndex(DocumentIndex):
             "hits": num_to_retrieve,
             "offset": offset,
             "ranking.profile": ranking_profile,
+            "presentation.summary": HYBRID_SEARCH_SUMMARY,
             "timeout": VESPA_TIMEOUT,
         }
 
@@ -1013,6 +1042,7 @@ class VespaIndex(DocumentIndex):
             "hits": num_to_retrieve,
             "offset": 0,
             "ranking.profile": "admin_search",
+            "presentation.summary": ADMIN_SEARCH_SUMMARY,
             "timeout": VESPA_TIMEOUT,
         }
 
@@ -1193,30 +1223,27 @@ class VespaIndex(DocumentIndex):
 
         logger.debug(f"Starting batch deletion for {len(delete_requests)} documents")
 
-        with concurrent.futures.ThreadPoolExecutor(max_workers=NUM_THREADS) as executor:
-            with get_vespa_http_client() as http_client:
-                for batch_start in range(0, len(delete_requests), batch_size):
-                    batch = delete_requests[batch_start : batch_start + batch_size]
-
-                    future_to_document_id = {
-                        executor.submit(
-                            _delete_document,
-                            delete_request,
-                            http_client,
-                        ): delete_request.document_id
+        with get_vespa_http_client() as http_client:
+            for batch_start in range(0, len(delete_requests), batch_size):
+                batch = delete_requests[batch_start : batch_start + batch_size]
+
+                futures = get_executor_service().run_all(
+                    ExecutorPool.IO,
+                    [
+                        (_delete_document, (delete_request, http_client), {})
                         for delete_request in batch
-                    }
+                    ],
+                    max_concurrency=NUM_THREADS,
+                )
 
-                    for future in concurrent.futures.as_completed(
-                        future_to_document_id
-                    ):
-                        doc_id = future_to_document_id[future]
-                        try:
-                            future.result()
-                            logger.debug(f"Successfully deleted document: {doc_id}")
-                        except httpx.HTTPError as e:
-                            logger.error(f"Failed to delete document {doc_id}: {e}")
-                            # Optionally, implement retry logic or error handling here
+                for delete_request, future in zip(batch, futures):
+                    doc_id = delete_request.document_id
+                    try:
+                        future.result()
+                        logger.debug(f"Successfully deleted document: {doc_id}")
+                    except httpx.HTTPError as e:
+                        logger.error(f"Failed to delete document {doc_id}: {e}")
+                        # Optionally, implement retry logic or error handling here
 
         logger.info("Batch deletion completed")
 
@@ -1242,6 +1269,7 @@ class VespaIndex(DocumentIndex):
             "timeout": VESPA_TIMEOUT,
             "ranking.profile": "random_",
             "ranking.properties.random.seed": random_seed,
+            "presentation.summary": ID_BASED_RETRIEVAL_SUMMARY,
         }
 
         return query_vespa(params)
@@ -1,4 +1,3 @@
-import concurrent.futures
 import json
 import uuid
 from abc import ABC
@@ -25,6 +24,7 @@ from onyx.document_index.vespa_constants import ACCESS_CONTROL_LIST
 from onyx.document_index.vespa_constants import AGGREGATED_CHUNK_BOOST_FACTOR
 from onyx.document_index.vespa_constants import BLURB
 from onyx.document_index.vespa_constants import BOOST
+from onyx.document_index.vespa_constants import CC_PAIR_IDS
 from onyx.document_index.vespa_constants import CHUNK_CONTEXT
 from onyx.document_index.vespa_constants import CHUNK_ID
 from onyx.document_index.vespa_constants import CONTENT
@@ -53,6 +53,8 @@ from onyx.document_index.vespa_constants import TITLE
 from onyx.document_index.vespa_constants import TITLE_EMBEDDING
 from onyx.document_index.vespa_constants import USER_PROJECT
 from onyx.indexing.models import DocMetadataAwareIndexChunk
+from onyx.utils.executor_service import ExecutorPool
+from onyx.utils.executor_service import get_executor_service
 from onyx.utils.logger import setup_logger
 
 
@@ -93,34 +95,26 @@ def get_existing_documents_from_chunks(
     chunks: list[DocMetadataAwareIndexChunk],
     index_name: str,
     http_client: httpx.Client,
-    executor: concurrent.futures.ThreadPoolExecutor | None = None,
 ) -> set[str]:
-    external_executor = True
-
-    if not executor:
-        external_executor = False
-        executor = concurrent.futures.ThreadPoolExecutor(max_workers=NUM_THREADS)
-
-    document_ids: set[str] = set()
-    try:
-        chunk_existence_future = {
-            executor.submit(
+    futures = get_executor_service().run_all(
+        ExecutorPool.IO,
+        [
+            (
                 _does_doc_chunk_exist,
-                get_uuid_from_chunk(chunk),
-                index_name,
-                http_client,
-            ): chunk
+                (get_uuid_from_chunk(chunk), index_name, http_client),
+                {},
+            )
             for chunk in chunks
-        }
-        for future in concurrent.futures.as_completed(chunk_existence_future):
-            chunk = chunk_existence_future[future]
-            chunk_already_existed = future.result()
-            if chunk_already_existed:
-                document_ids.add(chunk.source_document.id)
+        ],
+        max_concurrency=NUM_THREADS,
+        fail_fast=True,
+    )
 
-    finally:
-        if not external_executor:
-            executor.shutdown(wait=True)
+    document_ids: set[str] = set()
+    for chunk, future in zip(chunks, futures):
+        chunk_already_existed = future.result()
+        if chunk_already_existed:
+            document_ids.add(chunk.source_document.id)
 
     return document_ids
 
@@ -208,6 +202,7 @@ def _index_vespa_chunk(
         # still called `image_file_name` in Vespa for backwards compatibility
         IMAGE_FILE_NAME: chunk.image_file_id,
         USER_PROJECT: chunk.user_project if chunk.user_project is not None else [],
+        CC_PAIR_IDS: chunk.cc_pair_ids,
         BOOST: chunk.boost,
         AGGREGATED_CHUNK_BOOST_FACTOR: chunk.aggregated_chunk_boost_factor,
     }
@@ -242,28 +237,19 @@ def batch_index_vespa_chunks(
     index_name: str,
     http_client: httpx.Client,
     multitenant: bool,
-    executor: concurrent.futures.ThreadPoolExecutor | None = None,
 ) -> None:
-    external_executor = True
-
-    if not executor:
-        external_executor = False
-        executor = concurrent.futures.ThreadPoolExecutor(max_workers=NUM_THREADS)
-
-    try:
-        chunk_index_future = {
-            executor.submit(
-                _index_vespa_chunk, chunk, index_name, http_client, multitenant
-            ): chunk
+    futures = get_executor_service().run_all(
+        ExecutorPool.IO,
+        [
+            (_index_vespa_chunk, (chunk, index_name, http_client, multitenant), {})
             for chunk in chunks
-        }
-        for future in concurrent.futures.as_completed(chunk_index_future):
-            # Will raise exception if any indexing raised an exception
-            future.result()
-
-    finally:
-        if not external_executor:
-            executor.shutdown(wait=True)
+        ],
+        max_concurrency=NUM_THREADS,
+        fail_fast=True,
+    )
+    for future in futures:
+        # Will raise exception if any indexing raised an exception
+        future.result()
 
 
 def clean_chunk_id_copy(
@@ -2,10 +2,12 @@ from datetime import datetime
 from datetime import timedelta
 from datetime import timezone
 
+from onyx.configs.app_configs import RESOLVE_DOC_SETS_AND_GROUPS_AT_QUERY_TIME
 from onyx.configs.constants import INDEX_SEPARATOR
 from onyx.context.search.models import IndexFilters
 from onyx.document_index.interfaces import VespaChunkRequest
 from onyx.document_index.vespa_constants import ACCESS_CONTROL_LIST
+from onyx.document_index.vespa_constants import CC_PAIR_IDS
 from onyx.document_index.vespa_constants import CHUNK_ID
 from onyx.document_index.vespa_constants import DOC_UPDATED_AT
 from onyx.document_index.vespa_constants import DOCUMENT_ID
@@ -16,6 +18,8 @@ from onyx.document_index.vespa_constants import SOURCE_TYPE
 from onyx.document_index.vespa_constants import TENANT_ID
 from onyx.document_index.vespa_constants import USER_PROJECT
 from onyx.kg.utils.formatting_utils import split_relationship_id
+from onyx.redis.redis_cc_pair_membership import get_cc_pair_ids_for_document_sets
+from onyx.redis.redis_cc_pair_membership import resolve_user_groups_in_acl
 from onyx.utils.logger import setup_logger
 from shared_configs.configs import MULTI_TENANT
 
@@ -61,6 +65,36 @@ def build_vespa_filters(
 
         return result
 
+    def _build_resolved_document_set_filter(
+        document_sets: list[str] | None,
+    ) -> str:
+        """Document sets resolved to the cc_pairs they contain, see
+        RESOLVE_DOC_SETS_AND_GROUPS_AT_QUERY_TIME"""
+        if not document_sets:
+            return ""
+
+        cc_pair_ids = get_cc_pair_ids_for_document_sets(document_sets)
+        if not cc_pair_ids:
+            # none of the document sets contain any documents
+            return "false and "
+        return _build_int_or_filters(CC_PAIR_IDS, cc_pair_ids)
+
+    def _build_resolved_acl_filter(access_control_list: list[str]) -> str:
+        """User groups are matched on the cc_pairs they have access to instead of on
+        the group entries of the document ACLs"""
+        if not any(access_control_list):
+            return ""
+
+        acl_entries, cc_pair_ids = resolve_user_groups_in_acl(access_control_list)
+        elems = [
+            f'{ACCESS_CONTROL_LIST} contains "{val}"' for val in acl_entries if val
+        ]
+        elems.extend(f"{CC_PAIR_IDS} = {cc_pair_id}" for cc_pair_id in cc_pair_ids)
+        if not elems:
+            # only user groups without any cc_pairs
+            return "false and "
+        return f"({' or '.join(elems)}) and "
+
     def _build_kg_filter(
         kg_entities: list[str] | None,
         kg_relationships: list[str] | None,
@@ -161,9 +195,12 @@ def build_vespa_filters(
 
     # ACL filters
     if filters.access_control_list is not None:
-        filter_str += _build_or_filters(
-            ACCESS_CONTROL_LIST, filters.access_control_list
-        )
+        if RESOLVE_DOC_SETS_AND_GROUPS_AT_QUERY_TIME:
+            filter_str += _build_resolved_acl_filter(filters.access_control_list)
+        else:
+            filter_str += _build_or_filters(
+                ACCESS_CONTROL_LIST, filters.access_control_list
+            )
 
     # Source type filters
     source_strs = (
@@ -181,7 +218,10 @@ def build_vespa_filters(
     filter_str += _build_or_filters(METADATA_LIST, tag_attributes)
 
     # Document sets
-    filter_str += _build_or_filters(DOCUMENT_SETS, filters.document_set)
+    if RESOLVE_DOC_SETS_AND_GROUPS_AT_QUERY_TIME:
+        filter_str += _build_resolved_document_set_filter(filters.document_set)
+    else:
+        filter_str += _build_or_filters(DOCUMENT_SETS, filters.document_set)
 
     # Convert UUIDs to strings for user_file_ids
     user_file_ids_str = (
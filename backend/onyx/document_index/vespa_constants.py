@@ -56,6 +56,7 @@ DOCUMENT_SETS = "document_sets"
 USER_FILE = "user_file"
 USER_FOLDER = "user_folder"
 USER_PROJECT = "user_project"
+CC_PAIR_IDS = "cc_pair_ids"
 LARGE_CHUNK_REFERENCE_IDS = "large_chunk_reference_ids"
 METADATA = "metadata"
 METADATA_LIST = "metadata_list"
@@ -75,6 +76,11 @@ IMAGE_FILE_NAME = "image_file_name"
 # Specific to Vespa, needed for highlighting matching keywords / section
 CONTENT_SUMMARY = "content_summary"
 
+# Document summary classes defined in danswer_chunk.sd.jinja, one per query path
+ID_BASED_RETRIEVAL_SUMMARY = "id_based_retrieval_summary"
+HYBRID_SEARCH_SUMMARY = "hybrid_search_summary"
+ADMIN_SEARCH_SUMMARY = "admin_search_summary"
+
 
 YQL_BASE = (
     f"select "
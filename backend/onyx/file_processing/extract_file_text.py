@@ -262,14 +262,31 @@ def pdf_to_text(file: IO[Any], pdf_pass: str | None = None) -> str:
     return text
 
 
+def get_pdf_page_count(file: IO[Any], pdf_pass: str | None = None) -> int:
+    """Returns the number of pages in a PDF, or 0 if it can't be read."""
+    from pypdf import PdfReader
+
+    try:
+        pdf_reader = PdfReader(file)
+        if pdf_reader.is_encrypted:
+            if pdf_pass is None or pdf_reader.decrypt(pdf_pass) == 0:
+                return 0
+        return len(pdf_reader.pages)
+    except Exception:
+        logger.exception("Failed to read PDF page count")
+        return 0
+
+
 def read_pdf_file(
     file: IO[Any],
     pdf_pass: str | None = None,
     extract_images: bool = False,
     image_callback: Callable[[bytes, str], None] | None = None,
+    page_range: tuple[int, int] | None = None,
 ) -> tuple[str, dict[str, Any], Sequence[tuple[bytes, str]]]:
     """
     Returns the text, basic PDF metadata, and optionally extracted images.
+    If `page_range` ([start, end)) is given, only those pages are read.
     """
     from pypdf import PdfReader
     from pypdf.errors import PdfStreamError
@@ -303,12 +320,13 @@ def read_pdf_file(
                 ):
                     metadata[clean_key] = ", ".join(value)
 
-        text = TEXT_SECTION_SEPARATOR.join(
-            page.extract_text() for page in pdf_reader.pages
-        )
+        first_page, last_page = page_range or (0, len(pdf_reader.pages))
+        pages = pdf_reader.pages[first_page:last_page]
+
+        text = TEXT_SECTION_SEPARATOR.join(page.extract_text() for page in pages)
 
         if extract_images:
-            for page_num, page in enumerate(pdf_reader.pages):
+            for page_num, page in enumerate(pages, start=first_page):
                 for image_file_object in page.images:
                     image = Image.open(io.BytesIO(image_file_object.data))
                     img_byte_arr = io.BytesIO()
@@ -638,16 +656,40 @@ def extract_text_and_images(
     return res
 
 
+def extract_text_and_images_locally(
+    file: IO[Any],
+    file_name: str,
+    pdf_pass: str | None = None,
+    content_type: str | None = None,
+    extract_pdf_images: bool = False,
+) -> ExtractionResult:
+    """Like `extract_text_and_images`, but only with the built-in parsers (never
+    Unstructured) and with the PDF image extraction setting passed in, so it can
+    run in a process without database access. Embedded images are returned in the
+    result."""
+    return _extract_text_and_images(
+        file,
+        file_name,
+        pdf_pass=pdf_pass,
+        content_type=content_type,
+        extract_pdf_images=extract_pdf_images,
+        allow_unstructured=False,
+    )
+
+
 def _extract_text_and_images(
     file: IO[Any],
     file_name: str,
     pdf_pass: str | None = None,
     content_type: str | None = None,
     image_callback: Callable[[bytes, str], None] | None = None,
+    # if None, resolved from the workspace settings
+    extract_pdf_images: bool | None = None,
+    allow_unstructured: bool = True,
 ) -> ExtractionResult:
     file.seek(0)
 
-    if get_unstructured_api_key():
+    if allow_unstructured and get_unstructured_api_key():
         try:
             text_content = unstructured_to_text(file, file_name)
             return ExtractionResult(
@@ -684,7 +726,11 @@ def _extract_text_and_images(
             text_content, pdf_metadata, images = read_pdf_file(
                 file,
                 pdf_pass,
-                extract_images=get_image_extraction_and_analysis_enabled(),
+                extract_images=(
+                    get_image_extraction_and_analysis_enabled()
+                    if extract_pdf_images is None
+                    else extract_pdf_images
+                ),
                 image_callback=image_callback,
             )
             return ExtractionResult(
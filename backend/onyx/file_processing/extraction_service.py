@@ -0,0 +1,576 @@
+"""
+Sandboxed text extraction.
+
+Parsing untrusted files (PDFs in particular) can pin a core for minutes or use
+an unbounded amount of memory. `FileExtractionService` runs extraction in a pool
+of worker processes, each with an address space limit and a per-job CPU time
+limit, so a single pathological file can't take down the caller. Large PDFs are
+split into page ranges that are parsed in parallel, and results are cached in
+the file store keyed by a hash of the file content so unchanged files aren't
+re-parsed on every re-index.
+
+Files are spooled to a temporary file once and workers open it by path, so the
+content is never copied into every job. Connectors can `submit` jobs and keep
+fetching while they run.
+"""
+
+import hashlib
+import json
+import math
+import multiprocessing as mp
+import os
+import resource
+import signal
+import tempfile
+import threading
+from collections.abc import Callable
+from collections.abc import Iterator
+from concurrent.futures import Future
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager
+from datetime import datetime
+from datetime import timedelta
+from datetime import timezone
+from io import BytesIO
+from types import FrameType
+from typing import Any
+from typing import IO
+from typing import TypeVar
+
+from sqlalchemy.orm import Session
+
+from onyx.configs.app_configs import FILE_EXTRACTION_CACHE_ENABLED
+from onyx.configs.app_configs import FILE_EXTRACTION_CACHE_TTL_DAYS
+from onyx.configs.app_configs import FILE_EXTRACTION_CPU_TIME_LIMIT_SECONDS
+from onyx.configs.app_configs import FILE_EXTRACTION_MAX_JOBS_PER_WORKER
+from onyx.configs.app_configs import FILE_EXTRACTION_MAX_WORKERS
+from onyx.configs.app_configs import FILE_EXTRACTION_MEMORY_LIMIT_MB
+from onyx.configs.app_configs import FILE_EXTRACTION_PDF_PAGES_PER_JOB
+from onyx.configs.constants import FileOrigin
+from onyx.configs.llm_configs import get_image_extraction_and_analysis_enabled
+from onyx.db.file_record import get_file_ids_by_origin_created_before
+from onyx.file_processing.extract_file_text import extract_text_and_images
+from onyx.file_processing.extract_file_text import extract_text_and_images_locally
+from onyx.file_processing.extract_file_text import ExtractionResult
+from onyx.file_processing.extract_file_text import get_file_ext
+from onyx.file_processing.extract_file_text import get_pdf_page_count
+from onyx.file_processing.extract_file_text import read_pdf_file
+from onyx.file_processing.extract_file_text import TEXT_SECTION_SEPARATOR
+from onyx.file_processing.unstructured import get_unstructured_api_key
+from onyx.file_store.file_store import get_default_file_store
+from onyx.utils.executor_service import ExecutorPool
+from onyx.utils.executor_service import get_executor_service
+from onyx.utils.logger import setup_logger
+
+logger = setup_logger()
+
+R = TypeVar("R")
+
+# bump when extraction output changes so stale cache entries are ignored
+_CACHE_VERSION = 1
+_CACHE_FILE_TYPE = "application/json"
+_SPOOL_CHUNK_SIZE = 1024 * 1024
+# expired cache entries are looked up and deleted this many at a time
+_CACHE_CLEANUP_BATCH_SIZE = 1000
+# PDFs smaller than this are always parsed in a single job
+_PAGE_PARALLEL_MIN_PDF_BYTES = 1024 * 1024
+# How long (wall clock, relative to the CPU time limit) the parent waits for a
+# running job before assuming the worker is stuck (e.g. in native code that
+# never returns to the interpreter) and replacing the pool
+_WALL_TIME_LIMIT_FACTOR = 2
+# on top of the above, to account for starting the worker process
+_WALL_TIME_LIMIT_GRACE_SECONDS = 30
+
+# set in worker processes. Limits are only ever applied there, never to a process
+# that falls back to extracting inline
+_is_extraction_worker = False
+
+
+class ExtractionLimitExceededError(Exception):
+    """Raised in a worker process when a job exceeds its CPU time limit."""
+
+
+# ---------------------------------------------------------------------------
+# Worker process side
+# ---------------------------------------------------------------------------
+
+
+def _raise_cpu_limit_exceeded(signum: int, frame: FrameType | None) -> None:
+    raise ExtractionLimitExceededError("Extraction exceeded its CPU time limit")
+
+
+def _init_worker(memory_limit_mb: int) -> None:
+    global _is_extraction_worker
+    _is_extraction_worker = True
+
+    if memory_limit_mb > 0:
+        try:
+            _, hard = resource.getrlimit(resource.RLIMIT_AS)
+            limit = memory_limit_mb * 1024 * 1024
+            if hard != resource.RLIM_INFINITY:
+                limit = min(limit, hard)
+            resource.setrlimit(resource.RLIMIT_AS, (limit, hard))
+        except (ValueError, OSError) as e:
+            logger.warning(f"Unable to set extraction worker memory limit: {e}")
+
+    # the soft CPU limit sends SIGXCPU, which is turned into an exception so the
+    # job fails without killing the worker
+    signal.signal(signal.SIGXCPU, _raise_cpu_limit_exceeded)
+
+
+@contextmanager
+def _cpu_time_limit(seconds: int) -> Iterator[None]:
+    if not _is_extraction_worker:
+        yield
+        return
+
+    # RLIMIT_CPU is the total for the process, so the limit for this job is
+    # relative to what previous jobs in this worker already used
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    used = usage.ru_utime + usage.ru_stime
+    _, hard = resource.getrlimit(resource.RLIMIT_CPU)
+    soft = math.ceil(used) + seconds
+    if hard != resource.RLIM_INFINITY:
+        soft = min(soft, hard)
+
+    resource.setrlimit(resource.RLIMIT_CPU, (soft, hard))
+    try:
+        yield
+    finally:
+        resource.setrlimit(resource.RLIMIT_CPU, (hard, hard))
+
+
+def _extract_in_worker(
+    file_path: str,
+    file_name: str,
+    pdf_pass: str | None,
+    content_type: str | None,
+    extract_pdf_images: bool,
+    cpu_time_limit: int,
+) -> ExtractionResult:
+    with _cpu_time_limit(cpu_time_limit), open(file_path, "rb") as file:
+        return extract_text_and_images_locally(
+            file,
+            file_name,
+            pdf_pass=pdf_pass,
+            content_type=content_type,
+            extract_pdf_images=extract_pdf_images,
+        )
+
+
+def _pdf_page_count_in_worker(
+    file_path: str, pdf_pass: str | None, cpu_time_limit: int
+) -> int:
+    with _cpu_time_limit(cpu_time_limit), open(file_path, "rb") as file:
+        return get_pdf_page_count(file, pdf_pass)
+
+
+def _extract_pdf_pages_in_worker(
+    file_path: str,
+    pdf_pass: str | None,
+    page_range: tuple[int, int],
+    extract_images: bool,
+    cpu_time_limit: int,
+) -> ExtractionResult:
+    with _cpu_time_limit(cpu_time_limit), open(file_path, "rb") as file:
+        text, metadata, images = read_pdf_file(
+            file,
+            pdf_pass,
+            extract_images=extract_images,
+            page_range=page_range,
+        )
+    return ExtractionResult(
+        text_content=text, embedded_images=images, metadata=metadata
+    )
+
+
+# ---------------------------------------------------------------------------
+# Parent process side
+# ---------------------------------------------------------------------------
+
+
+@contextmanager
+def _spooled_to_disk(file: IO[Any] | bytes) -> Iterator[tuple[str, str]]:
+    """Copies the file to a temporary file in chunks, yielding its path and the
+    sha256 of the content. The temporary file is deleted afterwards."""
+    fd, file_path = tempfile.mkstemp(prefix="onyx_extraction_")
+    try:
+        hasher = hashlib.sha256()
+        with os.fdopen(fd, "wb") as spool:
+            if isinstance(file, bytes):
+                hasher.update(file)
+                spool.write(file)
+            else:
+                file.seek(0)
+                while chunk := file.read(_SPOOL_CHUNK_SIZE):
+                    hasher.update(chunk)
+                    spool.write(chunk)
+        yield file_path, hasher.hexdigest()
+    finally:
+        os.remove(file_path)
+
+
+def _cache_file_id(
+    content_hash: str,
+    file_name: str,
+    pdf_pass: str | None,
+    content_type: str | None,
+    extract_pdf_images: bool,
+) -> str:
+    hasher = hashlib.sha256(content_hash.encode())
+    # anything that changes the extraction output is part of the key
+    hasher.update(
+        json.dumps(
+            [
+                _CACHE_VERSION,
+                get_file_ext(file_name),
+                content_type,
+                hashlib.sha256(pdf_pass.encode()).hexdigest() if pdf_pass else None,
+                extract_pdf_images,
+            ]
+        ).encode()
+    )
+    return f"extraction_cache_{hasher.hexdigest()}"
+
+
+def _load_cached_result(file_id: str) -> ExtractionResult | None:
+    try:
+        cached = json.loads(get_default_file_store().read_file(file_id).read())
+    except Exception:
+        # not cached (or the file store isn't reachable from here)
+        return None
+
+    return ExtractionResult(
+        text_content=cached["text_content"],
+        embedded_images=[],
+        metadata=cached["metadata"],
+    )
+
+
+def _store_cached_result(
+    file_id: str, file_name: str, result: ExtractionResult
+) -> None:
+    # images are streamed out / stored separately by the callers, so only results
+    # without them are cached. Failed extractions (empty text) aren't cached either.
+    if result.embedded_images or not result.text_content:
+        return
+
+    try:
+        get_default_file_store().save_file(
+            content=BytesIO(
+                json.dumps(
+                    {
+                        "text_content": result.text_content,
+                        "metadata": result.metadata,
+                    },
+                    default=str,
+                ).encode()
+            ),
+            display_name=f"Extracted text for {file_name}",
+            file_origin=FileOrigin.EXTRACTION_CACHE,
+            file_type=_CACHE_FILE_TYPE,
+            file_id=file_id,
+        )
+    except Exception as e:
+        logger.warning(f"Failed to cache extraction result for {file_name}: {e}")
+
+
+def delete_expired_extraction_cache_entries(
+    db_session: Session, ttl_days: int = FILE_EXTRACTION_CACHE_TTL_DAYS
+) -> int:
+    """Deletes the cached extraction results that were written more than ttl_days
+    ago. Returns the number of deleted entries."""
+    cutoff = datetime.now(timezone.utc) - timedelta(days=ttl_days)
+    file_store = get_default_file_store()
+
+    num_deleted = 0
+    while True:
+        file_ids = get_file_ids_by_origin_created_before(
+            file_origin=FileOrigin.EXTRACTION_CACHE,
+            created_before=cutoff,
+            limit=_CACHE_CLEANUP_BATCH_SIZE,
+            db_session=db_session,
+        )
+        for file_id in file_ids:
+            file_store.delete_file(file_id)
+        num_deleted += len(file_ids)
+
+        if len(file_ids) < _CACHE_CLEANUP_BATCH_SIZE:
+            return num_deleted
+
+
+class FileExtractionService:
+    def __init__(
+        self,
+        max_workers: int = FILE_EXTRACTION_MAX_WORKERS,
+        cpu_time_limit: int = FILE_EXTRACTION_CPU_TIME_LIMIT_SECONDS,
+        memory_limit_mb: int = FILE_EXTRACTION_MEMORY_LIMIT_MB,
+        max_jobs_per_worker: int = FILE_EXTRACTION_MAX_JOBS_PER_WORKER,
+        pdf_pages_per_job: int = FILE_EXTRACTION_PDF_PAGES_PER_JOB,
+        cache_enabled: bool = FILE_EXTRACTION_CACHE_ENABLED,
+    ) -> None:
+        self.max_workers = max_workers
+        self.cpu_time_limit = cpu_time_limit
+        self.memory_limit_mb = memory_limit_mb
+        self.max_jobs_per_worker = max_jobs_per_worker
+        self.pdf_pages_per_job = pdf_pages_per_job
+        self.cache_enabled = cache_enabled
+
+        self._pool: ProcessPoolExecutor | None = None
+        # set if worker processes can't be started here (e.g. in a daemonic process)
+        self._pool_unavailable = max_workers <= 0
+        self._lock = threading.Lock()
+        # at most one job per worker is handed to the pool, so jobs never wait in
+        # the pool's queue and the wall time limit only covers running them
+        self._worker_slots = threading.BoundedSemaphore(max(max_workers, 1))
+
+    def submit(
+        self,
+        file: IO[Any] | bytes,
+        file_name: str,
+        pdf_pass: str | None = None,
+        content_type: str | None = None,
+    ) -> Future[ExtractionResult]:
+        """Starts extracting the file in the background. A file object is only read
+        once the job starts, so it must stay open until the returned future is done.
+        """
+        return get_executor_service().submit(
+            ExecutorPool.IO, self.extract, file, file_name, pdf_pass, content_type
+        )
+
+    def extract(
+        self,
+        file: IO[Any] | bytes,
+        file_name: str,
+        pdf_pass: str | None = None,
+        content_type: str | None = None,
+    ) -> ExtractionResult:
+        """Blocking version of `submit`. Never raises for bad files; like
+        `extract_text_and_images`, failures result in empty text."""
+        if get_unstructured_api_key():
+            # extraction happens on the Unstructured side, nothing to sandbox
+            return extract_text_and_images(
+                BytesIO(file) if isinstance(file, bytes) else file,
+                file_name,
+                pdf_pass,
+                content_type,
+            )
+
+        with _spooled_to_disk(file) as (file_path, content_hash):
+            return self._extract_cached(
+                file_path, content_hash, file_name, pdf_pass, content_type
+            )
+
+    def _extract_cached(
+        self,
+        file_path: str,
+        content_hash: str,
+        file_name: str,
+        pdf_pass: str | None,
+        content_type: str | None,
+    ) -> ExtractionResult:
+        extract_pdf_images = get_image_extraction_and_analysis_enabled()
+
+        cache_file_id: str | None = None
+        if self.cache_enabled:
+            cache_file_id = _cache_file_id(
+                content_hash, file_name, pdf_pass, content_type, extract_pdf_images
+            )
+            cached = _load_cached_result(cache_file_id)
+            if cached is not None:
+                logger.debug(f"Using cached extraction result for {file_name}")
+                return cached
+
+        try:
+            result = self._extract(
+                file_path, file_name, pdf_pass, content_type, extract_pdf_images
+            )
+        except Exception as e:
+            logger.exception(f"Failed to extract text/images from {file_name}: {e}")
+            return ExtractionResult(text_content="", embedded_images=[], metadata={})
+
+        if cache_file_id is not None:
+            _store_cached_result(cache_file_id, file_name, result)
+        return result
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=False, cancel_futures=True)
+                self._pool = None
+
+    def _extract(
+        self,
+        file_path: str,
+        file_name: str,
+        pdf_pass: str | None,
+        content_type: str | None,
+        extract_pdf_images: bool,
+    ) -> ExtractionResult:
+        if (
+            get_file_ext(file_name) == ".pdf"
+            and os.path.getsize(file_path) >= _PAGE_PARALLEL_MIN_PDF_BYTES
+        ):
+            num_pages = self._run(
+                _pdf_page_count_in_worker, file_path, pdf_pass, self.cpu_time_limit
+            )
+            if num_pages > self.pdf_pages_per_job:
+                return self._extract_pdf_page_parallel(
+                    file_path, pdf_pass, num_pages, extract_pdf_images
+                )
+
+        return self._run(
+            _extract_in_worker,
+            file_path,
+            file_name,
+            pdf_pass,
+            content_type,
+            extract_pdf_images,
+            self.cpu_time_limit,
+        )
+
+    def _extract_pdf_page_parallel(
+        self,
+        file_path: str,
+        pdf_pass: str | None,
+        num_pages: int,
+        extract_images: bool,
+    ) -> ExtractionResult:
+        page_ranges = [
+            (start, min(start + self.pdf_pages_per_job, num_pages))
+            for start in range(0, num_pages, self.pdf_pages_per_job)
+        ]
+        # workers are the bottleneck, so there's no point in running more page
+        # ranges at once than there are workers
+        futures = get_executor_service().run_all(
+            ExecutorPool.IO,
+            [
+                (
+                    self._run,
+                    (
+                        _extract_pdf_pages_in_worker,
+                        file_path,
+                        pdf_pass,
+                        page_range,
+                        extract_images,
+                        self.cpu_time_limit,
+                    ),
+                    {},
+                )
+                for page_range in page_ranges
+            ],
+            max_concurrency=max(self.max_workers, 1),
+            fail_fast=True,
+        )
+        results = [future.result() for future in futures]
+
+        return ExtractionResult(
+            text_content=TEXT_SECTION_SEPARATOR.join(
+                result.text_content for result in results
+            ),
+            embedded_images=[
+                image for result in results for image in result.embedded_images
+            ],
+            metadata=results[0].metadata,
+        )
+
+    def _run(self, func: Callable[..., R], *args: Any) -> R:
+        """Runs `func` in a worker process, or inline if there are none."""
+        for attempt in range(2):
+            pool = self._get_pool()
+            if pool is None:
+                return func(*args)
+
+            with self._worker_slots:
+                try:
+                    future = pool.submit(func, *args)
+                except (AssertionError, OSError) as e:
+                    # e.g. "daemonic processes are not allowed to have children"
+                    logger.warning(
+                        "Unable to start extraction worker processes, extracting "
+                        f"inline: {e}"
+                    )
+                    self._pool_unavailable = True
+                    self._reset_pool(pool)
+                    continue
+
+                try:
+                    return future.result(
+                        timeout=self.cpu_time_limit * _WALL_TIME_LIMIT_FACTOR
+                        + _WALL_TIME_LIMIT_GRACE_SECONDS
+                    )
+                except FutureTimeoutError:
+                    logger.error(
+                        "Extraction worker did not finish in time, replacing worker "
+                        "pool"
+                    )
+                    self._reset_pool(pool, kill=True)
+                    raise ExtractionLimitExceededError(
+                        "Extraction exceeded its wall time limit"
+                    )
+                except BrokenProcessPool:
+                    # a worker died (e.g. killed for using too much memory). This
+                    # may have been caused by another job sharing the pool, so
+                    # retry once.
+                    logger.warning("Extraction worker pool broke, replacing it")
+                    self._reset_pool(pool)
+                    if attempt == 1:
+                        raise
+
+        # the pool couldn't be started
+        return func(*args)
+
+    def _get_pool(self) -> ProcessPoolExecutor | None:
+        if self._pool_unavailable:
+            return None
+        if self._pool is not None:
+            return self._pool
+
+        with self._lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=mp.get_context("spawn"),
+                    initializer=_init_worker,
+                    initargs=(self.memory_limit_mb,),
+                    max_tasks_per_child=self.max_jobs_per_worker,
+                )
+            return self._pool
+
+    def _reset_pool(self, pool: ProcessPoolExecutor, kill: bool = False) -> None:
+        with self._lock:
+            # another job may have already replaced it
+            if self._pool is pool:
+                self._pool = None
+
+        if kill:
+            # no public API for this before python 3.14
+            for process in list(getattr(pool, "_processes", {}).values()):
+                process.kill()
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+_service: FileExtractionService | None = None
+_service_lock = threading.Lock()
+
+
+def get_file_extraction_service() -> FileExtractionService:
+    global _service
+
+    if _service is None:
+        with _service_lock:
+            if _service is None:
+                _service = FileExtractionService()
+    return _service
+
+
+def _reset_after_fork() -> None:
+    # worker processes belong to the parent
+    global _service, _service_lock
+    _service = None
+    _service_lock = threading.Lock()
+
+
+os.register_at_fork(after_in_child=_reset_after_fork)
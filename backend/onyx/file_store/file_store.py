@@ -1,8 +1,11 @@
+import base64
 import hashlib
+import shutil
 import tempfile
 import uuid
 from abc import ABC
 from abc import abstractmethod
+from collections.abc import Iterator
 from io import BytesIO
 from typing import Any
 from typing import cast
@@ -15,6 +18,8 @@ import puremagic
 from botocore.config import Config
 from botocore.exceptions import ClientError
 from mypy_boto3_s3 import S3Client
+from mypy_boto3_s3.type_defs import CompletedPartTypeDef
+from mypy_boto3_s3.type_defs import GetObjectOutputTypeDef
 from sqlalchemy.orm import Session
 
 from onyx.configs.app_configs import AWS_REGION_NAME
@@ -24,6 +29,7 @@ from onyx.configs.app_configs import S3_ENDPOINT_URL
 from onyx.configs.app_configs import S3_FILE_STORE_BUCKET_NAME
 from onyx.configs.app_configs import S3_FILE_STORE_PREFIX
 from onyx.configs.app_configs import S3_GENERATE_LOCAL_CHECKSUM
+from onyx.configs.app_configs import S3_MULTIPART_CHUNK_SIZE
 from onyx.configs.app_configs import S3_VERIFY_SSL
 from onyx.configs.constants import FileOrigin
 from onyx.db.engine.sql_engine import get_session_with_current_tenant
@@ -43,10 +49,25 @@ from shared_configs.contextvars import get_current_tenant_id
 logger = setup_logger()
 
 
+# size of the chunks yielded when streaming a file out of the store
+_STREAM_CHUNK_SIZE = 1024 * 1024
+
+
 class S3PutKwargs(TypedDict):
     ChecksumSHA256: NotRequired[str]
 
 
+def _read_chunk(content: IO, size: int) -> bytes:
+    chunk = content.read(size)
+    # text streams are stored utf-8 encoded
+    return chunk.encode() if isinstance(chunk, str) else chunk
+
+
+def _sha256_checksum(data: bytes) -> str:
+    # S3 expects the base64 encoded digest, not the hex one
+    return base64.b64encode(hashlib.sha256(data).digest()).decode()
+
+
 class FileStore(ABC):
     """
     An abstraction for storing files and large binary objects.
@@ -120,6 +141,38 @@ class FileStore(ABC):
             Contents of the file and metadata dict
         """
 
+    @abstractmethod
+    def read_file_range(
+        self, file_id: str, start: int, end: int | None = None
+    ) -> bytes:
+        """
+        Read only part of a file, e.g. a prefix to sniff its type
+
+        Parameters:
+        - file_id: Unique ID of file to read
+        - start: Offset of the first byte to read
+        - end: Offset of the last byte to read (inclusive), or None to read to the end
+
+        Returns:
+            The bytes in the range
+        """
+
+    @abstractmethod
+    def open_stream(
+        self, file_id: str, chunk_size: int = _STREAM_CHUNK_SIZE
+    ) -> Iterator[bytes]:
+        """
+        Stream the content of a file without loading it into memory, e.g. to send
+        it to a client. Raises right away if the file cannot be read.
+
+        Parameters:
+        - file_id: Unique ID of file to read
+        - chunk_size: Maximum size of the yielded chunks
+
+        Returns:
+            An iterator over the chunks of the file
+        """
+
     @abstractmethod
     def read_file_record(self, file_id: str) -> FileStoreModel:
         """
@@ -328,32 +381,36 @@ class S3BackedFileStore(FileStore):
         bucket_name = self._get_bucket_name()
         s3_key = self._get_s3_key(file_id)
 
-        hash256 = ""
-        sha256_hash = hashlib.sha256()
-        kwargs: S3PutKwargs = {}
+        if isinstance(content, (bytes, str)):
+            content = BytesIO(content.encode() if isinstance(content, str) else content)
 
-        # Read content from IO object
-        if hasattr(content, "read"):
-            file_content = content.read()
+        # Files of up to one part are uploaded with a single put, anything larger is
+        # streamed part by part so that the whole file is never held in memory
+        first_chunk = _read_chunk(content, S3_MULTIPART_CHUNK_SIZE)
+        if len(first_chunk) < S3_MULTIPART_CHUNK_SIZE:
+            kwargs: S3PutKwargs = {}
             if S3_GENERATE_LOCAL_CHECKSUM:
-                data_bytes = str(file_content).encode()
-                sha256_hash.update(data_bytes)
-                hash256 = sha256_hash.hexdigest()  # get the sha256 has in hex format
-                kwargs["ChecksumSHA256"] = hash256
-            if hasattr(content, "seek"):
-                content.seek(0)  # Reset position for potential re-reads
+                kwargs["ChecksumSHA256"] = _sha256_checksum(first_chunk)
+
+            s3_client.put_object(
+                Bucket=bucket_name,
+                Key=s3_key,
+                Body=first_chunk,
+                ContentType=file_type,
+                **kwargs,
+            )
         else:
-            file_content = content
-
-        # Upload to S3
+            self._upload_multipart(
+                s3_client=s3_client,
+                bucket_name=bucket_name,
+                s3_key=s3_key,
+                first_chunk=first_chunk,
+                content=content,
+                file_type=file_type,
+            )
 
-        s3_client.put_object(
-            Bucket=bucket_name,
-            Key=s3_key,
-            Body=file_content,
-            ContentType=file_type,
-            **kwargs,
-        )
+        if hasattr(content, "seek"):
+            content.seek(0)  # Reset position for potential re-reads
 
         with get_session_with_current_tenant_if_none(db_session) as db_session:
             # Save metadata to database
@@ -371,13 +428,75 @@ class S3BackedFileStore(FileStore):
 
         return file_id
 
-    def read_file(
+    def _upload_multipart(
+        self,
+        s3_client: S3Client,
+        bucket_name: str,
+        s3_key: str,
+        first_chunk: bytes,
+        content: IO,
+        file_type: str,
+    ) -> None:
+        # S3 only verifies SHA-256 checksums of multipart uploads per part
+        if S3_GENERATE_LOCAL_CHECKSUM:
+            upload = s3_client.create_multipart_upload(
+                Bucket=bucket_name,
+                Key=s3_key,
+                ContentType=file_type,
+                ChecksumAlgorithm="SHA256",
+            )
+        else:
+            upload = s3_client.create_multipart_upload(
+                Bucket=bucket_name, Key=s3_key, ContentType=file_type
+            )
+        upload_id = upload["UploadId"]
+
+        parts: list[CompletedPartTypeDef] = []
+        try:
+            chunk = first_chunk
+            while chunk:
+                part_number = len(parts) + 1
+                kwargs: S3PutKwargs = {}
+                if S3_GENERATE_LOCAL_CHECKSUM:
+                    kwargs["ChecksumSHA256"] = _sha256_checksum(chunk)
+
+                response = s3_client.upload_part(
+                    Bucket=bucket_name,
+                    Key=s3_key,
+                    UploadId=upload_id,
+                    PartNumber=part_number,
+                    Body=chunk,
+                    **kwargs,
+                )
+                part: CompletedPartTypeDef = {
+                    "PartNumber": part_number,
+                    "ETag": response["ETag"],
+                }
+                if "ChecksumSHA256" in kwargs:
+                    part["ChecksumSHA256"] = kwargs["ChecksumSHA256"]
+                parts.append(part)
+
+                chunk = _read_chunk(content, S3_MULTIPART_CHUNK_SIZE)
+
+            s3_client.complete_multipart_upload(
+                Bucket=bucket_name,
+                Key=s3_key,
+                UploadId=upload_id,
+                MultipartUpload={"Parts": parts},
+            )
+        except Exception:
+            # don't leave the uploaded parts behind, they are billed until aborted
+            s3_client.abort_multipart_upload(
+                Bucket=bucket_name, Key=s3_key, UploadId=upload_id
+            )
+            raise
+
+    def _get_object(
         self,
         file_id: str,
-        mode: str | None = None,
-        use_tempfile: bool = False,
         db_session: Session | None = None,
-    ) -> IO[bytes]:
+        byte_range: str | None = None,
+    ) -> GetObjectOutputTypeDef:
         with get_session_with_current_tenant_if_none(db_session) as db_session:
             file_record = get_filerecord_by_file_id(
                 file_id=file_id, db_session=db_session
@@ -385,23 +504,67 @@ class S3BackedFileStore(FileStore):
 
         s3_client = self._get_s3_client()
         try:
-            response = s3_client.get_object(
-                Bucket=file_record.bucket_name, Key=file_record.object_key
+            if byte_range is None:
+                return s3_client.get_object(
+                    Bucket=file_record.bucket_name, Key=file_record.object_key
+                )
+            return s3_client.get_object(
+                Bucket=file_record.bucket_name,
+                Key=file_record.object_key,
+                Range=byte_range,
             )
         except ClientError:
             logger.error(f"Failed to read file {file_id} from S3")
             raise
 
-        file_content = response["Body"].read()
+    def read_file(
+        self,
+        file_id: str,
+        mode: str | None = None,
+        use_tempfile: bool = False,
+        db_session: Session | None = None,
+    ) -> IO[bytes]:
+        response = self._get_object(file_id, db_session=db_session)
 
         if use_tempfile:
-            # Always open in binary mode for temp files since we're writing bytes
+            # Always open in binary mode for temp files since we're writing bytes.
+            # The body is copied over in chunks so it is never fully in memory.
             temp_file = tempfile.NamedTemporaryFile(mode="w+b", delete=False)
-            temp_file.write(file_content)
+            shutil.copyfileobj(response["Body"], temp_file, _STREAM_CHUNK_SIZE)
             temp_file.seek(0)
             return temp_file
         else:
-            return BytesIO(file_content)
+            return BytesIO(response["Body"].read())
+
+    def read_file_range(
+        self,
+        file_id: str,
+        start: int,
+        end: int | None = None,
+        db_session: Session | None = None,
+    ) -> bytes:
+        byte_range = f"bytes={start}-{'' if end is None else end}"
+        response = self._get_object(
+            file_id, db_session=db_session, byte_range=byte_range
+        )
+        return response["Body"].read()
+
+    def open_stream(
+        self,
+        file_id: str,
+        chunk_size: int = _STREAM_CHUNK_SIZE,
+        db_session: Session | None = None,
+    ) -> Iterator[bytes]:
+        # fetched eagerly so that a missing file raises before streaming starts
+        body = self._get_object(file_id, db_session=db_session)["Body"]
+
+        def _stream() -> Iterator[bytes]:
+            try:
+                yield from body.iter_chunks(chunk_size)
+            finally:
+                body.close()
+
+        return _stream()
 
     def read_file_record(
         self, file_id: str, db_session: Session | None = None
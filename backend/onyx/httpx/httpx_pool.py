@@ -43,6 +43,13 @@ class HttpxPool:
             if client:
                 client.close()
 
+    @classmethod
+    def discard_client(cls, name: str) -> None:
+        """Forget the client without closing it. Used in forked children, where the
+        client's connections are still shared with the parent process."""
+        with cls._lock:
+            cls._clients.pop(name, None)
+
     @classmethod
     def close_all(cls) -> None:
         """Close all registered clients."""
@@ -10,6 +10,7 @@ from onyx.configs.constants import DEFAULT_BOOST
 from onyx.connectors.models import Document
 from onyx.connectors.models import IndexAttemptMetadata
 from onyx.db.chunk import update_chunk_boost_components__no_commit
+from onyx.db.document import fetch_cc_pair_ids_for_documents
 from onyx.db.document import fetch_chunk_counts_for_documents
 from onyx.db.document import mark_document_as_indexed_for_cc_pair__no_commit
 from onyx.db.document import prepare_to_modify_documents
@@ -111,6 +112,11 @@ class DocumentIndexingBatchAdapter:
                 document_ids=updatable_ids, db_session=self.db_session
             )
         }
+        doc_id_to_cc_pair_ids = dict(
+            fetch_cc_pair_ids_for_documents(
+                db_session=self.db_session, document_ids=updatable_ids
+            )
+        )
 
         doc_id_to_previous_chunk_cnt: dict[str, int] = {
             document_id: chunk_count
@@ -139,6 +145,7 @@ class DocumentIndexingBatchAdapter:
                     doc_id_to_document_set.get(chunk.source_document.id, [])
                 ),
                 user_project=[],
+                cc_pair_ids=doc_id_to_cc_pair_ids.get(chunk.source_document.id, []),
                 boost=(
                     context.id_to_boost_map[chunk.source_document.id]
                     if chunk.source_document.id in context.id_to_boost_map
@@ -178,6 +178,7 @@ class UserFileIndexingAdapter:
                 user_project=user_file_id_to_project_ids.get(
                     chunk.source_document.id, []
                 ),
+                cc_pair_ids=[],
                 # we are going to index userfiles only once, so we just set the boost to the default
                 boost=DEFAULT_BOOST,
                 tenant_id=tenant_id,
@@ -22,6 +22,7 @@ from onyx.indexing.indexing_heartbeat import IndexingHeartbeatInterface
 from onyx.indexing.models import DocAwareChunk
 from onyx.llm.utils import MAX_CONTEXT_TOKENS
 from onyx.natural_language_processing.utils import BaseTokenizer
+from onyx.natural_language_processing.utils import TokenCountCache
 from onyx.utils.logger import setup_logger
 from onyx.utils.text_processing import clean_text
 from onyx.utils.text_processing import shared_precompare_cleanup
@@ -157,19 +158,19 @@ class Chunker:
         self.max_context = 0
         self.prompt_tokens = 0
 
-        # Create a token counter function that returns the count instead of the tokens
-        def token_counter(text: str) -> int:
-            return len(tokenizer.encode(text))
+        # Shared by all splitters and the chunker itself so that each distinct
+        # sentence/section is only tokenized once per document
+        self.token_counter = TokenCountCache(tokenizer)
 
         self.blurb_splitter = SentenceChunker(
-            tokenizer_or_token_counter=token_counter,
+            tokenizer_or_token_counter=self.token_counter,
             chunk_size=blurb_size,
             chunk_overlap=0,
             return_type="texts",
         )
 
         self.chunk_splitter = SentenceChunker(
-            tokenizer_or_token_counter=token_counter,
+            tokenizer_or_token_counter=self.token_counter,
             chunk_size=chunk_token_limit,
             chunk_overlap=chunk_overlap,
             return_type="texts",
@@ -177,7 +178,7 @@ class Chunker:
 
         self.mini_chunk_splitter = (
             SentenceChunker(
-                tokenizer_or_token_counter=token_counter,
+                tokenizer_or_token_counter=self.token_counter,
                 chunk_size=mini_chunk_size,
                 chunk_overlap=0,
                 return_type="texts",
@@ -274,9 +275,14 @@ class Chunker:
         link_offsets: dict[int, str] = {}
         chunk_text = ""
 
-        for section_idx, section in enumerate(sections):
-            # Get section text and other attributes
-            section_text = clean_text(str(section.text or ""))
+        section_texts = [clean_text(str(section.text or "")) for section in sections]
+        # count all sections in one batch up front, the loop below hits the cache
+        self.token_counter.count_batch(section_texts + [SECTION_SEPARATOR])
+
+        for section_idx, (section, section_text) in enumerate(
+            zip(sections, section_texts)
+        ):
+            # Get section attributes
             section_link_text = section.link or ""
             image_url = section.image_file_id
 
@@ -321,7 +327,7 @@ class Chunker:
                 continue
 
             # CASE 2: Normal text section
-            section_token_count = len(self.tokenizer.encode(section_text))
+            section_token_count = self.token_counter(section_text)
 
             # If the section is large on its own, split it separately
             if section_token_count > content_token_limit:
@@ -345,7 +351,7 @@ class Chunker:
                     # If even the split_text is bigger than strict limit, further split
                     if (
                         STRICT_CHUNK_TOKEN_LIMIT
-                        and len(self.tokenizer.encode(split_text)) > content_token_limit
+                        and self.token_counter(split_text) > content_token_limit
                     ):
                         smaller_chunks = self._split_oversized_chunk(
                             split_text, content_token_limit
@@ -375,10 +381,10 @@ class Chunker:
                 continue
 
             # If we can still fit this section into the current chunk, do so
-            current_token_count = len(self.tokenizer.encode(chunk_text))
+            current_token_count = self.token_counter(chunk_text)
             current_offset = len(shared_precompare_cleanup(chunk_text))
             next_section_tokens = (
-                len(self.tokenizer.encode(SECTION_SEPARATOR)) + section_token_count
+                self.token_counter(SECTION_SEPARATOR) + section_token_count
             )
 
             if next_section_tokens + current_token_count <= content_token_limit:
@@ -423,10 +429,13 @@ class Chunker:
         if document.source == DocumentSource.GMAIL:
             logger.debug(f"Chunking {document.semantic_identifier}")
 
+        # token counts are only reused within a document
+        self.token_counter.clear()
+
         # Title prep
         title = self._extract_blurb(document.get_title_for_document_index() or "")
         title_prefix = title + RETURN_SEPARATOR if title else ""
-        title_tokens = len(self.tokenizer.encode(title_prefix))
+        title_tokens = self.token_counter(title_prefix)
 
         # Metadata prep
         metadata_suffix_semantic = ""
@@ -439,7 +448,7 @@ class Chunker:
             ) = _get_metadata_suffix_for_document_index(
                 document.metadata, include_separator=True
             )
-            metadata_tokens = len(self.tokenizer.encode(metadata_suffix_semantic))
+            metadata_tokens = self.token_counter(metadata_suffix_semantic)
 
         # If metadata is too large, skip it in the semantic content
         if metadata_tokens >= self.chunk_token_limit * MAX_METADATA_PERCENTAGE:
@@ -449,9 +458,7 @@ class Chunker:
         single_chunk_fits = True
         doc_token_count = 0
         if self.enable_contextual_rag:
-            doc_content = document.get_text_content()
-            tokenized_doc = self.tokenizer.tokenize(doc_content)
-            doc_token_count = len(tokenized_doc)
+            doc_token_count = self.token_counter(document.get_text_content())
 
             # check if doc + title + metadata fits in a single chunk. If so, no need for contextual RAG
             single_chunk_fits = (
@@ -65,6 +65,7 @@ from onyx.natural_language_processing.utils import tokenizer_trim_middle
 from onyx.prompts.chat_prompts import CONTEXTUAL_RAG_PROMPT1
 from onyx.prompts.chat_prompts import CONTEXTUAL_RAG_PROMPT2
 from onyx.prompts.chat_prompts import DOCUMENT_SUMMARY_PROMPT
+from onyx.utils.executor_service import ExecutorPool
 from onyx.utils.logger import setup_logger
 from onyx.utils.threadpool_concurrency import run_functions_tuples_in_parallel
 from onyx.utils.timing import log_function_time
@@ -543,7 +544,9 @@ def add_document_summaries(
     doc_content = tokenizer_trim_middle(doc_tokens, trunc_doc_tokens, tokenizer)
     summary_prompt = DOCUMENT_SUMMARY_PROMPT.format(document=doc_content)
     doc_summary = message_to_string(
-        llm.invoke(summary_prompt, max_tokens=MAX_CONTEXT_TOKENS)
+        llm.invoke(
+            summary_prompt, max_tokens=MAX_CONTEXT_TOKENS, use_response_cache=True
+        )
     )
 
     for chunk in chunks_by_doc:
@@ -587,6 +590,7 @@ def add_chunk_summaries(
             llm.invoke(
                 DOCUMENT_SUMMARY_PROMPT.format(document=doc_content),
                 max_tokens=MAX_CONTEXT_TOKENS,
+                use_response_cache=True,
             )
         )
 
@@ -599,6 +603,7 @@ def add_chunk_summaries(
                 llm.invoke(
                     context_prompt1 + context_prompt2,
                     max_tokens=MAX_CONTEXT_TOKENS,
+                    use_response_cache=True,
                 )
             )
         except LLMRateLimitError as e:
@@ -611,7 +616,8 @@ def add_chunk_summaries(
             chunk.chunk_context = ""
 
     run_functions_tuples_in_parallel(
-        [(assign_context, (chunk,)) for chunk in chunks_by_doc]
+        [(assign_context, (chunk,)) for chunk in chunks_by_doc],
+        pool=ExecutorPool.LLM,
     )
 
 
@@ -99,6 +99,8 @@ class DocMetadataAwareIndexChunk(IndexChunk):
             source document for this chunk.
     document_sets: all document sets the source document for this chunk is a part
                    of. This is used for filtering / personas.
+    cc_pair_ids: the cc_pairs that indexed the source document. Used to resolve document
+                 set and user group filters at query time.
     boost: influences the ranking of this chunk at query time. Positive -> ranked higher,
            negative -> ranked lower. Not included in aggregated boost calculation
            for legacy reasons.
@@ -109,6 +111,7 @@ class DocMetadataAwareIndexChunk(IndexChunk):
     access: "DocumentAccess"
     document_sets: set[str]
     user_project: list[int]
+    cc_pair_ids: list[int]
     boost: int
     aggregated_chunk_boost_factor: float
 
@@ -119,6 +122,7 @@ class DocMetadataAwareIndexChunk(IndexChunk):
         access: "DocumentAccess",
         document_sets: set[str],
         user_project: list[int],
+        cc_pair_ids: list[int],
         boost: int,
         aggregated_chunk_boost_factor: float,
         tenant_id: str,
@@ -129,6 +133,7 @@ class DocMetadataAwareIndexChunk(IndexChunk):
             access=access,
             document_sets=document_sets,
             user_project=user_project,
+            cc_pair_ids=cc_pair_ids,
             boost=boost,
             aggregated_chunk_boost_factor=aggregated_chunk_boost_factor,
             tenant_id=tenant_id,
@@ -0,0 +1,97 @@
+import re
+from array import array
+
+import numpy as np
+
+_WORD_REGEX = re.compile(r"[^\W_]+")
+
+
+def pg_trigrams(name: str) -> set[str]:
+    """
+    Trigrams of a name, built the same way as pg_trgm's show_trgm: every
+    alphanumeric word is lowercased and padded with two spaces in front and one
+    behind before being split into trigrams.
+    """
+    trigrams: set[str] = set()
+    for word in _WORD_REGEX.findall(name.lower()):
+        padded = f"  {word} "
+        trigrams.update(padded[i : i + 3] for i in range(len(padded) - 2))
+    return trigrams
+
+
+class EntityCandidateIndex:
+    """
+    In-memory trigram index over the KGEntities of one entity type, replacing a
+    pg_trgm similarity query per clustered entity.
+
+    Every entity can be looked up by its (name, document_id) key, but only the
+    searchable ones are returned by find_similar. Entities are added as they are
+    created so that later entities of the same run can be clustered into them.
+    """
+
+    def __init__(self) -> None:
+        self.id_names: list[str] = []
+        self.names: list[str] = []
+        self.document_ids: list[str | None] = []
+        self._positions: dict[str, int] = {}
+        self._positions_by_key: dict[tuple[str, str | None], int] = {}
+        # number of trigrams of each entity, 0 for unsearchable entities
+        self._num_trigrams = array("q")
+        # trigram -> positions of the entities containing it
+        self._postings: dict[str, array] = {}
+
+    def __len__(self) -> int:
+        return len(self.id_names)
+
+    def add(
+        self,
+        id_name: str,
+        name: str,
+        document_id: str | None,
+        searchable: bool = True,
+    ) -> int:
+        position = len(self.id_names)
+        self.id_names.append(id_name)
+        self.names.append(name)
+        self.document_ids.append(document_id)
+        self._positions[id_name] = position
+        self._positions_by_key[(name, document_id)] = position
+
+        trigrams = pg_trigrams(name) if searchable else set()
+        self._num_trigrams.append(len(trigrams))
+        for trigram in trigrams:
+            self._postings.setdefault(trigram, array("q")).append(position)
+        return position
+
+    def position_of(self, id_name: str) -> int:
+        return self._positions[id_name]
+
+    def find_by_key(self, name: str, document_id: str | None) -> int | None:
+        return self._positions_by_key.get((name, document_id))
+
+    def set_document_id(self, position: int, document_id: str | None) -> None:
+        key = (self.names[position], self.document_ids[position])
+        if self._positions_by_key.get(key) == position:
+            del self._positions_by_key[key]
+        self.document_ids[position] = document_id
+        self._positions_by_key[(self.names[position], document_id)] = position
+
+    def find_similar(self, name: str, min_similarity: float) -> list[int]:
+        """
+        Positions of the searchable entities whose pg_trgm similarity to the name,
+        |shared trigrams| / |all trigrams|, is at least min_similarity. Returned in
+        the order the entities were added.
+        """
+        trigrams = pg_trigrams(name)
+        postings = [
+            np.frombuffer(self._postings[trigram], dtype=np.int64)
+            for trigram in trigrams
+            if trigram in self._postings
+        ]
+        if not postings:
+            return []
+
+        shared = np.bincount(np.concatenate(postings), minlength=len(self.id_names))
+        num_trigrams = np.frombuffer(self._num_trigrams, dtype=np.int64)
+        similarity = shared / (len(trigrams) + num_trigrams - shared)
+        return np.flatnonzero(similarity >= min_similarity).tolist()
@@ -1,21 +1,31 @@
 import time
+import uuid
 from collections.abc import Generator
+from dataclasses import dataclass
+from datetime import datetime
+from datetime import timezone
+from enum import Enum
+from typing import Any
 from typing import cast
 
 from rapidfuzz.fuzz import ratio
 from redis.lock import Lock as RedisLock
-from sqlalchemy import func
-from sqlalchemy import text
+from sqlalchemy.orm import Session
 
 from onyx.background.celery.tasks.kg_processing.utils import extend_lock
 from onyx.configs.constants import CELERY_GENERIC_BEAT_LOCK_TIMEOUT
+from onyx.configs.kg_configs import KG_CLUSTERING_BATCH_SIZE
 from onyx.configs.kg_configs import KG_CLUSTERING_RETRIEVE_THRESHOLD
 from onyx.configs.kg_configs import KG_CLUSTERING_THRESHOLD
 from onyx.db.engine.sql_engine import get_session_with_current_tenant
+from onyx.db.document import update_documents_kg_info
+from onyx.db.entities import get_entities_by_id_names
+from onyx.db.entities import get_entity_keys_for_type
+from onyx.db.entities import insert_entities
 from onyx.db.entities import KGEntity
 from onyx.db.entities import KGEntityExtractionStaging
-from onyx.db.entities import merge_entities
-from onyx.db.entities import transfer_entity
+from onyx.db.entities import mark_staging_entities_transferred
+from onyx.db.entities import update_entities
 from onyx.db.kg_config import get_kg_config_settings
 from onyx.db.kg_config import validate_kg_settings
 from onyx.db.models import Document
@@ -30,11 +40,13 @@ from onyx.document_index.vespa.kg_interactions import (
     get_kg_vespa_info_update_requests_for_document,
 )
 from onyx.document_index.vespa.kg_interactions import update_kg_chunks_vespa_info
+from onyx.kg.clustering.candidate_index import EntityCandidateIndex
 from onyx.kg.models import KGGroundingType
+from onyx.kg.models import KGStage
+from onyx.kg.utils.formatting_utils import make_entity_id
 from onyx.kg.utils.formatting_utils import make_relationship_id
 from onyx.utils.logger import setup_logger
 from onyx.utils.threadpool_concurrency import run_functions_tuples_in_parallel
-from shared_configs.configs import POSTGRES_DEFAULT_SCHEMA
 
 logger = setup_logger()
 
@@ -144,79 +156,277 @@ def _get_batch_kg_processed_documents(
             offset += batch_size
 
 
-def _cluster_one_grounded_entity(
+def _has_digit(name: str) -> bool:
+    return any(char.isdigit() for char in name)
+
+
+class _ClusteringAction(str, Enum):
+    # a new entity is created from the staging entity
+    INSERT = "insert"
+    # the staging entity has the same name, type and document as an existing
+    # entity and is upserted into it
+    UPSERT = "upsert"
+    # the staging entity is similar enough to an existing entity to be merged
+    MERGE = "merge"
+
+
+@dataclass
+class _ClusteringDecision:
+    action: _ClusteringAction
+    # the entity the staging entity ends up in, and its stored name
+    id_name: str
+    name: str
+    entity: KGEntityExtractionStaging
+
+
+def _get_candidate_index(
+    db_session: Session,
+    candidate_indices: dict[str, EntityCandidateIndex],
+    entity_type_id_name: str,
+) -> EntityCandidateIndex:
+    """Loads the entities of a type into an index the first time it's needed in
+    a clustering run. The index is kept up to date with every batch after that."""
+    if entity_type_id_name not in candidate_indices:
+        index = EntityCandidateIndex()
+        for id_name, name, document_id in get_entity_keys_for_type(
+            db_session, entity_type_id_name
+        ):
+            # skip those with numbers so we don't cluster version1 and version2, etc.
+            index.add(id_name, name, document_id, searchable=not _has_digit(name))
+        candidate_indices[entity_type_id_name] = index
+    return candidate_indices[entity_type_id_name]
+
+
+def _decide_clustering(
     entity: KGEntityExtractionStaging,
-) -> tuple[KGEntity, bool]:
+    entity_name: str,
+    index: EntityCandidateIndex,
+) -> _ClusteringDecision:
     """
-    Cluster a single grounded entity.
+    Decides what to do with one staging entity and updates the index with the
+    result, so that the next entity sees it just like it would see the database.
     """
-    with get_session_with_current_tenant() as db_session:
-        # get entity name and filtering conditions
+    # find best match among entities of the same type with a similar name,
+    # skipping those with numbers so we don't cluster version1 and version2, etc.
+    best_score = -1.0
+    best_position = None
+    if not _has_digit(entity_name):
+        for position in index.find_similar(
+            entity_name, KG_CLUSTERING_RETRIEVE_THRESHOLD
+        ):
+            # entities from a document can only merge into document-less ones
+            if (
+                entity.document_id is not None
+                and index.document_ids[position] is not None
+            ):
+                continue
+            score = ratio(index.names[position], entity_name)
+            if score >= KG_CLUSTERING_THRESHOLD * 100 and score > best_score:
+                best_score = score
+                best_position = position
+
+    if best_position is not None:
+        logger.debug(f"Merged {entity.name} with {index.names[best_position]}")
         if entity.document_id is not None:
-            entity_name = cast(
-                str,
-                db_session.query(Document.semantic_id)
-                .filter(Document.id == entity.document_id)
-                .scalar(),
-            ).lower()
-            filtering = [KGEntity.document_id.is_(None)]
-        else:
-            entity_name = entity.name.lower()
-            filtering = []
-
-        # skip those with numbers so we don't cluster version1 and version2, etc.
-        similar_entities: list[KGEntity] = []
-        if not any(char.isdigit() for char in entity_name):
-            # find similar entities, uses GIN index, very efficient
-            db_session.execute(
-                text(
-                    "SET pg_trgm.similarity_threshold = "
-                    + str(KG_CLUSTERING_RETRIEVE_THRESHOLD)
-                )
-            )
-            similar_entities = (
-                db_session.query(KGEntity)
-                .filter(
-                    # find entities of the same type with a similar name
-                    *filtering,
-                    KGEntity.entity_type_id_name == entity.entity_type_id_name,
-                    getattr(func, POSTGRES_DEFAULT_SCHEMA).similarity_op(
-                        KGEntity.name, entity_name
-                    ),
-                )
-                .all()
-            )
+            index.set_document_id(best_position, entity.document_id)
+        return _ClusteringDecision(
+            action=_ClusteringAction.MERGE,
+            id_name=index.id_names[best_position],
+            name=index.names[best_position],
+            entity=entity,
+        )
 
-    # find best match
-    best_score = -1.0
-    best_entity = None
-    for similar in similar_entities:
-        # skip those with numbers so we don't cluster version1 and version2, etc.
-        if any(char.isdigit() for char in similar.name):
+    # the name the kg_entity trigger stores for the new entity
+    stored_name = entity_name if entity.document_id else entity.name.casefold()
+    existing_position = index.find_by_key(stored_name, entity.document_id)
+    if existing_position is not None:
+        return _ClusteringDecision(
+            action=_ClusteringAction.UPSERT,
+            id_name=index.id_names[existing_position],
+            name=stored_name,
+            entity=entity,
+        )
+
+    id_name = make_entity_id(entity.entity_type_id_name, uuid.uuid4().hex[:20])
+    index.add(
+        id_name,
+        stored_name,
+        entity.document_id,
+        searchable=not _has_digit(stored_name),
+    )
+    return _ClusteringDecision(
+        action=_ClusteringAction.INSERT,
+        id_name=id_name,
+        name=stored_name,
+        entity=entity,
+    )
+
+
+def _entity_values(entity: KGEntity) -> dict[str, Any]:
+    return {
+        "id_name": entity.id_name,
+        "name": entity.name,
+        "document_id": entity.document_id,
+        "alternative_names": list(entity.alternative_names or []),
+        "occurrences": entity.occurrences,
+        "attributes": dict(entity.attributes or {}),
+        "entity_key": entity.entity_key,
+        "parent_key": entity.parent_key,
+        "event_time": entity.event_time,
+    }
+
+
+def _apply_clustering_decisions(
+    decisions: list[_ClusteringDecision], existing: dict[str, dict[str, Any]]
+) -> tuple[list[dict[str, Any]], list[dict[str, Any]], set[str]]:
+    """
+    Applies the decisions in order to the current values of the affected
+    entities. Returns the entities to insert, the entities to update and the
+    documents whose entities got normalized.
+    """
+    new: dict[str, dict[str, Any]] = {}
+    inserted_document_ids: dict[str, str | None] = {}
+    updated: dict[str, dict[str, Any]] = {}
+    normalized_document_ids: set[str] = set()
+
+    for decision in decisions:
+        entity = decision.entity
+        if decision.action == _ClusteringAction.INSERT:
+            new[decision.id_name] = {
+                "id_name": decision.id_name,
+                "name": decision.name,
+                "entity_type_id_name": entity.entity_type_id_name,
+                "document_id": entity.document_id,
+                "alternative_names": list(entity.alternative_names or []),
+                "occurrences": entity.occurrences,
+                "attributes": dict(entity.attributes or {}),
+                "entity_key": entity.entity_key,
+                "parent_key": entity.parent_key,
+                "event_time": entity.event_time,
+            }
+            inserted_document_ids[decision.id_name] = entity.document_id
+            if entity.document_id is not None:
+                normalized_document_ids.add(entity.document_id)
+            continue
+
+        values = new.get(decision.id_name)
+        if values is None:
+            values = updated.setdefault(decision.id_name, existing[decision.id_name])
+
+        if decision.action == _ClusteringAction.UPSERT:
+            values["occurrences"] += entity.occurrences
+            values["attributes"] = values["attributes"] | entity.attributes
+            values["entity_key"] = values["entity_key"] or entity.entity_key
+            values["parent_key"] = values["parent_key"] or entity.parent_key
+            values["event_time"] = entity.event_time
+            if entity.document_id is not None:
+                normalized_document_ids.add(entity.document_id)
             continue
-        score = ratio(similar.name, entity_name)
-        if score >= KG_CLUSTERING_THRESHOLD * 100 and score > best_score:
-            best_score = score
-            best_entity = similar
 
-    # if there is a match, update the entity, otherwise create a new one
+        if (
+            values["document_id"] is not None
+            and entity.document_id is not None
+            and values["document_id"] != entity.document_id
+        ):
+            raise ValueError(
+                "Overwriting the document_id of an entity with a document_id already is not allowed"
+            )
+        if values["document_id"] is None and entity.document_id is not None:
+            values["document_id"] = entity.document_id
+            normalized_document_ids.add(entity.document_id)
+        alternative_names = set(values["alternative_names"])
+        alternative_names.update(entity.alternative_names or [])
+        alternative_names.add(entity.name.lower())
+        alternative_names.discard(values["name"])
+        values["alternative_names"] = list(alternative_names)
+        values["occurrences"] += entity.occurrences
+        values["attributes"] = values["attributes"] | entity.attributes
+        values["entity_key"] = values["entity_key"] or entity.entity_key
+        values["parent_key"] = values["parent_key"] or entity.parent_key
+
+    # The kg_entity trigger names entities with a document after the document, but
+    # only on insert. New entities that got their document from a later merge are
+    # inserted without it and updated after, to keep the name they were created with.
+    for id_name, values in new.items():
+        if values["document_id"] != inserted_document_ids[id_name]:
+            updated[id_name] = {
+                key: value
+                for key, value in values.items()
+                if key != "entity_type_id_name"
+            }
+            values["document_id"] = inserted_document_ids[id_name]
+
+    # the name is only set on insert
+    for values in updated.values():
+        values.pop("name", None)
+        values["time_updated"] = datetime.now(timezone.utc)
+
+    return list(new.values()), list(updated.values()), normalized_document_ids
+
+
+def _cluster_grounded_entity_batch(
+    entities: list[KGEntityExtractionStaging],
+    candidate_indices: dict[str, EntityCandidateIndex],
+) -> None:
+    """
+    Clusters a batch of grounded entities against the in-memory candidate indices
+    and writes all resulting inserts, merges and transfers in bulk.
+    """
     with get_session_with_current_tenant() as db_session:
-        if best_entity:
-            logger.debug(f"Merged {entity.name} with {best_entity.name}")
-            update_vespa = (
-                best_entity.document_id is None and entity.document_id is not None
+        document_ids = {
+            entity.document_id for entity in entities if entity.document_id is not None
+        }
+        document_names: dict[str, str] = (
+            dict(
+                db_session.query(Document.id, Document.semantic_id)
+                .filter(Document.id.in_(document_ids))
+                .all()
             )
-            transferred_entity = merge_entities(
-                db_session=db_session, parent=best_entity, child=entity
+            if document_ids
+            else {}
+        )
+
+        decisions: list[_ClusteringDecision] = []
+        for entity in entities:
+            if entity.document_id is not None:
+                entity_name = document_names.get(
+                    entity.document_id, entity.name
+                ).lower()
+            else:
+                entity_name = entity.name.lower()
+            index = _get_candidate_index(
+                db_session, candidate_indices, entity.entity_type_id_name
             )
-        else:
-            update_vespa = entity.document_id is not None
-            transferred_entity = transfer_entity(db_session=db_session, entity=entity)
+            decisions.append(_decide_clustering(entity, entity_name, index))
+
+        existing = {
+            kg_entity.id_name: _entity_values(kg_entity)
+            for kg_entity in get_entities_by_id_names(
+                db_session,
+                list(
+                    {
+                        decision.id_name
+                        for decision in decisions
+                        if decision.action != _ClusteringAction.INSERT
+                    }
+                ),
+            )
+        }
+        new_entities, updated_entities, normalized_document_ids = (
+            _apply_clustering_decisions(decisions, existing)
+        )
 
+        insert_entities(db_session, new_entities)
+        update_entities(db_session, updated_entities)
+        mark_staging_entities_transferred(
+            db_session,
+            {decision.entity.id_name: decision.id_name for decision in decisions},
+        )
+        update_documents_kg_info(
+            db_session, list(normalized_document_ids), KGStage.NORMALIZED
+        )
         db_session.commit()
 
-    return transferred_entity, update_vespa
-
 
 def _create_one_parent_child_relationship(entity: KGEntityExtractionStaging) -> None:
     """
@@ -319,16 +529,18 @@ def kg_clustering(
 
     last_lock_time = time.monotonic()
 
-    # Cluster and transfer grounded entities sequentially
+    # Cluster and transfer grounded entities in batches. Each entity is clustered
+    # against all entities transferred before it, including earlier ones in the
+    # same run, which the candidate indices keep track of.
     start_time = time.monotonic()
     i_batch = 0
+    candidate_indices: dict[str, EntityCandidateIndex] = {}
     for i_batch, untransferred_grounded_entities in enumerate(
-        _get_batch_untransferred_grounded_entities(
-            batch_size=processing_chunk_batch_size
-        )
+        _get_batch_untransferred_grounded_entities(batch_size=KG_CLUSTERING_BATCH_SIZE)
     ):
-        for entity in untransferred_grounded_entities:
-            _cluster_one_grounded_entity(entity)
+        _cluster_grounded_entity_batch(
+            untransferred_grounded_entities, candidate_indices
+        )
         last_lock_time = extend_lock(
             lock, CELERY_GENERIC_BEAT_LOCK_TIMEOUT, last_lock_time
         )
@@ -53,10 +53,24 @@ def _clean_name(entity_name: str) -> str:
     )
 
 
+def _reflect_allowed_docs_temp_view(allowed_docs_temp_view_name: str) -> Table:
+    """Reflects the allowed docs view once per normalization run, rather than once
+    for every entity."""
+    effective_schema_allowed_docs_temp_view_name = allowed_docs_temp_view_name.split(
+        "."
+    )[-1]
+    with get_session_with_current_tenant() as db_session:
+        return Table(
+            effective_schema_allowed_docs_temp_view_name,
+            MetaData(),
+            autoload_with=db_session.get_bind(),
+        )
+
+
 def _normalize_one_entity(
     entity: str,
     attributes: dict[str, str],
-    allowed_docs_temp_view_name: str | None = None,
+    allowed_docs_temp_view: Table,
 ) -> str | None:
     from nltk import ngrams  # type: ignore
 
@@ -78,22 +92,6 @@ def _normalize_one_entity(
 
     # step 1: find entities containing the entity_name or something similar
     with get_session_with_current_tenant() as db_session:
-
-        # get allowed documents
-        metadata = MetaData()
-        if allowed_docs_temp_view_name is None:
-            raise ValueError("allowed_docs_temp_view_name is not available")
-
-        effective_schema_allowed_docs_temp_view_name = (
-            allowed_docs_temp_view_name.split(".")[-1]
-        )
-
-        allowed_docs_temp_view = Table(
-            effective_schema_allowed_docs_temp_view_name,
-            metadata,
-            autoload_with=db_session.get_bind(),
-        )
-
         # generate trigrams of the queried entity Q
         query_trigrams = db_session.query(
             getattr(func, POSTGRES_DEFAULT_SCHEMA)
@@ -249,12 +247,19 @@ def normalize_entities(
         get_attributes(attr_entity) for attr_entity in raw_entities_w_attributes
     ]
 
-    mapping: list[str | None] = run_functions_tuples_in_parallel(
-        [
-            (_normalize_one_entity, (entity, attributes, allowed_docs_temp_view_name))
-            for entity, attributes in zip(raw_entities, entity_attributes)
-        ]
-    )
+    mapping: list[str | None] = []
+    if raw_entities:
+        if allowed_docs_temp_view_name is None:
+            raise ValueError("allowed_docs_temp_view_name is not available")
+        allowed_docs_temp_view = _reflect_allowed_docs_temp_view(
+            allowed_docs_temp_view_name
+        )
+        mapping = run_functions_tuples_in_parallel(
+            [
+                (_normalize_one_entity, (entity, attributes, allowed_docs_temp_view))
+                for entity, attributes in zip(raw_entities, entity_attributes)
+            ]
+        )
     for entity, attributes, normalized_entity in zip(
         raw_entities, entity_attributes, mapping
     ):
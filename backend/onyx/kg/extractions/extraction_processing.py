@@ -40,6 +40,7 @@ from onyx.kg.utils.formatting_utils import extract_relationship_type_id
 from onyx.kg.utils.formatting_utils import get_entity_type
 from onyx.kg.utils.formatting_utils import split_entity_id
 from onyx.kg.utils.formatting_utils import split_relationship_id
+from onyx.utils.executor_service import ExecutorPool
 from onyx.utils.logger import setup_logger
 from onyx.utils.threadpool_concurrency import run_functions_tuples_in_parallel
 
@@ -403,7 +404,9 @@ def kg_extraction(
                 document_id: result
                 for document_id, result in zip(
                     documents_to_process,
-                    run_functions_tuples_in_parallel(batch_deep_extraction_func_calls),
+                    run_functions_tuples_in_parallel(
+                        batch_deep_extraction_func_calls, pool=ExecutorPool.LLM
+                    ),
                 )
             }
 
@@ -11,6 +11,8 @@ from pydantic import BaseModel
 from onyx.configs.app_configs import DISABLE_GENERATIVE_AI
 from onyx.configs.app_configs import LOG_INDIVIDUAL_MODEL_TOKENS
 from onyx.configs.app_configs import LOG_ONYX_MODEL_INTERACTIONS
+from onyx.llm.response_cache import build_llm_response_cache_key
+from onyx.llm.response_cache import get_llm_response_cache
 from onyx.utils.logger import setup_logger
 
 
@@ -96,11 +98,35 @@ class LLM(abc.ABC):
         structured_response_format: dict | None = None,
         timeout_override: int | None = None,
         max_tokens: int | None = None,
+        use_response_cache: bool = False,
     ) -> BaseMessage:
+        """use_response_cache: reuse the response of an identical earlier call if the
+        LLM response cache is enabled. Only has an effect at temperature 0, meant for
+        auxiliary calls where a previous answer is as good as a new one."""
         self._precall(prompt)
+
+        response_cache = (
+            get_llm_response_cache()
+            if use_response_cache and self.config.temperature == 0
+            else None
+        )
+        cache_key = None
+        if response_cache is not None:
+            cache_key = build_llm_response_cache_key(
+                self.config,
+                prompt,
+                tools,
+                tool_choice,
+                structured_response_format,
+                max_tokens,
+            )
+            cached_response = response_cache.get(cache_key)
+            if cached_response is not None:
+                return cached_response
+
         # TODO add a postcall to log model outputs independent of concrete class
         # implementation
-        return self._invoke_implementation(
+        response = self._invoke_implementation(
             prompt,
             tools,
             tool_choice,
@@ -109,6 +135,10 @@ class LLM(abc.ABC):
             max_tokens,
         )
 
+        if response_cache is not None and cache_key is not None:
+            response_cache.set(cache_key, response)
+        return response
+
     @abc.abstractmethod
     def _invoke_implementation(
         self,
@@ -0,0 +1,181 @@
+"""
+Opt-in cache for the responses of deterministic auxiliary LLM calls (query
+rephrasing, query rewrites, KG extraction, contextual RAG summaries, ...).
+
+Only non streaming calls that ask for it with `use_response_cache=True` and run at
+temperature 0 are cached. The key is a hash of everything that goes into the request
+apart from the credentials, and the entries are isolated per tenant. A failing cache
+backend is logged and never fails the LLM call.
+"""
+
+import abc
+import functools
+import hashlib
+import json
+import os
+import tempfile
+import time
+from typing import Any
+from typing import TYPE_CHECKING
+
+from langchain.schema.language_model import LanguageModelInput
+from langchain_core.messages import BaseMessage
+from langchain_core.messages import convert_to_messages
+from langchain_core.messages import message_to_dict
+from langchain_core.messages import messages_from_dict
+from langchain_core.prompt_values import PromptValue
+from pydantic import BaseModel
+
+from onyx.configs.model_configs import LLM_RESPONSE_CACHE_BACKEND
+from onyx.configs.model_configs import LLM_RESPONSE_CACHE_DIR
+from onyx.configs.model_configs import LLM_RESPONSE_CACHE_TTL
+from onyx.redis.redis_pool import get_redis_client
+from onyx.utils.logger import setup_logger
+from shared_configs.contextvars import get_current_tenant_id
+
+if TYPE_CHECKING:
+    from onyx.llm.interfaces import LLMConfig
+
+logger = setup_logger()
+
+LLM_RESPONSE_CACHE_PREFIX = "llm_response_cache"
+
+
+def _json_default(obj: Any) -> Any:
+    # structured_response_format may be a pydantic model class instead of a schema
+    if isinstance(obj, type) and issubclass(obj, BaseModel):
+        return obj.model_json_schema()
+    return str(obj)
+
+
+def _prompt_to_messages(prompt: LanguageModelInput) -> list[BaseMessage]:
+    if isinstance(prompt, str):
+        return convert_to_messages([("human", prompt)])
+    if isinstance(prompt, PromptValue):
+        return prompt.to_messages()
+    return convert_to_messages(prompt)
+
+
+def build_llm_response_cache_key(
+    config: "LLMConfig",
+    prompt: LanguageModelInput,
+    tools: list[dict] | None = None,
+    tool_choice: str | None = None,
+    structured_response_format: dict | None = None,
+    max_tokens: int | None = None,
+) -> str:
+    request = {
+        "model_provider": config.model_provider,
+        "model_name": config.model_name,
+        "deployment_name": config.deployment_name,
+        "api_base": config.api_base,
+        "api_version": config.api_version,
+        "temperature": config.temperature,
+        "messages": [message_to_dict(msg) for msg in _prompt_to_messages(prompt)],
+        "tools": tools,
+        "tool_choice": tool_choice,
+        "structured_response_format": structured_response_format,
+        "max_tokens": max_tokens,
+    }
+    return hashlib.sha256(
+        json.dumps(request, sort_keys=True, default=_json_default).encode()
+    ).hexdigest()
+
+
+def _serialize_response(response: BaseMessage) -> str:
+    return json.dumps(message_to_dict(response))
+
+
+def _deserialize_response(serialized: str | bytes) -> BaseMessage:
+    return messages_from_dict([json.loads(serialized)])[0]
+
+
+class LLMResponseCache(abc.ABC):
+    def __init__(self, ttl: int = LLM_RESPONSE_CACHE_TTL) -> None:
+        self.ttl = ttl
+
+    def get(self, key: str) -> BaseMessage | None:
+        try:
+            serialized = self._get(key)
+            return None if serialized is None else _deserialize_response(serialized)
+        except Exception as e:
+            logger.warning(f"Failed to read cached LLM response: {e}")
+            return None
+
+    def set(self, key: str, response: BaseMessage) -> None:
+        try:
+            self._set(key, _serialize_response(response))
+        except Exception as e:
+            logger.warning(f"Failed to cache LLM response: {e}")
+
+    @abc.abstractmethod
+    def _get(self, key: str) -> str | bytes | None:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def _set(self, key: str, serialized: str) -> None:
+        raise NotImplementedError
+
+
+class RedisLLMResponseCache(LLMResponseCache):
+    """Shared by all processes, keys are prefixed with the tenant id by the tenant
+    aware redis client."""
+
+    def _get(self, key: str) -> bytes | None:
+        return get_redis_client().get(f"{LLM_RESPONSE_CACHE_PREFIX}_{key}")
+
+    def _set(self, key: str, serialized: str) -> None:
+        get_redis_client().set(
+            f"{LLM_RESPONSE_CACHE_PREFIX}_{key}", serialized, ex=self.ttl
+        )
+
+
+class DiskLLMResponseCache(LLMResponseCache):
+    """One file per response in a directory per tenant. Meant for single node
+    deployments and local development, expired files are only removed when read."""
+
+    def __init__(
+        self, directory: str = LLM_RESPONSE_CACHE_DIR, ttl: int = LLM_RESPONSE_CACHE_TTL
+    ) -> None:
+        super().__init__(ttl)
+        self.directory = directory
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, get_current_tenant_id(), f"{key}.json")
+
+    def _get(self, key: str) -> str | None:
+        path = self._path(key)
+        try:
+            with open(path) as f:
+                entry = json.load(f)
+        except FileNotFoundError:
+            return None
+
+        if entry["expires_at"] < time.time():
+            os.remove(path)
+            return None
+        return entry["response"]
+
+    def _set(self, key: str, serialized: str) -> None:
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # write to a temporary file first so that readers never see a partial entry
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path))
+        with os.fdopen(fd, "w") as f:
+            json.dump({"expires_at": time.time() + self.ttl, "response": serialized}, f)
+        os.replace(tmp_path, path)
+
+
+@functools.lru_cache(maxsize=1)
+def get_llm_response_cache() -> LLMResponseCache | None:
+    """The configured cache, None if LLM_RESPONSE_CACHE_BACKEND is not set"""
+    if LLM_RESPONSE_CACHE_BACKEND == "redis":
+        return RedisLLMResponseCache()
+    if LLM_RESPONSE_CACHE_BACKEND == "disk":
+        return DiskLLMResponseCache()
+    if LLM_RESPONSE_CACHE_BACKEND:
+        logger.warning(
+            f"Unknown LLM_RESPONSE_CACHE_BACKEND {LLM_RESPONSE_CACHE_BACKEND}, "
+            "LLM responses will not be cached"
+        )
+    return None
@@ -3,8 +3,6 @@ import json
 import threading
 import time
 from collections.abc import Callable
-from concurrent.futures import as_completed
-from concurrent.futures import ThreadPoolExecutor
 from functools import partial
 from functools import wraps
 from types import TracebackType
@@ -42,9 +40,10 @@ from onyx.natural_language_processing.exceptions import (
     ModelServerRateLimitError,
 )
 from onyx.natural_language_processing.utils import get_tokenizer
-from onyx.natural_language_processing.utils import tokenizer_trim_content
+from onyx.natural_language_processing.utils import tokenizer_trim_contents
 from onyx.utils.logger import setup_logger
 from onyx.utils.search_nlp_models_utils import pass_aws_key
+from onyx.utils.threadpool_concurrency import run_functions_tuples_in_parallel
 from shared_configs.configs import API_BASED_EMBEDDING_TIMEOUT
 from shared_configs.configs import INDEXING_MODEL_SERVER_HOST
 from shared_configs.configs import INDEXING_MODEL_SERVER_PORT
@@ -191,10 +190,7 @@ class CloudEmbedding:
 
         # Use the OpenAI specific timeout for this one
         # Support custom base_url for Metis AI or other OpenAI-compatible providers
-        client_params = {
-            "api_key": self.api_key,
-            "timeout": OPENAI_EMBEDDING_TIMEOUT
-        }
+        client_params = {"api_key": self.api_key, "timeout": OPENAI_EMBEDDING_TIMEOUT}
 
         if self.api_url:
             client_params["base_url"] = self.api_url
@@ -759,35 +755,32 @@ class EmbeddingModel:
         #   2. we are using an API-based embedding model (provider_type is not None)
         #   3. there are more than 1 batch (no point in threading if only 1)
         if num_threads >= 1 and self.provider_type and len(text_batches) > 1:
-            with ThreadPoolExecutor(max_workers=num_threads) as executor:
-                future_to_batch = {
-                    executor.submit(
-                        partial(
-                            process_batch,
-                            idx,
-                            len(text_batches),
-                            batch,
-                            tenant_id=tenant_id,
-                            request_id=request_id,
-                        )
-                    ): idx
-                    for idx, batch in enumerate(text_batches, start=1)
-                }
-
-                # Collect results in order
-                batch_results: list[tuple[int, list[Embedding]]] = []
-                for future in as_completed(future_to_batch):
-                    try:
-                        result = future.result()
-                        batch_results.append(result)
-                    except Exception as e:
-                        logger.exception("Embedding model failed to process batch")
-                        raise e
-
-                # Sort by batch index and extend embeddings
-                batch_results.sort(key=lambda x: x[0])
-                for _, batch_embeddings in batch_results:
-                    embeddings.extend(batch_embeddings)
+            # runs on the shared IO pool rather than spinning up a new
+            # executor for every call
+            try:
+                batch_results: list[tuple[int, list[Embedding]]] = (
+                    run_functions_tuples_in_parallel(
+                        [
+                            (
+                                partial(
+                                    process_batch,
+                                    tenant_id=tenant_id,
+                                    request_id=request_id,
+                                ),
+                                (idx, len(text_batches), batch),
+                            )
+                            for idx, batch in enumerate(text_batches, start=1)
+                        ],
+                        max_workers=num_threads,
+                    )
+                )
+            except Exception:
+                logger.exception("Embedding model failed to process batch")
+                raise
+
+            # Results are returned in batch order
+            for _, batch_embeddings in batch_results:
+                embeddings.extend(batch_embeddings)
         else:
             # Original sequential processing
             for idx, text_batch in enumerate(text_batches, start=1):
@@ -823,14 +816,11 @@ class EmbeddingModel:
             # This is applied during indexing as a catchall for overly long titles (or other uncapped fields)
             # Note that this uses just the default tokenizer which may also lead to very minor miscountings
             # However this slight miscounting is very unlikely to have any material impact.
-            texts = [
-                tokenizer_trim_content(
-                    content=text,
-                    desired_length=max_seq_length,
-                    tokenizer=self.tokenizer,
-                )
-                for text in texts
-            ]
+            texts = tokenizer_trim_contents(
+                contents=texts,
+                desired_length=max_seq_length,
+                tokenizer=self.tokenizer,
+            )
 
         batch_size = (
             api_embedding_batch_size
@@ -32,6 +32,9 @@ class BaseTokenizer(ABC):
     def decode(self, tokens: list[int]) -> str:
         pass
 
+    def encode_batch(self, strings: list[str]) -> list[list[int]]:
+        return [self.encode(string) for string in strings]
+
 
 class TiktokenTokenizer(BaseTokenizer):
     _instances: dict[str, "TiktokenTokenizer"] = {}
@@ -51,6 +54,9 @@ class TiktokenTokenizer(BaseTokenizer):
         # this ignores special tokens that the model is trained on, see encode_ordinary for details
         return self.encoder.encode_ordinary(string)
 
+    def encode_batch(self, strings: list[str]) -> list[list[int]]:
+        return self.encoder.encode_ordinary_batch(strings)
+
     def tokenize(self, string: str) -> list[str]:
         encoded = self.encode(string)
         decoded = [self.encoder.decode([token]) for token in encoded]
@@ -87,6 +93,14 @@ class HuggingFaceTokenizer(BaseTokenizer):
         # this returns no special tokens
         return self._safer_encode(string).ids
 
+    def encode_batch(self, strings: list[str]) -> list[list[int]]:
+        # a single call into the Rust tokenizer instead of one per string
+        try:
+            encodings = self.encoder.encode_batch(strings, add_special_tokens=False)
+        except Exception:
+            return [self.encode(string) for string in strings]
+        return [encoding.ids for encoding in encodings]
+
     def tokenize(self, string: str) -> list[str]:
         return self._safer_encode(string).tokens
 
@@ -94,6 +108,47 @@ class HuggingFaceTokenizer(BaseTokenizer):
         return self.encoder.decode(tokens)
 
 
+class TokenCountCache:
+    """
+    Memoized token counts for a single tokenizer. Callable, so it can be handed
+    to chonkie as a token counter.
+
+    Chunking counts the same text many times over: every sentence is counted by
+    the chunk, blurb and mini-chunk splitters, and each section again when it is
+    packed into a chunk. Callers should clear the cache between documents.
+    """
+
+    def __init__(self, tokenizer: BaseTokenizer, max_entries: int = 100_000):
+        self.tokenizer = tokenizer
+        self.max_entries = max_entries
+        self._counts: dict[str, int] = {}
+
+    def __call__(self, text: str) -> int:
+        count = self._counts.get(text)
+        if count is None:
+            count = len(self.tokenizer.encode(text))
+            self._store(text, count)
+        return count
+
+    def count_batch(self, texts: list[str]) -> list[int]:
+        """Counts all texts, encoding the ones not seen before in a single batch."""
+        counts = {text: self._counts[text] for text in texts if text in self._counts}
+        missing = [text for text in dict.fromkeys(texts) if text not in counts]
+        if missing:
+            for text, tokens in zip(missing, self.tokenizer.encode_batch(missing)):
+                counts[text] = len(tokens)
+                self._store(text, len(tokens))
+        return [counts[text] for text in texts]
+
+    def clear(self) -> None:
+        self._counts.clear()
+
+    def _store(self, text: str, count: int) -> None:
+        # stop memoizing rather than grow without bound on pathological documents
+        if len(self._counts) < self.max_entries:
+            self._counts[text] = count
+
+
 _TOKENIZER_CACHE: dict[tuple[EmbeddingProvider | None, str | None], BaseTokenizer] = {}
 
 
@@ -185,6 +240,20 @@ def tokenizer_trim_content(
     return tokenizer.decode(tokens[:desired_length])
 
 
+def tokenizer_trim_contents(
+    contents: list[str], desired_length: int, tokenizer: BaseTokenizer
+) -> list[str]:
+    """Batched tokenizer_trim_content, only decoding the contents that are too long."""
+    return [
+        (
+            content
+            if len(tokens) <= desired_length
+            else tokenizer.decode(tokens[:desired_length])
+        )
+        for content, tokens in zip(contents, tokenizer.encode_batch(contents))
+    ]
+
+
 def tokenizer_trim_middle(
     tokens: list[int], desired_length: int, tokenizer: BaseTokenizer
 ) -> str:
@@ -207,8 +276,10 @@ def tokenizer_trim_chunks(
     max_chunk_toks: int = DOC_EMBEDDING_CONTEXT_SIZE,
 ) -> list[InferenceChunk]:
     new_chunks = copy(chunks)
-    for ind, chunk in enumerate(new_chunks):
-        new_content = tokenizer_trim_content(chunk.content, max_chunk_toks, tokenizer)
+    new_contents = tokenizer_trim_contents(
+        [chunk.content for chunk in chunks], max_chunk_toks, tokenizer
+    )
+    for ind, (chunk, new_content) in enumerate(zip(chunks, new_contents)):
         if len(new_content) != len(chunk.content):
             new_chunk = copy(chunk)
             new_chunk.content = new_content
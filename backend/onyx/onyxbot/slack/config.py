@@ -7,6 +7,8 @@ from onyx.db.slack_channel_config import (
     fetch_slack_channel_config_for_channel_or_default,
 )
 from onyx.db.slack_channel_config import fetch_slack_channel_configs
+from onyx.onyxbot.slack.cache import TTLCache
+from shared_configs.contextvars import get_current_tenant_id
 
 VALID_SLACK_FILTERS = [
     "answerable_prefilter",
@@ -20,6 +22,16 @@ def get_slack_channel_config_for_bot_and_channel(
     slack_bot_id: int,
     channel_name: str | None,
 ) -> SlackChannelConfig:
+    """Which config applies to a channel is cached for SLACK_CHANNEL_CACHE_TTL, the
+    config itself is always loaded fresh by its primary key"""
+    cache_key = (get_current_tenant_id(), slack_bot_id, channel_name)
+    slack_channel_config_id = _slack_channel_config_id_cache.get(cache_key)
+    if slack_channel_config_id is not None:
+        slack_bot_config = db_session.get(SlackChannelConfig, slack_channel_config_id)
+        if slack_bot_config:
+            return slack_bot_config
+        _slack_channel_config_id_cache.delete(cache_key)
+
     slack_bot_config = fetch_slack_channel_config_for_channel_or_default(
         db_session=db_session, slack_bot_id=slack_bot_id, channel_name=channel_name
     )
@@ -28,6 +40,7 @@ def get_slack_channel_config_for_bot_and_channel(
             "No default configuration has been set for this Slack bot. This should not be possible."
         )
 
+    _slack_channel_config_id_cache.set(cache_key, slack_bot_config.id)
     return slack_bot_config
 
 
@@ -69,3 +82,25 @@ TENANT_HEARTBEAT_EXPIRATION = (
 TENANT_ACQUISITION_INTERVAL = 60  # How often pods attempt to acquire unprocessed tenants and checks for new tokens
 
 MAX_TENANTS_PER_POD = int(os.getenv("MAX_TENANTS_PER_POD", 50))
+
+# Slack events are processed by a pool of workers shared by all tenants on the pod,
+# picking the next event round robin across tenants
+NUM_SLACK_EVENT_WORKERS = int(os.getenv("NUM_SLACK_EVENT_WORKERS", 16))
+# Most events of a single tenant processed at the same time, so that one busy tenant
+# can not occupy every worker
+MAX_CONCURRENT_SLACK_EVENTS_PER_TENANT = int(
+    os.getenv("MAX_CONCURRENT_SLACK_EVENTS_PER_TENANT", 4)
+)
+# Events of a tenant waiting for a worker, new events are dropped once this is reached
+MAX_QUEUED_SLACK_EVENTS_PER_TENANT = int(
+    os.getenv("MAX_QUEUED_SLACK_EVENTS_PER_TENANT", 100)
+)
+# How long the channel info fetched from Slack and the channel config matched to a
+# channel are reused before being looked up again
+SLACK_CHANNEL_CACHE_TTL = int(os.getenv("SLACK_CHANNEL_CACHE_TTL", 300))
+SLACK_CHANNEL_CACHE_SIZE = int(os.getenv("SLACK_CHANNEL_CACHE_SIZE", 10_000))
+
+# (tenant id, slack bot id, channel name) -> id of the channel config that applies
+_slack_channel_config_id_cache: TTLCache[tuple[str, int, str | None], int] = TTLCache(
+    ttl=SLACK_CHANNEL_CACHE_TTL, maxsize=SLACK_CHANNEL_CACHE_SIZE
+)
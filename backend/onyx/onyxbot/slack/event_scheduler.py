@@ -0,0 +1,150 @@
+"""
+Processing of Slack events off the socket mode listener threads.
+
+Events are acknowledged as soon as they arrive and then put on a bounded queue per
+tenant. A fixed pool of workers takes events from the tenants round robin, and never
+runs more than max_concurrent_per_tenant events of the same tenant at once, so a
+tenant with a burst of questions or slow LLM calls can not hold up the others. Once
+a tenant's queue is full, its new events are dropped instead of piling up.
+"""
+
+import threading
+from collections import deque
+from collections import OrderedDict
+from collections.abc import Callable
+
+from prometheus_client import Counter
+from prometheus_client import Gauge
+
+from onyx.configs.app_configs import POD_NAME
+from onyx.configs.app_configs import POD_NAMESPACE
+from onyx.onyxbot.slack.config import MAX_CONCURRENT_SLACK_EVENTS_PER_TENANT
+from onyx.onyxbot.slack.config import MAX_QUEUED_SLACK_EVENTS_PER_TENANT
+from onyx.onyxbot.slack.config import NUM_SLACK_EVENT_WORKERS
+from onyx.utils.logger import setup_logger
+from shared_configs.contextvars import CURRENT_TENANT_ID_CONTEXTVAR
+
+logger = setup_logger()
+
+queued_events_gauge = Gauge(
+    "slack_bot_queued_events",
+    "Number of Slack events waiting for a worker",
+    ["namespace", "pod"],
+)
+dropped_events_counter = Counter(
+    "slack_bot_dropped_events",
+    "Number of Slack events dropped because their tenant's queue was full",
+    ["namespace", "pod"],
+)
+
+
+class TenantEventScheduler:
+    def __init__(
+        self,
+        num_workers: int = NUM_SLACK_EVENT_WORKERS,
+        max_concurrent_per_tenant: int = MAX_CONCURRENT_SLACK_EVENTS_PER_TENANT,
+        max_queued_per_tenant: int = MAX_QUEUED_SLACK_EVENTS_PER_TENANT,
+    ) -> None:
+        self.max_concurrent_per_tenant = max_concurrent_per_tenant
+        self.max_queued_per_tenant = max_queued_per_tenant
+
+        # tenants with queued events, in the order they get their next turn
+        self._queues: OrderedDict[str, deque[Callable[[], None]]] = OrderedDict()
+        self._num_running: dict[str, int] = {}
+        self._num_queued = 0
+        self._stopped = False
+        self._condition = threading.Condition()
+
+        self._workers = [
+            threading.Thread(
+                target=self._work, name=f"slack-event-worker-{i}", daemon=True
+            )
+            for i in range(num_workers)
+        ]
+        for worker in self._workers:
+            worker.start()
+
+    @property
+    def num_queued(self) -> int:
+        return self._num_queued
+
+    def submit(self, tenant_id: str, event: Callable[[], None]) -> bool:
+        """Queues event to be run with the tenant's context. Returns False if it was
+        dropped because the tenant already has too many queued events."""
+        with self._condition:
+            if self._stopped:
+                return False
+
+            queue = self._queues.setdefault(tenant_id, deque())
+            if len(queue) >= self.max_queued_per_tenant:
+                dropped_events_counter.labels(
+                    namespace=POD_NAMESPACE, pod=POD_NAME
+                ).inc()
+                return False
+
+            queue.append(event)
+            self._set_num_queued(self._num_queued + 1)
+            self._condition.notify()
+            return True
+
+    def stop(self, timeout: float | None = None) -> None:
+        """Stops the workers once they finish the event they are running, queued
+        events are discarded"""
+        with self._condition:
+            self._stopped = True
+            self._queues.clear()
+            self._set_num_queued(0)
+            self._condition.notify_all()
+
+        for worker in self._workers:
+            worker.join(timeout=timeout)
+
+    def _set_num_queued(self, num_queued: int) -> None:
+        self._num_queued = num_queued
+        queued_events_gauge.labels(namespace=POD_NAMESPACE, pod=POD_NAME).set(
+            num_queued
+        )
+
+    def _next_event(self) -> tuple[str, Callable[[], None]] | None:
+        """Takes the next event of the first tenant in line that is below its
+        concurrency limit and sends that tenant to the back of the line"""
+        for tenant_id, queue in self._queues.items():
+            if self._num_running.get(tenant_id, 0) >= self.max_concurrent_per_tenant:
+                continue
+
+            event = queue.popleft()
+            if queue:
+                self._queues.move_to_end(tenant_id)
+            else:
+                del self._queues[tenant_id]
+
+            self._num_running[tenant_id] = self._num_running.get(tenant_id, 0) + 1
+            self._set_num_queued(self._num_queued - 1)
+            return tenant_id, event
+
+        return None
+
+    def _work(self) -> None:
+        while True:
+            with self._condition:
+                next_event = self._next_event()
+                while next_event is None and not self._stopped:
+                    self._condition.wait()
+                    next_event = self._next_event()
+                if next_event is None:
+                    return
+
+            tenant_id, event = next_event
+            token = CURRENT_TENANT_ID_CONTEXTVAR.set(tenant_id)
+            try:
+                event()
+            except Exception:
+                logger.exception(f"Failed to process Slack event: {tenant_id=}")
+            finally:
+                CURRENT_TENANT_ID_CONTEXTVAR.reset(token)
+                with self._condition:
+                    self._num_running[tenant_id] -= 1
+                    if not self._num_running[tenant_id]:
+                        del self._num_running[tenant_id]
+                    # an event of this tenant may have been waiting for the slot
+                    self._condition.notify()
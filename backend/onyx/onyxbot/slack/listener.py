@@ -65,6 +65,7 @@ from onyx.onyxbot.slack.constants import KEEP_TO_YOURSELF_ACTION_ID
 from onyx.onyxbot.slack.constants import LIKE_BLOCK_ACTION_ID
 from onyx.onyxbot.slack.constants import SHOW_EVERYONE_ACTION_ID
 from onyx.onyxbot.slack.constants import VIEW_DOC_FEEDBACK_ID
+from onyx.onyxbot.slack.event_scheduler import TenantEventScheduler
 from onyx.onyxbot.slack.handlers.handle_buttons import handle_doc_feedback_button
 from onyx.onyxbot.slack.handlers.handle_buttons import handle_followup_button
 from onyx.onyxbot.slack.handlers.handle_buttons import (
@@ -154,6 +155,10 @@ class SlackbotHandler:
 
         self._lock = threading.Lock()
 
+        # Events of all tenants are processed here instead of on the socket clients'
+        # listener threads, so that slow or bursty tenants don't block the others
+        self.event_scheduler = TenantEventScheduler()
+
         logger.info(f"Pod ID: {self.pod_id}")
 
         # Set up signal handlers for graceful shutdown
@@ -265,7 +270,7 @@ class SlackbotHandler:
                 self.socket_clients[tenant_bot_pair].close()
 
             socket_client = self.start_socket_client(
-                bot.id, tenant_id, slack_bot_tokens
+                bot.id, tenant_id, slack_bot_tokens, self.event_scheduler
             )
             if socket_client:
                 # Ensure tenant is tracked as active
@@ -300,6 +305,9 @@ class SlackbotHandler:
             if tenant_id not in gated_tenants
         ]
 
+        # tenants whose bots were already fetched in this cycle
+        checked_tenant_ids: set[str] = set()
+
         # 1) Try to acquire locks for new tenants
         for tenant_id in all_active_tenants:
             if (
@@ -350,6 +358,7 @@ class SlackbotHandler:
             token = CURRENT_TENANT_ID_CONTEXTVAR.set(
                 tenant_id or POSTGRES_DEFAULT_SCHEMA
             )
+            checked_tenant_ids.add(tenant_id)
             try:
                 with get_session_with_tenant(tenant_id=tenant_id) as db_session:
                     bots: list[SlackBot] = []
@@ -388,7 +397,7 @@ class SlackbotHandler:
                 CURRENT_TENANT_ID_CONTEXTVAR.reset(token)
 
         # 2) Make sure tenants we're handling still have Slack bots
-        for tenant_id in list(self.tenant_ids):
+        for tenant_id in list(self.tenant_ids - checked_tenant_ids):
             token = CURRENT_TENANT_ID_CONTEXTVAR.set(
                 tenant_id or POSTGRES_DEFAULT_SCHEMA
             )
@@ -466,7 +475,10 @@ class SlackbotHandler:
 
     @staticmethod
     def start_socket_client(
-        slack_bot_id: int, tenant_id: str, slack_bot_tokens: SlackBotTokens
+        slack_bot_id: int,
+        tenant_id: str,
+        slack_bot_tokens: SlackBotTokens,
+        event_scheduler: TenantEventScheduler,
     ) -> TenantSocketModeClient | None:
         """Returns the socket client if this succeeds"""
         socket_client: TenantSocketModeClient = _get_socket_client(
@@ -509,7 +521,7 @@ class SlackbotHandler:
             )
 
         # Append the event handler
-        process_slack_event = create_process_slack_event()
+        process_slack_event = create_process_slack_event(event_scheduler)
         socket_client.socket_mode_request_listeners.append(process_slack_event)  # type: ignore
 
         # Establish a WebSocket connection to the Socket Mode servers
@@ -555,6 +567,13 @@ class SlackbotHandler:
         logger.info(f"Stopping {len(self.socket_clients)} socket clients")
         SlackbotHandler.stop_socket_clients(self.pod_id, self.socket_clients)
 
+        # Let the events that are being processed finish, queued ones are dropped
+        logger.info(
+            f"Stopping Slack event workers, {self.event_scheduler.num_queued} queued "
+            "events dropped"
+        )
+        self.event_scheduler.stop(timeout=60.0)
+
         # Release locks for all tenants we currently hold
         logger.info(f"Releasing locks for {len(self.tenant_ids)} tenants")
         for tenant_id in list(self.tenant_ids):
@@ -1076,9 +1095,22 @@ def view_routing(req: SocketModeRequest, client: TenantSocketModeClient) -> None
             return process_feedback(req, client)
 
 
-def create_process_slack_event() -> (
-    Callable[[TenantSocketModeClient, SocketModeRequest], None]
-):
+def route_slack_event(req: SocketModeRequest, client: TenantSocketModeClient) -> None:
+    try:
+        if req.type == "interactive":
+            if req.payload.get("type") == "block_actions":
+                return action_routing(req, client)
+            elif req.payload.get("type") == "view_submission":
+                return view_routing(req, client)
+        elif req.type == "events_api" or req.type == "slash_commands":
+            return process_message(req, client)
+    except Exception:
+        logger.exception("Failed to process slack event")
+
+
+def create_process_slack_event(
+    event_scheduler: TenantEventScheduler,
+) -> Callable[[TenantSocketModeClient, SocketModeRequest], None]:
     def process_slack_event(
         client: TenantSocketModeClient, req: SocketModeRequest
     ) -> None:
@@ -1086,16 +1118,14 @@ def create_process_slack_event() -> (
         # it will assume the Bot is DEAD!!! :(
         acknowledge_message(req, client)
 
-        try:
-            if req.type == "interactive":
-                if req.payload.get("type") == "block_actions":
-                    return action_routing(req, client)
-                elif req.payload.get("type") == "view_submission":
-                    return view_routing(req, client)
-            elif req.type == "events_api" or req.type == "slash_commands":
-                return process_message(req, client)
-        except Exception:
-            logger.exception("Failed to process slack event")
+        # The processing waits for its turn among the other tenants' events
+        if not event_scheduler.submit(
+            get_current_tenant_id(), lambda: route_slack_event(req, client)
+        ):
+            logger.warning(
+                f"Too many queued slack events, dropping event: {client.slack_bot_id=} "
+                f"{req.type=} {req.envelope_id=}"
+            )
 
     return process_slack_event
 
@@ -38,6 +38,9 @@ from onyx.llm.exceptions import GenAIDisabledException
 from onyx.llm.factory import get_default_llms
 from onyx.llm.utils import dict_based_prompt_to_langchain_prompt
 from onyx.llm.utils import message_to_string
+from onyx.onyxbot.slack.cache import TTLCache
+from onyx.onyxbot.slack.config import SLACK_CHANNEL_CACHE_SIZE
+from onyx.onyxbot.slack.config import SLACK_CHANNEL_CACHE_TTL
 from onyx.onyxbot.slack.constants import FeedbackVisibility
 from onyx.onyxbot.slack.models import ChannelType
 from onyx.onyxbot.slack.models import ThreadMessage
@@ -54,6 +57,11 @@ slack_token_user_ids: dict[str, str | None] = {}
 slack_token_bot_ids: dict[str, str | None] = {}
 slack_token_lock = threading.Lock()
 
+# (bot token, channel id) -> (channel name, is dm)
+_channel_name_cache: TTLCache[tuple[str | None, str], tuple[str | None, bool]] = (
+    TTLCache(ttl=SLACK_CHANNEL_CACHE_TTL, maxsize=SLACK_CHANNEL_CACHE_SIZE)
+)
+
 _ONYX_BOT_MESSAGE_COUNT: int = 0
 _ONYX_BOT_COUNT_START_TIME: float = time.time()
 
@@ -462,10 +470,17 @@ def get_channel_from_id(client: WebClient, channel_id: str) -> dict[str, Any]:
 def get_channel_name_from_id(
     client: WebClient, channel_id: str
 ) -> tuple[str | None, bool]:
+    """Cached for SLACK_CHANNEL_CACHE_TTL, since this is looked up for every message"""
+    cache_key = (client.token, channel_id)
+    cached = _channel_name_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
     try:
         channel_info = get_channel_from_id(client, channel_id)
         name = channel_info.get("name")
         is_dm = any([channel_info.get("is_im"), channel_info.get("is_mpim")])
+        _channel_name_cache.set(cache_key, (name, is_dm))
         return name, is_dm
     except SlackApiError as e:
         logger.exception(f"Couldn't fetch channel name from id: {channel_id}")
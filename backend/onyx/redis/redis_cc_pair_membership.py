@@ -0,0 +1,105 @@
+import json
+from collections.abc import Callable
+from collections.abc import Sequence
+
+from redis import Redis
+from sqlalchemy.orm import Session
+
+from onyx.access.utils import prefix_user_group
+from onyx.configs.app_configs import CC_PAIR_MEMBERSHIP_CACHE_TTL
+from onyx.db.document_set import fetch_cc_pair_ids_for_document_sets
+from onyx.db.engine.sql_engine import get_session_with_current_tenant
+from onyx.redis.redis_pool import get_redis_client
+from onyx.utils.variable_functionality import fetch_ee_implementation_or_noop
+
+# Caches which cc_pairs belong to a document set / user group, used to turn document
+# set and user group filters into cc_pair id filters at query time.
+# See RESOLVE_DOC_SETS_AND_GROUPS_AT_QUERY_TIME
+DOCUMENT_SET_CC_PAIRS_PREFIX = "documentset_cc_pairs"
+USER_GROUP_CC_PAIRS_PREFIX = "usergroup_cc_pairs"
+
+
+def _get_cc_pair_ids(
+    prefix: str,
+    names: list[str],
+    fetch_cc_pair_ids: Callable[[Session, list[str]], Sequence[tuple[str, list[int]]]],
+) -> list[int]:
+    if not names:
+        return []
+
+    r = get_redis_client()
+    pipe = r.pipeline()
+    for name in names:
+        pipe.get(f"{prefix}_{name}")
+
+    cc_pair_ids: set[int] = set()
+    missing_names: list[str] = []
+    for name, cached in zip(names, pipe.execute()):
+        if cached is None:
+            missing_names.append(name)
+        else:
+            cc_pair_ids.update(json.loads(cached))
+
+    if not missing_names:
+        return sorted(cc_pair_ids)
+
+    with get_session_with_current_tenant() as db_session:
+        name_to_cc_pair_ids = dict(fetch_cc_pair_ids(db_session, missing_names))
+
+    pipe = r.pipeline()
+    for name in missing_names:
+        name_cc_pair_ids = name_to_cc_pair_ids.get(name, [])
+        cc_pair_ids.update(name_cc_pair_ids)
+        pipe.set(
+            f"{prefix}_{name}",
+            json.dumps(name_cc_pair_ids),
+            ex=CC_PAIR_MEMBERSHIP_CACHE_TTL,
+        )
+    pipe.execute()
+
+    return sorted(cc_pair_ids)
+
+
+def get_cc_pair_ids_for_document_sets(document_set_names: list[str]) -> list[int]:
+    """Returns the ids of all cc_pairs in any of the document sets"""
+    return _get_cc_pair_ids(
+        DOCUMENT_SET_CC_PAIRS_PREFIX,
+        document_set_names,
+        fetch_cc_pair_ids_for_document_sets,
+    )
+
+
+def get_cc_pair_ids_for_user_groups(user_group_names: list[str]) -> list[int]:
+    """Returns the ids of all cc_pairs any of the user groups has access to"""
+    return _get_cc_pair_ids(
+        USER_GROUP_CC_PAIRS_PREFIX,
+        user_group_names,
+        fetch_ee_implementation_or_noop(
+            "onyx.db.user_group", "fetch_cc_pair_ids_for_user_groups", []
+        ),
+    )
+
+
+def resolve_user_groups_in_acl(
+    access_control_list: list[str],
+) -> tuple[list[str], list[int]]:
+    """Splits the user group entries off an ACL from get_acl_for_user. Returns the
+    remaining ACL entries and the ids of the cc_pairs the user groups have access to."""
+    user_group_prefix = prefix_user_group("")
+    acl_entries: list[str] = []
+    user_group_names: list[str] = []
+    for acl_entry in access_control_list:
+        if acl_entry.startswith(user_group_prefix):
+            user_group_names.append(acl_entry[len(user_group_prefix) :])
+        else:
+            acl_entries.append(acl_entry)
+
+    return acl_entries, get_cc_pair_ids_for_user_groups(user_group_names)
+
+
+def invalidate_document_set_cc_pair_ids(r: Redis, document_set_name: str) -> None:
+    r.delete(f"{DOCUMENT_SET_CC_PAIRS_PREFIX}_{document_set_name}")
+
+
+def invalidate_user_group_cc_pair_ids(r: Redis, user_group_name: str) -> None:
+    r.delete(f"{USER_GROUP_CC_PAIRS_PREFIX}_{user_group_name}")
@@ -0,0 +1,29 @@
+import json
+from uuid import UUID
+
+from redis import Redis
+
+from onyx.configs.chat_configs import CHAT_MAINLINE_CACHE_TTL
+
+# Caches the ids of the mainline messages of a chat session (root message first), so
+# that building the chat history only has to follow the pointers of the new messages.
+# The cached ids are only a hint, they are validated against the messages themselves
+# on every read, so writers never need to invalidate them.
+CHAT_MAINLINE_PREFIX = "chatsession_mainline"
+
+
+def get_cached_mainline_message_ids(r: Redis, chat_session_id: UUID) -> list[int]:
+    cached = r.get(f"{CHAT_MAINLINE_PREFIX}_{chat_session_id}")
+    if cached is None:
+        return []
+    return json.loads(cached)
+
+
+def set_cached_mainline_message_ids(
+    r: Redis, chat_session_id: UUID, message_ids: list[int]
+) -> None:
+    r.set(
+        f"{CHAT_MAINLINE_PREFIX}_{chat_session_id}",
+        json.dumps(message_ids),
+        ex=CHAT_MAINLINE_CACHE_TTL,
+    )
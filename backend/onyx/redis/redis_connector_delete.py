@@ -1,4 +1,5 @@
 import time
+from collections.abc import Iterable
 from datetime import datetime
 from typing import cast
 from uuid import uuid4
@@ -9,6 +10,7 @@ from pydantic import BaseModel
 from redis.lock import Lock as RedisLock
 from sqlalchemy.orm import Session
 
+from onyx.configs.app_configs import CONNECTOR_DELETION_BULK_BATCH_SIZE
 from onyx.configs.app_configs import DB_YIELD_PER_DEFAULT
 from onyx.configs.constants import CELERY_VESPA_SYNC_BEAT_LOCK_TIMEOUT
 from onyx.configs.constants import OnyxCeleryPriority
@@ -16,6 +18,9 @@ from onyx.configs.constants import OnyxCeleryQueues
 from onyx.configs.constants import OnyxCeleryTask
 from onyx.configs.constants import OnyxRedisConstants
 from onyx.db.connector_credential_pair import get_connector_credential_pair_from_id
+from onyx.db.document import (
+    construct_document_deletion_run_select_for_connector_credential_pair,
+)
 from onyx.db.document import construct_document_id_select_for_connector_credential_pair
 
 
@@ -99,6 +104,58 @@ class RedisConnectorDelete:
 
         return f"{self.PREFIX}_{self.id}_{uuid4()}"
 
+    def generate_document_task(
+        self,
+        celery_app: Celery,
+        document_id: str,
+        connector_id: int,
+        credential_id: int,
+    ) -> None:
+        custom_task_id = self._generate_task_id()
+
+        # add to the tracking taskset in redis BEFORE creating the celery task.
+        # note that for the moment we are using a single taskset key, not differentiated by cc_pair id
+        self.redis.sadd(self.taskset_key, custom_task_id)
+
+        # Priority on sync's triggered by new indexing should be medium
+        celery_app.send_task(
+            OnyxCeleryTask.DOCUMENT_BY_CC_PAIR_CLEANUP_TASK,
+            kwargs=dict(
+                document_id=document_id,
+                connector_id=connector_id,
+                credential_id=credential_id,
+                tenant_id=self.tenant_id,
+            ),
+            queue=OnyxCeleryQueues.CONNECTOR_DELETION,
+            task_id=custom_task_id,
+            priority=OnyxCeleryPriority.MEDIUM,
+            ignore_result=True,
+        )
+
+    def _generate_bulk_task(
+        self,
+        celery_app: Celery,
+        document_id_runs: list[list[str]],
+        connector_id: int,
+        credential_id: int,
+    ) -> None:
+        custom_task_id = self._generate_task_id()
+        self.redis.sadd(self.taskset_key, custom_task_id)
+        celery_app.send_task(
+            OnyxCeleryTask.DOCUMENT_BY_CC_PAIR_BULK_CLEANUP_TASK,
+            kwargs=dict(
+                document_id_runs=document_id_runs,
+                connector_id=connector_id,
+                credential_id=credential_id,
+                cc_pair_id=self.id,
+                tenant_id=self.tenant_id,
+            ),
+            queue=OnyxCeleryQueues.CONNECTOR_DELETION,
+            task_id=custom_task_id,
+            priority=OnyxCeleryPriority.MEDIUM,
+            ignore_result=True,
+        )
+
     def generate_tasks(
         self,
         celery_app: Celery,
@@ -106,7 +163,11 @@ class RedisConnectorDelete:
         lock: RedisLock,
     ) -> int | None:
         """Returns None if the cc_pair doesn't exist.
-        Otherwise, returns an int with the number of generated tasks."""
+        Otherwise, returns an int with the number of generated tasks.
+
+        Documents that only belong to this cc_pair are deleted in bulk, batched by runs
+        of documents that are contiguous in Vespa so that each run can be deleted with
+        a single id range. Documents shared with other cc_pairs get one task each."""
         last_lock_time = time.monotonic()
 
         cc_pair = get_connector_credential_pair_from_id(
@@ -118,10 +179,28 @@ class RedisConnectorDelete:
 
         num_tasks_sent = 0
 
-        stmt = construct_document_id_select_for_connector_credential_pair(
-            cc_pair.connector_id, cc_pair.credential_id
-        )
-        for doc_id in db_session.scalars(stmt).yield_per(DB_YIELD_PER_DEFAULT):
+        # (document id, exclusive, run)
+        rows: Iterable[tuple[str, bool, int]]
+        if CONNECTOR_DELETION_BULK_BATCH_SIZE > 0:
+            run_stmt = (
+                construct_document_deletion_run_select_for_connector_credential_pair(
+                    cc_pair.connector_id, cc_pair.credential_id
+                )
+            )
+            rows = db_session.execute(run_stmt).tuples().yield_per(DB_YIELD_PER_DEFAULT)
+        else:
+            stmt = construct_document_id_select_for_connector_credential_pair(
+                cc_pair.connector_id, cc_pair.credential_id
+            )
+            rows = (
+                (doc_id, False, 0)
+                for doc_id in db_session.scalars(stmt).yield_per(DB_YIELD_PER_DEFAULT)
+            )
+
+        document_id_runs: list[list[str]] = []
+        num_bulk_documents = 0
+        last_run: int | None = None
+        for doc_id, exclusive, run in rows:
             doc_id = cast(str, doc_id)
             current_time = time.monotonic()
             if current_time - last_lock_time >= (
@@ -130,27 +209,38 @@ class RedisConnectorDelete:
                 lock.reacquire()
                 last_lock_time = current_time
 
-            custom_task_id = self._generate_task_id()
-
-            # add to the tracking taskset in redis BEFORE creating the celery task.
-            # note that for the moment we are using a single taskset key, not differentiated by cc_pair id
-            self.redis.sadd(self.taskset_key, custom_task_id)
-
-            # Priority on sync's triggered by new indexing should be medium
-            celery_app.send_task(
-                OnyxCeleryTask.DOCUMENT_BY_CC_PAIR_CLEANUP_TASK,
-                kwargs=dict(
-                    document_id=doc_id,
-                    connector_id=cc_pair.connector_id,
-                    credential_id=cc_pair.credential_id,
-                    tenant_id=self.tenant_id,
-                ),
-                queue=OnyxCeleryQueues.CONNECTOR_DELETION,
-                task_id=custom_task_id,
-                priority=OnyxCeleryPriority.MEDIUM,
-                ignore_result=True,
+            if not exclusive:
+                self.generate_document_task(
+                    celery_app, doc_id, cc_pair.connector_id, cc_pair.credential_id
+                )
+                num_tasks_sent += 1
+                continue
+
+            if document_id_runs and run == last_run:
+                document_id_runs[-1].append(doc_id)
+            else:
+                document_id_runs.append([doc_id])
+            last_run = run
+            num_bulk_documents += 1
+
+            if num_bulk_documents >= CONNECTOR_DELETION_BULK_BATCH_SIZE:
+                self._generate_bulk_task(
+                    celery_app,
+                    document_id_runs,
+                    cc_pair.connector_id,
+                    cc_pair.credential_id,
+                )
+                num_tasks_sent += 1
+                document_id_runs = []
+                num_bulk_documents = 0
+
+        if document_id_runs:
+            self._generate_bulk_task(
+                celery_app,
+                document_id_runs,
+                cc_pair.connector_id,
+                cc_pair.credential_id,
             )
-
             num_tasks_sent += 1
 
         return num_tasks_sent
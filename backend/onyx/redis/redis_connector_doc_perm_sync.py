@@ -173,29 +173,24 @@ class RedisConnectorPermissionSync:
         credential_id: int,
         task_logger: Logger | None = None,
     ) -> PermissionSyncResult:
-        """Update permissions for documents.
+        """Update permissions for documents. The documents are written as a single
+        batch, falling back to one document at a time if the batch fails so that a
+        bad document does not fail the others.
 
         Returns:
             PermissionSyncResult containing counts of successful updates and errors
         """
-        last_lock_time = time.monotonic()
-
+        document_update_permissions_batch_fn = fetch_versioned_implementation(
+            "onyx.background.celery.tasks.doc_permission_syncing.tasks",
+            "document_update_permissions_batch",
+        )
         document_update_permissions_fn = fetch_versioned_implementation(
             "onyx.background.celery.tasks.doc_permission_syncing.tasks",
             "document_update_permissions",
         )
 
-        num_permissions = 0
-        num_errors = 0
-        # Create a task for each document permission sync
+        permissions_batch: list[DocExternalAccess] = []
         for permissions in new_permissions:
-            current_time = time.monotonic()
-            if lock and current_time - last_lock_time >= (
-                CELERY_GENERIC_BEAT_LOCK_TIMEOUT / 4
-            ):
-                lock.reacquire()
-                last_lock_time = current_time
-
             if (
                 permissions.external_access.num_entries
                 > permissions.external_access.MAX_NUM_ENTRIES
@@ -213,11 +208,48 @@ class RedisConnectorPermissionSync:
                     )
                 continue
 
-            # NOTE(rkuo): this used to fire a task instead of directly writing to the DB,
-            # but the permissions can be excessively large if sent over the wire.
-            # On the other hand, the downside of doing db updates here is that we can
-            # block and fail if we can't make the calls to the DB ... but that's probably
-            # a rare enough case to be acceptable.
+            permissions_batch.append(permissions)
+
+        if not permissions_batch:
+            return PermissionSyncResult(num_updated=0, num_errors=0)
+
+        # a batch can take a while, so the lock is refreshed for every batch
+        if lock:
+            lock.reacquire()
+        last_lock_time = time.monotonic()
+
+        # NOTE(rkuo): this used to fire a task instead of directly writing to the DB,
+        # but the permissions can be excessively large if sent over the wire.
+        # On the other hand, the downside of doing db updates here is that we can
+        # block and fail if we can't make the calls to the DB ... but that's probably
+        # a rare enough case to be acceptable.
+        try:
+            document_update_permissions_batch_fn(
+                self.tenant_id,
+                permissions_batch,
+                source_string,
+                connector_id,
+                credential_id,
+            )
+            return PermissionSyncResult(
+                num_updated=len(permissions_batch), num_errors=0
+            )
+        except Exception:
+            if task_logger:
+                task_logger.exception(
+                    f"Failed to update permissions for a batch of "
+                    f"{len(permissions_batch)} documents, retrying one at a time"
+                )
+
+        num_permissions = 0
+        num_errors = 0
+        for permissions in permissions_batch:
+            current_time = time.monotonic()
+            if lock and current_time - last_lock_time >= (
+                CELERY_GENERIC_BEAT_LOCK_TIMEOUT / 4
+            ):
+                lock.reacquire()
+                last_lock_time = current_time
 
             # This can internally exception due to db issues but still continue
             # Catch exceptions per-document to avoid breaking the entire sync
@@ -3,6 +3,7 @@ import functools
 import json
 import ssl
 import threading
+from collections import OrderedDict
 from collections.abc import Callable
 from typing import Any
 from typing import cast
@@ -11,6 +12,7 @@ from typing import Optional
 import redis
 from fastapi import Request
 from redis import asyncio as aioredis
+from redis.client import Pipeline
 from redis.client import Redis
 from redis.lock import Lock as RedisLock
 
@@ -38,104 +40,141 @@ logger = setup_logger()
 
 SCAN_ITER_COUNT_DEFAULT = 4096
 
+_MAX_CACHED_TENANT_CLIENTS = 1024
+
+
+# Redis methods whose first argument (or `name` keyword) is a key that gets the
+# tenant prefix
+_PREFIXED_METHODS = (
+    "lock",
+    "get",
+    "set",
+    "delete",
+    "exists",
+    "incrby",
+    "hset",
+    "hget",
+    "getset",
+    "smembers",
+    "sismember",
+    "sadd",
+    "srem",
+    "scard",
+    "hexists",
+    "hdel",
+    "ttl",
+    "pttl",
+)
+
+# Scan methods whose `match` pattern gets the prefix and whose results have it removed
+_PREFIXED_SCAN_METHODS = ("scan_iter", "sscan_iter")
+
+
+def _prefix_key_method(method: Callable) -> Callable:
+    @functools.wraps(method)
+    def wrapper(self: "_TenantPrefixMixin", *args: Any, **kwargs: Any) -> Any:
+        if "name" in kwargs:
+            kwargs["name"] = self._prefixed(kwargs["name"])
+        elif len(args) > 0:
+            args = (self._prefixed(args[0]),) + args[1:]
+        return method(self, *args, **kwargs)
+
+    return wrapper
+
+
+def _prefix_scan_method(method: Callable) -> Callable:
+    @functools.wraps(method)
+    def wrapper(self: "_TenantPrefixMixin", *args: Any, **kwargs: Any) -> Any:
+        # Prefix the match pattern if provided
+        if "match" in kwargs:
+            kwargs["match"] = self._prefixed(kwargs["match"])
+        elif len(args) > 0:
+            args = (self._prefixed(args[0]),) + args[1:]
+
+        # Remove prefix from returned keys
+        prefix = self._prefix_bytes
+        prefix_len = len(prefix)
+        for key in method(self, *args, **kwargs):
+            if isinstance(key, bytes) and key.startswith(prefix):
+                yield key[prefix_len:]
+            else:
+                yield key
 
-class TenantRedis(redis.Redis):
-    def __init__(self, tenant_id: str, *args: Any, **kwargs: Any) -> None:
-        super().__init__(*args, **kwargs)
-        self.tenant_id: str = tenant_id
+    return wrapper
+
+
+class _TenantPrefixMixin:
+    """
+    Prefixes the keys of the methods above with the tenant id. The wrappers are
+    created once, when this module is imported, so attribute access on a tenant
+    client costs the same as on a raw client.
+    """
+
+    tenant_id: str
+    _prefix: str
+    _prefix_bytes: bytes
+
+    def _set_tenant(self, tenant_id: str) -> None:
+        self.tenant_id = tenant_id
+        self._prefix = f"{tenant_id}:"
+        self._prefix_bytes = self._prefix.encode()
 
     def _prefixed(self, key: str | bytes | memoryview) -> str | bytes | memoryview:
-        prefix: str = f"{self.tenant_id}:"
         if isinstance(key, str):
-            if key.startswith(prefix):
+            if key.startswith(self._prefix):
                 return key
             else:
-                return prefix + key
+                return self._prefix + key
         elif isinstance(key, bytes):
-            prefix_bytes = prefix.encode()
-            if key.startswith(prefix_bytes):
+            if key.startswith(self._prefix_bytes):
                 return key
             else:
-                return prefix_bytes + key
+                return self._prefix_bytes + key
         elif isinstance(key, memoryview):
             key_bytes = key.tobytes()
-            prefix_bytes = prefix.encode()
-            if key_bytes.startswith(prefix_bytes):
+            if key_bytes.startswith(self._prefix_bytes):
                 return key
             else:
-                return memoryview(prefix_bytes + key_bytes)
+                return memoryview(self._prefix_bytes + key_bytes)
         else:
             raise TypeError(f"Unsupported key type: {type(key)}")
 
-    def _prefix_method(self, method: Callable) -> Callable:
-        @functools.wraps(method)
-        def wrapper(*args: Any, **kwargs: Any) -> Any:
-            if "name" in kwargs:
-                kwargs["name"] = self._prefixed(kwargs["name"])
-            elif len(args) > 0:
-                args = (self._prefixed(args[0]),) + args[1:]
-            return method(*args, **kwargs)
-
-        return wrapper
-
-    def _prefix_scan_iter(self, method: Callable) -> Callable:
-        @functools.wraps(method)
-        def wrapper(*args: Any, **kwargs: Any) -> Any:
-            # Prefix the match pattern if provided
-            if "match" in kwargs:
-                kwargs["match"] = self._prefixed(kwargs["match"])
-            elif len(args) > 0:
-                args = (self._prefixed(args[0]),) + args[1:]
-
-            # Get the iterator
-            iterator = method(*args, **kwargs)
-
-            # Remove prefix from returned keys
-            prefix = f"{self.tenant_id}:".encode()
-            prefix_len = len(prefix)
-
-            for key in iterator:
-                if isinstance(key, bytes) and key.startswith(prefix):
-                    yield key[prefix_len:]
-                else:
-                    yield key
-
-        return wrapper
-
-    def __getattribute__(self, item: str) -> Any:
-        original_attr = super().__getattribute__(item)
-        methods_to_wrap = [
-            "lock",
-            "unlock",
-            "get",
-            "set",
-            "delete",
-            "exists",
-            "incrby",
-            "hset",
-            "hget",
-            "getset",
-            "owned",
-            "reacquire",
-            "create_lock",
-            "startswith",
-            "smembers",
-            "sismember",
-            "sadd",
-            "srem",
-            "scard",
-            "hexists",
-            "hset",
-            "hdel",
-            "ttl",
-            "pttl",
-        ]  # Regular methods that need simple prefixing
-
-        if item == "scan_iter" or item == "sscan_iter":
-            return self._prefix_scan_iter(original_attr)
-        elif item in methods_to_wrap and callable(original_attr):
-            return self._prefix_method(original_attr)
-        return original_attr
+
+for _method_name in _PREFIXED_METHODS:
+    setattr(
+        _TenantPrefixMixin,
+        _method_name,
+        _prefix_key_method(getattr(redis.Redis, _method_name)),
+    )
+for _method_name in _PREFIXED_SCAN_METHODS:
+    setattr(
+        _TenantPrefixMixin,
+        _method_name,
+        _prefix_scan_method(getattr(redis.Redis, _method_name)),
+    )
+
+
+class TenantPipeline(_TenantPrefixMixin, Pipeline):
+    def __init__(self, tenant_id: str, *args: Any, **kwargs: Any) -> None:
+        self._set_tenant(tenant_id)
+        super().__init__(*args, **kwargs)
+
+
+class TenantRedis(_TenantPrefixMixin, redis.Redis):
+    def __init__(self, tenant_id: str, *args: Any, **kwargs: Any) -> None:
+        self._set_tenant(tenant_id)
+        super().__init__(*args, **kwargs)
+
+    def pipeline(
+        self, transaction: bool = True, shard_hint: str | None = None
+    ) -> Pipeline:
+        return TenantPipeline(
+            self.tenant_id,
+            self.connection_pool,
+            self.response_callbacks,
+            transaction,
+            shard_hint,
+        )
 
 
 class RedisPool:
@@ -157,12 +196,33 @@ class RedisPool:
         self._replica_pool = RedisPool.create_pool(
             host=REDIS_REPLICA_HOST, ssl=REDIS_SSL
         )
+        # clients only hold a reference to the pool, so one per tenant is shared
+        # by every caller in the process instead of building one per call
+        self._tenant_clients: OrderedDict[tuple[str, bool], TenantRedis] = OrderedDict()
+        self._tenant_clients_lock = threading.Lock()
+
+    def _get_tenant_client(self, tenant_id: str, replica: bool) -> TenantRedis:
+        cache_key = (tenant_id, replica)
+        with self._tenant_clients_lock:
+            client = self._tenant_clients.get(cache_key)
+            if client is not None:
+                self._tenant_clients.move_to_end(cache_key)
+                return client
+
+            client = TenantRedis(
+                tenant_id,
+                connection_pool=self._replica_pool if replica else self._pool,
+            )
+            self._tenant_clients[cache_key] = client
+            if len(self._tenant_clients) > _MAX_CACHED_TENANT_CLIENTS:
+                self._tenant_clients.popitem(last=False)
+            return client
 
     def get_client(self, tenant_id: str) -> Redis:
-        return TenantRedis(tenant_id, connection_pool=self._pool)
+        return self._get_tenant_client(tenant_id, replica=False)
 
     def get_replica_client(self, tenant_id: str) -> Redis:
-        return TenantRedis(tenant_id, connection_pool=self._replica_pool)
+        return self._get_tenant_client(tenant_id, replica=True)
 
     def get_raw_client(self) -> Redis:
         """
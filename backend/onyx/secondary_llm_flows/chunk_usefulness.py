@@ -6,6 +6,7 @@ from onyx.llm.utils import dict_based_prompt_to_langchain_prompt
 from onyx.llm.utils import message_to_string
 from onyx.prompts.llm_chunk_filter import NONUSEFUL_PAT
 from onyx.prompts.llm_chunk_filter import SECTION_FILTER_PROMPT
+from onyx.utils.executor_service import ExecutorPool
 from onyx.utils.logger import setup_logger
 from onyx.utils.threadpool_concurrency import run_functions_tuples_in_parallel
 
@@ -87,7 +88,7 @@ def llm_batch_eval_sections(
             "Running LLM usefulness eval in parallel (following logging may be out of order)"
         )
         parallel_results = run_functions_tuples_in_parallel(
-            functions_with_args, allow_failures=True
+            functions_with_args, allow_failures=True, pool=ExecutorPool.LLM
         )
 
         # In case of failure/timeout, don't throw out the section
@@ -12,6 +12,7 @@ from onyx.llm.utils import dict_based_prompt_to_langchain_prompt
 from onyx.llm.utils import message_to_string
 from onyx.prompts.chat_prompts import HISTORY_QUERY_REPHRASE
 from onyx.prompts.miscellaneous_prompts import LANGUAGE_REPHRASE_PROMPT
+from onyx.utils.executor_service import ExecutorPool
 from onyx.utils.logger import setup_logger
 from onyx.utils.text_processing import count_punctuation
 from onyx.utils.threadpool_concurrency import run_functions_tuples_in_parallel
@@ -42,7 +43,9 @@ def llm_multilingual_query_expansion(query: str, language: str) -> str:
 
     messages = _get_rephrase_messages()
     filled_llm_prompt = dict_based_prompt_to_langchain_prompt(messages)
-    model_output = message_to_string(fast_llm.invoke(filled_llm_prompt))
+    model_output = message_to_string(
+        fast_llm.invoke(filled_llm_prompt, use_response_cache=True)
+    )
     logger.debug(model_output)
 
     return model_output
@@ -60,7 +63,9 @@ def multilingual_query_expansion(
             for language in languages
         ]
 
-        query_rephrases = run_functions_tuples_in_parallel(functions_with_args)
+        query_rephrases = run_functions_tuples_in_parallel(
+            functions_with_args, pool=ExecutorPool.LLM
+        )
         return query_rephrases
 
     else:
@@ -124,7 +129,9 @@ def history_based_query_rephrase(
     )
 
     filled_llm_prompt = dict_based_prompt_to_langchain_prompt(prompt_msgs)
-    rephrased_query = message_to_string(llm.invoke(filled_llm_prompt))
+    rephrased_query = message_to_string(
+        llm.invoke(filled_llm_prompt, use_response_cache=True)
+    )
 
     logger.debug(f"Rephrased combined query: {rephrased_query}")
 
@@ -159,7 +166,9 @@ def thread_based_query_rephrase(
     )
 
     filled_llm_prompt = dict_based_prompt_to_langchain_prompt(prompt_msgs)
-    rephrased_query = message_to_string(llm.invoke(filled_llm_prompt))
+    rephrased_query = message_to_string(
+        llm.invoke(filled_llm_prompt, use_response_cache=True)
+    )
 
     logger.debug(f"Rephrased combined query: {rephrased_query}")
 
@@ -20,6 +20,7 @@ from onyx.document_index.factory import get_default_document_index
 from onyx.llm.factory import get_default_llms
 from onyx.prompts.starter_messages import format_persona_starter_message_prompt
 from onyx.prompts.starter_messages import PERSONA_CATEGORY_GENERATION_PROMPT
+from onyx.utils.executor_service import ExecutorPool
 from onyx.utils.logger import setup_logger
 from onyx.utils.threadpool_concurrency import FunctionCall
 from onyx.utils.threadpool_concurrency import run_functions_in_parallel
@@ -187,7 +188,7 @@ def generate_starter_messages(
         logger.error("No functions to execute for starter message generation.")
         return []
 
-    results = run_functions_in_parallel(function_calls=functions)
+    results = run_functions_in_parallel(function_calls=functions, pool=ExecutorPool.LLM)
     prompts = []
 
     for response in results.values():
@@ -292,7 +292,11 @@ def test_mcp_server_credentials(
     try:
         # Attempt to discover tools using the provided credentials
         tools = discover_mcp_tools(
-            server_url, connection_headers, transport=transport, auth=auth
+            server_url,
+            connection_headers,
+            transport=transport,
+            auth=auth,
+            use_cache=False,
         )
 
         if (
@@ -8,6 +8,7 @@ from pathlib import Path
 from fastapi import APIRouter
 from fastapi import Depends
 from fastapi import HTTPException
+from fastapi import Query
 from fastapi.responses import FileResponse
 from starlette.background import BackgroundTask
 
@@ -17,22 +18,26 @@ from onyx.utils.long_term_log import LongTermLogger
 
 router = APIRouter(prefix="/admin/long-term-logs")
 
+_MAX_LOGS_PER_REQUEST = 10_000
+
 
 @router.get("/{category}")
 def get_long_term_logs(
     category: str,
     start_time: datetime | None = None,
     end_time: datetime | None = None,
+    limit: int = Query(100, ge=1, le=_MAX_LOGS_PER_REQUEST),
     _: User | None = Depends(current_admin_user),
 ) -> list[dict | list | str]:
-    """Fetch logs for a specific category within an optional time range.
-    Only accessible by admin users."""
+    """Fetch the most recent logs for a specific category within an optional time
+    range. Only accessible by admin users."""
     try:
         logger = LongTermLogger()
         return logger.fetch_category(  # type: ignore
             category=category,
             start_time=start_time,
             end_time=end_time,
+            limit=limit,
         )
     except Exception as e:
         raise HTTPException(
@@ -46,9 +51,10 @@ def download_long_term_logs_zip(
     category: str,
     start_time: datetime | None = None,
     end_time: datetime | None = None,
+    limit: int = Query(_MAX_LOGS_PER_REQUEST, ge=1, le=_MAX_LOGS_PER_REQUEST),
     _: User | None = Depends(current_admin_user),
 ) -> FileResponse:
-    """Download logs for a specific category as a ZIP file.
+    """Download the most recent logs for a specific category as a ZIP file.
     Only accessible by admin users."""
     try:
         logger = LongTermLogger()
@@ -56,6 +62,7 @@ def download_long_term_logs_zip(
             category=category,
             start_time=start_time,
             end_time=end_time,
+            limit=limit,
         )
 
         # Create temporary files without using context manager
@@ -51,6 +51,7 @@ from onyx.server.manage.llm.models import OpenRouterModelDetails
 from onyx.server.manage.llm.models import OpenRouterModelsRequest
 from onyx.server.manage.llm.models import TestLLMRequest
 from onyx.server.manage.llm.models import VisionProviderResponse
+from onyx.utils.executor_service import ExecutorPool
 from onyx.utils.logger import setup_logger
 from onyx.utils.threadpool_concurrency import run_functions_tuples_in_parallel
 
@@ -123,7 +124,7 @@ def test_llm_configuration(
         functions_with_args.append((test_llm, (fast_llm,)))
 
     parallel_results = run_functions_tuples_in_parallel(
-        functions_with_args, allow_failures=False
+        functions_with_args, allow_failures=False, pool=ExecutorPool.LLM
     )
     error = parallel_results[0] or (
         parallel_results[1] if len(parallel_results) > 1 else None
@@ -151,7 +152,7 @@ def test_default_provider(
         (test_llm, (fast_llm,)),
     ]
     parallel_results = run_functions_tuples_in_parallel(
-        functions_with_args, allow_failures=False
+        functions_with_args, allow_failures=False, pool=ExecutorPool.LLM
     )
     error = parallel_results[0] or (
         parallel_results[1] if len(parallel_results) > 1 else None
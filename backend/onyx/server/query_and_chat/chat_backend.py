@@ -46,12 +46,15 @@ from onyx.db.chat import get_or_create_root_message
 from onyx.db.chat import set_as_latest_chat_message
 from onyx.db.chat import translate_db_message_to_chat_message_detail
 from onyx.db.chat import update_chat_session
+from onyx.db.chat_search import ChatSessionCursor
 from onyx.db.chat_search import search_chat_sessions
+from onyx.db.chat_search import search_chat_sessions_ranked
 from onyx.db.engine.sql_engine import get_session
 from onyx.db.engine.sql_engine import get_session_with_tenant
 from onyx.db.feedback import create_chat_message_feedback
 from onyx.db.feedback import create_doc_retrieval_feedback
 from onyx.db.feedback import remove_chat_message_feedback
+from onyx.db.models import ChatSession
 from onyx.db.models import User
 from onyx.db.persona import get_persona_by_id
 from onyx.db.projects import check_project_ownership
@@ -752,9 +755,22 @@ def fetch_chat_file(
             file_id = txt_file_id
 
     media_type = file_record.file_type
-    file_io = file_store.read_file(file_id, mode="b")
+    # streamed in chunks rather than read fully into memory, files can be large
+    file_stream = file_store.open_stream(file_id)
 
-    return StreamingResponse(file_io, media_type=media_type)
+    return StreamingResponse(file_stream, media_type=media_type)
+
+
+def _to_chat_session_summary(session: ChatSession) -> ChatSessionSummary:
+    return ChatSessionSummary(
+        id=session.id,
+        name=session.description,
+        persona_id=session.persona_id,
+        time_created=session.time_created,
+        shared_status=session.shared_status,
+        current_alternate_model=session.current_alternate_model,
+        current_temperature_override=session.temperature_override,
+    )
 
 
 @router.get("/search")
@@ -762,13 +778,67 @@ async def search_chats(
     query: str | None = Query(None),
     page: int = Query(1),
     page_size: int = Query(10),
+    cursor: str | None = Query(None),
+    ranked: bool = Query(False),
     user: User | None = Depends(current_user),
     db_session: Session = Depends(get_session),
 ) -> ChatSearchResponse:
     """
     Search for chat sessions based on the provided query.
     If no query is provided, returns recent chat sessions.
+
+    Pass the returned `next_cursor` back as `cursor` for keyset pagination;
+    `page` is still supported but gets slower the deeper it goes. If `ranked`
+    is set (and a query is provided), results are ordered by relevance and
+    returned in a single group.
     """
+    try:
+        decoded_cursor = ChatSessionCursor.decode(cursor) if cursor else None
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    # a cursor only makes sense for the ordering it was created for, silently
+    # ignoring it would restart from the first page
+    is_ranked_search = bool(ranked and query and query.strip())
+    if decoded_cursor is not None and is_ranked_search != (
+        decoded_cursor.rank is not None
+    ):
+        raise HTTPException(
+            status_code=400,
+            detail="Cursor does not match the requested search ordering",
+        )
+
+    if is_ranked_search:
+        ranked_sessions, has_more = search_chat_sessions_ranked(
+            user_id=user.id if user else None,
+            db_session=db_session,
+            query=query or "",
+            page_size=page_size,
+            include_deleted=False,
+            include_onyxbot_flows=False,
+            cursor=decoded_cursor,
+        )
+        next_cursor = None
+        if has_more and ranked_sessions:
+            last_session, last_rank = ranked_sessions[-1]
+            next_cursor = ChatSessionCursor(
+                time_created=last_session.time_created,
+                id=last_session.id,
+                rank=last_rank,
+            ).encode()
+
+        ranked_chats = [
+            _to_chat_session_summary(session) for session, _ in ranked_sessions
+        ]
+        return ChatSearchResponse(
+            groups=(
+                [ChatSessionGroup(title="Best Matches", chats=ranked_chats)]
+                if ranked_chats
+                else []
+            ),
+            has_more=has_more,
+            next_cursor=next_cursor,
+        )
 
     # Use the enhanced database function for chat search
     chat_sessions, has_more = search_chat_sessions(
@@ -779,6 +849,7 @@ async def search_chats(
         page_size=page_size,
         include_deleted=False,
         include_onyxbot_flows=False,
+        cursor=decoded_cursor,
     )
 
     # Group chat sessions by time period
@@ -796,15 +867,7 @@ async def search_chats(
     for session in chat_sessions:
         session_date = session.time_created.date()
 
-        chat_summary = ChatSessionSummary(
-            id=session.id,
-            name=session.description,
-            persona_id=session.persona_id,
-            time_created=session.time_created,
-            shared_status=session.shared_status,
-            current_alternate_model=session.current_alternate_model,
-            current_temperature_override=session.temperature_override,
-        )
+        chat_summary = _to_chat_session_summary(session)
 
         if session_date == today:
             today_chats.append(chat_summary)
@@ -830,10 +893,18 @@ async def search_chats(
     if older_chats:
         groups.append(ChatSessionGroup(title="Older", chats=older_chats))
 
+    next_cursor = None
+    if has_more and chat_sessions:
+        next_cursor = ChatSessionCursor(
+            time_created=chat_sessions[-1].time_created,
+            id=chat_sessions[-1].id,
+        ).encode()
+
     return ChatSearchResponse(
         groups=groups,
         has_more=has_more,
-        next_page=page + 1 if has_more else None,
+        next_page=page + 1 if has_more and decoded_cursor is None else None,
+        next_cursor=next_cursor,
     )
 
 
@@ -332,12 +332,16 @@ class ChatSearchResponse(BaseModel):
     groups: list[ChatSessionGroup]
     has_more: bool
     next_page: int | None = None
+    # opaque keyset cursor, pass back as `cursor` to fetch the next page
+    next_cursor: str | None = None
 
 
 class ChatSearchRequest(BaseModel):
     query: str | None = None
     page: int = 1
     page_size: int = 10
+    cursor: str | None = None
+    ranked: bool = False
 
 
 class CreateChatResponse(BaseModel):
@@ -28,6 +28,7 @@ from onyx.tools.tool import Tool
 from onyx.tools.tool_implementations.images.prompt import (
     build_image_generation_user_prompt,
 )
+from onyx.utils.executor_service import ExecutorPool
 from onyx.utils.logger import setup_logger
 from onyx.utils.special_types import JSON_ro
 from onyx.utils.threadpool_concurrency import run_functions_tuples_in_parallel
@@ -317,7 +318,8 @@ class ImageGenerationTool(Tool[None]):
                                 ),
                             )
                             for _ in range(self.num_imgs)
-                        ]
+                        ],
+                        pool=ExecutorPool.LLM,
                     ),
                 )
                 for i, result in enumerate(generated_results):
@@ -5,9 +5,16 @@ This module provides a proper MCP client that follows the JSON-RPC 2.0 specifica
 and handles connection initialization, session management, and protocol communication.
 """
 
+import threading
+import time
+from collections.abc import AsyncIterator
 from collections.abc import Awaitable
 from collections.abc import Callable
+from collections.abc import Hashable
+from contextlib import asynccontextmanager
+from datetime import timedelta
 from enum import Enum
+from functools import partial
 from typing import Any
 from typing import Dict
 from typing import TypeVar
@@ -24,7 +31,9 @@ from mcp.types import TextResourceContents
 from mcp.types import Tool as MCPLibTool
 from pydantic import BaseModel
 
+from onyx.configs.tool_configs import MCP_TOOL_LIST_CACHE_TTL
 from onyx.db.enums import MCPTransport
+from onyx.tools.tool_implementations.mcp.mcp_session_pool import get_mcp_session_pool
 from onyx.utils.logger import setup_logger
 from onyx.utils.threadpool_concurrency import run_async_sync_no_cancel
 
@@ -34,6 +43,10 @@ T = TypeVar("T", covariant=True)
 
 MCPClientFunction = Callable[[ClientSession], Awaitable[T]]
 
+# (monotonic time the tools were listed at, tools) by session key
+_tool_list_cache: dict[Hashable, tuple[float, list[MCPLibTool]]] = {}
+_tool_list_cache_lock = threading.Lock()
+
 
 class MCPMessageType(str, Enum):
     """MCP message types"""
@@ -85,9 +98,9 @@ class MCPMessage(BaseModel):
         return msg
 
 
-# TODO: in the future we should do things like manage sessions and handle errors better
-# using an abstraction like this. For now things are purely functional and we initialize
-# a new session for each tool call.
+# TODO: in the future we should do things like handle errors better using an
+# abstraction like this. For now things are purely functional, sessions are reused
+# through the pool in mcp_session_pool.py.
 # class MCPClient:
 #     """
 #     MCP Client implementation that properly handles the protocol lifecycle
@@ -120,14 +133,14 @@ class MCPMessage(BaseModel):
 #         self.process: Optional[subprocess.Popen] = None
 
 
-def _create_mcp_client_function_runner(
-    function: Callable[[ClientSession], Awaitable[T]],
+@asynccontextmanager
+async def _open_mcp_session(
     server_url: str,
     connection_headers: dict[str, str] | None = None,
     transport: MCPTransport = MCPTransport.STREAMABLE_HTTP,
     auth: OAuthClientProvider | None = None,  # TODO: maybe used this for all auth types
-    **kwargs: Any,
-) -> Callable[[], Awaitable[T]]:
+) -> AsyncIterator[ClientSession]:
+    """Opens a session with the server, the session is not initialized yet"""
     auth_headers = connection_headers or {}
     # Normalize URL
     normalized_url = server_url.rstrip("/")
@@ -155,29 +168,64 @@ def _create_mcp_client_function_runner(
         else sse_client
     )
 
+    async with client_func(
+        server_url, headers=auth_headers, auth=auth_for_request
+    ) as client_tuple:
+        if len(client_tuple) == 3:
+            read, write, _ = client_tuple
+        elif len(client_tuple) == 2:
+            assert isinstance(client_tuple, tuple)  # mypy
+            read, write = client_tuple
+        else:
+            raise ValueError(
+                f"Unexpected number of client tuple elements: {len(client_tuple)}"
+            )
+
+        async with ClientSession(
+            read, write, read_timeout_seconds=timedelta(seconds=300)
+        ) as session:
+            yield session
+
+
+def _create_mcp_client_function_runner(
+    function: Callable[[ClientSession], Awaitable[T]],
+    server_url: str,
+    connection_headers: dict[str, str] | None = None,
+    transport: MCPTransport = MCPTransport.STREAMABLE_HTTP,
+    auth: OAuthClientProvider | None = None,
+    **kwargs: Any,
+) -> Callable[[], Awaitable[T]]:
     async def run_client_function() -> T:
-        async with client_func(
-            server_url, headers=auth_headers, auth=auth_for_request
-        ) as client_tuple:
-            if len(client_tuple) == 3:
-                read, write, _ = client_tuple
-            elif len(client_tuple) == 2:
-                assert isinstance(client_tuple, tuple)  # mypy
-                read, write = client_tuple
-            else:
-                raise ValueError(
-                    f"Unexpected number of client tuple elements: {len(client_tuple)}"
-                )
-            from datetime import timedelta
-
-            async with ClientSession(
-                read, write, read_timeout_seconds=timedelta(seconds=300)
-            ) as session:
-                return await function(session, **kwargs)
+        async with _open_mcp_session(
+            server_url, connection_headers, transport, auth
+        ) as session:
+            return await function(session, **kwargs)
 
     return run_client_function
 
 
+def _session_key(
+    server_url: str,
+    connection_headers: dict[str, str] | None,
+    transport: MCPTransport,
+) -> Hashable:
+    return (
+        server_url.rstrip("/"),
+        transport,
+        tuple(sorted((connection_headers or {}).items())),
+    )
+
+
+def _with_initialize(
+    function: Callable[[ClientSession], Awaitable[T]],
+) -> Callable[[ClientSession], Awaitable[T]]:
+    async def initialize_and_run(session: ClientSession, **kwargs: Any) -> T:
+        await session.initialize()
+        return await function(session, **kwargs)
+
+    return initialize_and_run
+
+
 def log_exception_group(e: ExceptionGroup) -> Exception | None:
     logger.error(e)
     saved_e = None
@@ -197,13 +245,32 @@ def _call_mcp_client_function_sync(
     connection_headers: dict[str, str] | None = None,
     transport: MCPTransport = MCPTransport.STREAMABLE_HTTP,
     auth: OAuthClientProvider | None = None,
+    retry_on_closed_session: bool = False,
     **kwargs: Any,
 ) -> T:
-    run_client_function = _create_mcp_client_function_runner(
-        function, server_url, connection_headers, transport, auth, **kwargs
-    )
+    """Runs function with an initialized session. Sessions are pooled, except for
+    OAuth as the provider can't be shared between calls. Only set
+    retry_on_closed_session for functions that are safe to run twice."""
     try:
-        return run_async_sync_no_cancel(run_client_function())
+        if auth is not None:
+            run_client_function = _create_mcp_client_function_runner(
+                _with_initialize(function),
+                server_url,
+                connection_headers,
+                transport,
+                auth,
+                **kwargs,
+            )
+            return run_async_sync_no_cancel(run_client_function())
+
+        return get_mcp_session_pool().run(
+            key=_session_key(server_url, connection_headers, transport),
+            open_session=partial(
+                _open_mcp_session, server_url, connection_headers, transport
+            ),
+            function=partial(function, **kwargs),
+            retry_on_closed_session=retry_on_closed_session,
+        )
     except Exception as e:
         logger.error(f"Failed to call MCP client function: {e}")
         if isinstance(e, ExceptionGroup):
@@ -251,7 +318,6 @@ def process_mcp_result(call_tool_result: CallToolResult) -> str:
 
 def _call_mcp_tool(tool_name: str, arguments: dict[str, Any]) -> MCPClientFunction[str]:
     async def call_tool(session: ClientSession) -> str:
-        await session.initialize()
         result = await session.call_tool(tool_name, arguments)
         return process_mcp_result(result)
 
@@ -292,17 +358,9 @@ async def initialize_mcp_client(
 
 
 async def _discover_mcp_tools(session: ClientSession) -> list[MCPLibTool]:
-    # 1) initialize
-    import time
-
     t1 = time.time()
-    init_result = await session.initialize()  # sends JSON-RPC "initialize"
-    logger.info(f"Initialized with server: {init_result.serverInfo}")
-    logger.info(f"Initialized with server time: {time.time() - t1}")
-    # 2) tools/list
-    t2 = time.time()
     tools_response = await session.list_tools()  # sends JSON-RPC "tools/list"
-    logger.info(f"Listed tools with server time: {time.time() - t2}")
+    logger.info(f"Listed tools with server time: {time.time() - t1}")
     return tools_response.tools
 
 
@@ -311,18 +369,38 @@ def discover_mcp_tools(
     connection_headers: dict[str, str] | None = None,
     transport: MCPTransport = MCPTransport.STREAMABLE_HTTP,
     auth: OAuthClientProvider | None = None,
+    use_cache: bool = True,
 ) -> list[MCPLibTool]:
     """
     Synchronous wrapper for discovering MCP tools.
+    The tools are cached for MCP_TOOL_LIST_CACHE_TTL seconds, except with OAuth.
     """
-    return _call_mcp_client_function_sync(
+    cacheable = auth is None and MCP_TOOL_LIST_CACHE_TTL > 0
+    cache_key = _session_key(server_url, connection_headers, transport)
+    if cacheable and use_cache:
+        with _tool_list_cache_lock:
+            cached = _tool_list_cache.get(cache_key)
+        if cached and time.monotonic() - cached[0] < MCP_TOOL_LIST_CACHE_TTL:
+            return list(cached[1])
+
+    tools = _call_mcp_client_function_sync(
         _discover_mcp_tools,
         server_url,
         connection_headers,
         transport,
         auth,
+        retry_on_closed_session=True,
     )
 
+    if cacheable:
+        now = time.monotonic()
+        with _tool_list_cache_lock:
+            for key, (cached_at, _) in list(_tool_list_cache.items()):
+                if now - cached_at >= MCP_TOOL_LIST_CACHE_TTL:
+                    del _tool_list_cache[key]
+            _tool_list_cache[cache_key] = (now, list(tools))
+    return tools
+
 
 async def _discover_mcp_resources(session: ClientSession) -> ListResourcesResult:
     return await session.list_resources()
@@ -344,4 +422,5 @@ def discover_mcp_resources_sync(
         connection_headers,
         MCPTransport(transport),
         auth,
+        retry_on_closed_session=True,
     )
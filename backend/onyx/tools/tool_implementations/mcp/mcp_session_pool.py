@@ -0,0 +1,241 @@
+"""
+Long-lived MCP client sessions, pooled per server.
+
+Opening an MCP session costs a new connection plus the initialize handshake, so
+instead of paying that on every tool call the sessions are kept open on a dedicated
+event loop thread and shared by all calls to the same server with the same
+connection headers. A session that was idle for a while is pinged before it is
+reused, sessions are closed after MCP_SESSION_IDLE_TIMEOUT and a session that
+fails is dropped, so the next call opens a new one.
+"""
+
+import asyncio
+import os
+import threading
+import time
+from collections import defaultdict
+from collections.abc import Awaitable
+from collections.abc import Callable
+from collections.abc import Hashable
+from contextlib import AbstractAsyncContextManager
+from typing import TypeVar
+
+import anyio
+from mcp import ClientSession
+from mcp.shared.exceptions import McpError
+
+from onyx.configs.tool_configs import MCP_SESSION_IDLE_TIMEOUT
+from onyx.utils.logger import setup_logger
+
+logger = setup_logger()
+
+T = TypeVar("T")
+
+MCPSessionOpener = Callable[[], AbstractAsyncContextManager[ClientSession]]
+
+# sessions idle for longer than this are pinged before being reused
+_PING_AFTER_IDLE_SECONDS = 30
+_PING_TIMEOUT_SECONDS = 5
+_CLOSE_TIMEOUT_SECONDS = 10
+
+
+class _PooledSession:
+    """An initialized session, owned by a task that keeps its transport open until
+    the session is closed. The anyio based transports have to be entered and exited
+    by the same task."""
+
+    def __init__(self, open_session: MCPSessionOpener) -> None:
+        self._open_session = open_session
+        self.session: ClientSession | None = None
+        self.num_in_use = 0
+        self.last_used = time.monotonic()
+
+        self._ready = asyncio.Event()
+        self._close_requested = asyncio.Event()
+        self._task: asyncio.Task[None] | None = None
+        self._error: Exception | None = None
+
+    @property
+    def alive(self) -> bool:
+        return self.session is not None and not self._close_requested.is_set()
+
+    async def start(self) -> ClientSession:
+        self._task = asyncio.create_task(self._run())
+        await self._ready.wait()
+        if self.session is None:
+            raise self._error or RuntimeError("MCP session closed while opening")
+        return self.session
+
+    async def _run(self) -> None:
+        try:
+            async with self._open_session() as session:
+                await session.initialize()
+                self.session = session
+                self._ready.set()
+                await self._close_requested.wait()
+        except Exception as e:
+            self._error = e
+            if self._ready.is_set():
+                logger.warning(f"Pooled MCP session failed: {e}")
+        finally:
+            self.session = None
+            self._ready.set()
+
+    async def close(self) -> None:
+        self._close_requested.set()
+        if self._task is None:
+            return
+        _, pending = await asyncio.wait({self._task}, timeout=_CLOSE_TIMEOUT_SECONDS)
+        for task in pending:
+            task.cancel()
+
+
+class MCPSessionPool:
+    def __init__(self, idle_timeout: float = MCP_SESSION_IDLE_TIMEOUT) -> None:
+        self.idle_timeout = idle_timeout
+        self.num_sessions_opened = 0
+
+        self._sessions: dict[Hashable, _PooledSession] = {}
+        # only ever used from the event loop thread
+        self._locks: defaultdict[Hashable, asyncio.Lock] = defaultdict(asyncio.Lock)
+
+        self._loop = asyncio.new_event_loop()
+        threading.Thread(
+            target=self._loop.run_forever, name="mcp-session-pool", daemon=True
+        ).start()
+        self._eviction = asyncio.run_coroutine_threadsafe(
+            self._evict_idle_sessions(), self._loop
+        )
+
+    def run(
+        self,
+        key: Hashable,
+        open_session: MCPSessionOpener,
+        function: Callable[[ClientSession], Awaitable[T]],
+        retry_on_closed_session: bool = False,
+    ) -> T:
+        """Runs function with the pooled session of key, opening it with open_session
+        if needed. Must not be called from the pool's event loop thread.
+
+        A session that is closed under the running function may have sent the
+        request already, so function is only run again on a new session if
+        retry_on_closed_session is set, i.e. for requests without side effects like
+        listing tools. Sessions that fail their health check are replaced before
+        the request is sent."""
+        return asyncio.run_coroutine_threadsafe(
+            self._run(key, open_session, function, retry_on_closed_session),
+            self._loop,
+        ).result()
+
+    def close(self) -> None:
+        self._eviction.cancel()
+        asyncio.run_coroutine_threadsafe(self._close_all(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+
+    async def _run(
+        self,
+        key: Hashable,
+        open_session: MCPSessionOpener,
+        function: Callable[[ClientSession], Awaitable[T]],
+        retry_on_closed_session: bool,
+    ) -> T:
+        pooled, session = await self._acquire(key, open_session)
+        try:
+            return await function(session)
+        except (anyio.ClosedResourceError, anyio.BrokenResourceError):
+            await self._discard(key, pooled)
+            if not retry_on_closed_session:
+                raise
+        except McpError:
+            # an error response from the server, the session itself is fine
+            raise
+        except Exception:
+            await self._discard(key, pooled)
+            raise
+        finally:
+            self._release(pooled)
+
+        pooled, session = await self._acquire(key, open_session)
+        try:
+            return await function(session)
+        finally:
+            self._release(pooled)
+
+    async def _acquire(
+        self, key: Hashable, open_session: MCPSessionOpener
+    ) -> tuple[_PooledSession, ClientSession]:
+        async with self._locks[key]:
+            pooled = self._sessions.get(key)
+            if pooled is not None and not await self._is_healthy(pooled):
+                await self._discard(key, pooled)
+                pooled = None
+
+            if pooled is None:
+                pooled = _PooledSession(open_session)
+                await pooled.start()
+                self._sessions[key] = pooled
+                self.num_sessions_opened += 1
+
+            assert pooled.session is not None  # for mypy, checked by _is_healthy
+            pooled.num_in_use += 1
+            pooled.last_used = time.monotonic()
+            return pooled, pooled.session
+
+    @staticmethod
+    def _release(pooled: _PooledSession) -> None:
+        pooled.num_in_use -= 1
+        pooled.last_used = time.monotonic()
+
+    @staticmethod
+    async def _is_healthy(pooled: _PooledSession) -> bool:
+        if pooled.session is None or not pooled.alive:
+            return False
+        if (
+            pooled.num_in_use
+            or time.monotonic() - pooled.last_used < _PING_AFTER_IDLE_SECONDS
+        ):
+            return True
+
+        try:
+            await asyncio.wait_for(
+                pooled.session.send_ping(), timeout=_PING_TIMEOUT_SECONDS
+            )
+        except Exception as e:
+            logger.info(f"Pooled MCP session failed its health check: {e}")
+            return False
+        return pooled.alive
+
+    async def _discard(self, key: Hashable, pooled: _PooledSession) -> None:
+        if self._sessions.get(key) is pooled:
+            del self._sessions[key]
+        await pooled.close()
+
+    async def _evict_idle_sessions(self) -> None:
+        while True:
+            await asyncio.sleep(min(self.idle_timeout, 60))
+            now = time.monotonic()
+            for key, pooled in list(self._sessions.items()):
+                if not pooled.alive or (
+                    not pooled.num_in_use and now - pooled.last_used > self.idle_timeout
+                ):
+                    await self._discard(key, pooled)
+
+    async def _close_all(self) -> None:
+        for key, pooled in list(self._sessions.items()):
+            await self._discard(key, pooled)
+
+
+_pool: MCPSessionPool | None = None
+_pool_pid: int | None = None
+_pool_lock = threading.Lock()
+
+
+def get_mcp_session_pool() -> MCPSessionPool:
+    """The pool of the current process, the event loop thread does not survive a
+    fork so a forked worker gets a new pool"""
+    global _pool, _pool_pid
+    with _pool_lock:
+        if _pool is None or _pool_pid != os.getpid():
+            _pool = MCPSessionPool()
+            _pool_pid = os.getpid()
+        return _pool
@@ -10,6 +10,7 @@ from onyx.tools.models import ToolCallFinalResult
 from onyx.tools.models import ToolCallKickoff
 from onyx.tools.models import ToolResponse
 from onyx.tools.tool import Tool
+from onyx.utils.executor_service import ExecutorPool
 from onyx.utils.threadpool_concurrency import run_functions_tuples_in_parallel
 
 
@@ -62,4 +63,4 @@ def check_which_tools_should_run_for_non_tool_calling_llm(
         (tool.get_args_for_non_tool_calling_llm, (query, history, llm))
         for tool in tools
     ]
-    return run_functions_tuples_in_parallel(tool_args_list)
+    return run_functions_tuples_in_parallel(tool_args_list, pool=ExecutorPool.LLM)
@@ -0,0 +1,264 @@
+"""Process-wide, bounded thread pools shared by all callers in a process.
+
+Creating a `ThreadPoolExecutor` per call (sized to the number of tasks) means
+that under load a process ends up with hundreds of short-lived threads and
+pays the thread creation cost on every request. Instead, work is submitted to
+one of a few named, bounded pools which live for the lifetime of the process.
+
+All submissions propagate contextvars (e.g. the current tenant id) to the
+worker thread, and report queue-wait time and in-flight counts as Prometheus
+metrics.
+
+Since the pools are bounded and shared, a task that fans out and then blocks
+on its sub-tasks could deadlock if every worker is doing the same. `run_all`
+avoids this by having the calling thread also execute any of its tasks that
+no worker has picked up yet ("caller runs"), so a batch always makes progress
+even if the pool is saturated.
+"""
+
+import contextvars
+import os
+import threading
+import time
+from collections.abc import Callable
+from collections.abc import Sequence
+from concurrent.futures import Future
+from concurrent.futures import ThreadPoolExecutor
+from enum import Enum
+from typing import Any
+from typing import TypeVar
+
+from prometheus_client import Gauge
+from prometheus_client import Histogram
+
+from onyx.configs.app_configs import EXECUTOR_IO_MAX_WORKERS
+from onyx.configs.app_configs import EXECUTOR_LLM_MAX_WORKERS
+from onyx.utils.logger import setup_logger
+
+logger = setup_logger()
+
+R = TypeVar("R")
+
+
+class ExecutorPool(str, Enum):
+    # network / disk bound work, e.g. calls to Vespa or the model server
+    IO = "io"
+    # LLM calls, which are slow and should not starve the other pools
+    LLM = "llm"
+
+
+_POOL_MAX_WORKERS: dict[ExecutorPool, int] = {
+    ExecutorPool.IO: EXECUTOR_IO_MAX_WORKERS,
+    ExecutorPool.LLM: EXECUTOR_LLM_MAX_WORKERS,
+}
+
+_QUEUE_WAIT_SECONDS = Histogram(
+    "onyx_executor_queue_wait_seconds",
+    "Time a task spent waiting for a worker in a shared executor pool",
+    ["pool"],
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+_IN_FLIGHT = Gauge(
+    "onyx_executor_in_flight",
+    "Number of tasks submitted to a shared executor pool that have not finished",
+    ["pool"],
+)
+_RUNNING = Gauge(
+    "onyx_executor_running",
+    "Number of tasks currently executing in a shared executor pool",
+    ["pool"],
+)
+
+
+class ManagedThreadPoolExecutor(ThreadPoolExecutor):
+    """A `ThreadPoolExecutor` which propagates contextvars and reports metrics.
+
+    Instances are owned by the `ExecutorService` and must NOT be used as a
+    context manager or shut down by callers."""
+
+    def __init__(self, pool: ExecutorPool, max_workers: int) -> None:
+        super().__init__(max_workers=max_workers, thread_name_prefix=f"onyx-{pool}")
+        self.pool = pool
+
+    def submit(  # type: ignore[override]
+        self, fn: Callable[..., R], /, *args: Any, **kwargs: Any
+    ) -> Future[R]:
+        context = contextvars.copy_context()
+        enqueued_at = time.monotonic()
+        pool_label = self.pool.value
+
+        def _run() -> R:
+            _QUEUE_WAIT_SECONDS.labels(pool=pool_label).observe(
+                time.monotonic() - enqueued_at
+            )
+            _RUNNING.labels(pool=pool_label).inc()
+            try:
+                return context.run(fn, *args, **kwargs)
+            finally:
+                _RUNNING.labels(pool=pool_label).dec()
+
+        _IN_FLIGHT.labels(pool=pool_label).inc()
+        future = super().submit(_run)
+        future.add_done_callback(lambda _: _IN_FLIGHT.labels(pool=pool_label).dec())
+        return future
+
+    def __enter__(self) -> "ManagedThreadPoolExecutor":
+        raise RuntimeError(
+            "Shared executors are process-wide and must not be used as a context manager"
+        )
+
+
+class _StealableFuture(Future[R]):
+    """Future for a call in a `_Batch`. Waiting on it runs the call on the
+    waiting thread if no worker has picked it up yet."""
+
+    def __init__(self, batch: "_Batch") -> None:
+        super().__init__()
+        self._batch = batch
+
+    def result(self, timeout: float | None = None) -> R:
+        self._batch.drain()
+        return super().result(timeout)
+
+    def exception(self, timeout: float | None = None) -> BaseException | None:
+        self._batch.drain()
+        return super().exception(timeout)
+
+
+class _Batch:
+    """A set of calls that may be executed either by pool workers or by the
+    submitting thread. Whoever claims a call first runs it."""
+
+    def __init__(
+        self,
+        calls: Sequence[tuple[Callable[..., Any], tuple[Any, ...], dict[str, Any]]],
+        fail_fast: bool,
+    ) -> None:
+        self._calls = calls
+        self._fail_fast = fail_fast
+        # each call gets its own copy of the submitter's context, mirroring the
+        # behavior of submitting each call to an executor individually
+        self._contexts = [contextvars.copy_context() for _ in calls]
+        self.futures: list[Future[Any]] = [_StealableFuture(self) for _ in calls]
+        self._next_index = 0
+        self._lock = threading.Lock()
+
+    def _claim(self) -> int | None:
+        with self._lock:
+            while self._next_index < len(self._calls):
+                index = self._next_index
+                self._next_index += 1
+                if self.futures[index].set_running_or_notify_cancel():
+                    return index
+            return None
+
+    def _cancel_pending(self) -> None:
+        with self._lock:
+            for future in self.futures[self._next_index :]:
+                # notify so that waiters (e.g. `as_completed`) see the
+                # cancellation, otherwise they'd wait on these forever
+                if future.cancel():
+                    future.set_running_or_notify_cancel()
+            self._next_index = len(self._calls)
+
+    def drain(self) -> None:
+        while (index := self._claim()) is not None:
+            func, args, kwargs = self._calls[index]
+            try:
+                result = self._contexts[index].run(func, *args, **kwargs)
+            except BaseException as e:
+                self.futures[index].set_exception(e)
+                if self._fail_fast:
+                    self._cancel_pending()
+            else:
+                self.futures[index].set_result(result)
+
+
+class ExecutorService:
+    """Holds the process-wide executor pools. Use `get_executor_service()`."""
+
+    def __init__(self) -> None:
+        self._executors: dict[ExecutorPool, ManagedThreadPoolExecutor] = {}
+        self._lock = threading.Lock()
+
+    def get_executor(self, pool: ExecutorPool) -> ManagedThreadPoolExecutor:
+        executor = self._executors.get(pool)
+        if executor is not None:
+            return executor
+
+        with self._lock:
+            executor = self._executors.get(pool)
+            if executor is None:
+                executor = ManagedThreadPoolExecutor(pool, _POOL_MAX_WORKERS[pool])
+                self._executors[pool] = executor
+            return executor
+
+    def submit(
+        self,
+        pool: ExecutorPool,
+        func: Callable[..., R],
+        *args: Any,
+        **kwargs: Any,
+    ) -> Future[R]:
+        """Schedules `func` on `pool`. Calling `.result()` on the returned future
+        runs `func` inline if it is still queued, so it is safe to wait on from
+        within another pool task."""
+        batch = _Batch([(func, args, kwargs)], fail_fast=False)
+        self.get_executor(pool).submit(batch.drain)
+        return batch.futures[0]
+
+    def run_all(
+        self,
+        pool: ExecutorPool,
+        calls: Sequence[tuple[Callable[..., Any], tuple[Any, ...], dict[str, Any]]],
+        max_concurrency: int | None = None,
+        fail_fast: bool = False,
+    ) -> list[Future[Any]]:
+        """Executes `calls` on `pool` and returns their futures (in input order).
+        If `fail_fast` is set, calls which have not started yet are cancelled as
+        soon as any call raises.
+
+        At most `max_concurrency` calls run at once. The calling thread counts
+        towards that limit: it executes calls itself until none are left
+        unclaimed before returning, which guarantees forward progress even when
+        the pool is saturated (e.g. by other batches nested inside this one).
+        """
+        if not calls:
+            return []
+
+        batch = _Batch(calls, fail_fast=fail_fast)
+        concurrency = len(calls)
+        if max_concurrency is not None:
+            concurrency = max(1, min(concurrency, max_concurrency))
+
+        executor = self.get_executor(pool)
+        # the calling thread is one of the "runners", so only ask the pool for
+        # the rest
+        for _ in range(concurrency - 1):
+            executor.submit(batch.drain)
+
+        batch.drain()
+        return batch.futures
+
+    def shutdown(self, wait: bool = True) -> None:
+        with self._lock:
+            executors = list(self._executors.values())
+            self._executors.clear()
+        for executor in executors:
+            ThreadPoolExecutor.shutdown(executor, wait=wait)
+
+
+_executor_service = ExecutorService()
+
+
+def get_executor_service() -> ExecutorService:
+    return _executor_service
+
+
+def _reset_after_fork() -> None:
+    # threads don't survive a fork, so the child needs fresh pools
+    global _executor_service
+    _executor_service = ExecutorService()
+
+
+os.register_at_fork(after_in_child=_reset_after_fork)
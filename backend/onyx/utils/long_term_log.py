@@ -1,9 +1,16 @@
+import atexit
 import json
 import os
+import queue
 import threading
+import time
+from collections import deque
 from datetime import datetime
 from pathlib import Path
 from typing import Any
+from typing import IO
+
+from prometheus_client import Counter
 
 from onyx.utils.logger import setup_logger
 from onyx.utils.special_types import JSON_ro
@@ -11,21 +18,256 @@ from onyx.utils.special_types import JSON_ro
 logger = setup_logger()
 
 _LOG_FILE_NAME_TIMESTAMP_FORMAT = "%Y-%m-%d_%H-%M-%S-%f"
+_SEGMENT_SUFFIX = ".jsonl"
+
+# Max number of records waiting to be written. When full, new records are dropped
+# rather than blocking the caller.
+_MAX_QUEUED_RECORDS = 10_000
+# Max number of records the writer thread pulls off the queue per write
+_WRITE_BATCH_SIZE = 500
+# A segment is rotated once it exceeds either of these
+_MAX_SEGMENT_BYTES = 16 * 1024 * 1024
+_MAX_SEGMENT_AGE_SECONDS = 60 * 60
+# Oldest segments of a category are deleted once its segments add up to more
+# than this (or there are more than `max_files_per_category` of them)
+_MAX_BYTES_PER_CATEGORY = 64 * 1024 * 1024
+# How long to wait for pending records to be written out on shutdown
+_SHUTDOWN_FLUSH_TIMEOUT_SECONDS = 5.0
+
+_DROPPED_RECORDS = Counter(
+    "onyx_long_term_log_dropped_records",
+    "Long-term log records dropped because the write queue was full or the write failed",
+    ["reason"],
+)
+
+
+class _Segment:
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.created_at = time.monotonic()
+        self.file: IO[str] = open(path, "a")
+        self.size = self.file.tell()
+
+    def write_lines(self, lines: list[str]) -> None:
+        data = "".join(lines)
+        self.file.write(data)
+        self.file.flush()
+        self.size += len(data)
+
+    def close(self) -> None:
+        try:
+            self.file.close()
+        except Exception:
+            pass
+
+
+class _LongTermLogWriter:
+    """Single background thread per log directory that appends records to
+    size / time rotated JSONL segment files.
+
+    Retention (a max number of files and a max number of bytes per category)
+    is enforced from an in-memory index of the closed segments in each category,
+    seeded from disk the first time a category is written to, so writing a
+    record never requires listing the directory."""
+
+    def __init__(
+        self,
+        log_file_path: Path,
+        max_files_per_category: int,
+        max_bytes_per_category: int = _MAX_BYTES_PER_CATEGORY,
+        max_segment_bytes: int = _MAX_SEGMENT_BYTES,
+        max_segment_age_seconds: float = _MAX_SEGMENT_AGE_SECONDS,
+        max_queued_records: int = _MAX_QUEUED_RECORDS,
+    ) -> None:
+        self.log_file_path = log_file_path
+        self.max_files_per_category = max_files_per_category
+        self.max_bytes_per_category = max_bytes_per_category
+        # a single segment should never exceed the category budget on its own
+        self.max_segment_bytes = min(max_segment_bytes, max_bytes_per_category)
+        self.max_segment_age_seconds = max_segment_age_seconds
+
+        # items are either (category, serialized record) or a flush marker
+        self._queue: queue.Queue[tuple[str, str] | threading.Event] = queue.Queue(
+            maxsize=max_queued_records
+        )
+        self._segments: dict[str, _Segment] = {}
+        # closed segments (oldest first) with their sizes, and their total size
+        self._retention_index: dict[str, deque[tuple[Path, int]]] = {}
+        self._closed_bytes: dict[str, int] = {}
+
+        self._thread = threading.Thread(
+            target=self._run, name="long-term-log-writer", daemon=True
+        )
+        self._thread.start()
+
+    def enqueue(self, category: str, line: str) -> None:
+        try:
+            self._queue.put_nowait((category, line))
+        except queue.Full:
+            _DROPPED_RECORDS.labels(reason="queue_full").inc()
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """Blocks until every record enqueued before this call has been written.
+        Returns False if the timeout was hit first."""
+        done = threading.Event()
+        try:
+            self._queue.put(done, timeout=timeout)
+        except queue.Full:
+            return False
+        return done.wait(timeout)
+
+    def _run(self) -> None:
+        while True:
+            items = [self._queue.get()]
+            while len(items) < _WRITE_BATCH_SIZE:
+                try:
+                    items.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            lines_by_category: dict[str, list[str]] = {}
+            flush_events: list[threading.Event] = []
+            for item in items:
+                if isinstance(item, threading.Event):
+                    flush_events.append(item)
+                    continue
+                category, line = item
+                lines_by_category.setdefault(category, []).append(line)
+
+            for category, lines in lines_by_category.items():
+                try:
+                    self._write(category, lines)
+                except Exception:
+                    _DROPPED_RECORDS.labels(reason="write_failed").inc(len(lines))
+
+            # everything queued before the flush markers has now been written
+            for event in flush_events:
+                event.set()
+
+    def _write(self, category: str, lines: list[str]) -> None:
+        segment = self._segments.get(category)
+        if segment is not None and (
+            segment.size >= self.max_segment_bytes
+            or time.monotonic() - segment.created_at >= self.max_segment_age_seconds
+        ):
+            segment.close()
+            self._retention_index[category].append((segment.path, segment.size))
+            self._closed_bytes[category] += segment.size
+            segment = None
+
+        if segment is None:
+            segment = self._open_segment(category)
+            self._segments[category] = segment
+
+        segment.write_lines(lines)
+        self._enforce_retention(category, segment)
+
+    def _open_segment(self, category: str) -> _Segment:
+        category_path = self.log_file_path / category
+        os.makedirs(category_path, exist_ok=True)
+
+        if category not in self._retention_index:
+            # only done once per category per process
+            index: deque[tuple[Path, int]] = deque()
+            for f in sorted(
+                (
+                    f
+                    for f in category_path.iterdir()
+                    if f.suffix in (_SEGMENT_SUFFIX, ".json")
+                ),
+                key=lambda f: f.name,
+            ):
+                try:
+                    index.append((f, f.stat().st_size))
+                except OSError:
+                    continue
+            self._retention_index[category] = index
+            self._closed_bytes[category] = sum(size for _, size in index)
+
+        # the pid keeps segments from different processes sharing a log
+        # directory from clobbering each other
+        segment_path = category_path / (
+            f"{datetime.now().strftime(_LOG_FILE_NAME_TIMESTAMP_FORMAT)}"
+            f"_{os.getpid()}{_SEGMENT_SUFFIX}"
+        )
+        return _Segment(segment_path)
+
+    def _enforce_retention(self, category: str, current_segment: _Segment) -> None:
+        index = self._retention_index[category]
+        while index and (
+            len(index) + 1 > self.max_files_per_category
+            or self._closed_bytes[category] + current_segment.size
+            > self.max_bytes_per_category
+        ):
+            oldest, size = index.popleft()
+            self._closed_bytes[category] -= size
+            try:
+                oldest.unlink()
+            except Exception:
+                pass
+
+
+_writers: dict[Path, _LongTermLogWriter] = {}
+_writers_lock = threading.Lock()
+
+
+def _get_writer(
+    log_file_path: Path,
+    max_files_per_category: int,
+    max_bytes_per_category: int = _MAX_BYTES_PER_CATEGORY,
+) -> _LongTermLogWriter:
+    writer = _writers.get(log_file_path)
+    if writer is not None:
+        return writer
+
+    with _writers_lock:
+        writer = _writers.get(log_file_path)
+        if writer is None:
+            writer = _LongTermLogWriter(
+                log_file_path=log_file_path,
+                max_files_per_category=max_files_per_category,
+                max_bytes_per_category=max_bytes_per_category,
+            )
+            _writers[log_file_path] = writer
+        return writer
+
+
+def flush_long_term_logs(timeout: float = _SHUTDOWN_FLUSH_TIMEOUT_SECONDS) -> None:
+    """Waits for all queued long-term log records to be written out."""
+    for writer in list(_writers.values()):
+        writer.flush(timeout=timeout)
+
+
+def _reset_after_fork() -> None:
+    # the writer threads don't survive a fork
+    global _writers_lock
+    _writers.clear()
+    _writers_lock = threading.Lock()
+
+
+atexit.register(flush_long_term_logs)
+os.register_at_fork(after_in_child=_reset_after_fork)
 
 
 class LongTermLogger:
-    """NOTE: should support a LOT of data AND should be extremely fast,
-    ideally done in a background thread."""
+    """NOTE: should support a LOT of data AND should be extremely fast.
+
+    `record` only serializes the message and puts it on a bounded queue; a
+    single background thread per log directory appends records to rotating
+    JSONL segments (see `_LongTermLogWriter`). If the queue is full the record
+    is dropped and counted in the `onyx_long_term_log_dropped_records` metric."""
 
     def __init__(
         self,
         metadata: dict[str, str] | None = None,
         log_file_path: str = "/tmp/long_term_log",
         max_files_per_category: int = 1000,
+        max_bytes_per_category: int = _MAX_BYTES_PER_CATEGORY,
     ):
         self.metadata = metadata
         self.log_file_path = Path(log_file_path)
         self.max_files_per_category = max_files_per_category
+        self.max_bytes_per_category = max_bytes_per_category
         try:
             # Create directory if it doesn't exist
             os.makedirs(os.path.dirname(log_file_path), exist_ok=True)
@@ -33,65 +275,30 @@ class LongTermLogger:
             # logger.error(f"Error creating directory for long-term logs: {e}")
             pass
 
-    def _cleanup_old_files(self, category_path: Path) -> None:
-        try:
-            files = sorted(
-                [f for f in category_path.glob("*.json")],
-                key=lambda x: x.stat().st_mtime,  # Sort by modification time
-                reverse=True,
-            )
-
-            # Delete oldest files that exceed the limit
-            for file in files[self.max_files_per_category :]:
-                if not file.is_file():
-                    logger.debug(f"File already deleted: {file}")
-                    continue
-                try:
-                    file.unlink()
-                except Exception:
-                    pass
-                    # logger.error(f"Error deleting old log file {file
-                    # }: {e}")
-        except Exception:
-            pass
-            # logger.error(f"Error during log rotation cleanup: {e}")
-
-    def _record(self, message: Any, category: str) -> None:
-        category_path = self.log_file_path / category
+    def record(self, message: JSON_ro, category: str = "default") -> None:
         try:
-            # Create directory if it doesn't exist
-            os.makedirs(category_path, exist_ok=True)
-
-            # Perform cleanup before writing new file
-            self._cleanup_old_files(category_path)
-
             final_record = {
+                "timestamp": datetime.now().isoformat(),
                 "metadata": self.metadata,
                 "record": message,
             }
-
-            file_path = (
-                category_path
-                / f"{datetime.now().strftime(_LOG_FILE_NAME_TIMESTAMP_FORMAT)}.json"
-            )
-            with open(file_path, "w+") as f:
-                # default allows us to "ignore" unserializable objects
-                json.dump(final_record, f, default=lambda x: str(x))
-        except Exception:
-            # logger.error(f"Error recording log: {e}")
-            pass
-
-    def record(self, message: JSON_ro, category: str = "default") -> None:
-        try:
-            # Run in separate thread to have minimal overhead in main flows
-            thread = threading.Thread(
-                target=self._record, args=(message, category), daemon=True
-            )
-            thread.start()
+            # default allows us to "ignore" unserializable objects
+            line = json.dumps(final_record, default=lambda x: str(x)) + "\n"
+            self._get_writer().enqueue(category, line)
         except Exception:
             # Should never interfere with normal functions of Onyx
             pass
 
+    def flush(self, timeout: float | None = None) -> bool:
+        return self._get_writer().flush(timeout=timeout)
+
+    def _get_writer(self) -> _LongTermLogWriter:
+        return _get_writer(
+            self.log_file_path,
+            self.max_files_per_category,
+            self.max_bytes_per_category,
+        )
+
     def fetch_category(
         self,
         category: str,
@@ -99,26 +306,87 @@ class LongTermLogger:
         end_time: datetime | None = None,
         limit: int = 100,
     ) -> list[JSON_ro]:
+        """Returns the most recent `limit` records in the time range, oldest first.
+        Segments are read newest first and line by line, so memory use is bounded
+        by `limit` rather than by the size of the category."""
         category_path = self.log_file_path / category
-        files = list(category_path.glob("*.json"))
+        if limit <= 0 or not category_path.is_dir():
+            return []
 
-        results: list[JSON_ro] = []
-        for file in files:
-            # Parse timestamp from filename (YYYY-MM-DD_HH-MM-SS.json)
-            try:
-                file_time = datetime.strptime(
-                    file.stem, _LOG_FILE_NAME_TIMESTAMP_FORMAT
-                )
+        # make sure records from this process are visible
+        writer = _writers.get(self.log_file_path)
+        if writer is not None:
+            writer.flush(timeout=_SHUTDOWN_FLUSH_TIMEOUT_SECONDS)
 
-                # Skip if outside time range
-                if start_time and file_time < start_time:
-                    continue
-                if end_time and file_time > end_time:
+        # Segment files are named <start time>_<pid>.jsonl. Files written by older
+        # versions are named <time>.json and hold a single record.
+        files: list[tuple[datetime, Path]] = []
+        for file in category_path.iterdir():
+            try:
+                if file.suffix == _SEGMENT_SUFFIX:
+                    file_time = datetime.strptime(
+                        file.stem.rsplit("_", 1)[0], _LOG_FILE_NAME_TIMESTAMP_FORMAT
+                    )
+                elif file.suffix == ".json":
+                    file_time = datetime.strptime(
+                        file.stem, _LOG_FILE_NAME_TIMESTAMP_FORMAT
+                    )
+                else:
                     continue
-
-                results.append(json.loads(file.read_text()))
             except ValueError:
                 # Skip files that don't match expected format
                 continue
 
-        return results
+            if end_time and file_time > end_time:
+                continue
+            files.append((file_time, file))
+        files.sort(key=lambda f: (f[0], f[1].name), reverse=True)
+
+        # newest segments first, each segment's records oldest first
+        results_by_file: list[deque[JSON_ro]] = []
+        num_results = 0
+        for file_time, file in files:
+            if num_results >= limit:
+                break
+
+            file_results: deque[JSON_ro] = deque(maxlen=limit - num_results)
+            try:
+                if file.suffix == ".json":
+                    if start_time and file_time < start_time:
+                        continue
+                    file_results.append(json.loads(file.read_text()))
+                else:
+                    with open(file) as f:
+                        for line in f:
+                            entry = self._parse_segment_line(line, start_time, end_time)
+                            if entry is not None:
+                                file_results.append(entry)
+            except (OSError, ValueError):
+                # deleted by retention in the meantime, or malformed
+                continue
+
+            results_by_file.append(file_results)
+            num_results += len(file_results)
+
+        return [
+            entry
+            for file_results in reversed(results_by_file)
+            for entry in file_results
+        ]
+
+    @staticmethod
+    def _parse_segment_line(
+        line: str, start_time: datetime | None, end_time: datetime | None
+    ) -> JSON_ro | None:
+        try:
+            entry: dict[str, Any] = json.loads(line)
+            record_time = datetime.fromisoformat(entry.pop("timestamp"))
+        except (ValueError, KeyError):
+            # partially written / malformed line
+            return None
+
+        if start_time and record_time < start_time:
+            return None
+        if end_time and record_time > end_time:
+            return None
+        return entry
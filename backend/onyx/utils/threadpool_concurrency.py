@@ -5,6 +5,7 @@ import contextvars
 import copy
 import threading
 import uuid
+from collections import deque
 from collections.abc import Awaitable
 from collections.abc import Callable
 from collections.abc import Iterator
@@ -26,6 +27,8 @@ from pydantic import GetCoreSchemaHandler
 from pydantic.types import T
 from pydantic_core import core_schema
 
+from onyx.utils.executor_service import ExecutorPool
+from onyx.utils.executor_service import get_executor_service
 from onyx.utils.logger import setup_logger
 
 logger = setup_logger()
@@ -35,6 +38,10 @@ KT = TypeVar("KT")  # Key type
 VT = TypeVar("VT")  # Value type
 _T = TypeVar("_T")  # Default type
 
+# how long `parallel_map_unordered` waits on the shared pool before running
+# queued calls on the consuming thread
+_STEAL_AFTER_SECONDS = 0.5
+
 
 class ThreadSafeDict(MutableMapping[KT, VT]):
     """
@@ -182,6 +189,7 @@ def run_functions_tuples_in_parallel(
     functions_with_args: Sequence[tuple[CallableProtocol, tuple[Any, ...]]],
     allow_failures: bool = False,
     max_workers: int | None = None,
+    pool: ExecutorPool = ExecutorPool.IO,
 ) -> list[Any]:
     """
     Executes multiple functions in parallel and returns a list of the results for each function.
@@ -191,40 +199,43 @@ def run_functions_tuples_in_parallel(
     Args:
         functions_with_args: List of tuples each containing the function callable and a tuple of arguments.
         allow_failures: if set to True, then the function result will just be None
-        max_workers: Max number of worker threads
+        max_workers: Max number of functions from this call to run at the same time
+        pool: The shared executor pool to run the functions on
 
     Returns:
         list: A list of results from each function, in the same order as the input functions.
     """
-    workers = (
-        min(max_workers, len(functions_with_args))
-        if max_workers is not None
-        else len(functions_with_args)
-    )
-
-    if workers <= 0:
+    if not functions_with_args or (max_workers is not None and max_workers <= 0):
         return []
 
+    # The primary reason for propagating contextvars is to allow acquiring a db session
+    # that respects tenant id. Context.run is expected to be low-overhead, but if we later
+    # find that it is increasing latency we can make using it optional.
+    futures = get_executor_service().run_all(
+        pool,
+        [(func, args, {}) for func, args in functions_with_args],
+        max_concurrency=max_workers,
+        fail_fast=not allow_failures,
+    )
+    future_to_index = {future: i for i, future in enumerate(futures)}
+
     results = []
-    with ThreadPoolExecutor(max_workers=workers) as executor:
-        # The primary reason for propagating contextvars is to allow acquiring a db session
-        # that respects tenant id. Context.run is expected to be low-overhead, but if we later
-        # find that it is increasing latency we can make using it optional.
-        future_to_index = {
-            executor.submit(contextvars.copy_context().run, func, *args): i
-            for i, (func, args) in enumerate(functions_with_args)
-        }
+    first_error: BaseException | None = None
+    for future in as_completed(future_to_index):
+        index = future_to_index[future]
+        if future.cancelled():
+            continue
+        try:
+            results.append((index, future.result()))
+        except Exception as e:
+            logger.exception(f"Function at index {index} failed due to {e}")
+            results.append((index, None))  # type: ignore
 
-        for future in as_completed(future_to_index):
-            index = future_to_index[future]
-            try:
-                results.append((index, future.result()))
-            except Exception as e:
-                logger.exception(f"Function at index {index} failed due to {e}")
-                results.append((index, None))  # type: ignore
+            if not allow_failures and first_error is None:
+                first_error = e
 
-                if not allow_failures:
-                    raise
+    if first_error is not None:
+        raise first_error
 
     results.sort(key=lambda x: x[0])
     return [result for index, result in results]
@@ -251,6 +262,7 @@ class FunctionCall(Generic[R]):
 def run_functions_in_parallel(
     function_calls: list[FunctionCall],
     allow_failures: bool = False,
+    pool: ExecutorPool = ExecutorPool.IO,
 ) -> dict[str, Any]:
     """
     Executes a list of FunctionCalls in parallel and stores the results in a dictionary where the keys
@@ -261,24 +273,32 @@ def run_functions_in_parallel(
     if len(function_calls) == 0:
         return results
 
-    with ThreadPoolExecutor(max_workers=len(function_calls)) as executor:
-        future_to_id = {
-            executor.submit(
-                contextvars.copy_context().run, func_call.execute
-            ): func_call.result_id
-            for func_call in function_calls
-        }
+    futures = get_executor_service().run_all(
+        pool,
+        [(func_call.execute, (), {}) for func_call in function_calls],
+        fail_fast=not allow_failures,
+    )
+    future_to_id = {
+        future: func_call.result_id
+        for future, func_call in zip(futures, function_calls)
+    }
+
+    first_error: BaseException | None = None
+    for future in as_completed(future_to_id):
+        result_id = future_to_id[future]
+        if future.cancelled():
+            continue
+        try:
+            results[result_id] = future.result()
+        except Exception as e:
+            logger.exception(f"Function with ID {result_id} failed due to {e}")
+            results[result_id] = None
 
-        for future in as_completed(future_to_id):
-            result_id = future_to_id[future]
-            try:
-                results[result_id] = future.result()
-            except Exception as e:
-                logger.exception(f"Function with ID {result_id} failed due to {e}")
-                results[result_id] = None
+            if not allow_failures and first_error is None:
+                first_error = e
 
-                if not allow_failures:
-                    raise
+    if first_error is not None:
+        raise first_error
 
     return results
 
@@ -343,6 +363,9 @@ def run_with_timeout(
 # difficult to use. It's up to the programmer to call wait_on_background on the thread after
 # the code you want to run in parallel is finished. As with all python thread parallelism,
 # this is only useful for I/O bound tasks.
+# This spawns a dedicated thread, so it is meant for long-lived work (e.g. driving a whole
+# chat turn). For short tasks on hot paths, submit to a shared pool via
+# `get_executor_service().submit(...)` instead.
 def run_in_background(
     func: Callable[..., R], *args: Any, **kwargs: Any
 ) -> TimeoutThread[R]:
@@ -422,3 +445,76 @@ def parallel_yield_from_funcs(
     yield from parallel_yield(
         [func_wrapper(func) for func in funcs], max_workers=max_workers
     )
+
+
+def _wait_for_any(futures: set[Future[R]]) -> set[Future[R]]:
+    done, _ = wait(futures, timeout=_STEAL_AFTER_SECONDS, return_when=FIRST_COMPLETED)
+    if done:
+        return done
+
+    # the shared pool may be saturated (e.g. when called from within a pool
+    # task), so run a call that is still queued on this thread instead of
+    # waiting for a worker to pick it up
+    for future in futures:
+        if not future.running():
+            # runs the call inline if no worker has claimed it yet
+            future.exception()
+            break
+    done, _ = wait(futures, return_when=FIRST_COMPLETED)
+    return done
+
+
+def parallel_map_unordered(
+    func: Callable[[_T], R],
+    items: collections.abc.Iterable[_T],
+    max_workers: int,
+    max_pending: int | None = None,
+) -> Iterator[R]:
+    """
+    Applies `func` to every item on the shared IO pool, yielding results as
+    they finish (NOT in input order). At most `max_workers` calls run at once.
+    `items` is consumed lazily: at most `max_pending` items (default
+    2 * max_workers) are pulled but not yet yielded, so memory stays bounded
+    regardless of how many items there are and the first results are available
+    before `items` is exhausted.
+
+    `items` is always iterated on the calling thread. Every item pulled from it
+    has been processed and yielded by the time the returned iterator is
+    exhausted. If `func` raises, the exception is re-raised and any items that
+    have not started yet are dropped.
+    """
+    max_workers = max(1, max_workers)
+    max_pending = max(max_pending or 2 * max_workers, max_workers)
+    executor_service = get_executor_service()
+    queued: deque[_T] = deque()
+    in_flight: set[Future[R]] = set()
+
+    def _submit_queued() -> None:
+        while queued and len(in_flight) < max_workers:
+            in_flight.add(
+                executor_service.submit(ExecutorPool.IO, func, queued.popleft())
+            )
+
+    def _collect(done: set[Future[R]]) -> list[R]:
+        in_flight.difference_update(done)
+        # keep the workers busy while the consumer handles the results
+        _submit_queued()
+        return [future.result() for future in done]
+
+    try:
+        for item in items:
+            queued.append(item)
+            _submit_queued()
+
+            if len(queued) + len(in_flight) >= max_pending:
+                yield from _collect(_wait_for_any(in_flight))
+            else:
+                # don't hold on to results that are already available
+                yield from _collect({future for future in in_flight if future.done()})
+
+        while in_flight:
+            yield from _collect(_wait_for_any(in_flight))
+    finally:
+        queued.clear()
+        for future in in_flight:
+            future.cancel()
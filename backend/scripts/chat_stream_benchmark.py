@@ -0,0 +1,134 @@
+"""
+Compares serializing a chat answer stream packet by packet (the previous
+get_json_line(obj.model_dump()) per packet) with the coalescing ChatStreamWriter.
+Reports packets/sec, the number of frames written and the bytes on the wire.
+
+The synthetic stream is a reasoning section followed by an answer, one or two
+tokens per delta. By default the packets arrive as fast as they are produced, so
+merging is only bounded by --max-deltas. Pass --token-interval-ms to space the
+deltas out like a streaming LLM would (the run then takes that much longer).
+
+Usage:
+    python scripts/chat_stream_benchmark.py --tokens 2000
+    python scripts/chat_stream_benchmark.py --tokens 500 --token-interval-ms 5
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from collections.abc import Callable
+from collections.abc import Iterator
+
+# Ensure PYTHONPATH is set up for direct script execution
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(parent_dir)
+
+from pydantic import BaseModel  # noqa: E402
+
+from onyx.chat.packet_proccessing.chat_stream_writer import (  # noqa: E402
+    ChatStreamWriter,
+)
+from onyx.server.query_and_chat.streaming_models import MessageDelta  # noqa: E402
+from onyx.server.query_and_chat.streaming_models import MessageStart  # noqa: E402
+from onyx.server.query_and_chat.streaming_models import OverallStop  # noqa: E402
+from onyx.server.query_and_chat.streaming_models import Packet  # noqa: E402
+from onyx.server.query_and_chat.streaming_models import ReasoningDelta  # noqa: E402
+from onyx.server.query_and_chat.streaming_models import ReasoningStart  # noqa: E402
+from onyx.server.query_and_chat.streaming_models import SectionEnd  # noqa: E402
+from onyx.server.utils import get_json_line  # noqa: E402
+
+_WORDS = ["the", " answer", " is", " that", " Onyx", " connects", ",", " and", "."]
+
+
+def build_stream(num_tokens: int, seed: int) -> list[Packet]:
+    rng = random.Random(seed)
+
+    def token() -> str:
+        return "".join(rng.choice(_WORDS) for _ in range(rng.randint(1, 2)))
+
+    num_reasoning = num_tokens // 4
+    return [
+        Packet(ind=0, obj=ReasoningStart()),
+        *(
+            Packet(ind=0, obj=ReasoningDelta(reasoning=token()))
+            for _ in range(num_reasoning)
+        ),
+        Packet(ind=0, obj=SectionEnd()),
+        Packet(ind=1, obj=MessageStart(content="", final_documents=None)),
+        *(
+            Packet(ind=1, obj=MessageDelta(content=token()))
+            for _ in range(num_tokens - num_reasoning)
+        ),
+        Packet(ind=1, obj=SectionEnd()),
+        Packet(ind=1, obj=OverallStop()),
+    ]
+
+
+def _arrive(packets: list[Packet], interval_seconds: float) -> Iterator[Packet]:
+    for packet in packets:
+        if interval_seconds:
+            time.sleep(interval_seconds)
+        yield packet
+
+
+def write_per_packet(packets: Iterator[BaseModel]) -> Iterator[str]:
+    for packet in packets:
+        yield get_json_line(packet.model_dump())
+
+
+def write_coalesced(
+    packets: Iterator[BaseModel], window_ms: int, max_deltas: int
+) -> Iterator[str]:
+    writer = ChatStreamWriter(window_ms=window_ms, max_deltas=max_deltas)
+    for packet in packets:
+        yield from writer.write(packet)
+    yield from writer.flush()
+
+
+def _run(
+    write: Callable[[Iterator[BaseModel]], Iterator[str]],
+    packets: list[Packet],
+    interval_seconds: float,
+) -> tuple[float, int, int]:
+    start = time.perf_counter()
+    frames = list(write(_arrive(packets, interval_seconds)))
+    elapsed = time.perf_counter() - start
+    return elapsed, len(frames), sum(len(frame.encode()) for frame in frames)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark chat stream writing")
+    parser.add_argument("--tokens", type=int, default=2_000)
+    parser.add_argument("--streams", type=int, default=50)
+    parser.add_argument("--window-ms", type=int, default=15)
+    parser.add_argument("--max-deltas", type=int, default=64)
+    parser.add_argument("--token-interval-ms", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    packets = build_stream(args.tokens, args.seed)
+    interval_seconds = args.token_interval_ms / 1000
+    num_streams = 1 if interval_seconds else args.streams
+
+    print(f"packets per stream: {len(packets)} ({args.tokens} tokens)")
+    for name, write in (
+        ("per packet", write_per_packet),
+        (
+            "coalesced",
+            lambda stream: write_coalesced(stream, args.window_ms, args.max_deltas),
+        ),
+    ):
+        total_elapsed = 0.0
+        for _ in range(num_streams):
+            elapsed, num_frames, num_bytes = _run(write, packets, interval_seconds)
+            total_elapsed += elapsed
+        print(
+            f"{name:<11}{len(packets) * num_streams / total_elapsed:>12,.0f} packets/s "
+            f"{num_frames:>6} frames {num_bytes:>9,} bytes per stream"
+        )
+
+
+if __name__ == "__main__":
+    main()
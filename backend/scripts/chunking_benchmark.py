@@ -0,0 +1,132 @@
+"""
+Measures chunking throughput on a fixed, generated corpus so that changes to the
+chunker or tokenizer can be compared run over run. No services are needed, only
+the tokenizer of the embedding model (downloaded from HuggingFace on first use).
+
+Usage:
+    python scripts/chunking_benchmark.py --num-docs 200 --multipass
+"""
+
+import argparse
+import random
+import time
+from collections import Counter
+
+from onyx.configs.constants import DocumentSource
+from onyx.configs.model_configs import DOCUMENT_ENCODER_MODEL
+from onyx.connectors.models import Document
+from onyx.connectors.models import IndexingDocument
+from onyx.connectors.models import TextSection
+from onyx.indexing.chunker import Chunker
+from onyx.indexing.indexing_pipeline import process_image_sections
+from onyx.natural_language_processing.utils import BaseTokenizer
+from onyx.natural_language_processing.utils import get_tokenizer
+
+_WORDS = (
+    "the quick brown fox jumps over lazy dog index search query document "
+    "connector embedding chunk token vector latency throughput cache batch "
+    "tenant permission sync pipeline model server request response"
+).split()
+
+
+class _CountingTokenizer(BaseTokenizer):
+    def __init__(self, tokenizer: BaseTokenizer) -> None:
+        self.tokenizer = tokenizer
+        self.encoded_texts = 0
+        self.encoded_chars = 0
+
+    def _record(self, strings: list[str]) -> None:
+        self.encoded_texts += len(strings)
+        self.encoded_chars += sum(len(string) for string in strings)
+
+    def encode(self, string: str) -> list[int]:
+        self._record([string])
+        return self.tokenizer.encode(string)
+
+    def encode_batch(self, strings: list[str]) -> list[list[int]]:
+        self._record(strings)
+        return self.tokenizer.encode_batch(strings)
+
+    def tokenize(self, string: str) -> list[str]:
+        self._record([string])
+        return self.tokenizer.tokenize(string)
+
+    def decode(self, tokens: list[int]) -> str:
+        return self.tokenizer.decode(tokens)
+
+
+def _sentence(rng: random.Random) -> str:
+    words = rng.choices(_WORDS, k=rng.randint(5, 30))
+    return " ".join(words).capitalize() + "."
+
+
+def build_corpus(num_docs: int, seed: int) -> list[IndexingDocument]:
+    """Mix of short sections, medium sections and a few very long sections, like
+    a typical wiki/ticketing connector batch."""
+    rng = random.Random(seed)
+    documents = []
+    for doc_num in range(num_docs):
+        sections = []
+        for _ in range(rng.randint(1, 15)):
+            num_sentences = rng.choice([1, 3, 10, 40, 200])
+            sections.append(
+                TextSection(
+                    text=" ".join(_sentence(rng) for _ in range(num_sentences)),
+                    link=f"https://example.com/{doc_num}",
+                )
+            )
+        documents.append(
+            Document(
+                id=f"benchmark_doc_{doc_num}",
+                source=DocumentSource.WEB,
+                semantic_identifier=_sentence(rng),
+                metadata={"tags": rng.choices(_WORDS, k=3)},
+                doc_updated_at=None,
+                sections=sections,
+            )
+        )
+    return process_image_sections(documents)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark document chunking")
+    parser.add_argument("--num-docs", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--multipass", action="store_true")
+    parser.add_argument("--model-name", default=DOCUMENT_ENCODER_MODEL)
+    args = parser.parse_args()
+
+    documents = build_corpus(args.num_docs, args.seed)
+    num_chars = sum(len(doc.get_text_content()) for doc in documents)
+    tokenizer = _CountingTokenizer(get_tokenizer(args.model_name, None))
+    chunker = Chunker(tokenizer=tokenizer, enable_multipass=args.multipass)
+
+    # warm up the tokenizer outside of the timed rounds
+    chunker.chunk(documents[:1])
+
+    timings = []
+    chunk_counts: Counter[int] = Counter()
+    for _ in range(args.rounds):
+        tokenizer.encoded_texts = 0
+        tokenizer.encoded_chars = 0
+        start = time.perf_counter()
+        chunks = chunker.chunk(documents)
+        timings.append(time.perf_counter() - start)
+        chunk_counts[len(chunks)] += 1
+
+    best = min(timings)
+    print(f"documents:          {len(documents)} ({num_chars / 1e6:.2f}M chars)")
+    print(f"chunks:             {', '.join(str(count) for count in chunk_counts)}")
+    print(f"best round:         {best:.3f}s")
+    print(f"documents/s:        {len(documents) / best:.1f}")
+    print(f"MB/s:               {num_chars / 1e6 / best:.2f}")
+    print(f"encoded texts:      {tokenizer.encoded_texts}")
+    print(
+        f"encoded chars:      {tokenizer.encoded_chars / 1e6:.2f}M "
+        f"({tokenizer.encoded_chars / num_chars:.1f}x the corpus)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Compares ops/sec of the tenant-prefixing Redis client against the raw client.
+
+By default commands are not sent anywhere: execute_command is replaced by a no-op
+so that only the client-side overhead (client lookup, key prefixing, method
+dispatch) is measured. Pass --live to run the same operations against the
+configured Redis instead.
+
+Usage:
+    python scripts/redis_client_benchmark.py --ops 200000
+    python scripts/redis_client_benchmark.py --ops 20000 --live
+"""
+
+import argparse
+import time
+from collections.abc import Callable
+from typing import Any
+
+from redis.client import Redis
+
+from onyx.redis.redis_pool import get_raw_redis_client
+from onyx.redis.redis_pool import get_redis_client
+
+_TENANT_ID = "benchmark_tenant"
+
+
+def _no_op(*args: Any, **options: Any) -> Any:
+    return None
+
+
+def _client_ops(client: Redis, key: str) -> Callable[[], None]:
+    # the mix of calls made by fence checks, stop signals and heartbeats
+    def ops() -> None:
+        client.exists(key)
+        client.get(key)
+        client.set(key, 1, ex=60)
+
+    return ops
+
+
+def _lookup_and_ops(get_client: Callable[[], Redis], key: str) -> Callable[[], None]:
+    # most call sites fetch a client right before using it
+    def ops() -> None:
+        client = get_client()
+        client.exists(key)
+        client.get(key)
+        client.set(key, 1, ex=60)
+
+    return ops
+
+
+def _ops_per_sec(ops: Callable[[], None], num_ops: int) -> float:
+    # every call of `ops` makes 3 commands
+    num_calls = max(num_ops // 3, 1)
+    start = time.perf_counter()
+    for _ in range(num_calls):
+        ops()
+    return num_calls * 3 / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the tenant Redis client")
+    parser.add_argument("--ops", type=int, default=200_000)
+    parser.add_argument("--live", action="store_true")
+    args = parser.parse_args()
+
+    raw_client = get_raw_redis_client()
+    tenant_client = get_redis_client(tenant_id=_TENANT_ID)
+    raw_key = f"{_TENANT_ID}:benchmark_key"
+    tenant_key = "benchmark_key"
+
+    def get_raw() -> Redis:
+        return raw_client
+
+    def get_tenant() -> Redis:
+        return get_redis_client(tenant_id=_TENANT_ID)
+
+    if not args.live:
+        for client in (raw_client, tenant_client):
+            client.execute_command = _no_op  # type: ignore[method-assign]
+
+    try:
+        results = {
+            "raw client": _ops_per_sec(_client_ops(raw_client, raw_key), args.ops),
+            "tenant client": _ops_per_sec(
+                _client_ops(tenant_client, tenant_key), args.ops
+            ),
+            "raw client + lookup": _ops_per_sec(
+                _lookup_and_ops(get_raw, raw_key), args.ops
+            ),
+            "tenant client + lookup": _ops_per_sec(
+                _lookup_and_ops(get_tenant, tenant_key), args.ops
+            ),
+        }
+    finally:
+        if args.live:
+            raw_client.delete(raw_key)
+
+    baseline = results["raw client"]
+    print(f"mode: {'live' if args.live else 'client overhead only'}")
+    for name, ops_per_sec in results.items():
+        print(f"{name:<24} {ops_per_sec:>12,.0f} ops/s ({ops_per_sec / baseline:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,8 +4,8 @@ from unittest.mock import MagicMock
 from unittest.mock import patch
 
 from onyx.connectors.gmail.connector import GmailConnector
-from onyx.connectors.models import Document
 from onyx.connectors.models import SlimDocument
+from tests.daily.connectors.utils import load_all_docs_from_checkpoint_connector
 
 
 _THREAD_1_START_TIME = 1730568700
@@ -102,9 +102,9 @@ def test_docs_retrieval(
 ) -> None:
     print("\n\nRunning test_docs_retrieval")
     connector = google_gmail_service_acct_connector_factory()
-    retrieved_docs: list[Document] = []
-    for doc_batch in connector.poll_source(_THREAD_1_START_TIME, _THREAD_1_END_TIME):
-        retrieved_docs.extend(doc_batch)
+    retrieved_docs = load_all_docs_from_checkpoint_connector(
+        connector, _THREAD_1_START_TIME, _THREAD_1_END_TIME
+    )
 
     assert len(retrieved_docs) == 4
 
@@ -0,0 +1,191 @@
+from unittest.mock import patch
+from uuid import UUID
+
+import pytest
+from sqlalchemy.orm import Session
+
+from onyx.chat import chat_utils
+from onyx.chat.chat_utils import create_chat_chain
+from onyx.configs.constants import MessageType
+from onyx.db.chat import create_chat_session
+from onyx.db.chat import create_new_chat_message
+from onyx.db.chat import get_mainline_chat_message_ids
+from onyx.db.chat import get_or_create_root_message
+from onyx.db.models import ChatMessage
+from onyx.redis.redis_chat_mainline import get_cached_mainline_message_ids
+from onyx.redis.redis_pool import get_redis_client
+from tests.external_dependency_unit.conftest import create_test_user
+
+
+def _create_session(db_session: Session, email_prefix: str) -> UUID:
+    user = create_test_user(db_session, email_prefix=email_prefix)
+    chat_session = create_chat_session(
+        db_session=db_session, description="chat", user_id=user.id, persona_id=None
+    )
+    return chat_session.id
+
+
+def _reply(
+    db_session: Session,
+    chat_session_id: UUID,
+    parent_message: ChatMessage,
+    message_type: MessageType,
+    message: str,
+) -> ChatMessage:
+    return create_new_chat_message(
+        chat_session_id=chat_session_id,
+        parent_message=parent_message,
+        message=message,
+        token_count=len(message.split()),
+        message_type=message_type,
+        db_session=db_session,
+    )
+
+
+def _create_conversation(
+    db_session: Session, chat_session_id: UUID, questions: list[str]
+) -> list[ChatMessage]:
+    """Root message followed by a question and an answer for each of questions"""
+    messages = [get_or_create_root_message(chat_session_id, db_session)]
+    for question in questions:
+        messages.append(
+            _reply(
+                db_session, chat_session_id, messages[-1], MessageType.USER, question
+            )
+        )
+        messages.append(
+            _reply(
+                db_session,
+                chat_session_id,
+                messages[-1],
+                MessageType.ASSISTANT,
+                f"answer to {question}",
+            )
+        )
+    return messages
+
+
+def _chain_ids(
+    chat_session_id: UUID, db_session: Session, stop_at_message_id: int | None = None
+) -> tuple[int, list[int]]:
+    final_message, history = create_chat_chain(
+        chat_session_id=chat_session_id,
+        db_session=db_session,
+        stop_at_message_id=stop_at_message_id,
+    )
+    return final_message.id, [message.id for message in history]
+
+
+def test_abandoned_edit_branches_are_skipped(
+    db_session: Session, tenant_context: None
+) -> None:
+    chat_session_id = _create_session(db_session, "chat_chain_edit")
+    root, question, answer, abandoned_question, abandoned_answer = _create_conversation(
+        db_session, chat_session_id, ["first", "second"]
+    )
+    # editing the second question starts a new branch from the first answer
+    edited_question = _reply(
+        db_session, chat_session_id, answer, MessageType.USER, "second, edited"
+    )
+    edited_answer = _reply(
+        db_session, chat_session_id, edited_question, MessageType.ASSISTANT, "answer"
+    )
+
+    mainline_ids = [root.id, question.id, answer.id, edited_question.id]
+    assert get_mainline_chat_message_ids(chat_session_id, db_session) == [
+        *mainline_ids,
+        edited_answer.id,
+    ]
+    assert get_mainline_chat_message_ids(
+        chat_session_id, db_session, start_message_id=answer.id
+    ) == [answer.id, edited_question.id, edited_answer.id]
+    assert _chain_ids(chat_session_id, db_session) == (
+        edited_answer.id,
+        mainline_ids[1:],
+    )
+    assert abandoned_question.id not in get_cached_mainline_message_ids(
+        get_redis_client(), chat_session_id
+    )
+    assert abandoned_answer.id not in get_cached_mainline_message_ids(
+        get_redis_client(), chat_session_id
+    )
+
+
+def test_regenerated_message_replaces_the_cached_chain(
+    db_session: Session, tenant_context: None
+) -> None:
+    chat_session_id = _create_session(db_session, "chat_chain_regenerate")
+    root, question, answer, follow_up, follow_up_answer = _create_conversation(
+        db_session, chat_session_id, ["first", "second"]
+    )
+    assert _chain_ids(chat_session_id, db_session) == (
+        follow_up_answer.id,
+        [question.id, answer.id, follow_up.id],
+    )
+
+    # regenerating the first answer makes the cached chain invalid after the question
+    regenerated_answer = _reply(
+        db_session, chat_session_id, question, MessageType.ASSISTANT, "new answer"
+    )
+
+    assert _chain_ids(chat_session_id, db_session) == (
+        regenerated_answer.id,
+        [question.id],
+    )
+    assert get_cached_mainline_message_ids(get_redis_client(), chat_session_id) == [
+        root.id,
+        question.id,
+        regenerated_answer.id,
+    ]
+
+
+def test_chain_stops_at_message(db_session: Session, tenant_context: None) -> None:
+    chat_session_id = _create_session(db_session, "chat_chain_stop")
+    _, question, answer, follow_up, _ = _create_conversation(
+        db_session, chat_session_id, ["first", "second"]
+    )
+
+    assert _chain_ids(chat_session_id, db_session, stop_at_message_id=follow_up.id) == (
+        follow_up.id,
+        [question.id, answer.id],
+    )
+    # the stop only applies to the returned chain, the whole mainline is cached
+    assert (
+        len(get_cached_mainline_message_ids(get_redis_client(), chat_session_id)) == 5
+    )
+
+
+@pytest.mark.parametrize("warm_cache", [False, True])
+def test_dangling_latest_child_message_raises(
+    db_session: Session, tenant_context: None, warm_cache: bool
+) -> None:
+    chat_session_id = _create_session(db_session, "chat_chain_dangling")
+    *_, last_answer = _create_conversation(db_session, chat_session_id, ["first"])
+    if warm_cache:
+        _chain_ids(chat_session_id, db_session)
+
+    # points at a message that doesn't exist (anymore)
+    last_answer.latest_child_message = last_answer.id + 1_000_000
+    db_session.commit()
+
+    with pytest.raises(RuntimeError, match="Invalid message chain"):
+        create_chat_chain(chat_session_id=chat_session_id, db_session=db_session)
+
+
+def test_warm_cache_matches_cold_cache(
+    db_session: Session, tenant_context: None
+) -> None:
+    chat_session_id = _create_session(db_session, "chat_chain_cache")
+    _create_conversation(db_session, chat_session_id, ["first", "second", "third"])
+
+    cold_chain = _chain_ids(chat_session_id, db_session)
+    with patch.object(
+        chat_utils,
+        "get_mainline_chat_message_ids",
+        wraps=get_mainline_chat_message_ids,
+    ) as mainline_lookup:
+        warm_chain = _chain_ids(chat_session_id, db_session)
+
+    assert warm_chain == cold_chain
+    # nothing was added since the chain was cached, so nothing had to be looked up
+    mainline_lookup.assert_not_called()
@@ -0,0 +1,173 @@
+import datetime
+from uuid import UUID
+
+from sqlalchemy.orm import Session
+
+from onyx.configs.constants import MessageType
+from onyx.db.chat import create_chat_session
+from onyx.db.chat_search import ChatSessionCursor
+from onyx.db.chat_search import search_chat_sessions
+from onyx.db.chat_search import search_chat_sessions_ranked
+from onyx.db.models import ChatMessage
+from onyx.db.models import ChatSession
+from tests.external_dependency_unit.conftest import create_test_user
+
+
+def _create_session(
+    db_session: Session,
+    user_id: UUID,
+    time_created: datetime.datetime,
+    description: str = "chat",
+    messages: list[str] | None = None,
+) -> ChatSession:
+    chat_session = create_chat_session(
+        db_session=db_session,
+        description=description,
+        user_id=user_id,
+        persona_id=None,
+    )
+    chat_session.time_created = time_created
+    for message in messages or []:
+        db_session.add(
+            ChatMessage(
+                chat_session_id=chat_session.id,
+                message=message,
+                token_count=len(message.split()),
+                message_type=MessageType.USER,
+            )
+        )
+    db_session.commit()
+    return chat_session
+
+
+def _paginate_recent(
+    db_session: Session, user_id: UUID, page_size: int, query: str | None = None
+) -> list[list[UUID]]:
+    pages: list[list[UUID]] = []
+    cursor: ChatSessionCursor | None = None
+    while True:
+        sessions, has_more = search_chat_sessions(
+            user_id=user_id,
+            db_session=db_session,
+            query=query,
+            page_size=page_size,
+            cursor=cursor,
+        )
+        pages.append([session.id for session in sessions])
+        if not has_more:
+            return pages
+        cursor = ChatSessionCursor(
+            time_created=sessions[-1].time_created, id=sessions[-1].id
+        )
+
+
+def test_keyset_pages_do_not_overlap_or_skip_with_tied_timestamps(
+    db_session: Session, tenant_context: None
+) -> None:
+    user = create_test_user(db_session, email_prefix="chat_search_keyset")
+    tied_time = datetime.datetime(2025, 1, 1, tzinfo=datetime.timezone.utc)
+    # most sessions share a timestamp, so only the id breaks the tie
+    sessions = [
+        _create_session(
+            db_session,
+            user.id,
+            tied_time if i % 4 else tied_time - datetime.timedelta(days=i),
+        )
+        for i in range(11)
+    ]
+
+    pages = _paginate_recent(db_session, user.id, page_size=3)
+
+    returned_ids = [session_id for page in pages for session_id in page]
+    assert len(returned_ids) == len(set(returned_ids))
+    assert set(returned_ids) == {session.id for session in sessions}
+    assert all(len(page) == 3 for page in pages[:-1])
+
+    # same order as a single unpaginated query
+    all_sessions, has_more = search_chat_sessions(
+        user_id=user.id, db_session=db_session, page_size=100
+    )
+    assert not has_more
+    assert returned_ids == [session.id for session in all_sessions]
+
+
+def test_full_text_filter_matches_messages_and_descriptions(
+    db_session: Session, tenant_context: None
+) -> None:
+    user = create_test_user(db_session, email_prefix="chat_search_fts")
+    now = datetime.datetime.now(datetime.timezone.utc)
+    by_message = _create_session(
+        db_session,
+        user.id,
+        now,
+        messages=["how do I rotate the kubernetes credentials", "thanks"],
+    )
+    by_description = _create_session(
+        db_session,
+        user.id,
+        now - datetime.timedelta(minutes=1),
+        description="kubernetes upgrade plan",
+    )
+    # several matching messages in one session must only return it once
+    many_matches = _create_session(
+        db_session,
+        user.id,
+        now - datetime.timedelta(minutes=2),
+        messages=["kubernetes pods", "more kubernetes", "kubernetes again"],
+    )
+    _create_session(db_session, user.id, now, messages=["unrelated question"])
+
+    pages = _paginate_recent(db_session, user.id, page_size=2, query="kubernetes")
+
+    assert [session_id for page in pages for session_id in page] == [
+        by_message.id,
+        by_description.id,
+        many_matches.id,
+    ]
+
+
+def test_ranked_cursor_pages_through_tied_ranks(
+    db_session: Session, tenant_context: None
+) -> None:
+    user = create_test_user(db_session, email_prefix="chat_search_ranked")
+    tied_time = datetime.datetime(2025, 1, 1, tzinfo=datetime.timezone.utc)
+    # identical content gives identical ranks, and identical timestamps leave
+    # only the id to order by
+    sessions = [
+        _create_session(
+            db_session,
+            user.id,
+            tied_time,
+            messages=["postgres vacuum settings"] * (1 + i % 3),
+        )
+        for i in range(10)
+    ]
+
+    returned: list[tuple[UUID, object]] = []
+    cursor: ChatSessionCursor | None = None
+    while True:
+        ranked_sessions, has_more = search_chat_sessions_ranked(
+            user_id=user.id,
+            db_session=db_session,
+            query="postgres vacuum",
+            page_size=3,
+            cursor=cursor,
+        )
+        returned.extend((session.id, rank) for session, rank in ranked_sessions)
+        if not has_more:
+            break
+        last_session, last_rank = ranked_sessions[-1]
+        # go through the same encoding the API uses
+        cursor = ChatSessionCursor.decode(
+            ChatSessionCursor(
+                time_created=last_session.time_created,
+                id=last_session.id,
+                rank=last_rank,
+            ).encode()
+        )
+
+    returned_ids = [session_id for session_id, _ in returned]
+    assert len(returned_ids) == len(set(returned_ids))
+    assert set(returned_ids) == {session.id for session in sessions}
+    ranks = [rank for _, rank in returned]
+    assert ranks == sorted(ranks, reverse=True)  # type: ignore[type-var]
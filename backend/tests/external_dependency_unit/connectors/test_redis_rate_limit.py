@@ -0,0 +1,91 @@
+import time
+from collections.abc import Generator
+from uuid import uuid4
+
+import pytest
+
+from onyx.configs.constants import DocumentSource
+from onyx.connectors.cross_connector_utils.redis_rate_limit import (
+    RedisTokenBucketRateLimiter,
+)
+from onyx.redis.redis_pool import get_raw_redis_client
+from shared_configs.contextvars import CURRENT_TENANT_ID_CONTEXTVAR
+
+
+@pytest.fixture
+def credential_key() -> Generator[str, None, None]:
+    credential_key = f"test_{uuid4().hex}"
+    yield credential_key
+
+    redis_client = get_raw_redis_client()
+    for key in redis_client.scan_iter(match=f"*:{credential_key}"):
+        redis_client.delete(key)
+
+
+def _make_limiter(
+    credential_key: str, max_calls: int, period: float, burst: int | None = None
+) -> RedisTokenBucketRateLimiter:
+    return RedisTokenBucketRateLimiter(
+        DocumentSource.HUBSPOT,
+        credential_key=credential_key,
+        max_calls=max_calls,
+        period=period,
+        burst=burst,
+    )
+
+
+def test_bucket_is_shared_and_drains(tenant_context: None, credential_key: str) -> None:
+    first = _make_limiter(credential_key, max_calls=3, period=60)
+    second = _make_limiter(credential_key, max_calls=3, period=60)
+
+    assert first.try_acquire() == 0
+    assert second.try_acquire() == 0
+    assert first.try_acquire() == 0
+
+    # one token refills every 20 seconds
+    wait = second.try_acquire()
+    assert 19 < wait <= 20
+
+
+def test_bucket_refills(tenant_context: None, credential_key: str) -> None:
+    limiter = _make_limiter(credential_key, max_calls=20, period=1, burst=1)
+
+    assert limiter.try_acquire() == 0
+    wait = limiter.try_acquire()
+    assert 0 < wait <= 0.05
+
+    time.sleep(wait + 0.01)
+    assert limiter.try_acquire() == 0
+
+
+def test_block_for_applies_to_every_limiter(
+    tenant_context: None, credential_key: str
+) -> None:
+    first = _make_limiter(credential_key, max_calls=100, period=1)
+    second = _make_limiter(credential_key, max_calls=100, period=1)
+
+    first.block_for(2)
+
+    wait = second.try_acquire()
+    assert 1.5 < wait <= 2
+    # a shorter block doesn't shorten an existing one
+    second.block_for(0.1)
+    assert first.try_acquire() > 1.5
+
+
+def test_buckets_are_per_tenant(credential_key: str) -> None:
+    limiter = _make_limiter(credential_key, max_calls=1, period=60)
+
+    token = CURRENT_TENANT_ID_CONTEXTVAR.set(f"tenant_a_{credential_key}")
+    try:
+        assert limiter.try_acquire() == 0
+        assert limiter.try_acquire() > 0
+    finally:
+        CURRENT_TENANT_ID_CONTEXTVAR.reset(token)
+
+    # the same limiter instance uses another bucket for another tenant
+    token = CURRENT_TENANT_ID_CONTEXTVAR.set(f"tenant_b_{credential_key}")
+    try:
+        assert limiter.try_acquire() == 0
+    finally:
+        CURRENT_TENANT_ID_CONTEXTVAR.reset(token)
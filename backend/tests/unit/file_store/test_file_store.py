@@ -238,6 +238,118 @@ class TestExternalStorageFileStore:
                 assert call_args[1]["Key"] == "onyx-files/public/test-file.txt"
                 assert call_args[1]["ContentType"] == "text/plain"
 
+    @patch("boto3.client")
+    def test_s3_save_file_multipart(self, mock_boto3: MagicMock) -> None:
+        """Test that files larger than one part are uploaded part by part"""
+        mock_s3_client: Mock = Mock()
+        mock_s3_client.create_multipart_upload.return_value = {"UploadId": "upload"}
+        mock_s3_client.upload_part.side_effect = [
+            {"ETag": f"etag-{part}"} for part in range(3)
+        ]
+        mock_boto3.return_value = mock_s3_client
+
+        with (
+            patch("onyx.file_store.file_store.S3_MULTIPART_CHUNK_SIZE", 10),
+            patch("onyx.file_store.file_store.S3_GENERATE_LOCAL_CHECKSUM", True),
+            patch("onyx.file_store.file_store.upsert_filerecord"),
+        ):
+            file_store = S3BackedFileStore(bucket_name="test-bucket")
+            file_store.save_file(
+                file_id="test-file.txt",
+                content=BytesIO(b"0123456789" * 2 + b"0123"),
+                display_name="Test File",
+                file_origin=FileOrigin.OTHER,
+                file_type="text/plain",
+                db_session=Mock(),
+            )
+
+        mock_s3_client.put_object.assert_not_called()
+        uploaded_parts = [
+            call[1]["Body"] for call in mock_s3_client.upload_part.call_args_list
+        ]
+        assert uploaded_parts == [b"0123456789", b"0123456789", b"0123"]
+
+        completed_parts = mock_s3_client.complete_multipart_upload.call_args[1][
+            "MultipartUpload"
+        ]["Parts"]
+        assert [part["PartNumber"] for part in completed_parts] == [1, 2, 3]
+        assert [part["ETag"] for part in completed_parts] == [
+            "etag-0",
+            "etag-1",
+            "etag-2",
+        ]
+        # base64 of the SHA-256 of the part's bytes
+        assert (
+            completed_parts[2]["ChecksumSHA256"]
+            == "G+LkUrRteg2WVrux92joJI66G3W67WX12Z6vqUiJmmo="
+        )
+
+    @patch("boto3.client")
+    def test_s3_save_file_multipart_aborted_on_error(
+        self, mock_boto3: MagicMock
+    ) -> None:
+        """Test that a failed multipart upload is aborted"""
+        mock_s3_client: Mock = Mock()
+        mock_s3_client.create_multipart_upload.return_value = {"UploadId": "upload"}
+        mock_s3_client.upload_part.side_effect = RuntimeError("upload failed")
+        mock_boto3.return_value = mock_s3_client
+
+        with (
+            patch("onyx.file_store.file_store.S3_MULTIPART_CHUNK_SIZE", 10),
+            patch("onyx.file_store.file_store.upsert_filerecord") as mock_upsert,
+        ):
+            file_store = S3BackedFileStore(bucket_name="test-bucket")
+            with pytest.raises(RuntimeError):
+                file_store.save_file(
+                    file_id="test-file.txt",
+                    content=BytesIO(b"0123456789" * 2),
+                    display_name="Test File",
+                    file_origin=FileOrigin.OTHER,
+                    file_type="text/plain",
+                    db_session=Mock(),
+                )
+
+        mock_s3_client.abort_multipart_upload.assert_called_once_with(
+            Bucket="test-bucket",
+            Key="onyx-files/public/test-file.txt",
+            UploadId="upload",
+        )
+        mock_upsert.assert_not_called()
+
+    @patch("boto3.client")
+    def test_s3_read_file_range_and_stream(self, mock_boto3: MagicMock) -> None:
+        """Test ranged reads and streaming reads"""
+        mock_s3_client: Mock = Mock()
+        mock_body: Mock = Mock()
+        mock_body.read.return_value = b"0123"
+        mock_body.iter_chunks.return_value = iter([b"0123", b"4567"])
+        mock_s3_client.get_object.return_value = {"Body": mock_body}
+        mock_boto3.return_value = mock_s3_client
+
+        file_record = Mock(bucket_name="test-bucket", object_key="key")
+        with patch(
+            "onyx.file_store.file_store.get_filerecord_by_file_id",
+            return_value=file_record,
+        ):
+            file_store = S3BackedFileStore(bucket_name="test-bucket")
+
+            assert file_store.read_file_range("file", 0, 3, db_session=Mock()) == (
+                b"0123"
+            )
+            mock_s3_client.get_object.assert_called_with(
+                Bucket="test-bucket", Key="key", Range="bytes=0-3"
+            )
+
+            file_store.read_file_range("file", 10, db_session=Mock())
+            mock_s3_client.get_object.assert_called_with(
+                Bucket="test-bucket", Key="key", Range="bytes=10-"
+            )
+
+            stream = file_store.open_stream("file", chunk_size=4, db_session=Mock())
+            assert list(stream) == [b"0123", b"4567"]
+            mock_body.iter_chunks.assert_called_once_with(4)
+            mock_body.close.assert_called_once()
+
     def test_minio_client_initialization(self) -> None:
         """Test S3 client initialization with MinIO endpoint"""
         with (
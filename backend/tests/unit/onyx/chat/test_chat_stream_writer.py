@@ -0,0 +1,87 @@
+import json
+import threading
+from collections.abc import Iterator
+
+import pytest
+
+from onyx.chat.models import MessageResponseIDInfo
+from onyx.chat.packet_proccessing.chat_stream_writer import ChatStreamWriter
+from onyx.server.query_and_chat.streaming_models import MessageDelta
+from onyx.server.query_and_chat.streaming_models import OverallStop
+from onyx.server.query_and_chat.streaming_models import Packet
+from onyx.server.query_and_chat.streaming_models import ReasoningDelta
+from onyx.server.query_and_chat.streaming_models import SectionEnd
+
+
+def _write_all(writer: ChatStreamWriter, objects: list) -> list[dict]:
+    lines: list[str] = []
+    for obj in objects:
+        lines.extend(writer.write(obj))
+    lines.extend(writer.flush())
+    return [json.loads(line) for line in lines]
+
+
+def test_consecutive_deltas_are_merged() -> None:
+    objects = [
+        MessageResponseIDInfo(user_message_id=1, reserved_assistant_message_id=2),
+        Packet(ind=0, obj=ReasoningDelta(reasoning="think")),
+        Packet(ind=0, obj=ReasoningDelta(reasoning="ing")),
+        Packet(ind=0, obj=SectionEnd()),
+        Packet(ind=1, obj=MessageDelta(content="Hello")),
+        Packet(ind=1, obj=MessageDelta(content=" world")),
+        Packet(ind=2, obj=MessageDelta(content="!")),
+        Packet(ind=2, obj=OverallStop()),
+    ]
+
+    assert _write_all(ChatStreamWriter(window_ms=60_000), objects) == [
+        {"user_message_id": 1, "reserved_assistant_message_id": 2},
+        {"ind": 0, "obj": {"type": "reasoning_delta", "reasoning": "thinking"}},
+        {"ind": 0, "obj": {"type": "section_end"}},
+        {"ind": 1, "obj": {"type": "message_delta", "content": "Hello world"}},
+        {"ind": 2, "obj": {"type": "message_delta", "content": "!"}},
+        {"ind": 2, "obj": {"type": "stop"}},
+    ]
+
+
+def test_merging_is_bounded() -> None:
+    deltas = [Packet(ind=0, obj=MessageDelta(content=str(i))) for i in range(5)]
+
+    lines = _write_all(ChatStreamWriter(window_ms=60_000, max_deltas=2), deltas)
+    assert [line["obj"]["content"] for line in lines] == ["01", "23", "4"]
+
+    # a window of 0 disables merging
+    lines = _write_all(ChatStreamWriter(window_ms=0), deltas)
+    assert [line["obj"]["content"] for line in lines] == ["0", "1", "2", "3", "4"]
+
+
+def test_merged_deltas_are_flushed_while_waiting_for_the_stream() -> None:
+    next_delta_requested = threading.Event()
+    release_stream = threading.Event()
+
+    def delayed_stream() -> Iterator[Packet]:
+        yield Packet(ind=0, obj=MessageDelta(content="Hello"))
+        next_delta_requested.set()
+        # e.g. the LLM taking a while to produce the next token
+        release_stream.wait(timeout=5)
+        yield Packet(ind=0, obj=MessageDelta(content=" world"))
+
+    lines = ChatStreamWriter(window_ms=50).stream(delayed_stream())
+    try:
+        # written once the window passes, not when the next delta arrives
+        assert json.loads(next(lines))["obj"]["content"] == "Hello"
+        assert next_delta_requested.is_set()
+        assert not release_stream.is_set()
+    finally:
+        release_stream.set()
+    assert [json.loads(line)["obj"]["content"] for line in lines] == [" world"]
+
+
+def test_stream_errors_are_raised_after_the_merged_deltas() -> None:
+    def failing_stream() -> Iterator[Packet]:
+        yield Packet(ind=0, obj=MessageDelta(content="Hello"))
+        raise RuntimeError("LLM failed")
+
+    lines = ChatStreamWriter(window_ms=60_000).stream(failing_stream())
+    assert json.loads(next(lines))["obj"]["content"] == "Hello"
+    with pytest.raises(RuntimeError, match="LLM failed"):
+        next(lines)
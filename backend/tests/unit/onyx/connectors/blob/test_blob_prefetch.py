@@ -0,0 +1,208 @@
+from collections.abc import Iterator
+from concurrent.futures import Future
+from datetime import datetime
+from datetime import timezone
+from typing import Any
+from typing import IO
+from unittest.mock import MagicMock
+
+import pytest
+
+from onyx.configs.constants import BlobType
+from onyx.connectors.blob import connector as blob_connector_module
+from onyx.connectors.blob.connector import _BlobObject
+from onyx.connectors.blob.connector import BlobStorageConnector
+from onyx.file_processing.extract_file_text import ExtractionResult
+
+_LAST_MODIFIED = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+
+class _FakeBody:
+    def __init__(self, content: bytes) -> None:
+        self.content = content
+
+    def iter_chunks(self, chunk_size: int) -> Iterator[bytes]:
+        for i in range(0, len(self.content), chunk_size):
+            yield self.content[i : i + chunk_size]
+
+    def close(self) -> None:
+        pass
+
+
+class _FakeRedis:
+    def __init__(self) -> None:
+        self.hashes: dict[str, dict[str, bytes]] = {}
+
+    def hmget(self, name: str, keys: list[str]) -> list[bytes | None]:
+        return [self.hashes.get(name, {}).get(key) for key in keys]
+
+    def hset(self, name: str, mapping: dict[str, str]) -> None:
+        self.hashes.setdefault(name, {}).update(
+            {key: value.encode() for key, value in mapping.items()}
+        )
+
+    def expire(self, name: str, seconds: int) -> None:
+        pass
+
+    def pipeline(self, transaction: bool = True) -> "_FakeRedis":
+        return self
+
+    def execute(self) -> None:
+        pass
+
+
+class _FakeExtractionService:
+    def submit(self, file: IO[bytes], file_name: str) -> Future[ExtractionResult]:
+        future: Future[ExtractionResult] = Future()
+        future.set_result(ExtractionResult(file.read().decode(), [], {}))
+        return future
+
+
+@pytest.fixture
+def fake_redis(monkeypatch: pytest.MonkeyPatch) -> _FakeRedis:
+    fake_redis = _FakeRedis()
+    monkeypatch.setattr(
+        blob_connector_module, "get_raw_redis_client", lambda: fake_redis
+    )
+    monkeypatch.setattr(
+        blob_connector_module,
+        "get_file_extraction_service",
+        lambda: _FakeExtractionService(),
+    )
+    return fake_redis
+
+
+def _make_connector(objects: dict[str, tuple[str, bytes]]) -> BlobStorageConnector:
+    """Connector backed by a fake bucket of key -> (etag, content)."""
+    connector = BlobStorageConnector(bucket_type="s3", bucket_name="bucket")
+    s3_client = MagicMock()
+    s3_client.get_paginator.return_value.paginate.side_effect = lambda **_: [
+        {
+            "Contents": [
+                {
+                    "Key": key,
+                    "ETag": etag,
+                    "Size": len(content),
+                    "LastModified": _LAST_MODIFIED,
+                }
+                for key, (etag, content) in objects.items()
+            ]
+        }
+    ]
+    s3_client.get_object.side_effect = lambda Bucket, Key: {
+        "Body": _FakeBody(objects[Key][1])
+    }
+    s3_client.meta.region_name = "us-east-1"
+    connector.s3_client = s3_client
+    return connector
+
+
+def _doc_id(key: str) -> str:
+    return f"{BlobType.S3}:bucket:{key}"
+
+
+def _poll(connector: BlobStorageConnector) -> dict[str, str]:
+    end = datetime.now(timezone.utc).timestamp()
+    return {
+        document.id: document.get_text_content()
+        for batch in connector.poll_source(start=1, end=end)
+        for document in batch
+    }
+
+
+def _downloaded_keys(connector: BlobStorageConnector) -> list[str]:
+    get_object = connector.s3_client.get_object  # type: ignore[union-attr]
+    return [call.kwargs["Key"] for call in get_object.call_args_list]
+
+
+def test_poll_skips_unchanged_objects(fake_redis: _FakeRedis) -> None:
+    objects = {"a.txt": ("etag-a", b"first"), "b.txt": ("etag-b", b"second")}
+    connector = _make_connector(objects)
+
+    assert _poll(connector) == {_doc_id("a.txt"): "first", _doc_id("b.txt"): "second"}
+
+    objects["b.txt"] = ("etag-b2", b"changed")
+    connector.s3_client.get_object.reset_mock()  # type: ignore[union-attr]
+    assert _poll(connector) == {_doc_id("b.txt"): "changed"}
+    assert _downloaded_keys(connector) == ["b.txt"]
+
+    # full loads fetch everything
+    connector.s3_client.get_object.reset_mock()  # type: ignore[union-attr]
+    loaded = [doc for batch in connector.load_from_state() for doc in batch]
+    assert len(loaded) == 2
+    assert sorted(_downloaded_keys(connector)) == ["a.txt", "b.txt"]
+
+
+def test_versions_are_only_recorded_after_the_batch_is_handed_off(
+    fake_redis: _FakeRedis,
+) -> None:
+    connector = _make_connector({"a.txt": ("etag-a", b"first")})
+    end = datetime.now(timezone.utc).timestamp()
+
+    batches = connector.poll_source(start=1, end=end)
+    next(batches)
+    assert fake_redis.hashes == {}
+
+    assert list(batches) == []
+    assert list(fake_redis.hashes.values()) == [{"a.txt": b"etag-a:5"}]
+
+
+def test_slim_docs_do_not_download(fake_redis: _FakeRedis) -> None:
+    connector = _make_connector(
+        {"a.txt": ("etag-a", b"first"), "dir/": ("etag-dir", b"")}
+    )
+
+    slim_docs = [doc for batch in connector.retrieve_all_slim_docs() for doc in batch]
+
+    assert [doc.id for doc in slim_docs] == [_doc_id("a.txt")]
+    assert _downloaded_keys(connector) == []
+
+
+@pytest.mark.parametrize(
+    "max_workers,max_bytes,max_pulled",
+    [
+        # bounded by the number of downloads
+        (2, 1000, 3),
+        # bounded by the size of the downloads
+        (10, 15, 2),
+    ],
+)
+def test_prefetch_is_bounded(
+    fake_redis: _FakeRedis,
+    monkeypatch: pytest.MonkeyPatch,
+    max_workers: int,
+    max_bytes: int,
+    max_pulled: int,
+) -> None:
+    monkeypatch.setattr(
+        blob_connector_module, "BLOB_STORAGE_DOWNLOAD_WORKERS", max_workers
+    )
+    monkeypatch.setattr(
+        blob_connector_module, "BLOB_STORAGE_PREFETCH_MAX_BYTES", max_bytes
+    )
+    objects = {f"{i}.txt": (f"etag-{i}", b"0123456789") for i in range(20)}
+    connector = _make_connector(objects)
+    num_pulled = 0
+
+    def _blob_objects() -> Iterator[_BlobObject]:
+        nonlocal num_pulled
+        for key in objects:
+            num_pulled += 1
+            yield _BlobObject(
+                key=key,
+                file_name=key,
+                last_modified=_LAST_MODIFIED,
+                size_bytes=10,
+                version=None,
+                is_image=False,
+            )
+
+    downloads = connector._prefetch_downloads(_blob_objects())
+    blob, future = next(downloads)
+    assert blob.key == "0.txt"
+    assert num_pulled <= max_pulled
+
+    results: list[Any] = [future.result()] + [
+        download.result() for _, download in downloads
+    ]
+    assert [result.read() for result in results] == [b"0123456789"] * 20
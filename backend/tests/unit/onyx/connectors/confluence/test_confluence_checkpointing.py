@@ -1,3 +1,4 @@
+import threading
 import time
 from collections.abc import Callable
 from collections.abc import Generator
@@ -470,3 +471,189 @@ def test_checkpoint_progress(
     assert isinstance(outputs_with_checkpoint[0].items[0], Document)
     assert outputs_with_checkpoint[0].items[0].semantic_identifier == "Page 3"
     assert not outputs_with_checkpoint[-1].next_checkpoint.has_more
+
+
+def test_pages_are_enriched_concurrently_in_order(
+    confluence_connector: ConfluenceConnector,
+    create_mock_page: Callable[..., dict[str, Any]],
+) -> None:
+    """Test that pages within a page of CQL results are processed concurrently,
+    while documents are still yielded in the original page / attachment order."""
+    mock_page1 = create_mock_page(id="1", title="Page 1")
+    mock_page2 = create_mock_page(id="2", title="Page 2")
+
+    confluence_client = confluence_connector._confluence_client
+    assert confluence_client is not None, "bad test setup"
+    get_mock = MagicMock()
+    confluence_client.get = get_mock  # type: ignore
+    get_mock.side_effect = [
+        MagicMock(json=lambda: {"results": [mock_page1, mock_page2], "_links": {}}),
+    ]
+
+    # only passes once both pages are being converted at the same time
+    barrier = threading.Barrier(2, timeout=10)
+
+    def mock_convert(page: dict[str, Any]) -> Document:
+        barrier.wait()
+        return Document(
+            id=f"page_{page['id']}",
+            sections=[],
+            source=DocumentSource.CONFLUENCE,
+            semantic_identifier=page["title"],
+            metadata={},
+        )
+
+    def mock_fetch_attachments(
+        page: dict[str, Any], *args: Any
+    ) -> tuple[list[Document], list[ConnectorFailure]]:
+        attachment = Document(
+            id=f"attachment_{page['id']}",
+            sections=[],
+            source=DocumentSource.CONFLUENCE,
+            semantic_identifier=f"Attachment of {page['title']}",
+            metadata={},
+        )
+        return [attachment], []
+
+    with (
+        patch.object(
+            confluence_connector,
+            "_convert_page_to_document",
+            side_effect=mock_convert,
+        ),
+        patch.object(
+            confluence_connector,
+            "_fetch_page_attachments",
+            side_effect=mock_fetch_attachments,
+        ),
+    ):
+        outputs = load_everything_from_checkpoint_connector(
+            confluence_connector, 0, time.time()
+        )
+
+    assert len(outputs) == 1
+    assert [item.id for item in outputs[0].items if isinstance(item, Document)] == [
+        "page_1",
+        "attachment_1",
+        "page_2",
+        "attachment_2",
+    ]
+    assert not outputs[0].next_checkpoint.has_more
+
+
+def test_atlassian_date_error_during_enrichment_is_retried(
+    confluence_connector: ConfluenceConnector,
+    create_mock_page: Callable[..., dict[str, Any]],
+) -> None:
+    """Test that a date error raised while enriching a page reaches the retry in
+    load_from_checkpoint, and that the retried page of results isn't duplicated."""
+    mock_page1 = create_mock_page(id="1", title="Page 1")
+    mock_page2 = create_mock_page(id="2", title="Page 2")
+
+    confluence_client = confluence_connector._confluence_client
+    assert confluence_client is not None, "bad test setup"
+    get_mock = MagicMock()
+    confluence_client.get = get_mock  # type: ignore
+    get_mock.side_effect = [
+        MagicMock(json=lambda: {"results": [mock_page1, mock_page2], "_links": {}}),
+        # the retry with a 1 hour offset
+        MagicMock(json=lambda: {"results": [mock_page1, mock_page2], "_links": {}}),
+    ]
+
+    def mock_convert(page: dict[str, Any]) -> Document:
+        return Document(
+            id=f"page_{page['id']}",
+            sections=[],
+            source=DocumentSource.CONFLUENCE,
+            semantic_identifier=page["title"],
+            metadata={},
+        )
+
+    attachment_fetch_starts: list[float | None] = []
+
+    def mock_fetch_attachments(
+        page: dict[str, Any], start: float | None, end: float | None
+    ) -> tuple[list[Document], list[ConnectorFailure]]:
+        if page["id"] == "2":
+            attachment_fetch_starts.append(start)
+            if len(attachment_fetch_starts) == 1:
+                raise HTTPError("The value for the field 'updated' is invalid")
+        return [], []
+
+    with (
+        patch.object(
+            confluence_connector,
+            "_convert_page_to_document",
+            side_effect=mock_convert,
+        ),
+        patch.object(
+            confluence_connector,
+            "_fetch_page_attachments",
+            side_effect=mock_fetch_attachments,
+        ),
+    ):
+        outputs = load_everything_from_checkpoint_connector(
+            confluence_connector, 7200, time.time()
+        )
+
+    assert attachment_fetch_starts == [7200, 3600]
+    assert len(outputs) == 1
+    assert [item.id for item in outputs[0].items if isinstance(item, Document)] == [
+        "page_1",
+        "page_2",
+    ]
+
+
+def test_unexpected_enrichment_error_raised_after_preceding_pages(
+    confluence_connector: ConfluenceConnector,
+    create_mock_page: Callable[..., dict[str, Any]],
+) -> None:
+    """Test that an unexpected error for one page is raised only after everything
+    before it has been yielded, like processing the pages one by one would."""
+    mock_pages = [create_mock_page(id=str(i), title=f"Page {i}") for i in range(3)]
+
+    confluence_client = confluence_connector._confluence_client
+    assert confluence_client is not None, "bad test setup"
+    get_mock = MagicMock()
+    confluence_client.get = get_mock  # type: ignore
+    get_mock.side_effect = [
+        MagicMock(json=lambda: {"results": mock_pages, "_links": {}}),
+    ]
+
+    def mock_convert(page: dict[str, Any]) -> Document:
+        return Document(
+            id=f"page_{page['id']}",
+            sections=[],
+            source=DocumentSource.CONFLUENCE,
+            semantic_identifier=page["title"],
+            metadata={},
+        )
+
+    def mock_fetch_attachments(
+        page: dict[str, Any], *args: Any
+    ) -> tuple[list[Document], list[ConnectorFailure]]:
+        if page["id"] == "1":
+            raise RuntimeError("boom")
+        return [], []
+
+    yielded_ids: list[str] = []
+    with (
+        patch.object(
+            confluence_connector,
+            "_convert_page_to_document",
+            side_effect=mock_convert,
+        ),
+        patch.object(
+            confluence_connector,
+            "_fetch_page_attachments",
+            side_effect=mock_fetch_attachments,
+        ),
+        pytest.raises(RuntimeError, match="boom"),
+    ):
+        for item in confluence_connector.load_from_checkpoint(
+            0, time.time(), confluence_connector.build_dummy_checkpoint()
+        ):
+            assert isinstance(item, Document)
+            yielded_ids.append(item.id)
+
+    assert yielded_ids == ["page_0", "page_1"]
@@ -0,0 +1,172 @@
+from collections.abc import Callable
+from datetime import datetime
+from datetime import timedelta
+from datetime import timezone
+from email.utils import format_datetime
+from typing import Any
+from unittest.mock import MagicMock
+
+import pytest
+import requests
+
+from onyx.configs.constants import DocumentSource
+from onyx.connectors.cross_connector_utils import redis_rate_limit
+from onyx.connectors.cross_connector_utils.rate_limit_wrapper import (
+    RateLimitTriedTooManyTimesError,
+)
+from onyx.connectors.cross_connector_utils.redis_rate_limit import (
+    credential_key_from_credentials,
+)
+from onyx.connectors.cross_connector_utils.redis_rate_limit import (
+    get_retry_after_seconds,
+)
+from onyx.connectors.cross_connector_utils.redis_rate_limit import parse_retry_after
+from onyx.connectors.cross_connector_utils.redis_rate_limit import (
+    RedisTokenBucketRateLimiter,
+)
+from shared_configs.contextvars import CURRENT_TENANT_ID_CONTEXTVAR
+
+
+def _make_response(status_code: int, headers: dict[str, str]) -> requests.Response:
+    response = requests.Response()
+    response.status_code = status_code
+    response.headers.update(headers)
+    return response
+
+
+def _make_limiter(
+    acquire_results: list[list[Any]],
+    block_calls: list[float],
+    **kwargs: Any,
+) -> RedisTokenBucketRateLimiter:
+    """Limiter backed by canned script results instead of a real Redis."""
+    results = iter(acquire_results)
+
+    def _register_script(script: str) -> Callable[..., Any]:
+        if script == redis_rate_limit._ACQUIRE_SCRIPT:
+            return lambda keys, args: next(results, [1, b"0"])
+
+        def _block(keys: list[str], args: list[float]) -> bytes:
+            block_calls.append(args[0])
+            return str(args[0]).encode()
+
+        return _block
+
+    redis_client = MagicMock()
+    redis_client.register_script.side_effect = _register_script
+    return RedisTokenBucketRateLimiter(
+        DocumentSource.HUBSPOT,
+        credential_key="cred",
+        max_calls=10,
+        period=1,
+        redis_client=redis_client,
+        **kwargs,
+    )
+
+
+def test_parse_retry_after() -> None:
+    assert parse_retry_after("3") == 3.0
+    assert parse_retry_after("1.5") == 1.5
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("garbage") is None
+
+    in_ten_seconds = datetime.now(timezone.utc) + timedelta(seconds=10)
+    parsed = parse_retry_after(format_datetime(in_ten_seconds, usegmt=True))
+    assert parsed is not None and 8 <= parsed <= 10
+
+
+def test_get_retry_after_seconds() -> None:
+    assert get_retry_after_seconds(_make_response(200, {})) is None
+    assert get_retry_after_seconds(_make_response(429, {"Retry-After": "7"})) == 7.0
+
+    error = requests.HTTPError(response=_make_response(429, {"Retry-After": "2"}))
+    assert get_retry_after_seconds(error) == 2.0
+    assert get_retry_after_seconds(ValueError("not a rate limit")) is None
+
+
+def test_credential_key_is_stable() -> None:
+    assert credential_key_from_credentials(
+        {"a": 1, "b": "x"}
+    ) == credential_key_from_credentials({"b": "x", "a": 1})
+    assert credential_key_from_credentials({"a": 1}) != credential_key_from_credentials(
+        {"a": 2}
+    )
+
+
+def test_acquire_sleeps_exactly_until_a_token_is_available(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    sleeps: list[float] = []
+    monkeypatch.setattr(redis_rate_limit.time, "sleep", sleeps.append)
+
+    limiter = _make_limiter([[0, b"0.25"], [0, b"0.05"], [1, b"0"]], [])
+    limiter.acquire()
+
+    assert sleeps == [0.25, 0.05]
+
+
+def test_acquire_respects_max_wait(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(redis_rate_limit.time, "sleep", lambda _: None)
+
+    limiter = _make_limiter([[0, b"30"]], [], max_wait=10)
+    with pytest.raises(RateLimitTriedTooManyTimesError):
+        limiter.acquire()
+
+
+def test_decorator_honors_retry_after(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(redis_rate_limit.time, "sleep", lambda _: None)
+    block_calls: list[float] = []
+    limiter = _make_limiter([], block_calls)
+
+    responses = [
+        _make_response(429, {"Retry-After": "3"}),
+        _make_response(200, {}),
+    ]
+
+    @limiter
+    def call_api() -> requests.Response:
+        return responses.pop(0)
+
+    assert call_api().status_code == 200
+    assert block_calls == [3.0]
+
+
+def test_decorator_gives_up_after_max_retries(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(redis_rate_limit.time, "sleep", lambda _: None)
+    block_calls: list[float] = []
+    limiter = _make_limiter([], block_calls, max_rate_limit_retries=2)
+
+    @limiter
+    def call_api() -> None:
+        raise requests.HTTPError(response=_make_response(429, {"Retry-After": "1"}))
+
+    with pytest.raises(RateLimitTriedTooManyTimesError):
+        call_api()
+    assert block_calls == [1.0, 1.0, 1.0]
+
+
+def test_key_uses_the_tenant_of_each_call() -> None:
+    script = MagicMock(return_value=[1, b"0"])
+    redis_client = MagicMock()
+    redis_client.register_script.return_value = script
+    limiter = RedisTokenBucketRateLimiter(
+        DocumentSource.HUBSPOT,
+        credential_key="cred",
+        max_calls=10,
+        period=1,
+        redis_client=redis_client,
+    )
+
+    for tenant_id in ["tenant_a", "tenant_b"]:
+        token = CURRENT_TENANT_ID_CONTEXTVAR.set(tenant_id)
+        try:
+            limiter.try_acquire()
+        finally:
+            CURRENT_TENANT_ID_CONTEXTVAR.reset(token)
+
+    assert [call.kwargs["keys"] for call in script.call_args_list] == [
+        ["tenant_a:connector_rate_limit:hubspot:cred"],
+        ["tenant_b:connector_rate_limit:hubspot:cred"],
+    ]
@@ -3,6 +3,7 @@ from collections.abc import Callable
 from collections.abc import Generator
 from datetime import datetime
 from datetime import timezone
+from typing import Any
 from typing import cast
 from unittest.mock import MagicMock
 from unittest.mock import patch
@@ -923,3 +924,164 @@ def test_load_from_checkpoint_cursor_pagination_completion(
     assert (
         pull_requests_func_invocation_count == 3
     )  # twice for repo2 PRs, once for repo1 PRs
+
+
+def _graphql_user(login: str) -> dict[str, Any]:
+    return {"login": login, "name": f"{login} name", "email": ""}
+
+
+def _graphql_pr(number: int, comments: list[str] | None = None) -> dict[str, Any]:
+    return {
+        "databaseId": 1000 + number,
+        "number": number,
+        "title": f"PR {number}",
+        "body": "Test Description",
+        "url": f"https://github.com/test-org/test-repo/pull/{number}",
+        "state": "MERGED",
+        "merged": True,
+        "createdAt": "2023-01-01T00:00:00Z",
+        "updatedAt": "2023-01-02T00:00:00Z",
+        "closedAt": "2023-01-02T00:00:00Z",
+        "mergedAt": "2023-01-02T00:00:00Z",
+        "changedFiles": 3,
+        "commits": {"totalCount": 2},
+        "baseRepository": {"nameWithOwner": "test-org/test-repo"},
+        "author": _graphql_user("author"),
+        "mergedBy": _graphql_user("merger"),
+        "assignees": {"nodes": [_graphql_user("assignee")]},
+        "labels": {"nodes": [{"name": "bug"}]},
+        "comments": {"nodes": [{"body": comment} for comment in comments or []]},
+    }
+
+
+def _graphql_issue(number: int, comments: list[str] | None = None) -> dict[str, Any]:
+    return {
+        "databaseId": 2000 + number,
+        "number": number,
+        "title": f"Issue {number}",
+        "body": "Test Description",
+        "url": f"https://github.com/test-org/test-repo/issues/{number}",
+        "state": "OPEN",
+        "createdAt": "2023-01-01T00:00:00Z",
+        "updatedAt": "2023-01-02T00:00:00Z",
+        "closedAt": None,
+        "repository": {"nameWithOwner": "test-org/test-repo"},
+        "author": _graphql_user("author"),
+        "assignees": {"nodes": []},
+        "labels": {"nodes": []},
+        "comments": {"nodes": [{"body": comment} for comment in comments or []]},
+        "timelineItems": {"nodes": []},
+    }
+
+
+def _graphql_response(
+    object_type: str,
+    nodes: list[dict[str, Any]],
+    end_cursor: str | None = None,
+) -> tuple[dict[str, Any], dict[str, Any]]:
+    return {}, {
+        "data": {
+            "repository": {
+                object_type: {
+                    "pageInfo": {
+                        "hasNextPage": end_cursor is not None,
+                        "endCursor": end_cursor,
+                    },
+                    "nodes": nodes,
+                }
+            }
+        }
+    }
+
+
+def test_load_from_checkpoint_graphql(
+    build_github_connector: Callable[..., GithubConnector],
+    mock_github_client: MagicMock,
+    create_mock_repo: Callable[..., MagicMock],
+) -> None:
+    """Test that GraphQL mode pages through PRs and issues with their comments,
+    without any REST calls per item"""
+    github_connector = build_github_connector()
+    github_connector.use_graphql = True
+    mock_repo = create_mock_repo()
+    mock_repo.owner.login = "test-org"
+    mock_github_client.get_repo.return_value = mock_repo
+
+    graphql_query = mock_github_client.requester.graphql_query
+    graphql_query.side_effect = [
+        _graphql_response("pullRequests", [_graphql_pr(1), _graphql_pr(2)], "c1"),
+        _graphql_response("pullRequests", [_graphql_pr(3, ["LGTM"])]),
+        _graphql_response("issues", [_graphql_issue(1, ["+1", "same here"])]),
+    ]
+
+    with patch.object(SerializedRepository, "to_Repository", return_value=mock_repo):
+        outputs = load_everything_from_checkpoint_connector(
+            github_connector, 0, time.time()
+        )
+
+    documents = [item for output in outputs for item in output.items]
+    assert all(isinstance(document, Document) for document in documents)
+    documents_by_id = {cast(Document, document).id: document for document in documents}
+    assert list(documents_by_id) == [
+        "https://github.com/test-org/test-repo/pull/1",
+        "https://github.com/test-org/test-repo/pull/2",
+        "https://github.com/test-org/test-repo/pull/3",
+        "https://github.com/test-org/test-repo/issues/1",
+    ]
+
+    pr = cast(Document, documents_by_id["https://github.com/test-org/test-repo/pull/3"])
+    assert pr.sections[0].text == "Test Description\nComment: LGTM"
+    assert pr.metadata["state"] == "closed"
+    assert pr.metadata["labels"] == ["bug"]
+    assert pr.metadata["user"] == str({"login": "author", "name": "author name"})
+    assert pr.doc_updated_at == datetime(2023, 1, 2, tzinfo=timezone.utc)
+
+    issue = cast(
+        Document, documents_by_id["https://github.com/test-org/test-repo/issues/1"]
+    )
+    assert issue.sections[0].text == (
+        "Test Description\nComment: +1\nComment: same here"
+    )
+    assert issue.metadata["state"] == "open"
+
+    # the second page continues from the first page's cursor
+    cursors = [call.args[1]["cursor"] for call in graphql_query.call_args_list]
+    assert cursors == [None, "c1", None]
+    mock_repo.get_pulls.assert_not_called()
+    mock_repo.get_issues.assert_not_called()
+    assert outputs[-1].next_checkpoint.has_more is False
+
+
+def test_load_from_checkpoint_graphql_falls_back_to_rest(
+    build_github_connector: Callable[..., GithubConnector],
+    mock_github_client: MagicMock,
+    create_mock_repo: Callable[..., MagicMock],
+    create_mock_pr: Callable[..., MagicMock],
+) -> None:
+    """Test that REST is used if the GraphQL API is unavailable"""
+    github_connector = build_github_connector()
+    github_connector.include_issues = False
+    github_connector.use_graphql = True
+    mock_repo = create_mock_repo()
+    mock_github_client.get_repo.return_value = mock_repo
+    mock_github_client.requester.graphql_query.side_effect = GithubException(
+        502, {"message": "Server Error"}, {}
+    )
+
+    mock_repo.get_pulls.return_value = MagicMock()
+    mock_repo.get_pulls.return_value.get_page.side_effect = [
+        [create_mock_pr(number=1)],
+        [],
+    ]
+
+    with patch.object(SerializedRepository, "to_Repository", return_value=mock_repo):
+        outputs = load_everything_from_checkpoint_connector(
+            github_connector, 0, time.time()
+        )
+
+    documents = [item for output in outputs for item in output.items]
+    assert [cast(Document, document).id for document in documents] == [
+        "https://github.com/test-org/test-repo/pull/1"
+    ]
+    assert mock_github_client.requester.graphql_query.call_count == 1
+    assert outputs[-1].next_checkpoint.has_more is False
@@ -1,10 +1,18 @@
 import datetime
 import json
 import os
+from collections.abc import Callable
+from typing import Any
+from unittest.mock import MagicMock
+
+import pytest
 
 from onyx.configs.constants import DocumentSource
 from onyx.connectors.cross_connector_utils.miscellaneous_utils import time_str_to_utc
+from onyx.connectors.gmail import connector as gmail_connector_module
 from onyx.connectors.gmail.connector import _build_time_range_query
+from onyx.connectors.gmail.connector import GmailCheckpoint
+from onyx.connectors.gmail.connector import GmailConnector
 from onyx.connectors.gmail.connector import thread_to_document
 from onyx.connectors.models import Document
 
@@ -63,3 +71,119 @@ def test_time_str_to_utc() -> None:
     }
     for strptime, expected_datetime in str_to_dt.items():
         assert time_str_to_utc(strptime) == expected_datetime
+
+
+class _FakeRequest:
+    def __init__(self, result: dict[str, Any]) -> None:
+        self.result = result
+
+    def execute(self) -> dict[str, Any]:
+        return self.result
+
+
+class _FakeBatch:
+    def __init__(self, service: "_FakeGmailService", callback: Callable) -> None:
+        self.service = service
+        self.callback = callback
+        self.requests: list[tuple[str, _FakeRequest]] = []
+
+    def add(self, request: _FakeRequest, request_id: str) -> None:
+        self.requests.append((request_id, request))
+
+    def execute(self) -> None:
+        self.service.batch_sizes.append(len(self.requests))
+        for request_id, request in self.requests:
+            self.callback(request_id, request.execute(), None)
+
+
+class _FakeGmailService:
+    """A mailbox with num_threads threads, listed 100 per page"""
+
+    def __init__(self, user_email: str, num_threads: int) -> None:
+        self.thread_ids = [f"{user_email}-{i}" for i in range(num_threads)]
+        self.batch_sizes: list[int] = []
+
+    def users(self) -> "_FakeGmailService":
+        return self
+
+    def threads(self) -> "_FakeGmailService":
+        return self
+
+    def list(self, pageToken: str = "0", **kwargs: Any) -> _FakeRequest:
+        start = int(pageToken)
+        page: dict[str, Any] = {
+            "threads": [{"id": id} for id in self.thread_ids[start : start + 100]]
+        }
+        if start + 100 < len(self.thread_ids):
+            page["nextPageToken"] = str(start + 100)
+        return _FakeRequest(page)
+
+    def get(self, id: str, **kwargs: Any) -> _FakeRequest:
+        return _FakeRequest(
+            {
+                "id": id,
+                "messages": [
+                    {
+                        "id": id,
+                        "payload": {"headers": [{"name": "Subject", "value": id}]},
+                    }
+                ],
+            }
+        )
+
+    def new_batch_http_request(self, callback: Callable) -> _FakeBatch:
+        return _FakeBatch(self, callback)
+
+
+def _load_from_checkpoint(
+    connector: GmailConnector, checkpoint: GmailCheckpoint
+) -> tuple[list[Document], GmailCheckpoint]:
+    generator = connector.load_from_checkpoint(0, 1, checkpoint)
+    docs: list[Document] = []
+    while True:
+        try:
+            doc = next(generator)
+        except StopIteration as e:
+            return docs, e.value
+        assert isinstance(doc, Document)
+        docs.append(doc)
+
+
+def test_threads_are_fetched_in_batches_per_user(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    services = {
+        "a@onyx-test.com": _FakeGmailService("a@onyx-test.com", 120),
+        "b@onyx-test.com": _FakeGmailService("b@onyx-test.com", 3),
+    }
+    monkeypatch.setattr(
+        gmail_connector_module,
+        "get_gmail_service",
+        lambda creds, user_email: services[user_email],
+    )
+    # one page per mailbox before checkpointing, to test resuming
+    monkeypatch.setattr(gmail_connector_module, "THREAD_PAGES_PER_CHECKPOINT", 1)
+
+    connector = GmailConnector()
+    connector._creds = MagicMock()
+    monkeypatch.setattr(connector, "_get_all_user_emails", lambda: list(services))
+
+    docs, checkpoint = _load_from_checkpoint(
+        connector, connector.build_dummy_checkpoint()
+    )
+    assert checkpoint.has_more
+    assert checkpoint.done_user_emails == {"b@onyx-test.com"}
+    assert checkpoint.next_page_tokens == {"a@onyx-test.com": "100"}
+    for service in services.values():
+        # documents are yielded in per-user order
+        assert [
+            doc.id for doc in docs if doc.id in service.thread_ids
+        ] == service.thread_ids[:100]
+
+    # the rest of the first mailbox is fetched after resuming
+    docs, checkpoint = _load_from_checkpoint(connector, checkpoint)
+    assert not checkpoint.has_more
+    assert [doc.id for doc in docs] == services["a@onyx-test.com"].thread_ids[100:]
+
+    assert services["a@onyx-test.com"].batch_sizes == [50, 50, 20]
+    assert services["b@onyx-test.com"].batch_sizes == [3]
@@ -0,0 +1,118 @@
+from datetime import datetime
+from datetime import timezone
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+
+from onyx.connectors.hubspot import connector as hubspot_connector_module
+from onyx.connectors.hubspot.connector import HubSpotConnector
+
+_NUM_TICKETS = 150
+_NUM_CONTACTS = 3
+
+
+class _FakeHubSpot:
+    """Tickets that are each associated with one of a few shared contacts"""
+
+    def __init__(self) -> None:
+        self.association_calls: list[tuple[str, int]] = []
+        self.contact_reads: list[list[str]] = []
+
+        self.crm = SimpleNamespace(
+            tickets=SimpleNamespace(
+                basic_api=SimpleNamespace(get_page=self._get_tickets_page)
+            ),
+            contacts=SimpleNamespace(
+                batch_api=SimpleNamespace(read=self._read_contacts)
+            ),
+            associations=SimpleNamespace(
+                v4=SimpleNamespace(
+                    batch_api=SimpleNamespace(get_page=self._get_associations)
+                )
+            ),
+        )
+
+    def _get_tickets_page(self, **kwargs: Any) -> SimpleNamespace:
+        return SimpleNamespace(
+            results=[
+                SimpleNamespace(
+                    id=str(i),
+                    properties={"subject": f"Ticket {i}", "content": "content"},
+                    updated_at=datetime(2024, 1, 1, tzinfo=timezone.utc),
+                )
+                for i in range(_NUM_TICKETS)
+            ],
+            paging=None,
+        )
+
+    def _get_associations(
+        self,
+        from_object_type: str,
+        to_object_type: str,
+        batch_input_public_fetch_associations_batch_request: dict[str, Any],
+    ) -> SimpleNamespace:
+        inputs = batch_input_public_fetch_associations_batch_request["inputs"]
+        self.association_calls.append((to_object_type, len(inputs)))
+        if to_object_type != "contacts":
+            return SimpleNamespace(results=[])
+
+        return SimpleNamespace(
+            results=[
+                SimpleNamespace(
+                    _from=SimpleNamespace(id=input["id"]),
+                    to=[SimpleNamespace(to_object_id=int(input["id"]) % _NUM_CONTACTS)],
+                    paging=None,
+                )
+                for input in inputs
+            ]
+        )
+
+    def _read_contacts(
+        self, batch_read_input_simple_public_object_id: dict[str, Any]
+    ) -> SimpleNamespace:
+        ids = [
+            input["id"] for input in batch_read_input_simple_public_object_id["inputs"]
+        ]
+        self.contact_reads.append(ids)
+        return SimpleNamespace(
+            results=[
+                SimpleNamespace(
+                    to_dict=lambda id=id: {
+                        "id": id,
+                        "properties": {"firstname": f"Contact {id}"},
+                    }
+                )
+                for id in ids
+            ]
+        )
+
+
+def test_associations_are_fetched_in_batches(monkeypatch: pytest.MonkeyPatch) -> None:
+    fake_hubspot = _FakeHubSpot()
+    monkeypatch.setattr(
+        hubspot_connector_module, "HubSpot", lambda access_token: fake_hubspot
+    )
+
+    connector = HubSpotConnector(batch_size=1000, object_types=["tickets"])
+    connector.access_token = "token"
+    connector.portal_id = "portal"
+
+    docs = [doc for batch in connector.load_from_state() for doc in batch]
+
+    assert len(docs) == _NUM_TICKETS
+    for doc in docs:
+        ticket_id = int(doc.id.removeprefix("hubspot_ticket_"))
+        assert doc.metadata["associated_contact_ids"] == [
+            str(ticket_id % _NUM_CONTACTS)
+        ]
+        assert doc.sections[1].text == f"Contact: Contact {ticket_id % _NUM_CONTACTS}"
+
+    # one call per associated object type for each batch of up to 100 tickets
+    assert sorted(fake_hubspot.association_calls) == sorted(
+        (object_type, num_tickets)
+        for object_type in ["contacts", "companies", "deals", "notes"]
+        for num_tickets in [100, 50]
+    )
+    # the contacts shared by the tickets are only read once
+    assert fake_hubspot.contact_reads == [["0", "1", "2"]]
@@ -0,0 +1,44 @@
+import datetime
+from decimal import Decimal
+from unittest.mock import MagicMock
+from uuid import uuid4
+
+import pytest
+
+from onyx.db.chat_search import ChatSessionCursor
+from onyx.db.chat_search import search_chat_sessions
+from onyx.db.chat_search import search_chat_sessions_ranked
+
+
+def test_chat_session_cursor_round_trip() -> None:
+    cursor = ChatSessionCursor(
+        time_created=datetime.datetime(2025, 1, 2, 3, 4, 5, tzinfo=datetime.UTC),
+        id=uuid4(),
+        rank=0.123456789,
+    )
+    encoded = cursor.encode()
+
+    # should be safe to pass around as a query param
+    assert "=" not in encoded
+    assert ChatSessionCursor.decode(encoded) == cursor
+
+
+def test_chat_session_cursor_rejects_garbage() -> None:
+    with pytest.raises(ValueError):
+        ChatSessionCursor.decode("not-a-real-cursor")
+
+
+def test_cursor_must_match_search_ordering() -> None:
+    recency_cursor = ChatSessionCursor(
+        time_created=datetime.datetime(2025, 1, 2, tzinfo=datetime.UTC), id=uuid4()
+    )
+    ranked_cursor = recency_cursor.model_copy(update={"rank": Decimal("0.5")})
+
+    with pytest.raises(ValueError):
+        search_chat_sessions_ranked(
+            user_id=None, db_session=MagicMock(), query="q", cursor=recency_cursor
+        )
+    with pytest.raises(ValueError):
+        search_chat_sessions(
+            user_id=None, db_session=MagicMock(), query="q", cursor=ranked_cursor
+        )
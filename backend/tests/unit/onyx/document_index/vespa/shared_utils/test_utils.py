@@ -1,3 +1,7 @@
+import json
+import struct
+
+from onyx.document_index.vespa.shared_utils.utils import encode_query_embedding
 from onyx.document_index.vespa.shared_utils.utils import remove_invalid_unicode_chars
 
 
@@ -18,3 +22,20 @@ def test_remove_invalid_unicode_chars() -> None:
     sanitized = remove_invalid_unicode_chars(text_with_multiple_illegal)
     assert all(c not in sanitized for c in ["\x00", "\ufddb", "\ufffe"])
     assert sanitized == "Hello World!"
+
+
+def test_encode_query_embedding() -> None:
+    """Test that the compact encodings decode to the same float32 tensor."""
+    embedding = [0.1, -0.25, 1 / 3, 0.0, 12345.678]
+    float32_values = list(struct.unpack("5f", struct.pack("5f", *embedding)))
+
+    hex_encoded = encode_query_embedding(embedding, encoding="hex")
+    assert len(hex_encoded) == 8 * len(embedding)
+    assert list(struct.unpack(">5f", bytes.fromhex(hex_encoded))) == float32_values
+
+    short_encoded = encode_query_embedding(embedding, encoding="short")
+    assert len(short_encoded) < len(str(embedding))
+    decoded = json.loads(short_encoded)
+    assert list(struct.unpack("5f", struct.pack("5f", *decoded))) == float32_values
+
+    assert encode_query_embedding(embedding, encoding="list") == str(embedding)
@@ -0,0 +1,52 @@
+import json
+
+import httpx
+
+from onyx.document_index.interfaces import DocumentIdRange
+from onyx.document_index.vespa.deletion import build_document_id_range_selection
+from onyx.document_index.vespa.deletion import delete_vespa_document_id_ranges
+
+
+def test_build_document_id_range_selection() -> None:
+    selection = build_document_id_range_selection(
+        [
+            DocumentIdRange(first_document_id="a", last_document_id="c"),
+            DocumentIdRange(first_document_id='say "hi"', last_document_id='say "hi"'),
+        ],
+        index_name="danswer_chunk",
+        tenant_id="tenant\\1",
+    )
+
+    assert selection == (
+        'danswer_chunk.tenant_id == "tenant\\\\1" and '
+        '((danswer_chunk.document_id >= "a" and danswer_chunk.document_id <= "c")'
+        ' or danswer_chunk.document_id == "say \\"hi\\"")'
+    )
+
+
+def test_delete_vespa_document_id_ranges_follows_continuation() -> None:
+    requests: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        if "continuation" not in request.url.params:
+            return httpx.Response(
+                200, content=json.dumps({"documentCount": 3, "continuation": "abc"})
+            )
+        return httpx.Response(200, content=json.dumps({"documentCount": 2}))
+
+    with httpx.Client(transport=httpx.MockTransport(handler)) as http_client:
+        chunks_deleted = delete_vespa_document_id_ranges(
+            [DocumentIdRange(first_document_id="a", last_document_id="b")],
+            index_name="danswer_chunk",
+            tenant_id=None,
+            http_client=http_client,
+        )
+
+    assert chunks_deleted == 5
+    assert [request.method for request in requests] == ["DELETE", "DELETE"]
+    assert requests[0].url.params["cluster"] == "danswer_index"
+    assert requests[0].url.params["selection"] == (
+        '(danswer_chunk.document_id >= "a" and danswer_chunk.document_id <= "b")'
+    )
+    assert requests[1].url.params["continuation"] == "abc"
@@ -0,0 +1,94 @@
+import json
+import threading
+from collections.abc import Iterator
+from http.server import BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer
+
+import pytest
+from prometheus_client import REGISTRY
+
+from onyx.document_index.vespa import chunk_retrieval
+from onyx.document_index.vespa.shared_utils import utils
+from onyx.httpx.httpx_pool import HttpxPool
+
+_HIT = {
+    "id": "id:default:danswer_chunk::doc_0",
+    "relevance": 0.5,
+    "fields": {
+        "document_id": "doc",
+        "chunk_id": 0,
+        "content": "hello world",
+        "semantic_identifier": "doc",
+        "section_continuation": False,
+        "source_type": "web",
+    },
+}
+
+
+class _FakeVespaServer(ThreadingHTTPServer):
+    daemon_threads = True
+    num_connections = 0
+
+    def process_request(self, request, client_address):  # type: ignore[no-untyped-def]
+        # called once per accepted connection, not per request
+        self.num_connections += 1
+        super().process_request(request, client_address)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+
+    def do_POST(self) -> None:
+        self.rfile.read(int(self.headers["Content-Length"]))
+        body = json.dumps({"root": {"children": [_HIT]}}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: object) -> None:
+        pass
+
+
+@pytest.fixture
+def fake_vespa(monkeypatch: pytest.MonkeyPatch) -> Iterator[_FakeVespaServer]:
+    server = _FakeVespaServer(("127.0.0.1", 0), _Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    monkeypatch.setattr(
+        chunk_retrieval,
+        "SEARCH_ENDPOINT",
+        f"http://127.0.0.1:{server.server_address[1]}/search/",
+    )
+    HttpxPool.close_client(utils._VESPA_QUERY_CLIENT_NAME)
+    monkeypatch.setattr(utils, "_vespa_query_client_pid", None)
+
+    yield server
+
+    HttpxPool.close_client(utils._VESPA_QUERY_CLIENT_NAME)
+    server.shutdown()
+    server.server_close()
+
+
+def _num_requests(connection: str) -> float:
+    return (
+        REGISTRY.get_sample_value(
+            "onyx_vespa_query_requests_total",
+            {"operation": "search", "connection": connection},
+        )
+        or 0.0
+    )
+
+
+def test_query_vespa_reuses_connections(fake_vespa: _FakeVespaServer) -> None:
+    new_before = _num_requests("new")
+    reused_before = _num_requests("reused")
+
+    for _ in range(1000):
+        chunks = chunk_retrieval.query_vespa({"yql": "select * from x where true"})
+        assert len(chunks) == 1
+
+    assert fake_vespa.num_connections == 1
+    assert _num_requests("new") - new_before == 1
+    assert _num_requests("reused") - reused_before == 999
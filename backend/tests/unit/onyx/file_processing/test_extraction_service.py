@@ -0,0 +1,260 @@
+import os
+import time
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from io import BytesIO
+from typing import Any
+from typing import IO
+from unittest.mock import MagicMock
+
+import pytest
+from pypdf import PdfWriter
+from pypdf.generic import DecodedStreamObject
+from pypdf.generic import DictionaryObject
+from pypdf.generic import NameObject
+
+from onyx.file_processing import extraction_service as extraction_service_module
+from onyx.file_processing.extract_file_text import ExtractionResult
+from onyx.file_processing.extract_file_text import read_pdf_file
+from onyx.configs.constants import FileOrigin
+from onyx.file_processing.extraction_service import (
+    delete_expired_extraction_cache_entries,
+)
+from onyx.file_processing.extraction_service import ExtractionLimitExceededError
+from onyx.file_processing.extraction_service import FileExtractionService
+
+
+def _burn_cpu(seconds: float, cpu_time_limit: int) -> None:
+    with extraction_service_module._cpu_time_limit(cpu_time_limit):
+        end = time.process_time() + seconds
+        while time.process_time() < end:
+            pass
+
+
+def _allocate(num_mb: int) -> int:
+    return len(bytearray(num_mb * 1024 * 1024))
+
+
+def _get_pid() -> int:
+    return os.getpid()
+
+
+def _make_pdf(num_pages: int) -> bytes:
+    writer = PdfWriter()
+    font = writer._add_object(
+        DictionaryObject(
+            {
+                NameObject("/Type"): NameObject("/Font"),
+                NameObject("/Subtype"): NameObject("/Type1"),
+                NameObject("/BaseFont"): NameObject("/Helvetica"),
+            }
+        )
+    )
+    for page_num in range(num_pages):
+        page = writer.add_blank_page(width=300, height=300)
+        page[NameObject("/Resources")] = DictionaryObject(
+            {NameObject("/Font"): DictionaryObject({NameObject("/F1"): font})}
+        )
+        content = DecodedStreamObject()
+        content.set_data(f"BT /F1 12 Tf 20 150 Td (page {page_num}) Tj ET".encode())
+        page[NameObject("/Contents")] = writer._add_object(content)
+
+    output = BytesIO()
+    writer.write(output)
+    return output.getvalue()
+
+
+class _InMemoryFileStore:
+    def __init__(self) -> None:
+        self.files: dict[str, bytes] = {}
+
+    def save_file(self, content: IO, file_id: str, **kwargs: Any) -> str:
+        self.files[file_id] = content.read()
+        return file_id
+
+    def read_file(self, file_id: str, **kwargs: Any) -> IO[bytes]:
+        if file_id not in self.files:
+            raise RuntimeError(f"File {file_id} not found")
+        return BytesIO(self.files[file_id])
+
+    def delete_file(self, file_id: str) -> None:
+        del self.files[file_id]
+
+
+@pytest.fixture(autouse=True)
+def no_external_settings(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(
+        extraction_service_module, "get_unstructured_api_key", lambda: None
+    )
+    monkeypatch.setattr(
+        extraction_service_module,
+        "get_image_extraction_and_analysis_enabled",
+        lambda: False,
+    )
+
+
+@pytest.fixture
+def file_store(monkeypatch: pytest.MonkeyPatch) -> _InMemoryFileStore:
+    store = _InMemoryFileStore()
+    monkeypatch.setattr(
+        extraction_service_module, "get_default_file_store", lambda: store
+    )
+    return store
+
+
+@pytest.fixture
+def service() -> Iterator[FileExtractionService]:
+    service = FileExtractionService(
+        max_workers=2,
+        cpu_time_limit=2,
+        memory_limit_mb=2048,
+        cache_enabled=False,
+    )
+    yield service
+    service.shutdown()
+
+
+def test_extracts_in_worker_process(service: FileExtractionService) -> None:
+    assert service._run(_get_pid) != os.getpid()
+
+    result = service.submit(BytesIO(b"hello world"), "hello.txt").result()
+    assert result.text_content == "hello world"
+
+
+def test_cpu_time_limit(service: FileExtractionService) -> None:
+    with pytest.raises(ExtractionLimitExceededError):
+        service._run(_burn_cpu, 30, service.cpu_time_limit)
+
+    # the worker survives and its budget is reset for the next job
+    service._run(_burn_cpu, 1, service.cpu_time_limit)
+    service._run(_burn_cpu, 1, service.cpu_time_limit)
+    assert service.extract(b"still works", "ok.txt").text_content == "still works"
+
+
+def test_memory_limit(service: FileExtractionService) -> None:
+    with pytest.raises(MemoryError):
+        service._run(_allocate, 8192)
+
+    assert service._run(_allocate, 16) == 16 * 1024 * 1024
+
+
+def test_waiting_for_a_worker_does_not_count_against_the_time_limit(
+    service: FileExtractionService, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    with ThreadPoolExecutor(max_workers=6) as executor:
+        # start both workers before the grace period for starting them is removed
+        for future in [executor.submit(service._run, time.sleep, 1) for _ in range(2)]:
+            future.result()
+
+        # 2 * cpu_time_limit = 4 seconds per job once it runs
+        monkeypatch.setattr(
+            extraction_service_module, "_WALL_TIME_LIMIT_GRACE_SECONDS", 0
+        )
+
+        # 6 jobs of 1.5s on 2 workers, the last ones wait 3s before they start
+        futures = [executor.submit(service._run, time.sleep, 1.5) for _ in range(6)]
+        for future in futures:
+            future.result()
+
+
+def test_page_parallel_pdf_matches_whole_file(
+    service: FileExtractionService, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(extraction_service_module, "_PAGE_PARALLEL_MIN_PDF_BYTES", 0)
+    service.pdf_pages_per_job = 2
+    pdf_bytes = _make_pdf(7)
+
+    job_args: list[tuple[Any, ...]] = []
+    run = service._run
+
+    def _recording_run(func: Any, *args: Any) -> Any:
+        job_args.append(args)
+        return run(func, *args)
+
+    monkeypatch.setattr(service, "_run", _recording_run)
+
+    parallel = service.extract(pdf_bytes, "doc.pdf")
+    whole_text, _, _ = read_pdf_file(BytesIO(pdf_bytes))
+
+    # the page count plus 4 page ranges, all of them only get the file's path
+    assert len(job_args) == 5
+    assert all(not isinstance(arg, bytes) for args in job_args for arg in args)
+
+    assert "page 0" in parallel.text_content
+    assert "page 6" in parallel.text_content
+    assert parallel.text_content == whole_text
+
+
+def test_content_hash_cache(
+    file_store: _InMemoryFileStore, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    service = FileExtractionService(max_workers=0, cache_enabled=True)
+    num_extractions = 0
+    original_extract = service._extract
+
+    def _counting_extract(*args: Any) -> ExtractionResult:
+        nonlocal num_extractions
+        num_extractions += 1
+        return original_extract(*args)
+
+    monkeypatch.setattr(service, "_extract", _counting_extract)
+
+    assert service.extract(b"some text", "a.txt").text_content == "some text"
+    # same content under a different name with the same extension is a hit
+    assert service.extract(b"some text", "b.txt").text_content == "some text"
+    assert num_extractions == 1
+    assert len(file_store.files) == 1
+
+    # different content or options miss
+    service.extract(b"other text", "a.txt")
+    service.extract(b"some text", "a.md")
+    assert num_extractions == 3
+
+
+def test_failed_extractions_are_not_cached(
+    file_store: _InMemoryFileStore,
+) -> None:
+    service = FileExtractionService(max_workers=0, cache_enabled=True)
+
+    result = service.extract(b"not a pdf", "broken.pdf")
+
+    assert result.text_content == ""
+    assert file_store.files == {}
+
+
+def test_inline_fallback() -> None:
+    service = FileExtractionService(max_workers=0, cache_enabled=False)
+
+    assert service._run(_get_pid) == os.getpid()
+    assert service.extract(b"inline", "inline.txt").text_content == "inline"
+
+
+def test_expired_cache_entries_are_deleted(
+    file_store: _InMemoryFileStore, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    file_store.files = {f"extraction_cache_{i}": b"{}" for i in range(5)}
+    queries: list[tuple[FileOrigin, datetime]] = []
+
+    def _get_file_ids(
+        file_origin: FileOrigin, created_before: datetime, limit: int, **kwargs: Any
+    ) -> list[str]:
+        queries.append((file_origin, created_before))
+        return list(file_store.files)[:limit]
+
+    monkeypatch.setattr(
+        extraction_service_module,
+        "get_file_ids_by_origin_created_before",
+        _get_file_ids,
+    )
+    monkeypatch.setattr(extraction_service_module, "_CACHE_CLEANUP_BATCH_SIZE", 2)
+
+    num_deleted = delete_expired_extraction_cache_entries(
+        db_session=MagicMock(), ttl_days=7
+    )
+
+    assert num_deleted == 5
+    assert file_store.files == {}
+    assert {file_origin for file_origin, _ in queries} == {FileOrigin.EXTRACTION_CACHE}
+    # batches of 2, 2, 1
+    assert len(queries) == 3
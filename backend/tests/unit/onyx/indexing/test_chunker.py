@@ -1,3 +1,4 @@
+from collections import Counter
 from typing import Any
 from unittest.mock import Mock
 
@@ -12,6 +13,7 @@ from onyx.indexing.chunker import Chunker
 from onyx.indexing.embedder import DefaultIndexingEmbedder
 from onyx.indexing.indexing_pipeline import process_image_sections
 from onyx.llm.utils import MAX_CONTEXT_TOKENS
+from onyx.natural_language_processing.utils import BaseTokenizer
 from tests.unit.onyx.indexing.conftest import MockHeartbeat
 
 
@@ -105,3 +107,67 @@ def test_chunker_heartbeat(
 
     assert mock_heartbeat.call_count == 1
     assert len(chunks) > 0
+
+
+class _CountingTokenizer(BaseTokenizer):
+    def __init__(self, tokenizer: BaseTokenizer) -> None:
+        self.tokenizer = tokenizer
+        self.encoded: Counter[str] = Counter()
+
+    def encode(self, string: str) -> list[int]:
+        self.encoded[string] += 1
+        return self.tokenizer.encode(string)
+
+    def encode_batch(self, strings: list[str]) -> list[list[int]]:
+        self.encoded.update(strings)
+        return self.tokenizer.encode_batch(strings)
+
+    def tokenize(self, string: str) -> list[str]:
+        return self.tokenizer.tokenize(string)
+
+    def decode(self, tokens: list[int]) -> str:
+        return self.tokenizer.decode(tokens)
+
+
+def test_chunker_tokenizes_each_text_once(embedder: DefaultIndexingEmbedder) -> None:
+    sections = [
+        TextSection(text=f"Section {i} has a sentence. And another one.", link=None)
+        for i in range(20)
+    ] + [
+        TextSection(
+            text="A long section that has to be split by the chunker. " * 200,
+            link=None,
+        )
+    ]
+    documents = process_image_sections(
+        [
+            Document(
+                id=f"test_doc_{doc_num}",
+                source=DocumentSource.WEB,
+                semantic_identifier="Test Document",
+                metadata={"tags": ["tag1", "tag2"]},
+                doc_updated_at=None,
+                sections=sections,
+            )
+            for doc_num in range(2)
+        ]
+    )
+    tokenizer = embedder.embedding_model.tokenizer
+    counting_tokenizer = _CountingTokenizer(tokenizer)
+
+    chunks = Chunker(tokenizer=counting_tokenizer, enable_multipass=True).chunk(
+        documents
+    )
+    # the counts are cached per document, so every text is encoded once per doc
+    assert max(counting_tokenizer.encoded.values()) == 2
+
+    # and clearing the cache between documents doesn't change the chunking
+    doc_chunks = [
+        [
+            (c.content, c.blurb, c.mini_chunk_texts)
+            for c in chunks
+            if c.source_document.id == doc.id
+        ]
+        for doc in documents
+    ]
+    assert doc_chunks[0] == doc_chunks[1]
@@ -0,0 +1,130 @@
+from typing import Any
+
+from onyx.db.models import KGEntityExtractionStaging
+from onyx.kg.clustering import clustering
+from onyx.kg.clustering.candidate_index import EntityCandidateIndex
+from onyx.kg.clustering.candidate_index import pg_trigrams
+
+
+def _staging_entity(
+    id_name: str, name: str, document_id: str | None = None, **kwargs: Any
+) -> KGEntityExtractionStaging:
+    return KGEntityExtractionStaging(
+        id_name=id_name,
+        name=name,
+        entity_type_id_name="ACCOUNT",
+        document_id=document_id,
+        occurrences=kwargs.pop("occurrences", 1),
+        attributes=kwargs.pop("attributes", {}),
+        alternative_names=kwargs.pop("alternative_names", []),
+        **kwargs,
+    )
+
+
+def test_pg_trigrams() -> None:
+    # same as SELECT show_trgm('Cat-Dog')
+    assert pg_trigrams("Cat-Dog") == {
+        "  c",
+        " ca",
+        "cat",
+        "at ",
+        "  d",
+        " do",
+        "dog",
+        "og ",
+    }
+    assert pg_trigrams("--") == set()
+
+
+def test_candidate_index_find_similar() -> None:
+    index = EntityCandidateIndex()
+    index.add("a", "acme corporation", None)
+    index.add("b", "acme corporations", "doc_1")
+    index.add("c", "globex", None)
+    index.add("d", "acme corporation 2", None, searchable=False)
+
+    assert index.find_similar("acme corporation", 0.6) == [0, 1]
+    assert index.find_similar("initech", 0.6) == []
+    assert index.find_by_key("acme corporation 2", None) == 3
+
+    index.set_document_id(0, "doc_2")
+    assert index.find_by_key("acme corporation", None) is None
+    assert index.find_by_key("acme corporation", "doc_2") == 0
+
+
+def test_entities_cluster_into_entities_of_the_same_run() -> None:
+    index = EntityCandidateIndex()
+    index.add("ACCOUNT::existing", "globex", None)
+
+    entities = [
+        _staging_entity("s1", "Acme Corporation"),
+        # similar to the entity created for s1 in the same run
+        _staging_entity("s2", "acme corporations", attributes={"tier": "gold"}),
+        _staging_entity("s3", "Globex"),
+        # numbers are never clustered
+        _staging_entity("s4", "Acme Corporation 2"),
+        # document entities merge into document-less ones
+        _staging_entity("s5", "acme", document_id="doc_1"),
+    ]
+    # the names to match on, documents are matched by their semantic_id
+    names = [
+        "acme corporation",
+        "acme corporations",
+        "globex",
+        "acme corporation 2",
+        "acme corporation",
+    ]
+    decisions = [
+        clustering._decide_clustering(entity, name, index)
+        for entity, name in zip(entities, names)
+    ]
+
+    assert [decision.action for decision in decisions] == [
+        clustering._ClusteringAction.INSERT,
+        clustering._ClusteringAction.MERGE,
+        clustering._ClusteringAction.MERGE,
+        clustering._ClusteringAction.INSERT,
+        clustering._ClusteringAction.MERGE,
+    ]
+    acme_id_name = decisions[0].id_name
+    assert decisions[1].id_name == acme_id_name
+    assert decisions[2].id_name == "ACCOUNT::existing"
+    assert decisions[3].id_name != acme_id_name
+    assert decisions[4].id_name == acme_id_name
+    # the merge gave the new entity a document
+    assert index.document_ids[index.position_of(acme_id_name)] == "doc_1"
+
+    new_entities, updated_entities, normalized_document_ids = (
+        clustering._apply_clustering_decisions(
+            decisions,
+            existing={
+                "ACCOUNT::existing": {
+                    "id_name": "ACCOUNT::existing",
+                    "name": "globex",
+                    "document_id": None,
+                    "alternative_names": [],
+                    "occurrences": 4,
+                    "attributes": {},
+                    "entity_key": None,
+                    "parent_key": None,
+                    "event_time": None,
+                }
+            },
+        )
+    )
+
+    new_by_id = {values["id_name"]: values for values in new_entities}
+    updated_by_id = {values["id_name"]: values for values in updated_entities}
+    assert set(new_by_id) == {acme_id_name, decisions[3].id_name}
+    # inserted without the document it got from the merge, then updated
+    assert new_by_id[acme_id_name]["document_id"] is None
+    assert updated_by_id[acme_id_name]["document_id"] == "doc_1"
+    assert updated_by_id[acme_id_name]["occurrences"] == 3
+    assert updated_by_id[acme_id_name]["attributes"] == {"tier": "gold"}
+    assert set(updated_by_id[acme_id_name]["alternative_names"]) == {
+        "acme corporations",
+        "acme",
+    }
+    assert updated_by_id["ACCOUNT::existing"]["occurrences"] == 5
+    assert "name" not in updated_by_id["ACCOUNT::existing"]
+    assert normalized_document_ids == {"doc_1"}
@@ -0,0 +1,124 @@
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+from langchain.schema.language_model import LanguageModelInput
+from langchain_core.messages import AIMessage
+from langchain_core.messages import BaseMessage
+from langchain_core.messages import HumanMessage
+
+from onyx.llm import interfaces
+from onyx.llm.interfaces import LLM
+from onyx.llm.interfaces import LLMConfig
+from onyx.llm.interfaces import ToolChoiceOptions
+from onyx.llm.response_cache import DiskLLMResponseCache
+from shared_configs.contextvars import CURRENT_TENANT_ID_CONTEXTVAR
+
+
+class _FakeLLM(LLM):
+    """Answers every prompt with its last message and counts the calls"""
+
+    def __init__(self, temperature: float = 0) -> None:
+        self._config = LLMConfig(
+            model_provider="fake",
+            model_name="fake-model",
+            temperature=temperature,
+            max_input_tokens=4096,
+        )
+        self.num_calls = 0
+
+    @property
+    def config(self) -> LLMConfig:
+        return self._config
+
+    def log_model_configs(self) -> None:
+        pass
+
+    def _invoke_implementation(
+        self,
+        prompt: LanguageModelInput,
+        tools: list[dict] | None = None,
+        tool_choice: ToolChoiceOptions | None = None,
+        structured_response_format: dict | None = None,
+        timeout_override: int | None = None,
+        max_tokens: int | None = None,
+    ) -> BaseMessage:
+        self.num_calls += 1
+        assert isinstance(prompt, list)
+        return AIMessage(content=f"answer to {prompt[-1].content}")
+
+    def _stream_implementation(
+        self,
+        prompt: LanguageModelInput,
+        tools: list[dict] | None = None,
+        tool_choice: ToolChoiceOptions | None = None,
+        structured_response_format: dict | None = None,
+        timeout_override: int | None = None,
+        max_tokens: int | None = None,
+    ) -> Iterator[BaseMessage]:
+        raise NotImplementedError
+
+
+@pytest.fixture
+def response_cache(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> DiskLLMResponseCache:
+    cache = DiskLLMResponseCache(directory=str(tmp_path))
+    monkeypatch.setattr(interfaces, "get_llm_response_cache", lambda: cache)
+    return cache
+
+
+def test_repeated_calls_hit_the_cache(response_cache: DiskLLMResponseCache) -> None:
+    llm = _FakeLLM()
+    # 3 distinct questions asked 4 times each
+    questions = [f"question {i % 3}" for i in range(12)]
+
+    answers = [
+        llm.invoke([HumanMessage(content=question)], use_response_cache=True).content
+        for question in questions
+    ]
+
+    assert answers == [f"answer to {question}" for question in questions]
+    assert llm.num_calls == 3
+
+    # a different parameter is a different request
+    llm.invoke(
+        [HumanMessage(content="question 0")], max_tokens=5, use_response_cache=True
+    )
+    assert llm.num_calls == 4
+
+
+def test_only_deterministic_opted_in_calls_are_cached(
+    response_cache: DiskLLMResponseCache,
+) -> None:
+    llm = _FakeLLM()
+    for _ in range(3):
+        llm.invoke([HumanMessage(content="question")])
+    assert llm.num_calls == 3
+
+    sampling_llm = _FakeLLM(temperature=0.7)
+    for _ in range(3):
+        sampling_llm.invoke([HumanMessage(content="question")], use_response_cache=True)
+    assert sampling_llm.num_calls == 3
+
+
+def test_cache_is_isolated_per_tenant(response_cache: DiskLLMResponseCache) -> None:
+    llm = _FakeLLM()
+    for tenant_id in ["tenant_a", "tenant_b", "tenant_a"]:
+        token = CURRENT_TENANT_ID_CONTEXTVAR.set(tenant_id)
+        try:
+            llm.invoke([HumanMessage(content="question")], use_response_cache=True)
+        finally:
+            CURRENT_TENANT_ID_CONTEXTVAR.reset(token)
+    assert llm.num_calls == 2
+
+
+def test_expired_responses_are_not_used(tmp_path: Path) -> None:
+    cache = DiskLLMResponseCache(directory=str(tmp_path), ttl=-1)
+    cache.set("key", AIMessage(content="answer"))
+    assert cache.get("key") is None
+
+    cache.ttl = 60
+    cache.set("key", AIMessage(content="answer"))
+    cached = cache.get("key")
+    assert isinstance(cached, AIMessage) and cached.content == "answer"
@@ -0,0 +1,77 @@
+import threading
+import time
+
+from onyx.onyxbot.slack.event_scheduler import TenantEventScheduler
+from shared_configs.contextvars import get_current_tenant_id
+
+
+def test_busy_tenant_does_not_block_other_tenants() -> None:
+    scheduler = TenantEventScheduler(
+        num_workers=4, max_concurrent_per_tenant=2, max_queued_per_tenant=100
+    )
+    release_noisy = threading.Event()
+    quiet_done = threading.Event()
+    running_noisy = 0
+    max_running_noisy = 0
+    lock = threading.Lock()
+
+    def noisy_event() -> None:
+        nonlocal running_noisy, max_running_noisy
+        with lock:
+            running_noisy += 1
+            max_running_noisy = max(max_running_noisy, running_noisy)
+        release_noisy.wait()
+        with lock:
+            running_noisy -= 1
+
+    try:
+        for _ in range(50):
+            assert scheduler.submit("noisy", noisy_event)
+        assert scheduler.submit("quiet", quiet_done.set)
+
+        # the quiet tenant's event runs while the noisy tenant's events are stuck
+        assert quiet_done.wait(timeout=5)
+        assert max_running_noisy == 2
+        assert scheduler.num_queued == 48
+    finally:
+        release_noisy.set()
+        scheduler.stop(timeout=5)
+
+
+def test_events_are_dropped_once_the_tenant_queue_is_full() -> None:
+    scheduler = TenantEventScheduler(
+        num_workers=1, max_concurrent_per_tenant=1, max_queued_per_tenant=3
+    )
+    release = threading.Event()
+    try:
+        assert scheduler.submit("tenant_a", release.wait)
+        # wait for the worker to pick up the blocking event
+        while scheduler.num_queued:
+            time.sleep(0.01)
+
+        assert all(scheduler.submit("tenant_a", lambda: None) for _ in range(3))
+        assert not scheduler.submit("tenant_a", lambda: None)
+        # other tenants have their own queue
+        assert scheduler.submit("tenant_b", lambda: None)
+    finally:
+        release.set()
+        scheduler.stop(timeout=5)
+
+
+def test_events_run_with_their_tenant_context() -> None:
+    scheduler = TenantEventScheduler(num_workers=2)
+    seen_tenant_ids: list[str] = []
+    done = threading.Semaphore(0)
+
+    def record_tenant_id() -> None:
+        seen_tenant_ids.append(get_current_tenant_id())
+        done.release()
+
+    try:
+        for tenant_id in ["tenant_a", "tenant_b", "tenant_c"]:
+            scheduler.submit(tenant_id, record_tenant_id)
+        for _ in range(3):
+            assert done.acquire(timeout=5)
+        assert sorted(seen_tenant_ids) == ["tenant_a", "tenant_b", "tenant_c"]
+    finally:
+        scheduler.stop(timeout=5)
@@ -0,0 +1,75 @@
+from unittest.mock import MagicMock
+from unittest.mock import patch
+
+from onyx.access.models import DocExternalAccess
+from onyx.access.models import ExternalAccess
+from onyx.redis.redis_connector_doc_perm_sync import RedisConnectorPermissionSync
+
+
+def _doc_external_access(doc_id: str, num_emails: int = 1) -> DocExternalAccess:
+    return DocExternalAccess(
+        doc_id=doc_id,
+        external_access=ExternalAccess(
+            external_user_emails={f"user_{i}@example.com" for i in range(num_emails)},
+            external_user_group_ids=set(),
+            is_public=False,
+        ),
+    )
+
+
+def _update_db(
+    batch_fn: MagicMock, single_fn: MagicMock, permissions: list[DocExternalAccess]
+) -> tuple[int, int]:
+    implementations = {
+        "document_update_permissions_batch": batch_fn,
+        "document_update_permissions": single_fn,
+    }
+    with patch(
+        "onyx.redis.redis_connector_doc_perm_sync.fetch_versioned_implementation",
+        side_effect=lambda module, attribute: implementations[attribute],
+    ):
+        result = RedisConnectorPermissionSync("tenant", 1, MagicMock()).update_db(
+            lock=None,
+            new_permissions=permissions,
+            source_string="google_drive",
+            connector_id=1,
+            credential_id=2,
+        )
+    return result.num_updated, result.num_errors
+
+
+def test_update_db_writes_one_batch() -> None:
+    batch_fn = MagicMock()
+    single_fn = MagicMock()
+    too_many_entries = ExternalAccess.MAX_NUM_ENTRIES + 1
+    permissions = [
+        _doc_external_access("doc_1"),
+        _doc_external_access("doc_2", num_emails=too_many_entries),
+        _doc_external_access("doc_3"),
+    ]
+
+    assert _update_db(batch_fn, single_fn, permissions) == (2, 0)
+
+    batch_fn.assert_called_once()
+    assert [p.doc_id for p in batch_fn.call_args[0][1]] == ["doc_1", "doc_3"]
+    single_fn.assert_not_called()
+
+
+def test_update_db_falls_back_to_single_documents() -> None:
+    def update_single(
+        tenant_id: str, permissions: DocExternalAccess, *args: object
+    ) -> bool:
+        if permissions.doc_id == "bad_doc":
+            raise ValueError("bad document")
+        return True
+
+    batch_fn = MagicMock(side_effect=RuntimeError("batch failed"))
+    single_fn = MagicMock(side_effect=update_single)
+    permissions = [
+        _doc_external_access("doc_1"),
+        _doc_external_access("bad_doc"),
+        _doc_external_access("doc_3"),
+    ]
+
+    assert _update_db(batch_fn, single_fn, permissions) == (2, 1)
+    assert single_fn.call_count == 3
@@ -1,9 +1,11 @@
 import os
+from typing import Any
 
 import pytest
 import redis
 
 from onyx.redis.redis_pool import RedisPool
+from onyx.redis.redis_pool import TenantRedis
 from onyx.utils.logger import setup_logger
 
 logger = setup_logger()
@@ -37,3 +39,70 @@ def test_redis_ssl() -> None:
 
     r = redis.Redis(connection_pool=pool)
     assert r.ping()
+
+
+class _RecordingTenantRedis(TenantRedis):
+    def __init__(self, tenant_id: str) -> None:
+        super().__init__(tenant_id)
+        self.commands: list[tuple[Any, ...]] = []
+
+    def execute_command(self, *args: Any, **options: Any) -> Any:
+        self.commands.append(args)
+        return None
+
+
+def test_tenant_redis_prefixes_keys() -> None:
+    r = _RecordingTenantRedis("tenant_a")
+
+    r.set("fence", 1)
+    r.get(name=b"fence")
+    r.hset("tenant_a:hash", "field", "value")
+    r.sadd("members", "tenant_b:not_a_key")
+
+    assert r.commands == [
+        ("SET", "tenant_a:fence", 1),
+        ("GET", b"tenant_a:fence"),
+        ("HSET", "tenant_a:hash", "field", "value"),
+        ("SADD", "tenant_a:members", "tenant_b:not_a_key"),
+    ]
+    # methods that aren't wrapped are left alone
+    r.hmget("hash", ["field"])
+    assert r.commands[-1] == ("HMGET", "hash", "field")
+
+
+def test_tenant_pipeline_prefixes_keys() -> None:
+    pipeline = TenantRedis("tenant_a").pipeline(transaction=False)
+
+    pipeline.delete("gated")
+    pipeline.sadd("gated", "tenant_b")
+    pipeline.set(name="tenant_a:already_prefixed", value=1)
+
+    assert [args for args, _ in pipeline.command_stack] == [
+        ("DEL", "tenant_a:gated"),
+        ("SADD", "tenant_a:gated", "tenant_b"),
+        ("SET", "tenant_a:already_prefixed", 1),
+    ]
+
+
+def test_tenant_redis_scan_iter_strips_prefix(monkeypatch: pytest.MonkeyPatch) -> None:
+    r = TenantRedis("tenant_a")
+    seen_matches: list[Any] = []
+
+    def _scan(
+        cursor: int = 0, match: Any = None, count: Any = None, _type: Any = None
+    ) -> tuple[int, list[bytes]]:
+        seen_matches.append(match)
+        return 0, [b"tenant_a:fence_1", b"tenant_a:fence_2"]
+
+    monkeypatch.setattr(r, "scan", _scan)
+
+    assert list(r.scan_iter("fence_*")) == [b"fence_1", b"fence_2"]
+    assert seen_matches == ["tenant_a:fence_*"]
+
+
+def test_tenant_clients_are_reused() -> None:
+    pool = RedisPool()
+
+    assert pool.get_client("tenant_a") is pool.get_client("tenant_a")
+    assert pool.get_client("tenant_a") is not pool.get_client("tenant_b")
+    assert pool.get_client("tenant_a") is not pool.get_replica_client("tenant_a")
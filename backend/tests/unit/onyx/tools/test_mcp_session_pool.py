@@ -0,0 +1,169 @@
+import asyncio
+import socket
+import threading
+import time
+from collections.abc import AsyncIterator
+from collections.abc import Callable
+from collections.abc import Iterator
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock
+
+import anyio
+import pytest
+import uvicorn
+from mcp import ClientSession
+from mcp.server.fastmcp import FastMCP
+from mcp.types import Tool as MCPLibTool
+
+from onyx.tools.tool_implementations.mcp import mcp_client
+from onyx.tools.tool_implementations.mcp.mcp_client import call_mcp_tool
+from onyx.tools.tool_implementations.mcp.mcp_client import discover_mcp_tools
+from onyx.tools.tool_implementations.mcp.mcp_session_pool import MCPSessionPool
+from onyx.utils.logger import setup_logger
+from onyx.utils.threadpool_concurrency import run_async_sync_no_cancel
+
+logger = setup_logger()
+
+_NUM_CALLS = 20
+
+
+@pytest.fixture
+def mcp_server_url() -> Iterator[str]:
+    server = FastMCP("test")
+
+    @server.tool()
+    def echo(text: str) -> str:
+        return text
+
+    sock = socket.socket()
+    sock.bind(("127.0.0.1", 0))
+    uvicorn_server = uvicorn.Server(
+        uvicorn.Config(server.streamable_http_app(), log_level="warning")
+    )
+    thread = threading.Thread(
+        target=uvicorn_server.run, kwargs={"sockets": [sock]}, daemon=True
+    )
+    thread.start()
+    while not uvicorn_server.started:
+        time.sleep(0.01)
+
+    yield f"http://127.0.0.1:{sock.getsockname()[1]}/mcp"
+
+    uvicorn_server.should_exit = True
+    thread.join(timeout=10)
+
+
+@pytest.fixture
+def session_pool(monkeypatch: pytest.MonkeyPatch) -> Iterator[MCPSessionPool]:
+    pool = MCPSessionPool()
+    monkeypatch.setattr(mcp_client, "get_mcp_session_pool", lambda: pool)
+    monkeypatch.setattr(mcp_client, "_tool_list_cache", {})
+    yield pool
+    pool.close()
+
+
+def _mean_latency(call: Callable[[], str]) -> float:
+    start = time.perf_counter()
+    for _ in range(_NUM_CALLS):
+        assert call() == "hi"
+    return (time.perf_counter() - start) / _NUM_CALLS
+
+
+def test_pooled_calls_reuse_one_session(
+    mcp_server_url: str, session_pool: MCPSessionPool
+) -> None:
+    def pooled_call() -> str:
+        return call_mcp_tool(mcp_server_url, "echo", {"text": "hi"})
+
+    def one_shot_call() -> str:
+        # what every call did before sessions were pooled
+        run = mcp_client._create_mcp_client_function_runner(
+            mcp_client._with_initialize(
+                mcp_client._call_mcp_tool("echo", {"text": "hi"})
+            ),
+            mcp_server_url,
+        )
+        return run_async_sync_no_cancel(run())
+
+    pooled_latency = _mean_latency(pooled_call)
+    one_shot_latency = _mean_latency(one_shot_call)
+    logger.info(
+        f"MCP call latency: pooled {pooled_latency * 1000:.1f} ms, "
+        f"new session per call {one_shot_latency * 1000:.1f} ms"
+    )
+
+    assert session_pool.num_sessions_opened == 1
+
+
+def test_failed_session_is_reopened(
+    mcp_server_url: str, session_pool: MCPSessionPool
+) -> None:
+    assert call_mcp_tool(mcp_server_url, "echo", {"text": "hi"}) == "hi"
+
+    # the session going away, e.g. because the server restarted
+    (pooled,) = session_pool._sessions.values()
+    asyncio.run_coroutine_threadsafe(pooled.close(), session_pool._loop).result()
+
+    assert call_mcp_tool(mcp_server_url, "echo", {"text": "hi"}) == "hi"
+    assert session_pool.num_sessions_opened == 2
+
+
+@pytest.mark.parametrize("retry_on_closed_session", [False, True])
+def test_only_retryable_calls_are_resent_on_a_closed_session(
+    session_pool: MCPSessionPool, retry_on_closed_session: bool
+) -> None:
+    @asynccontextmanager
+    async def open_session() -> AsyncIterator[ClientSession]:
+        yield AsyncMock(spec=ClientSession)
+
+    num_calls = 0
+
+    async def closed_after_sending(session: ClientSession) -> str:
+        nonlocal num_calls
+        num_calls += 1
+        if num_calls == 1:
+            # the connection dropping while waiting for the response
+            raise anyio.BrokenResourceError()
+        return "hi"
+
+    def run() -> str:
+        return session_pool.run(
+            "server",
+            open_session,
+            closed_after_sending,
+            retry_on_closed_session=retry_on_closed_session,
+        )
+
+    if retry_on_closed_session:
+        assert run() == "hi"
+        assert num_calls == 2
+    else:
+        with pytest.raises(anyio.BrokenResourceError):
+            run()
+        assert num_calls == 1
+        # the closed session is not reused
+        assert run() == "hi"
+    assert session_pool.num_sessions_opened == 2
+
+
+def test_tool_list_is_cached(
+    mcp_server_url: str,
+    session_pool: MCPSessionPool,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    num_listed = 0
+    discover = mcp_client._discover_mcp_tools
+
+    async def counting_discover(session: ClientSession) -> list[MCPLibTool]:
+        nonlocal num_listed
+        num_listed += 1
+        return await discover(session)
+
+    monkeypatch.setattr(mcp_client, "_discover_mcp_tools", counting_discover)
+
+    for _ in range(3):
+        assert [tool.name for tool in discover_mcp_tools(mcp_server_url)] == ["echo"]
+    assert num_listed == 1
+
+    discover_mcp_tools(mcp_server_url, use_cache=False)
+    assert num_listed == 2
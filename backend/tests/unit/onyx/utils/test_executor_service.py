@@ -0,0 +1,125 @@
+import contextvars
+import threading
+import time
+from collections.abc import Generator
+from concurrent.futures import wait
+
+import pytest
+
+from onyx.utils import executor_service as executor_service_module
+from onyx.utils.executor_service import ExecutorPool
+from onyx.utils.executor_service import ExecutorService
+
+test_var = contextvars.ContextVar("test_var", default="default")
+
+
+@pytest.fixture
+def small_service(
+    monkeypatch: pytest.MonkeyPatch,
+) -> Generator[ExecutorService, None, None]:
+    monkeypatch.setitem(executor_service_module._POOL_MAX_WORKERS, ExecutorPool.IO, 2)
+    service = ExecutorService()
+    yield service
+    service.shutdown(wait=True)
+
+
+def test_submit_preserves_contextvar(small_service: ExecutorService) -> None:
+    test_var.set("submitted")
+    future = small_service.submit(ExecutorPool.IO, test_var.get)
+    assert future.result(timeout=5) == "submitted"
+
+
+def test_pool_is_reused_across_calls(small_service: ExecutorService) -> None:
+    thread_names: set[str] = set()
+    for _ in range(20):
+        small_service.submit(
+            ExecutorPool.IO, lambda: thread_names.add(threading.current_thread().name)
+        ).result(timeout=5)
+
+    # all calls should be served by the (bounded) shared pool or the caller
+    assert len(thread_names - {threading.current_thread().name}) <= 2
+
+
+def test_run_all_respects_max_concurrency(small_service: ExecutorService) -> None:
+    lock = threading.Lock()
+    running = 0
+    max_running = 0
+
+    def work() -> None:
+        nonlocal running, max_running
+        with lock:
+            running += 1
+            max_running = max(max_running, running)
+        time.sleep(0.05)
+        with lock:
+            running -= 1
+
+    futures = small_service.run_all(
+        ExecutorPool.IO, [(work, (), {}) for _ in range(8)], max_concurrency=2
+    )
+    for future in futures:
+        future.result(timeout=5)
+
+    assert max_running <= 2
+
+
+def test_nested_batches_do_not_deadlock(small_service: ExecutorService) -> None:
+    """Every pool worker blocks on a nested batch; the callers must pick up
+    the nested work themselves since the pool is saturated."""
+
+    def inner(i: int) -> int:
+        time.sleep(0.01)
+        return i
+
+    def outer(i: int) -> int:
+        futures = small_service.run_all(
+            ExecutorPool.IO, [(inner, (j,), {}) for j in range(4)]
+        )
+        return sum(future.result(timeout=5) for future in futures) + i
+
+    futures = small_service.run_all(
+        ExecutorPool.IO, [(outer, (i,), {}) for i in range(6)]
+    )
+    assert [future.result(timeout=10) for future in futures] == [
+        6 + i for i in range(6)
+    ]
+
+
+def test_nested_submit_does_not_deadlock(small_service: ExecutorService) -> None:
+    def outer() -> int:
+        return small_service.submit(ExecutorPool.IO, lambda: 1).result(timeout=5)
+
+    futures = [small_service.submit(ExecutorPool.IO, outer) for _ in range(4)]
+    assert [future.result(timeout=10) for future in futures] == [1, 1, 1, 1]
+
+
+def test_run_all_fail_fast_cancels_pending(small_service: ExecutorService) -> None:
+    calls_run: list[int] = []
+
+    def work(i: int) -> None:
+        calls_run.append(i)
+        if i == 0:
+            raise ValueError("boom")
+
+    futures = small_service.run_all(
+        ExecutorPool.IO,
+        [(work, (i,), {}) for i in range(50)],
+        max_concurrency=1,
+        fail_fast=True,
+    )
+
+    with pytest.raises(ValueError):
+        futures[0].result()
+    assert calls_run == [0]
+    assert all(future.cancelled() for future in futures[1:])
+    # waiters must be notified of the cancellations, not just the caller
+    done, not_done = wait(futures, timeout=5)
+    assert len(done) == 50 and not not_done
+
+
+def test_shared_executor_cannot_be_used_as_context_manager(
+    small_service: ExecutorService,
+) -> None:
+    with pytest.raises(RuntimeError):
+        with small_service.get_executor(ExecutorPool.IO):
+            pass
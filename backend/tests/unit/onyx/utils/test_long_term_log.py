@@ -0,0 +1,95 @@
+from datetime import datetime
+from datetime import timedelta
+from pathlib import Path
+
+from onyx.utils import long_term_log
+from onyx.utils.long_term_log import LongTermLogger
+
+
+def test_records_are_written_in_background_and_fetchable(tmp_path: Path) -> None:
+    ltl = LongTermLogger(metadata={"user_id": "1"}, log_file_path=str(tmp_path))
+    for i in range(25):
+        ltl.record({"i": i}, category="test")
+
+    assert ltl.flush(timeout=5)
+
+    # all records land in a single segment rather than one file per record
+    segments = list((tmp_path / "test").iterdir())
+    assert len(segments) == 1
+    assert segments[0].suffix == ".jsonl"
+
+    records = ltl.fetch_category("test")
+    assert records == [
+        {"metadata": {"user_id": "1"}, "record": {"i": i}} for i in range(25)
+    ]
+
+
+def test_fetch_category_filters_by_time(tmp_path: Path) -> None:
+    ltl = LongTermLogger(log_file_path=str(tmp_path))
+    ltl.record("hello", category="test")
+    ltl.flush(timeout=5)
+
+    now = datetime.now()
+    assert len(ltl.fetch_category("test", start_time=now - timedelta(minutes=1))) == 1
+    assert ltl.fetch_category("test", start_time=now + timedelta(minutes=1)) == []
+    assert ltl.fetch_category("test", end_time=now - timedelta(minutes=1)) == []
+
+
+def test_segments_rotate_and_are_pruned(tmp_path: Path) -> None:
+    ltl = LongTermLogger(log_file_path=str(tmp_path), max_files_per_category=3)
+    writer = long_term_log._get_writer(tmp_path, max_files_per_category=3)
+    # force a new segment for every write
+    writer.max_segment_bytes = 1
+
+    for i in range(10):
+        ltl.record({"i": i}, category="test")
+        ltl.flush(timeout=5)
+
+    segments = list((tmp_path / "test").iterdir())
+    assert len(segments) == 3
+    # oldest segments are the ones that get removed
+    assert [r["record"]["i"] for r in ltl.fetch_category("test")] == [7, 8, 9]  # type: ignore
+
+
+def test_record_never_raises_for_unserializable_values(tmp_path: Path) -> None:
+    ltl = LongTermLogger(log_file_path=str(tmp_path))
+    ltl.record({"obj": object()}, category="test")  # type: ignore[dict-item]
+    ltl.flush(timeout=5)
+
+    assert len(ltl.fetch_category("test")) == 1
+
+
+def test_segments_are_pruned_to_byte_budget(tmp_path: Path) -> None:
+    ltl = LongTermLogger(log_file_path=str(tmp_path), max_bytes_per_category=1000)
+    writer = long_term_log._get_writer(
+        tmp_path, max_files_per_category=1000, max_bytes_per_category=1000
+    )
+    # force a new segment for every few records
+    writer.max_segment_bytes = 200
+
+    for i in range(200):
+        ltl.record({"i": i, "padding": "x" * 20}, category="test")
+        ltl.flush(timeout=5)
+
+    segments = list((tmp_path / "test").iterdir())
+    assert sum(segment.stat().st_size for segment in segments) <= 1000
+    # the newest records are kept
+    records = ltl.fetch_category("test", limit=1000)
+    assert records[-1]["record"]["i"] == 199  # type: ignore
+
+
+def test_fetch_category_returns_most_recent_records_up_to_limit(
+    tmp_path: Path,
+) -> None:
+    ltl = LongTermLogger(log_file_path=str(tmp_path))
+    writer = long_term_log._get_writer(tmp_path, max_files_per_category=1000)
+    writer.max_segment_bytes = 300
+
+    for i in range(50):
+        ltl.record({"i": i}, category="test")
+        ltl.flush(timeout=5)
+    assert len(list((tmp_path / "test").iterdir())) > 1
+
+    records = ltl.fetch_category("test", limit=10)
+    assert [r["record"]["i"] for r in records] == list(range(40, 50))  # type: ignore
+    assert len(ltl.fetch_category("test", limit=1000)) == 50
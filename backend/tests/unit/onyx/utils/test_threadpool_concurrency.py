@@ -4,10 +4,17 @@ import time
 from collections.abc import Generator
 from collections.abc import Iterator
 from concurrent.futures import ThreadPoolExecutor
+from typing import Any
 
 import pytest
 
+from onyx.configs.app_configs import EXECUTOR_IO_MAX_WORKERS
+from onyx.utils import threadpool_concurrency as threadpool_concurrency_module
+from onyx.utils.threadpool_concurrency import FunctionCall
+from onyx.utils.threadpool_concurrency import parallel_map_unordered
 from onyx.utils.threadpool_concurrency import parallel_yield
+from onyx.utils.threadpool_concurrency import run_functions_in_parallel
+from onyx.utils.threadpool_concurrency import run_functions_tuples_in_parallel
 from onyx.utils.threadpool_concurrency import run_in_background
 from onyx.utils.threadpool_concurrency import run_with_timeout
 from onyx.utils.threadpool_concurrency import ThreadSafeDict
@@ -389,3 +396,135 @@ def test_parallel_yield_non_blocking() -> None:
     # Verify no values are missing
     assert len(results) == 300  # Should have all values from 0 to 299
     assert sorted(results) == list(range(300))
+
+
+def _fail_first(i: int) -> int:
+    if i == 0:
+        raise ValueError("Test error")
+    return i
+
+
+@pytest.mark.parametrize("max_workers", [1, None])
+def test_run_functions_tuples_in_parallel_raises_on_failure(
+    max_workers: int | None,
+) -> None:
+    """Test that a failing function is raised (rather than hanging on the calls
+    that were cancelled because of it)."""
+    with pytest.raises(ValueError, match="Test error"):
+        run_with_timeout(
+            5,
+            run_functions_tuples_in_parallel,
+            [(_fail_first, (i,)) for i in range(20)],
+            max_workers=max_workers,
+        )
+
+
+def test_run_functions_in_parallel_raises_on_failure() -> None:
+    with pytest.raises(ValueError, match="Test error"):
+        run_with_timeout(
+            5,
+            run_functions_in_parallel,
+            [FunctionCall(_fail_first, (i,)) for i in range(20)],
+        )
+
+
+def test_parallel_map_unordered_basic() -> None:
+    """Test that every item is processed exactly once."""
+    results = list(parallel_map_unordered(lambda x: x * 2, range(100), max_workers=4))
+    assert sorted(results) == [x * 2 for x in range(100)]
+
+
+def test_parallel_map_unordered_bounds_pending_items() -> None:
+    """Test that items are pulled lazily and the first results are available
+    before the input is exhausted."""
+    num_pulled = 0
+
+    def items() -> Iterator[int]:
+        nonlocal num_pulled
+        for i in range(1000):
+            num_pulled += 1
+            yield i
+
+    results = parallel_map_unordered(lambda x: x, items(), max_workers=2, max_pending=4)
+    next(results)
+    # at most max_pending items in flight, plus the one that was yielded
+    assert num_pulled <= 5
+
+    assert len(list(results)) == 999
+    assert num_pulled == 1000
+
+
+def test_parallel_map_unordered_propagates_exceptions() -> None:
+    """Test that an exception in func is re-raised to the consumer."""
+
+    def maybe_fail(x: int) -> int:
+        if x == 5:
+            raise ValueError("Test error")
+        return x
+
+    with pytest.raises(ValueError, match="Test error"):
+        list(parallel_map_unordered(maybe_fail, range(20), max_workers=2))
+
+
+def test_parallel_map_unordered_preserves_contextvars() -> None:
+    """Test that contextvars are visible in the worker threads."""
+    token = test_context_var.set("mapped")
+    try:
+        results = list(
+            parallel_map_unordered(
+                lambda _: test_context_var.get(), range(10), max_workers=3
+            )
+        )
+    finally:
+        test_context_var.reset(token)
+    assert results == ["mapped"] * 10
+
+
+def test_parallel_map_unordered_uses_shared_pool(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test that no executor is created per call and that at most max_workers
+    calls run at once."""
+
+    def _no_new_pools(*args: Any, **kwargs: Any) -> None:
+        raise AssertionError("parallel_map_unordered must use the shared pools")
+
+    monkeypatch.setattr(
+        threadpool_concurrency_module, "ThreadPoolExecutor", _no_new_pools
+    )
+    lock = threading.Lock()
+    running = 0
+    max_running = 0
+
+    def track(x: int) -> int:
+        nonlocal running, max_running
+        with lock:
+            running += 1
+            max_running = max(max_running, running)
+        time.sleep(0.01)
+        with lock:
+            running -= 1
+        return x
+
+    results = list(parallel_map_unordered(track, range(30), max_workers=3))
+
+    assert sorted(results) == list(range(30))
+    assert max_running <= 3
+
+
+def test_parallel_map_unordered_nested_in_saturated_pool() -> None:
+    """Test that mapping from within tasks of the shared pool makes progress
+    even when every pool worker is busy."""
+    num_outer = EXECUTOR_IO_MAX_WORKERS + 2
+
+    def outer(x: int) -> int:
+        return sum(parallel_map_unordered(lambda y: y, range(x), max_workers=2))
+
+    results = run_with_timeout(
+        30,
+        lambda: list(
+            parallel_map_unordered(outer, range(num_outer), max_workers=num_outer)
+        ),
+    )
+
+    assert sorted(results) == sorted(sum(range(x)) for x in range(num_outer))
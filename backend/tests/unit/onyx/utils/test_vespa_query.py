@@ -1,6 +1,7 @@
 from datetime import datetime
 from datetime import timedelta
 from datetime import timezone
+from unittest.mock import patch
 from uuid import UUID
 
 from onyx.configs.constants import DocumentSource
@@ -10,6 +11,7 @@ from onyx.context.search.models import Tag
 from onyx.document_index.vespa.shared_utils.vespa_request_builders import (
     build_vespa_filters,
 )
+from onyx.document_index.vespa_constants import CC_PAIR_IDS
 from onyx.document_index.vespa_constants import DOC_UPDATED_AT
 from onyx.document_index.vespa_constants import DOCUMENT_ID
 from onyx.document_index.vespa_constants import DOCUMENT_SETS
@@ -20,6 +22,8 @@ from onyx.document_index.vespa_constants import TENANT_ID
 from onyx.document_index.vespa_constants import USER_PROJECT
 from shared_configs.configs import MULTI_TENANT
 
+_BUILDERS_MODULE = "onyx.document_index.vespa.shared_utils.vespa_request_builders"
+
 # Import the function under test
 
 
@@ -153,6 +157,54 @@ class TestBuildVespaFilters:
         result = build_vespa_filters(filters)
         assert f"!({HIDDEN}=true) and " == result
 
+    def test_resolved_document_sets_filter(self) -> None:
+        """Test document sets resolved to their cc_pairs at query time."""
+        with patch(
+            f"{_BUILDERS_MODULE}.RESOLVE_DOC_SETS_AND_GROUPS_AT_QUERY_TIME", True
+        ), patch(
+            f"{_BUILDERS_MODULE}.get_cc_pair_ids_for_document_sets",
+            side_effect=lambda names: {"set1": [1, 3], "set2": []}[names[0]],
+        ):
+            filters = IndexFilters(access_control_list=None, document_set=["set1"])
+            result = build_vespa_filters(filters)
+            assert (
+                f"!({HIDDEN}=true) and ({CC_PAIR_IDS} = 1 or {CC_PAIR_IDS} = 3) and "
+                == result
+            )
+
+            # A document set without any cc_pairs matches nothing
+            filters = IndexFilters(access_control_list=None, document_set=["set2"])
+            result = build_vespa_filters(filters)
+            assert f"!({HIDDEN}=true) and false and " == result
+
+            # Empty document sets
+            filters = IndexFilters(access_control_list=None, document_set=[])
+            result = build_vespa_filters(filters)
+            assert f"!({HIDDEN}=true) and " == result
+
+    def test_resolved_acl_filter(self) -> None:
+        """Test user group ACL entries resolved to their cc_pairs at query time."""
+        with patch(
+            f"{_BUILDERS_MODULE}.RESOLVE_DOC_SETS_AND_GROUPS_AT_QUERY_TIME", True
+        ), patch(
+            f"{_BUILDERS_MODULE}.resolve_user_groups_in_acl",
+            side_effect=lambda acl: {
+                ("user1", "group1"): (["user1"], [2]),
+                ("group2",): ([], []),
+            }[tuple(acl)],
+        ):
+            filters = IndexFilters(access_control_list=["user1", "group1"])
+            result = build_vespa_filters(filters)
+            assert (
+                f'!({HIDDEN}=true) and (access_control_list contains "user1" '
+                f"or {CC_PAIR_IDS} = 2) and " == result
+            )
+
+            # Only user groups without any cc_pairs matches nothing
+            filters = IndexFilters(access_control_list=["group2"])
+            result = build_vespa_filters(filters)
+            assert f"!({HIDDEN}=true) and false and " == result
+
     def test_user_file_ids_filter(self) -> None:
         """Test user file IDs filtering."""
         id1 = UUID("00000000-0000-0000-0000-000000000123")